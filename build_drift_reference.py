@@ -0,0 +1,58 @@
+"""
+Build the reference distribution for feature drift monitoring
+This will create drift_reference.npz next to feature_scaler.pkl
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.drift_monitor import DRIFT_REFERENCE_FILE, DriftMonitor
+
+print("="*80)
+print("BUILDING DRIFT REFERENCE FROM TRAINING DATA")
+print("="*80)
+
+# Load the training data, encoded the way scoring encodes it
+print("\n1. Loading model and training data...")
+processor = DataProcessor(ModelLoader('models'))
+df = pd.read_csv('data.csv')
+processed_df, _ = processor.validate_and_prepare(df)
+X = processor.encode_features(processed_df[processor.feature_names])
+print(f"✓ {len(X)} samples, {X.shape[1]} features")
+
+# Bins from data.csv, mean and spread from the feature scaler
+print("\n2. Computing reference bins...")
+categorical = {col: len(encoder.classes_) for col, encoder in processor.label_encoders.items()}
+monitor = DriftMonitor.fit(X, processor.feature_names, processor.scaler.mean_, processor.scaler.scale_,
+                           categorical=categorical)
+print(f"✓ {len(monitor.reference)} bins over {len(monitor.feature_names)} features "
+      f"({len(categorical)} categorical)")
+
+# The training data must not drift from itself
+print("\n3. Checking training data against the reference...")
+start = time.perf_counter()
+monitor.update(X)
+elapsed = time.perf_counter() - start
+report = monitor.report()
+print(f"✓ Max PSI {report['psi'].max():.4f}, max KS {report['ks'].max():.4f}, "
+      f"max |mean shift| {report['mean_shift'].abs().max():.3f} sd")
+print(f"✓ Update cost: {elapsed / len(X) * 1e6:.2f} µs per row")
+
+# Save
+print("\n4. Saving drift reference...")
+output_path = os.path.join('models', DRIFT_REFERENCE_FILE)
+monitor.save(output_path)
+print(f"✓ Saved drift reference to: {output_path}")
+
+print("\n" + "="*80)
+print("✅ DRIFT REFERENCE SAVED!")
+print("="*80)
+print(f"\n📁 {os.path.abspath(output_path)}")
+print(f"   Size: {os.path.getsize(output_path) / 1024:.0f} KB")
+print(f"   Computed from: {len(X)} training samples")
@@ -0,0 +1,57 @@
+"""
+Compute global feature importance for the trained model on the training data
+This will create feature_importance.csv next to svm_optimized_model.pkl
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.explainer import FEATURE_IMPORTANCE_FILE, RBFExplainer, permutation_importance
+
+print("="*80)
+print("BUILDING FEATURE IMPORTANCE FROM TRAINING DATA")
+print("="*80)
+
+# Load the model and training data
+print("\n1. Loading model and training data...")
+processor = DataProcessor(ModelLoader('models'))
+df = pd.read_csv('data.csv')
+processed_df, _ = processor.validate_and_prepare(df)
+X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+# Classes were label-encoded as anomaly=0, normal=1 in training
+y = (processed_df['true_class'] == 'Normal').astype(int).to_numpy()
+print(f"✓ {len(X_scaled)} samples, {X_scaled.shape[1]} features")
+
+# Permutation importance, features scored in parallel
+print("\n2. Computing permutation importance (3 shuffles per feature)...")
+start = time.perf_counter()
+trust_scale = float(np.ravel(processor.trust_scaler.scale_)[0])
+importance = permutation_importance(processor.model, X_scaled, y, processor.feature_names,
+                                    trust_scale=trust_scale, n_repeats=3)
+print(f"✓ Done in {time.perf_counter() - start:.1f}s")
+
+# Mean absolute per-row attribution, for comparison with the per-row explanations
+print("\n3. Computing mean absolute attributions...")
+explainer = RBFExplainer.from_model_loader(processor.model_loader)
+attributions = np.abs(explainer.attributions(X_scaled)).mean(axis=0)
+importance['mean_abs_attribution'] = importance['feature'].map(dict(zip(processor.feature_names, attributions)))
+print(importance.head(10).round(4).to_string(index=False))
+
+# Save
+print("\n4. Saving feature importance...")
+output_path = os.path.join('models', FEATURE_IMPORTANCE_FILE)
+importance.round(6).to_csv(output_path, index=False)
+print(f"✓ Saved feature importance to: {output_path}")
+
+print("\n" + "="*80)
+print("✅ FEATURE IMPORTANCE SAVED!")
+print("="*80)
+print(f"\n📁 {os.path.abspath(output_path)}")
+print(f"   Features: {len(importance)}")
+print(f"   Computed from: {len(X_scaled)} training samples")
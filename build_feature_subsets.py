@@ -0,0 +1,118 @@
+"""
+Reduced-feature model variants: train the SVC on the notebook's feature subsets and
+compare accuracy against scoring cost, timed through DataProcessor.predict
+
+Run: python build_feature_subsets.py [--export Top_20 [--primary]] [--report subsets.csv]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.bakeoff import export_model, fit_trust_scaler, measure, scoring_processor
+from utils.feature_selection import (CORRELATION_THRESHOLD, correlated_pairs, feature_subsets,
+                                     rank_features, train_subset_models)
+from utils.training_data import load_training_matrix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train and compare reduced-feature SVC variants")
+    parser.add_argument('--threshold', type=float, default=CORRELATION_THRESHOLD,
+                        help="Absolute correlation above which the weaker feature is dropped (Reduced_Corr)")
+    parser.add_argument('--workers', type=int, help="Training processes (default: one per CPU)")
+    parser.add_argument('--single-rows', type=int, default=200, help="Rows timed one at a time per variant")
+    parser.add_argument('--report', help="Also write the report to this CSV")
+    parser.add_argument('--export', metavar='NAME',
+                        help="Save this variant and add it to models/model_registry.json")
+    parser.add_argument('--primary', action='store_true', help="Register the exported variant as the primary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*80)
+    print("REDUCED-FEATURE MODEL VARIANTS")
+    print("="*80)
+
+    # Encoded training matrix from the cache, and the notebook's 70/30 split
+    print("\n1. Loading encoded data.csv...")
+    model_loader = ModelLoader('models')
+    processor = DataProcessor(model_loader)
+    feature_names = list(processor.feature_names)
+    X_numeric, y, row_ids = load_training_matrix(processor, 'data.csv')
+    X_scaled = processor.scale_features(X_numeric)
+    from sklearn.model_selection import train_test_split
+    train_idx, test_idx = train_test_split(range(len(y)), test_size=0.3, random_state=42, stratify=y)
+    print(f"✓ {len(y)} rows: {len(train_idx)} train / {len(test_idx)} test")
+
+    # Importance ranking and correlation scan on the training rows
+    print("\n2. Selecting features...")
+    start = time.perf_counter()
+    ranking = rank_features(X_numeric[train_idx], y[train_idx], feature_names)
+    pairs = correlated_pairs(X_numeric[train_idx], feature_names, args.threshold)
+    subsets = feature_subsets(ranking, pairs, feature_names)
+    print(f"✓ {len(pairs)} pairs above |r| {args.threshold:g} in {time.perf_counter() - start:.2f}s")
+    for name, features in subsets.items():
+        print(f"  {name}: {len(features)} features")
+    if args.export and args.export not in subsets:
+        sys.exit(f"❌ Unknown variant {args.export!r}; expected one of {list(subsets)}")
+
+    # One SVC per subset, in parallel
+    print(f"\n3. Training {len(subsets)} variants...")
+    start = time.perf_counter()
+    fitted = train_subset_models(subsets, X_scaled[train_idx], y[train_idx], feature_names,
+                                 max_workers=args.workers)
+    for name, (model, seconds) in fitted.items():
+        print(f"✓ {name}: {seconds:.1f}s, {model.support_vectors_.shape[0]} support vectors")
+    print(f"✓ Wall time {time.perf_counter() - start:.1f}s")
+
+    # Score the test rows through DataProcessor.predict, one variant at a time
+    print("\n4. Measuring through DataProcessor.predict...")
+    test_df, _ = processor.validate_and_prepare(pd.read_csv('data.csv').iloc[row_ids[test_idx]])
+    variants, rows = {}, []
+    for name, (model, seconds) in fitted.items():
+        columns = [feature_names.index(f) for f in subsets[name]]
+        trust_scaler = fit_trust_scaler(model, X_scaled[test_idx][:, columns])
+        variants[name] = (model, trust_scaler)
+        scorer = scoring_processor(model_loader, name, model, trust_scaler, subsets[name])
+        rows.append({'variant': name, 'n_features': len(columns),
+                     'support_vectors': model.support_vectors_.shape[0], 'train_s': seconds,
+                     **measure(scorer, test_df, single_rows=args.single_rows)})
+        print(f"✓ {name}: accuracy {rows[-1]['accuracy']:.4f}, "
+              f"{rows[-1]['batch_us_per_row']:.1f} µs/row batch")
+    report = pd.DataFrame(rows)
+    full = report.set_index('variant').loc['Full_Features']
+    report['batch_speedup'] = full['batch_us_per_row'] / report['batch_us_per_row']
+    report['accuracy_delta'] = report['accuracy'] - full['accuracy']
+
+    print("\n5. Results (speedup and accuracy change against Full_Features)...")
+    with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.float_format', '{:.4g}'.format):
+        print(report.to_string(index=False))
+    if args.report:
+        report.to_csv(args.report, index=False)
+        print(f"✓ Report written to {args.report}")
+
+    print("\n" + "="*80)
+    if args.export:
+        role = 'primary' if args.primary else 'shadow'
+        registry_path = export_model(args.export, *variants[args.export], 'models', role=role,
+                                     feature_subset=subsets[args.export])
+        print(f"✅ {args.export.upper()} EXPORTED!")
+        print("="*80)
+        print(f"\n📁 {os.path.abspath(os.path.join('models', args.export + '_model.pkl'))}")
+        print(f"   Registered as {role} in {registry_path}")
+    else:
+        print("✅ VARIANTS COMPARED (rerun with --export NAME to save one)")
+        print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
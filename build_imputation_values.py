@@ -0,0 +1,56 @@
+"""
+Compute missing-value imputation statistics from the training data
+This will create imputation_values.pkl next to feature_scaler.pkl
+"""
+
+import pandas as pd
+import joblib
+import os
+
+print("="*80)
+print("BUILDING IMPUTATION VALUES FROM TRAINING DATA")
+print("="*80)
+
+# Load the training data
+print("\n1. Loading training data...")
+df = pd.read_csv('data.csv')
+
+# Clean column names
+df.columns = df.columns.str.strip().str.replace("'", "")
+print(f"✓ Loaded {len(df)} samples")
+
+# Use the same feature set and order as the model
+print("\n2. Loading feature names and label encoders...")
+feature_names = joblib.load('models/feature_names.pkl')
+label_encoders = joblib.load('models/label_encoders.pkl')
+print(f"✓ {len(feature_names)} features, encoders for: {list(label_encoders.keys())}")
+
+# Medians for numeric features, most frequent known category for categoricals
+print("\n3. Computing imputation values...")
+imputation_values = {}
+for col in feature_names:
+    values = df[col].dropna()
+    if col in label_encoders:
+        known = values[values.isin(label_encoders[col].classes_)]
+        imputation_values[col] = str(known.mode().iloc[0])
+    else:
+        imputation_values[col] = float(values.median())
+
+categorical = {c: v for c, v in imputation_values.items() if c in label_encoders}
+nonzero = {c: v for c, v in imputation_values.items() if c not in label_encoders and v != 0}
+print(f"✓ Categorical modes: {categorical}")
+print(f"✓ Non-zero numeric medians: {nonzero}")
+
+# Save
+print("\n4. Saving imputation values...")
+os.makedirs('models', exist_ok=True)
+output_path = 'models/imputation_values.pkl'
+joblib.dump(imputation_values, output_path)
+print(f"✓ Saved imputation values to: {output_path}")
+
+print("\n" + "="*80)
+print("✅ IMPUTATION VALUES SAVED!")
+print("="*80)
+print(f"\n📁 {os.path.abspath(output_path)}")
+print(f"   Features: {len(imputation_values)}")
+print(f"   Computed from: {len(df)} training samples")
@@ -0,0 +1,56 @@
+"""
+Index the labeled training connections for nearest-record lookups
+This will create neighbor_index.npz next to feature_scaler.pkl
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.neighbor_index import NEIGHBOR_INDEX_FILE, NeighborIndex
+
+print("="*80)
+print("BUILDING NEIGHBOR INDEX FROM TRAINING DATA")
+print("="*80)
+
+# Load the training data, scaled the way scoring scales it
+print("\n1. Loading model and training data...")
+processor = DataProcessor(ModelLoader('models'))
+df = pd.read_csv('data.csv')
+processed_df, _ = processor.validate_and_prepare(df)
+X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+print(f"✓ {len(X_scaled)} labeled samples, {X_scaled.shape[1]} features")
+
+# Build
+print("\n2. Building index...")
+start = time.perf_counter()
+index = NeighborIndex.build(X_scaled, processed_df['true_class'], row_ids=processed_df.index.to_numpy(),
+                            feature_names=processor.feature_names)
+print(f"✓ Built in {time.perf_counter() - start:.2f}s")
+
+# Every training row should find itself
+print("\n3. Checking self-lookups...")
+sample = np.random.default_rng(0).choice(len(X_scaled), 1000, replace=False)
+start = time.perf_counter()
+distances, indices = index.query(X_scaled[sample], k=5)
+elapsed = time.perf_counter() - start
+print(f"✓ Nearest distance 0 for {(distances[:, 0] < 1e-6).mean():.1%} of rows")
+print(f"✓ Query cost: {elapsed / len(sample) * 1000:.3f} ms per row (k=5)")
+
+# Save
+print("\n4. Saving index...")
+output_path = os.path.join('models', NEIGHBOR_INDEX_FILE)
+index.save(output_path)
+print(f"✓ Saved neighbor index to: {output_path}")
+
+print("\n" + "="*80)
+print("✅ NEIGHBOR INDEX SAVED!")
+print("="*80)
+print(f"\n📁 {os.path.abspath(output_path)}")
+print(f"   Size: {os.path.getsize(output_path) / 1024 / 1024:.1f} MB (not committed; rebuild after retraining)")
+print(f"   Indexed: {len(index)} training samples")
@@ -0,0 +1,65 @@
+"""
+Export int8 and float16 copies of the scoring bundle for small edge nodes
+This will create scoring_bundle_int8.npz and scoring_bundle_float16.npz next to scoring_bundle.npz,
+and report footprint, latency and agreement against svm_optimized_model.pkl
+"""
+
+import numpy as np
+import pandas as pd
+import joblib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.quantized_model import QUANTIZATIONS, compare_models, export_quantized, quantized_bundle_file
+from utils.scoring_bundle import BUNDLE_FILE, load_bundle, source_digest
+
+print("="*80)
+print("BUILDING QUANTIZED SCORING BUNDLES")
+print("="*80)
+
+# The quantized bundles are copies of the full one, so it has to be current
+print("\n1. Checking the scoring bundle...")
+bundle_path = os.path.join('models', BUNDLE_FILE)
+digest = source_digest('models')
+if load_bundle(bundle_path, digest=digest) is None:
+    sys.exit(f"❌ {bundle_path} is missing or out of date; run build_scoring_bundle.py first")
+print(f"✓ {bundle_path} is current")
+
+# Export
+print("\n2. Writing quantized bundles...")
+paths = {}
+for quantization in QUANTIZATIONS:
+    paths[quantization] = os.path.join('models', quantized_bundle_file(quantization))
+    export_quantized(bundle_path, paths[quantization], quantization)
+    print(f"✓ {quantization}: {paths[quantization]} ({os.path.getsize(paths[quantization]) / 1024:.0f} KB)")
+
+# Compare with the full model on the training data
+print("\n3. Comparing with svm_optimized_model.pkl on data.csv...")
+processor = DataProcessor(ModelLoader('models'))
+df = pd.read_csv('data.csv')
+processed_df, _ = processor.validate_and_prepare(df)
+X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+reference = joblib.load('models/svm_optimized_model.pkl')
+candidates = {'bundle': processor.model}
+for quantization in QUANTIZATIONS:
+    candidates[quantization] = ModelLoader('models', quantization=quantization).model
+report = compare_models(reference, candidates, X_scaled, processor.trust_scaler)
+file_sizes = [os.path.getsize(p) for p in ['models/svm_optimized_model.pkl', bundle_path] + list(paths.values())]
+report.insert(1, 'file_kb', np.array(file_sizes) / 1024)
+
+with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.float_format', '{:.4g}'.format):
+    print(report.to_string(index=False))
+worst = report.iloc[2:]
+print(f"\n✓ Action agreement: {worst['action_agreement'].min():.3%} or better "
+      f"(max trust-score difference {worst['max_trust_diff'].max():.2f} points)")
+
+print("\n" + "="*80)
+print("✅ QUANTIZED BUNDLES SAVED!")
+print("="*80)
+for quantization, path in paths.items():
+    print(f"\n📁 {os.path.abspath(path)}")
+print(f"   Built from: {digest[:12]}... (rebuild after build_scoring_bundle.py)")
+print("   Use with: batch_predict.py / stream_predict.py --quantized int8")
@@ -0,0 +1,59 @@
+"""
+Export the trained model and preprocessing as a NumPy-only scoring bundle
+This will create scoring_bundle.npz next to svm_optimized_model.pkl
+"""
+
+import numpy as np
+import pandas as pd
+import joblib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.scoring_bundle import BUNDLE_FILE, export_bundle, load_bundle, source_digest
+
+print("="*80)
+print("BUILDING SCORING BUNDLE")
+print("="*80)
+
+# Load the pickled components
+print("\n1. Loading model and preprocessing pickles...")
+model = joblib.load('models/svm_optimized_model.pkl')
+scaler = joblib.load('models/feature_scaler.pkl')
+trust_scaler = joblib.load('models/trust_scaler.pkl')
+label_encoders = joblib.load('models/label_encoders.pkl')
+feature_names = joblib.load('models/feature_names.pkl')
+imputation_values = joblib.load('models/imputation_values.pkl')
+print(f"✓ {type(model).__name__} with {len(model.support_vectors_)} support vectors, {len(feature_names)} features")
+
+# Export
+print("\n2. Writing bundle...")
+output_path = os.path.join('models', BUNDLE_FILE)
+digest = source_digest('models')
+export_bundle(model, scaler, trust_scaler, label_encoders, feature_names, imputation_values,
+              output_path, digest=digest)
+print(f"✓ Saved bundle to: {output_path}")
+
+# Check the bundle reproduces the pickled model on the training data
+print("\n3. Checking bundle against the pickles...")
+bundle = load_bundle(output_path, digest=digest)
+df = pd.read_csv('data.csv')
+df.columns = df.columns.str.strip().str.replace("'", "")
+X = df[feature_names].copy()
+for col, encoder in label_encoders.items():
+    X[col] = encoder.transform(X[col])
+X_scaled = scaler.transform(X.to_numpy(dtype=float))
+decision = model.decision_function(X_scaled)
+bundle_decision = bundle['model'].decision_function(bundle['scaler'].transform(X.to_numpy(dtype=float)))
+proba_diff = np.abs(model.predict_proba(X_scaled) - bundle['model'].proba_from_decision(bundle_decision)).max()
+same_labels = (model.predict(X_scaled) == bundle['model'].classes_[(bundle_decision > 0).astype(int)]).mean()
+print(f"✓ Max decision difference: {np.abs(decision - bundle_decision).max():.2e}")
+print(f"✓ Max probability difference: {proba_diff:.2e}")
+print(f"✓ Identical predictions: {same_labels:.2%}")
+
+print("\n" + "="*80)
+print("✅ SCORING BUNDLE SAVED!")
+print("="*80)
+print(f"\n📁 {os.path.abspath(output_path)}")
+print(f"   Size: {os.path.getsize(output_path) / 1024:.0f} KB")
+print(f"   Built from: {digest[:12]}... (rebuild after retraining or rebuilding imputation values)")
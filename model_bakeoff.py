@@ -0,0 +1,121 @@
+"""
+Model bake-off: train candidate algorithms and pick one on the accuracy/latency Pareto front
+Every model is timed through DataProcessor.predict, the path the app and CLIs score with
+
+Run: python model_bakeoff.py [--budget-ms 5] [--candidates random_forest,decision_tree] [--export]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.model_loader import DEFAULT_MODEL_NAME, ModelLoader
+from utils.data_processor import DataProcessor
+from utils.bakeoff import (choose, default_candidates, export_model, fit_trust_scaler, measure,
+                           pareto_front, scoring_processor, train_candidates)
+from utils.explainer import RBFExplainer
+from utils.training_data import load_training_matrix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare classifiers on accuracy, latency and memory")
+    parser.add_argument('--candidates', help="Comma-separated subset of: " + ', '.join(default_candidates()))
+    parser.add_argument('--budget-ms', type=float, help="Largest acceptable p99 single-row latency")
+    parser.add_argument('--workers', type=int, help="Training processes (default: one per CPU)")
+    parser.add_argument('--single-rows', type=int, default=200, help="Rows timed one at a time per model")
+    parser.add_argument('--report', help="Also write the report to this CSV")
+    parser.add_argument('--export', action='store_true',
+                        help="Save the chosen model and add it to models/model_registry.json")
+    parser.add_argument('--primary', action='store_true', help="Register the exported model as the primary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    candidates = default_candidates()
+    if args.candidates:
+        names = [n.strip() for n in args.candidates.split(',')]
+        unknown = set(names) - set(candidates)
+        if unknown:
+            sys.exit(f"❌ Unknown candidates: {sorted(unknown)}")
+        candidates = {name: candidates[name] for name in names}
+
+    print("="*80)
+    print("MODEL BAKE-OFF")
+    print("="*80)
+
+    # Encoded training matrix from the cache, and the notebook's 70/30 split
+    print("\n1. Loading encoded data.csv...")
+    model_loader = ModelLoader('models')
+    processor = DataProcessor(model_loader)
+    start = time.perf_counter()
+    X_numeric, y, row_ids = load_training_matrix(processor, 'data.csv')
+    X_scaled = processor.scale_features(X_numeric)
+    from sklearn.model_selection import train_test_split
+    train_idx, test_idx = train_test_split(range(len(y)), test_size=0.3, random_state=42, stratify=y)
+    print(f"✓ {len(y)} rows in {time.perf_counter() - start:.2f}s: {len(train_idx)} train / {len(test_idx)} test")
+
+    # Train in parallel
+    print(f"\n2. Training {len(candidates)} candidates...")
+    start = time.perf_counter()
+    fitted = train_candidates(candidates, X_scaled[train_idx], y[train_idx], max_workers=args.workers)
+    for name, (_, seconds) in fitted.items():
+        print(f"✓ {name}: {seconds:.1f}s")
+    print(f"✓ Wall time {time.perf_counter() - start:.1f}s")
+
+    # Score the test rows through DataProcessor.predict, one model at a time
+    print("\n3. Measuring through DataProcessor.predict...")
+    test_df, _ = processor.validate_and_prepare(pd.read_csv('data.csv').iloc[row_ids[test_idx]])
+    models = {DEFAULT_MODEL_NAME: (model_loader.get_model(DEFAULT_MODEL_NAME),
+                                   model_loader.get_trust_scaler(DEFAULT_MODEL_NAME))}
+    for name, (model, _) in fitted.items():
+        models[name] = (model, fit_trust_scaler(model, X_scaled[test_idx]))
+    rows = []
+    for name, (model, trust_scaler) in models.items():
+        scorer = scoring_processor(model_loader, name, model, trust_scaler)
+        rows.append({'model': name, 'train_s': fitted[name][1] if name in fitted else float('nan'),
+                     **measure(scorer, test_df, single_rows=args.single_rows)})
+        print(f"✓ {name}: accuracy {rows[-1]['accuracy']:.4f}, "
+              f"p99 single row {rows[-1]['single_row_p99_ms']:.2f} ms")
+    report = pd.DataFrame(rows)
+    report['on_front'] = pareto_front(report)
+
+    print("\n4. Results (front = not beaten on accuracy, median single-row and batch latency at once)...")
+    with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.float_format', '{:.4g}'.format):
+        print(report.sort_values('accuracy', ascending=False).to_string(index=False))
+    if args.report:
+        report.to_csv(args.report, index=False)
+        print(f"✓ Report written to {args.report}")
+
+    chosen = choose(report, args.budget_ms)
+    budget = f" within {args.budget_ms:g} ms" if args.budget_ms is not None else ""
+    if chosen is None:
+        print(f"\n❌ No model meets the budget{budget}")
+        return 1
+    print(f"\n✓ Chosen{budget}: {chosen}")
+
+    print("\n" + "="*80)
+    if chosen == DEFAULT_MODEL_NAME:
+        print(f"✅ {DEFAULT_MODEL_NAME} IS ALREADY DEPLOYED")
+        print("="*80)
+    elif args.export:
+        role = 'primary' if args.primary else 'shadow'
+        registry_path = export_model(chosen, *models[chosen], 'models', role=role)
+        print(f"✅ {chosen.upper()} EXPORTED!")
+        print("="*80)
+        print(f"\n📁 {os.path.abspath(os.path.join('models', chosen + '_model.pkl'))}")
+        print(f"   Registered as {role} in {registry_path}")
+        if args.primary and not RBFExplainer.supports(models[chosen][0]):
+            print("⚠️ Not an RBF SVC: the app's top_factors column stays empty while it is the primary")
+    else:
+        print("✅ BAKE-OFF COMPLETE (rerun with --export to save the chosen model)")
+        print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
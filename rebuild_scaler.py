@@ -1,6 +1,7 @@
 """
 Rebuild the correct feature scaler from training data
 This will create a new feature_scaler.pkl with all 41 features
+(train_pipeline.py rebuilds the scaler together with the model it was trained for)
 """
 
 import pandas as pd
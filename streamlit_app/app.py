@@ -7,12 +7,11 @@ Run: streamlit run app.py
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import joblib
 import os
 import sys
-import plotly.graph_objects as go
-import plotly.express as px
+import tempfile
+import time
+import uuid
 from datetime import datetime
 
 # Add parent directory to path for imports
@@ -20,8 +19,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import custom modules
 from utils.model_loader import ModelLoader
+from utils.csv_reader import SchemaCSVReader
+from utils.node_state import NodeStateStore, ACTIONS
 from utils.data_processor import DataProcessor
-from utils.visualizer import Visualizer
+from utils.result_pager import ResultPager
+from utils.exporter import ResultExporter, available_formats, export_filename, format_stats
+from utils.batch_runner import BatchRunner, compare_files, combine_summaries
+from utils.job_manager import JobManager, file_hash
+from utils.result_cache import ResultCache
+from utils.results_store import ResultsStore, BUCKET_WIDTHS
+from utils.drift_monitor import DriftMonitor
+from utils.neighbor_index import NeighborIndex
+from utils.trust_policy import TRUST_LEVELS, materialize
+
+# Nearest training records listed for each blocked row
+SIMILAR_RECORDS = 5
 
 # Page configuration
 st.set_page_config(
@@ -72,6 +84,83 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_model_loader():
+    """Models loaded once and shared by every page, session and worker thread"""
+    return ModelLoader('../models')
+
+
+@st.cache_resource
+def get_node_state():
+    """Per-node trust store shared across reruns and sessions"""
+    return NodeStateStore(memory_budget_mb=64)
+
+
+@st.cache_resource
+def get_job_manager():
+    """Background scoring pool shared by all sessions; survives reruns"""
+    return JobManager(get_model_loader(), node_state=get_node_state(), results_store=get_results_store(),
+                      explain=True, drift_monitor=get_drift_monitor(),
+                      neighbor_index=get_neighbor_index(), neighbors=SIMILAR_RECORDS,
+                      result_cache=get_result_cache(), progressive=True)
+
+
+@st.cache_resource
+def get_result_cache():
+    """Scored files by content hash and model fingerprint, shared by every session"""
+    return ResultCache('../results/cache', max_disk_bytes=2 << 30, max_memory_bytes=512 << 20)
+
+
+def get_upload_hash(uploaded_file):
+    """Content hash of an upload, computed once per upload rather than on every rerun"""
+    hashes = st.session_state.setdefault('upload_hashes', {})
+    if uploaded_file.file_id not in hashes:
+        hashes.clear()
+        hashes[uploaded_file.file_id] = file_hash(uploaded_file.getvalue())
+    return hashes[uploaded_file.file_id]
+
+
+@st.cache_resource
+def get_neighbor_index():
+    """Nearest labeled training records (None until build_neighbor_index.py has run)"""
+    return NeighborIndex.from_model_loader(get_model_loader())
+
+
+@st.cache_data
+def get_training_records(rows):
+    """Rows of data.csv by row number, for showing similar records"""
+    wanted = set(rows)
+    df = pd.read_csv('../data.csv', skiprows=lambda i: i > 0 and i - 1 not in wanted)
+    df.columns = df.columns.str.strip().str.replace("'", "")
+    df.index = sorted(wanted)
+    return df
+
+
+@st.cache_resource
+def get_drift_monitor():
+    """Feature drift against the training data, across every scored upload (None without a reference)"""
+    return DriftMonitor.from_model_loader(get_model_loader())
+
+
+@st.cache_resource
+def get_results_store():
+    """Local decision history shared by every session"""
+    return ResultsStore('../results/decisions.sqlite')
+
+
+def get_session_id():
+    """Stable id of this browser session, used to key its jobs"""
+    return st.session_state.setdefault('session_id', uuid.uuid4().hex)
+
+
+@st.cache_resource
+def get_visualizer():
+    """Visualizer whose figure cache survives reruns"""
+    # Plotly is imported with the first chart, not at app start
+    from utils.visualizer import Visualizer
+    return Visualizer(max_points=5000)
+
+
 def main():
     """Main application function"""
     
@@ -83,8 +172,7 @@ def main():
     with st.sidebar:
         st.image("https://img.icons8.com/color/96/000000/security-checked.png", width=100)
         st.title("Navigation")
-        # page = st.radio("Go to", ["🏠 Home", "📤 Upload & Predict", "📊 Batch Analysis", "ℹ️ About"])
-        page = st.radio("Go to", ["🏠 Home", "📤 Upload & Predict", "ℹ️ About"])
+        page = st.radio("Go to", ["🏠 Home", "📤 Upload & Predict", "📊 Batch Analysis", "ℹ️ About"])
         
         st.markdown("---")
         st.markdown("### Model Info")
@@ -100,8 +188,8 @@ def main():
         show_home_page()
     elif page == "📤 Upload & Predict":
         show_upload_page()
-    # elif page == "📊 Batch Analysis":
-        # show_batch_analysis_page()
+    elif page == "📊 Batch Analysis":
+        show_batch_analysis_page()
     elif page == "ℹ️ About":
         show_about_page()
 
@@ -157,6 +245,25 @@ def show_home_page():
     st.write("4. Download detailed reports")
 
 
+def display_validation_report(report):
+    """Per-column violation counts and the quarantined rows"""
+    if report is None or report.violations.empty:
+        return
+    with st.expander(f"🚧 Validation: {report.quarantined_rows:,} rows quarantined",
+                     expanded=report.quarantined_rows > 0):
+        st.dataframe(report.violations, use_container_width=True, hide_index=True)
+        if report.quarantined_rows:
+            st.write(f"**Sample of quarantined rows** ({len(report.samples)} of {report.quarantined_rows:,}) "
+                     "— these rows are not scored")
+            st.dataframe(report.samples, use_container_width=True)
+            st.download_button(
+                label="📥 Download Quarantined Rows (CSV)",
+                data=report.quarantine.to_csv(index=False),
+                file_name=f"quarantine_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+
+
 def show_upload_page():
     """Upload page for CSV file prediction"""
     st.title("📤 Upload CSV & Get Predictions")
@@ -164,7 +271,7 @@ def show_upload_page():
     # Initialize model loader
     try:
         with st.spinner("Loading models..."):
-            model_loader = ModelLoader('../models')
+            model_loader = get_model_loader()
             st.success("✅ Models loaded successfully!")
     except Exception as e:
         st.error(f"❌ Error loading models: {e}")
@@ -178,49 +285,75 @@ def show_upload_page():
     
     if uploaded_file is not None:
         try:
-            # Load data
-            df = pd.read_csv(uploaded_file)
+            # Preview the first rows only; the whole file is read by the scoring job
+            reader = SchemaCSVReader.from_model_loader(model_loader)
+            preview = next(reader.iter_chunks(uploaded_file, 10))
+            if reader.skipped_columns:
+                st.info(f"ℹ️ Ignoring {len(reader.skipped_columns)} columns not used by the model: "
+                        f"{', '.join(reader.skipped_columns[:10])}")
             
-            st.success(f"✅ File uploaded successfully! ({len(df)} rows)")
+            st.success(f"✅ File uploaded successfully! ({uploaded_file.size / 1024:,.1f} KB)")
             
             # Show preview
             with st.expander("👁️ View Data Preview", expanded=True):
-                st.dataframe(df.head(10), use_container_width=True)
-                st.write(f"**Shape:** {df.shape[0]} rows × {df.shape[1]} columns")
+                st.dataframe(preview, use_container_width=True)
+                st.write(f"**Columns:** {preview.shape[1]}")
             
-            # Process data
+            # Scoring runs as a background job keyed by session and file
+            # hash, so reruns (and reloads of a finished file) reattach to
+            # the job instead of scoring again; files any session already
+            # scored with these models come straight from the result cache
             st.markdown("---")
-            st.markdown("### 🔄 Processing Data...")
-            
-            processor = DataProcessor(model_loader)
-            
-            # Validate and prepare data
-            with st.spinner("Validating data..."):
-                processed_df, issues = processor.validate_and_prepare(df)
+            job_manager = get_job_manager()
+            file_key = get_upload_hash(uploaded_file)
+            job = job_manager.get(get_session_id(), file_key)
+            if st.button("🎯 Generate Predictions", type="primary"):
+                job = job_manager.submit(get_session_id(), uploaded_file.name, uploaded_file.getvalue())
             
-            if issues:
-                st.warning(f"⚠️ Found {len(issues)} issues:")
-                for issue in issues[:5]:  # Show first 5 issues
-                    st.write(f"- {issue}")
+            if job is not None and not job.is_finished:
+                track_job(job_manager, job)
+            elif job is not None and job.status == 'failed':
+                st.error(f"❌ Scoring failed: {job.error}")
+            elif job is not None and job.status == 'cancelled':
+                st.info("⏹️ Scoring was cancelled. Click **Generate Predictions** to start again.")
+            elif job is not None and job.status == 'done':
+                stored = st.session_state.get('results')
+                if stored is None or stored['file_key'] != file_key:
+                    with st.spinner("Loading results..."):
+                        output = job_manager.load_results(job)
+                    discard_exports(stored)
+                    st.session_state['results'] = {
+                        'file_key': file_key,
+                        'summary': output['summary'],
+                        'pager': ResultPager(output['results_df']),
+                        'shadow': output['shadow'],
+                        'report': output['report'],
+                        'issues': job.issues,
+                    }
             
-            # Make predictions
-            if st.button("🎯 Generate Predictions", type="primary"):
-                with st.spinner("Making predictions..."):
-                    results_df = processor.predict(processed_df)
-                
+            stored = st.session_state.get('results')
+            if stored is not None and stored['file_key'] == file_key:
                 st.success("✅ Predictions complete!")
+                if stored['issues']:
+                    st.warning(f"⚠️ Found {len(stored['issues'])} issues:")
+                    for issue in stored['issues'][:5]:  # Show first 5 issues
+                        st.write(f"- {issue}")
+                display_validation_report(stored['report'])
                 
                 # Display results
-                display_results(results_df)
+                display_results(stored['pager'], stored['summary'], stored.get('shadow'))
                 
-                # Download button
-                csv = results_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Results CSV",
-                    data=csv,
-                    file_name=f"predictions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                # Download button, served from a chunked export on disk
+                export_format = st.selectbox("Export format", available_formats())
+                export = export_results(stored, export_format)
+                with open(export['path'], 'rb') as export_file:
+                    st.download_button(
+                        label=f"📥 Download Results ({export_format})",
+                        data=export_file,
+                        file_name=export['file_name'],
+                        mime=ResultExporter(export_format).mime_type
+                    )
+                st.caption(f"Export: {format_stats(export['stats'])}")
                 
         except Exception as e:
             st.error(f"❌ Error processing file: {e}")
@@ -230,18 +363,87 @@ def show_upload_page():
             st.write("- Refer to the sample data format")
 
 
-def display_results(results_df):
+def track_job(job_manager, job):
+    """Show a running job's progress until it finishes, then rerun to show the outcome"""
+    st.markdown("### 🔄 Scoring in the background...")
+    st.caption("You can switch pages or rerun; the job keeps running and this page reattaches to it.")
+    if st.button("⏹️ Cancel", key=f"cancel_{job.id}"):
+        job_manager.cancel(job)
+    bar = st.progress(job.progress)
+    estimates = st.empty()
+    while not job.is_finished:
+        bar.progress(job.progress, text=f"{job.rows_read:,} rows read, {job.rows_scored:,} scored "
+                                        f"({job.chunks} chunks, {job.seconds:.0f}s)")
+        if job.estimate is not None:
+            with estimates.container():
+                display_estimates(job)
+        time.sleep(0.5)
+    st.rerun()
+
+
+def display_estimates(job):
+    """Running job's estimated action mix, from its sample plus the chunks scored so far"""
+    estimate = job.estimate.set_index(['dim', 'category'])
+    scored = estimate.loc[('rows', 'scored'), 'estimate']
+    st.markdown("### 📊 Prediction Results (estimated)")
+    st.caption(f"First estimate from a stratified sample in {job.estimate_seconds:.1f}s; intervals narrow "
+               "as chunks are scored and the exact results replace them when the job finishes (± is 95%).")
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Total Analyzed", f"≈{scored:,.0f}")
+    for col, (label, action) in zip((col2, col3, col4), [("🛑 Blocked", 'BLOCK'), ("⚠️ Monitor", 'MONITOR'),
+                                                         ("✅ Allowed", 'ALLOW')]):
+        row = estimate.loc[('action', action)]
+        half = (row['high'] - row['low']) / 2
+        col.metric(label, f"≈{row['estimate']:,.0f}",
+                   f"{row['estimate'] / scored * 100:.1f}% ± {half / scored * 100:.1f}" if scored else None,
+                   delta_color="off")
+    trust = estimate.loc[('trust_score', 'mean')]
+    col5.metric("Avg Trust", f"{trust['estimate']:.1f}", f"± {(trust['high'] - trust['low']) / 2:.1f}",
+                delta_color="off")
+
+
+def export_results(stored, export_format):
+    """Export stored results once per format to a temp file and reuse it on reruns"""
+    exports = stored.setdefault('exports', {})
+    if export_format not in exports:
+        exporter = ResultExporter(export_format)
+        fd, path = tempfile.mkstemp(prefix='predictions_', suffix=exporter.extension)
+        os.close(fd)
+        out, stats = exporter.export(stored['pager'].results_df, dest=path)
+        out.close()
+        exports[export_format] = {
+            'path': path,
+            'stats': stats,
+            'file_name': export_filename('predictions', export_format,
+                                         datetime.now().strftime('%Y%m%d_%H%M%S')),
+        }
+    return exports[export_format]
+
+
+def discard_exports(stored):
+    """Delete export files of results that are being replaced"""
+    for export in (stored or {}).get('exports', {}).values():
+        if os.path.exists(export['path']):
+            os.remove(export['path'])
+
+
+def display_results(pager, summary, shadow_monitor=None):
     """Display prediction results with visualizations"""
     st.markdown("---")
     st.markdown("### 📊 Prediction Results")
-    
+
+    total = summary.total
+    if total == 0:
+        st.warning("⚠️ No valid rows to score — see the quarantine report above.")
+        return
+
     # Summary statistics
     col1, col2, col3, col4 = st.columns(4)
-    
-    total = len(results_df)
-    blocked = len(results_df[results_df['action'] == 'BLOCK'])
-    monitored = len(results_df[results_df['action'] == 'MONITOR'])
-    allowed = len(results_df[results_df['action'] == 'ALLOW'])
+
+    blocked = summary.count('action', 'BLOCK')
+    monitored = summary.count('action', 'MONITOR')
+    allowed = summary.count('action', 'ALLOW')
     
     col1.metric("Total Analyzed", total)
     col2.metric("🛑 Blocked", blocked, f"{blocked/total*100:.1f}%")
@@ -252,45 +454,144 @@ def display_results(results_df):
     tab1, tab2, tab3 = st.tabs(["📋 Results Table", "📊 Visualizations", "🔍 Detailed Analysis"])
     
     with tab1:
-        st.dataframe(results_df, use_container_width=True)
+        display_results_page(pager)
     
     with tab2:
-        visualizer = Visualizer()
+        visualizer = get_visualizer()
         
         col1, col2 = st.columns(2)
         
         with col1:
             # Action distribution pie chart
-            fig = visualizer.create_action_distribution_chart(results_df)
+            fig = visualizer.create_action_distribution_chart(summary=summary)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Trust score distribution
-            fig = visualizer.create_trust_score_distribution(results_df)
+            fig = visualizer.create_trust_score_distribution(summary=summary)
             st.plotly_chart(fig, use_container_width=True)
         
         # Trust score by prediction
-        fig = visualizer.create_trust_score_by_prediction(results_df)
+        fig = visualizer.create_trust_score_by_prediction(summary=summary)
         st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
-        # Show high-risk detections
-        high_risk = results_df[results_df['action'] == 'BLOCK']
-        if len(high_risk) > 0:
-            st.markdown("#### 🚨 High Risk Detections (BLOCKED)")
-            st.dataframe(high_risk[['prediction', 'trust_score', 'confidence', 'recommendation']], 
-                        use_container_width=True)
+        detail_columns = ['prediction', 'trust_score', 'confidence', 'recommendation']
+        if 'top_factors' in pager.results_df.columns:
+            # Features pulling each flagged row's trust score down, in trust points
+            detail_columns.append('top_factors')
+        
+        # Show high-risk detections, lowest trust first
+        if blocked > 0:
+            st.markdown(f"#### 🚨 High Risk Detections (BLOCKED) — {blocked:,} nodes")
+            high_risk, _ = pager.page(0, 100, sort_by='trust_score', filters={'action': ['BLOCK']})
+            st.dataframe(materialize(high_risk[detail_columns]), use_container_width=True)
+            if 'similar_records' in high_risk.columns:
+                display_similar_records(high_risk)
         
         # Show medium risk
-        medium_risk = results_df[results_df['action'] == 'MONITOR']
-        if len(medium_risk) > 0:
+        if monitored > 0:
             st.markdown("#### ⚠️ Medium Risk Detections (MONITOR)")
-            st.dataframe(medium_risk[['prediction', 'trust_score', 'confidence', 'recommendation']].head(10), 
-                        use_container_width=True)
+            medium_risk, _ = pager.page(0, 10, filters={'action': ['MONITOR']})
+            st.dataframe(materialize(medium_risk[detail_columns]), use_container_width=True)
         
         # Statistics
         st.markdown("#### 📈 Statistical Summary")
-        st.dataframe(results_df[['trust_score', 'confidence']].describe())
+        st.dataframe(summary.describe())
+        
+        # Global permutation importance from the training data
+        importance = DataProcessor(get_model_loader()).get_feature_importance()
+        if pd.api.types.is_numeric_dtype(importance['importance']):
+            with st.expander("🧮 Global Feature Importance"):
+                st.write("Accuracy lost on the training data when each feature is shuffled; "
+                         "`top_factors` above explains individual flagged rows.")
+                st.dataframe(importance.head(15), use_container_width=True)
+        
+        # Rolling per-node trust across all batches seen so far
+        results_df = pager.results_df
+        if 'node_id' in results_df.columns:
+            node_state = get_node_state()
+            st.markdown("#### 🧭 Rolling Node Trust")
+            st.write(f"Tracking {len(node_state):,} nodes across all analyzed batches")
+            node_view = node_state.get(results_df['node_id'].unique())
+            st.dataframe(node_view.nsmallest(10, 'trust_score').drop(columns='node_key'),
+                        use_container_width=True)
+        
+        # Drift of uploaded data from the training distribution
+        drift_monitor = get_drift_monitor()
+        if drift_monitor is not None and drift_monitor.rows_seen:
+            display_drift_report(drift_monitor)
+        
+        # Shadow models scored on the same preprocessed batch
+        if shadow_monitor is not None and shadow_monitor.shadow_names():
+            display_shadow_report(shadow_monitor)
+
+
+def display_similar_records(high_risk):
+    """Labeled training connections nearest to a chosen blocked row"""
+    with st.expander("🔎 Similar known connections"):
+        row = st.selectbox("Blocked row", high_risk.index,
+                           format_func=lambda i: f"Row {i} (trust {high_risk.loc[i, 'trust_score']:.1f})")
+        rows = [int(r) for r in high_risk.loc[row, 'similar_records'].split(', ') if r]
+        share = high_risk.loc[row, 'similar_anomaly_share']
+        st.write(f"{share:.0%} of the {len(rows)} nearest training connections (data.csv rows) were anomalies")
+        st.dataframe(get_training_records(tuple(sorted(rows))).loc[rows], use_container_width=True)
+
+
+def display_drift_report(drift_monitor):
+    """Per-feature drift scores and recent alerts"""
+    st.markdown("#### 📉 Feature Drift")
+    report = drift_monitor.report()
+    drifted = report[report['level'] != 'ok']
+    st.write(f"{drift_monitor.rows_seen:,} uploaded rows compared with the training data "
+             f"(PSI ≥ 0.1 warns, ≥ 0.25 alerts; mean shift in training standard deviations)")
+    if len(drifted):
+        st.warning(f"⚠️ {len(drifted)} features have drifted: {', '.join(drifted['feature'].head(5))}")
+    else:
+        st.success("✅ No feature drift detected")
+    st.dataframe(report.head(10), use_container_width=True)
+    alerts = drift_monitor.recent_alerts()
+    if len(alerts):
+        with st.expander(f"Recent drift alerts ({len(alerts)})"):
+            alerts['time'] = pd.to_datetime(alerts['time'], unit='s')
+            st.dataframe(alerts, use_container_width=True)
+
+
+def display_shadow_report(shadow_monitor):
+    """Per-model latency and shadow vs primary disagreements"""
+    st.markdown("#### 🕶️ Shadow Models")
+    st.write("Shadow models score the same preprocessed rows; only the primary's results are shown above.")
+    st.dataframe(shadow_monitor.report(), use_container_width=True)
+    for name in shadow_monitor.shadow_names():
+        with st.expander(f"Primary vs {name}"):
+            st.dataframe(shadow_monitor.action_matrix(name), use_container_width=True)
+            st.write("**Recent disagreements**")
+            st.dataframe(shadow_monitor.samples(name), use_container_width=True)
+
+
+def display_results_page(pager):
+    """Server-side paginated results table with sort and filter controls"""
+    results_df = pager.results_df
+    
+    col1, col2, col3, col4 = st.columns(4)
+    sort_by = col1.selectbox("Sort by", ["(file order)", "trust_score", "confidence"])
+    ascending = col2.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+    actions = col3.multiselect("Action", ['ALLOW', 'MONITOR', 'BLOCK'])
+    page_size = col4.selectbox("Rows per page", [25, 100, 500], index=1)
+    
+    view = dict(
+        sort_by=None if sort_by == "(file order)" else sort_by,
+        ascending=ascending,
+        filters={'action': actions}
+    )
+    num_pages = pager.num_pages(page_size, **view)
+    page_number = st.number_input(f"Page (of {num_pages:,})", min_value=1,
+                                  max_value=num_pages, value=1, step=1)
+    
+    page_df, view_rows = pager.page(page_number - 1, page_size, **view)
+    st.dataframe(materialize(page_df), use_container_width=True)
+    st.caption(f"Showing {len(page_df):,} of {view_rows:,} matching rows "
+               f"({len(results_df):,} total)")
 
 
 def show_batch_analysis_page():
@@ -298,11 +599,136 @@ def show_batch_analysis_page():
     st.title("📊 Batch Analysis & Comparison")
     st.info("Upload multiple CSV files to compare predictions and analyze trends")
     
-    st.write("🚧 This feature is under development")
-    st.write("Coming soon:")
-    st.write("- Compare predictions across multiple datasets")
-    st.write("- Trend analysis over time")
-    st.write("- Export comprehensive reports")
+    try:
+        with st.spinner("Loading models..."):
+            model_loader = get_model_loader()
+    except Exception as e:
+        st.error(f"❌ Error loading models: {e}")
+        st.stop()
+    
+    uploaded_files = st.file_uploader("Choose CSV files", type=['csv'], accept_multiple_files=True)
+    if uploaded_files:
+        compare_uploaded_files(model_loader, uploaded_files)
+    else:
+        st.write("Select several capture files at once, e.g. the 20 files in `streamlit_app/test/`.")
+    
+    display_trends(get_results_store())
+
+
+def compare_uploaded_files(model_loader, uploaded_files):
+    """Score the uploaded files in parallel and show the side-by-side comparison"""
+    col1, col2 = st.columns(2)
+    workers = col1.slider("Parallel workers", 1, 16, min(8, os.cpu_count() or 1))
+    chunksize = col2.select_slider("Rows per chunk", [5_000, 20_000, 50_000, 100_000], value=20_000)
+    
+    # Only per-file summaries are kept, so reruns redraw without re-scoring
+    batch_key = tuple((f.name, f.size) for f in uploaded_files)
+    if st.button("🎯 Analyze Files", type="primary"):
+        runner = BatchRunner(model_loader, max_workers=workers, chunksize=chunksize,
+                             results_store=get_results_store())
+        overall = st.progress(0.0, text="Starting...")
+        per_file = st.empty()
+        
+        def show_progress(results):
+            finished = sum(r.status in ('done', 'failed') for r in results)
+            overall.progress(sum(r.progress for r in results) / len(results),
+                             text=f"{finished}/{len(results)} files scored")
+            per_file.dataframe(
+                pd.DataFrame([{'file': r.name, 'status': r.status, 'rows': r.rows_read,
+                               'progress': r.progress} for r in results]),
+                column_config={'progress': st.column_config.ProgressColumn(
+                    'progress', min_value=0.0, max_value=1.0)},
+                use_container_width=True, hide_index=True
+            )
+        
+        results = runner.run([(f.name, f) for f in uploaded_files], progress=show_progress)
+        st.session_state['batch'] = {'key': batch_key, 'results': results}
+    
+    stored = st.session_state.get('batch')
+    if stored is not None and stored['key'] == batch_key:
+        display_batch_results(stored['results'])
+
+
+def display_batch_results(results):
+    """Side-by-side comparison of per-file summaries"""
+    for result in results:
+        if result.status == 'failed':
+            st.error(f"❌ {result.name}: {result.error}")
+    
+    comparison = compare_files(results)
+    overall = combine_summaries(results)
+    total = overall.total
+    
+    st.markdown("---")
+    st.markdown("### 📊 Comparison")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Files", len(results))
+    col2.metric("Rows Scored", f"{total:,}")
+    col3.metric("Quarantined", f"{int(comparison['quarantined'].sum()):,}")
+    col4.metric("🛑 Blocked", f"{overall.count('action', 'BLOCK'):,}",
+                f"{overall.count('action', 'BLOCK') / total * 100:.1f}%" if total else None)
+    
+    st.dataframe(comparison.round(2), use_container_width=True)
+    
+    visualizer = get_visualizer()
+    st.plotly_chart(visualizer.create_batch_action_comparison(comparison), use_container_width=True)
+    st.plotly_chart(visualizer.create_batch_trust_comparison({r.name: r.summary for r in results}),
+                    use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(visualizer.create_batch_metric_comparison(
+            comparison, 'anomaly_pct', 'Predicted Anomalies (%)'), use_container_width=True)
+    with col2:
+        if comparison['accuracy_pct'].notna().any():
+            st.plotly_chart(visualizer.create_batch_metric_comparison(
+                comparison, 'accuracy_pct', 'Accuracy on Labeled Files (%)'), use_container_width=True)
+        else:
+            st.info("Accuracy is shown for files with a `class` column")
+    
+    st.download_button(
+        label="📥 Download Comparison (CSV)",
+        data=comparison.to_csv(),
+        file_name=f"batch_comparison_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
+
+
+def display_trends(results_store):
+    """Trends and lookups over every decision stored so far"""
+    st.markdown("---")
+    st.markdown("### 📈 Trends Over Stored Decisions")
+    totals = results_store.totals()
+    if totals['rows'] == 0:
+        st.info("Scored uploads and batch files are stored locally; trends appear after the first run.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Stored Decisions", f"{totals['rows']:,}")
+    col2.metric("Mean Trust", f"{totals['mean_trust']:.1f}")
+    col3.metric("🛑 Blocked", f"{totals['BLOCK'] / totals['rows'] * 100:.1f}%")
+    col4.metric("⚠️ Anomalies", f"{totals['anomalies'] / totals['rows'] * 100:.1f}%")
+    
+    bucket = st.selectbox("Time bucket", list(BUCKET_WIDTHS), index=1)
+    trend = results_store.trend(bucket)
+    st.plotly_chart(get_visualizer().create_trend_chart(trend), use_container_width=True)
+    
+    with st.expander("🔎 Look Up Stored Decisions"):
+        col1, col2, col3 = st.columns(3)
+        action = col1.selectbox("Action", ['Any', *ACTIONS])
+        trust_level = col2.selectbox("Trust level", ['Any', *TRUST_LEVELS])
+        node_id = col3.text_input("Node id")
+        decisions = results_store.decisions(
+            action=None if action == 'Any' else action,
+            trust_level=None if trust_level == 'Any' else trust_level,
+            node_id=node_id.strip() or None,
+            limit=1000
+        )
+        st.caption(f"Newest {len(decisions):,} matching decisions")
+        st.dataframe(decisions, use_container_width=True, hide_index=True)
+    
+    with st.expander("🗂️ Stored Batches"):
+        st.dataframe(results_store.batches(), use_container_width=True)
 
 
 def show_about_page():
@@ -0,0 +1,110 @@
+"""
+Batch prediction CLI
+Score one or more CSV files in chunks and stream the results to disk
+
+Run: python batch_predict.py input.csv [more.csv ...] -o predictions.csv.gz
+"""
+
+import argparse
+import os
+import sys
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.quantized_model import QUANTIZATIONS
+from utils.data_processor import DataProcessor
+from utils.drift_monitor import DriftMonitor
+from utils.neighbor_index import NeighborIndex
+from utils.csv_reader import SchemaCSVReader
+from utils.result_summary import ResultSummary
+from utils.exporter import EXPORT_FORMATS, ResultExporter, format_stats
+
+
+def score_chunks(processor, paths, chunksize, summary, quarantine=None, explain=False, neighbors=0):
+    """
+    Yield result chunks for every input file, in order
+
+    Rows failing validation are skipped; if quarantine is an open text
+    file they are appended to it as CSV. With explain, BLOCK and MONITOR
+    rows get a top_factors column; with neighbors, BLOCK rows get their
+    nearest training records.
+    """
+    reader = SchemaCSVReader.from_model_loader(processor.model_loader)
+    quarantined = 0
+    for path in paths:
+        for chunk in reader.iter_chunks(path, chunksize):
+            processed_df, issues = processor.validate_and_prepare(chunk)
+            for issue in issues:
+                print(f"⚠️ {os.path.basename(path)}: {issue}", file=sys.stderr)
+            bad_rows = processor.validation_report.quarantine
+            if quarantine is not None and len(bad_rows):
+                bad_rows.assign(source=os.path.basename(path)).to_csv(
+                    quarantine, header=(quarantined == 0), index=False)
+            quarantined += len(bad_rows)
+            yield processor.predict(processed_df, summary=summary, explain=explain, neighbors=neighbors)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score network connection CSV files")
+    parser.add_argument('inputs', nargs='+', help="Input CSV files")
+    parser.add_argument('-o', '--output', required=True, help="Output file path")
+    parser.add_argument('-f', '--format', choices=list(EXPORT_FORMATS),
+                        help="Output format (default: inferred from the output extension)")
+    parser.add_argument('--chunksize', type=int, default=50_000, help="Rows scored per chunk")
+    parser.add_argument('--models', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models'),
+                        help="Directory containing the model artifacts")
+    parser.add_argument('--quarantine', help="Write rows that fail validation to this CSV")
+    parser.add_argument('--explain', action='store_true',
+                        help="Add the features that lowered each BLOCK and MONITOR row's trust score")
+    parser.add_argument('--quantized', choices=QUANTIZATIONS,
+                        help="Score with the quantized model (needs build_quantized_model.py)")
+    parser.add_argument('--neighbors', type=int, default=0, metavar='K',
+                        help="List the K most similar data.csv rows for each BLOCK row "
+                             "(needs build_neighbor_index.py)")
+    return parser.parse_args(argv)
+
+
+def infer_format(path):
+    """Pick the export format from the output file name"""
+    for fmt, (extension, _) in EXPORT_FORMATS.items():
+        if path.endswith(extension):
+            return fmt
+    return 'csv.gz'
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or infer_format(args.output)
+
+    model_loader = ModelLoader(args.models, quantization=args.quantized)
+    drift_monitor = DriftMonitor.from_model_loader(model_loader)
+    neighbor_index = NeighborIndex.from_model_loader(model_loader) if args.neighbors else None
+    if args.neighbors and neighbor_index is None:
+        print("⚠️ No neighbor index found (run build_neighbor_index.py); --neighbors ignored", file=sys.stderr)
+    processor = DataProcessor(model_loader, drift_monitor=drift_monitor, neighbor_index=neighbor_index)
+    summary = ResultSummary()
+    exporter = ResultExporter(fmt, chunk_rows=args.chunksize)
+
+    quarantine = open(args.quarantine, 'w', newline='') if args.quarantine else None
+    try:
+        out, stats = exporter.export(score_chunks(processor, args.inputs, args.chunksize, summary, quarantine,
+                                                  explain=args.explain, neighbors=args.neighbors),
+                                     dest=args.output)
+        out.close()
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+
+    print(f"✓ Scored {summary.total:,} rows from {len(args.inputs)} file(s)")
+    for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+        print(f"  {action}: {summary.count('action', action):,}")
+    print(f"✓ Wrote {args.output}: {format_stats(stats)}")
+    if drift_monitor is not None:
+        print(f"✓ Drift: {drift_monitor.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
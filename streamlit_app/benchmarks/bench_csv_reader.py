@@ -0,0 +1,101 @@
+"""
+CSV reader benchmark
+Parse time and memory of SchemaCSVReader vs the plain pd.read_csv path
+
+Run: python benchmarks/bench_csv_reader.py [--rows 500000] [--repeat 3]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+VARIANTS = ['pd.read_csv', 'schema (c)', 'schema (pyarrow)']
+
+
+def make_input(rows, path):
+    """Write data.csv repeated up to rows, keeping its quoted header"""
+    base = pd.read_csv(DATA_CSV)
+    reps = -(-rows // len(base))
+    big = pd.concat([base] * reps, ignore_index=True).iloc[:rows]
+    big['id'] = range(1, rows + 1)
+    big.to_csv(path, index=False)
+
+
+def run_variant(variant, path, repeat):
+    """Parse path repeat times in this (fresh) process; report best time and memory"""
+    import warnings
+    warnings.filterwarnings('ignore')
+    from utils.model_loader import ModelLoader
+    from utils.csv_reader import SchemaCSVReader
+
+    loader = ModelLoader(MODELS_DIR)
+    if variant == 'pd.read_csv':
+        def parse():
+            # Today's path: infer every dtype, fix quoted headers afterwards
+            df = pd.read_csv(path)
+            df.columns = df.columns.str.strip().str.replace("'", "")
+            return df
+    else:
+        engine = 'pyarrow' if 'pyarrow' in variant else 'c'
+        reader = SchemaCSVReader.from_model_loader(loader, engine=engine)
+        parse = lambda: reader.read(path)
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = parse()
+        best = min(best, time.perf_counter() - start)
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return best, frame_mb, peak_rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'connections.csv')
+        make_input(args.rows, path)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Input: {args.rows:,} rows, {size_mb:,.1f} MB\n")
+
+        print(f"{'reader':<18} {'best s':>8} {'MB/s':>8} {'frame MB':>9} {'peak RSS MB':>12}")
+        results = {}
+        context = multiprocessing.get_context('spawn')
+        for variant in VARIANTS:
+            # One process per variant so peak RSS is not shared between them
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                try:
+                    results[variant] = pool.submit(run_variant, variant, path, args.repeat).result()
+                except ImportError as e:
+                    print(f"{variant:<18} skipped ({e})")
+                    continue
+            seconds, frame_mb, rss_mb = results[variant]
+            print(f"{variant:<18} {seconds:>8.3f} {size_mb / seconds:>8.1f} {frame_mb:>9.1f} {rss_mb:>12.1f}")
+
+        baseline = results['pd.read_csv']
+        for variant in VARIANTS[1:]:
+            if variant in results:
+                seconds, frame_mb, _ = results[variant]
+                print(f"\n{variant}: {baseline[0] / seconds:.1f}x faster, "
+                      f"{baseline[1] / frame_mb:.1f}x smaller frame", end='')
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Neighbor index benchmark
+Build time and k-NN query latency over the scaled training set, vs tree indexes and per-row scans
+
+Run: python benchmarks/bench_neighbor_index.py [--k 5] [--queries 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+
+from utils.model_loader import ModelLoader  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+from utils.neighbor_index import NeighborIndex  # noqa: E402
+
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+
+def per_row_scan(X, Q, k):
+    """The straightforward loop: one full distance scan per flagged row"""
+    out = np.empty((len(Q), k), dtype=np.int64)
+    for i, q in enumerate(Q):
+        dist = np.sqrt(((X - q) ** 2).sum(axis=1))
+        out[i] = np.argsort(dist)[:k]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=2000, help="Flagged rows per batch")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor = DataProcessor(ModelLoader(os.path.join(APP_DIR, '..', 'models')))
+    processed_df, _ = processor.validate_and_prepare(pd.read_csv(DATA_CSV))
+    X = processor.prepare_features(processed_df[processor.feature_names])
+    # Flagged rows: training rows nudged off their exact positions
+    rng = np.random.default_rng(0)
+    Q = X[rng.choice(len(X), args.queries, replace=False)] + rng.normal(0, 0.01, (args.queries, X.shape[1]))
+    print(f"Training set: {len(X):,} x {X.shape[1]}, k={args.k}, {args.queries:,} query rows\n")
+
+    build, index = timed(lambda: NeighborIndex.build(X, processed_df['true_class']))
+    # Results as data.csv row numbers, comparable across indexes
+    expected = index.row_ids[index.query(Q, args.k)[1]]
+    variants = [('NeighborIndex (blocked BLAS)', build, lambda: index.row_ids[index.query(Q, args.k)[1]])]
+    try:
+        from sklearn.neighbors import BallTree, KDTree
+        for cls in (BallTree, KDTree):
+            tree_build, tree = timed(lambda: cls(X, leaf_size=40))
+            variants.append((f"sklearn {cls.__name__}", tree_build, lambda tree=tree: tree.query(Q, args.k)[1]))
+        variants.append(("sklearn BallTree (dual tree)", variants[1][1],
+                         lambda: BallTree(X, leaf_size=40).query(Q, args.k, dualtree=True)[1]))
+    except ImportError:
+        print("(scikit-learn not installed; skipping tree indexes)")
+    sample = Q[:200]
+    variants.append(('per-row scan (200 rows)', 0.0, lambda: per_row_scan(X, sample, args.k)))
+
+    print(f"{'index':<30} {'build s':>8} {'query s':>8} {'ms/row':>8} {'same top-k':>11}")
+    for name, build_s, query in variants:
+        seconds, found = timed(query)
+        rows = len(found)
+        same = (np.sort(found, axis=1) == np.sort(expected[:rows], axis=1)).all(axis=1).mean()
+        print(f"{name:<30} {build_s:>8.2f} {seconds:>8.2f} {seconds / rows * 1000:>8.3f} {same:>11.1%}")
+
+    print("\nSingle flagged row latency:")
+    for n in (1, 10, 100):
+        seconds = min(timed(lambda: index.query(Q[:n], args.k))[0] for _ in range(5))
+        print(f"  {n:>4} rows: {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Results store benchmark
+Ingest rate and query latency of ResultsStore vs aggregating the raw decisions
+
+Run: python benchmarks/bench_results_store.py [--rows 2000000] [--days 90]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+
+from utils.results_store import ResultsStore  # noqa: E402
+
+CHUNK = 50_000
+
+
+def synthetic_chunk(rng, n, start, end):
+    """Results frame shaped like DataProcessor.predict output"""
+    trust = rng.uniform(0, 100, n).round(2)
+    codes = np.where(trust >= 66, 0, np.where(trust >= 33, 1, 2))
+    return pd.DataFrame({
+        'node_id': rng.integers(0, 100_000, n),
+        'prediction': np.where(trust >= 50, 'Normal', 'Anomaly'),
+        'trust_score': trust,
+        'trust_level': np.array(['High', 'Medium', 'Low'])[codes],
+        'action': np.array(['ALLOW', 'MONITOR', 'BLOCK'])[codes],
+    }), np.sort(rng.uniform(start, end, n))
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    end = time.time()
+    start = end - args.days * 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore(os.path.join(tmp, 'decisions.sqlite'))
+        batch_id = store.begin_batch('synthetic')
+        edges = np.linspace(start, end, -(-args.rows // CHUNK) + 1)
+        t = time.perf_counter()
+        for i, rows in enumerate(range(0, args.rows, CHUNK)):
+            chunk, ts = synthetic_chunk(rng, min(CHUNK, args.rows - rows), edges[i], edges[i + 1])
+            store.append(batch_id, chunk, ts)
+        store.finish_batch(batch_id)
+        ingest = time.perf_counter() - t
+        size_mb = os.path.getsize(store.path) / 1e6
+        print(f"Ingest: {args.rows:,} rows in {ingest:.1f}s ({args.rows / ingest:,.0f} rows/s), "
+              f"{size_mb:,.0f} MB on disk\n")
+
+        conn = store._conn
+        raw_hourly = ('SELECT CAST(ts / 3600 AS INTEGER), action, COUNT(*), AVG(trust_score) '
+                      'FROM decisions GROUP BY 1, 2')
+        queries = [
+            ('hourly trend (buckets)', lambda: store.trend('hour')),
+            ('hourly trend (raw scan)', lambda: conn.execute(raw_hourly).fetchall()),
+            ('daily totals (buckets)', lambda: store.totals()),
+            ('last 7 days BLOCK, 1k rows', lambda: store.decisions(start=end - 7 * 86400, action='BLOCK', limit=1000)),
+            ('node history', lambda: store.decisions(node_id=42)),
+        ]
+        print(f"{'query':<28} {'best ms':>9}")
+        for name, fn in queries:
+            ms, _ = timed(fn, repeat=1 if 'raw' in name else 5)
+            print(f"{name:<28} {ms:>9.1f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Sharded scoring benchmark
+Throughput and scaling efficiency of the coordinator with 1, 2, 4... local worker processes
+
+Run: python benchmarks/bench_sharding.py [--copies 8] [--workers 1 2 4] [--shard-rows 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+
+from shard_predict import start_local_workers  # noqa: E402
+from utils.sharding import Coordinator  # noqa: E402
+
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+
+
+def make_input(path, copies):
+    """data.csv repeated copies times under one header"""
+    with open(DATA_CSV, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    with open(path, 'wb') as f:
+        f.write(header + body * copies)
+
+
+def run(path, workers, shard_rows):
+    """Score path on workers local processes; (stats, seconds including worker start-up)"""
+    start = time.perf_counter()
+    coordinator = Coordinator([path], shard_rows=shard_rows)
+    procs = start_local_workers(workers, coordinator.address, MODELS_DIR)
+    for _ in coordinator.results():
+        pass
+    for proc in procs:
+        proc.wait()
+    return coordinator.stats(), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--copies', type=int, default=8, help="Copies of data.csv in the input")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--shard-rows', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.csv')
+        make_input(path, args.copies)
+        print(f"Input: data.csv x {args.copies}, {os.cpu_count()} CPUs, {args.shard_rows:,} rows per shard\n")
+        print(f"{'workers':>7} {'rows':>9} {'shards':>6} {'wall s':>7} {'total s':>7} {'rows/s':>9} "
+              f"{'speedup':>7} {'scaling':>7} {'busy':>5}")
+        base = None
+        for n in args.workers:
+            stats, total = run(path, n, args.shard_rows)
+            base = base or stats['rows_per_sec'] / n
+            speedup = stats['rows_per_sec'] / base
+            # scaling: speedup over worker count; busy: share of worker time spent scoring
+            print(f"{n:>7} {stats['rows']:>9,} {stats['shards']:>6} {stats['wall_seconds']:>7.2f} {total:>7.2f} "
+                  f"{stats['rows_per_sec']:>9,.0f} {speedup:>6.2f}x {speedup / n:>7.0%} {stats['efficiency']:>5.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Cold-start benchmark
+Time from process launch to first prediction, in fresh interpreters
+
+Run: python benchmarks/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(APP_DIR, 'test', 'test1.csv')
+
+# Runs in a fresh interpreter; prints stage timings and heavy modules loaded
+CHILD = """
+import time, sys, json, warnings
+t0 = time.perf_counter()
+warnings.filterwarnings('ignore')
+sys.path.insert(0, {app_dir!r})
+{imports}
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.csv_reader import SchemaCSVReader
+t_import = time.perf_counter()
+import contextlib, io
+with contextlib.redirect_stdout(io.StringIO()):
+    loader = ModelLoader({models_dir!r}, use_bundle={use_bundle})
+t_load = time.perf_counter()
+processor = DataProcessor(loader)
+chunk = next(SchemaCSVReader.from_model_loader(loader).iter_chunks({sample!r}, 1))
+processor.predict(processor.validate_and_prepare(chunk)[0])
+t_first = time.perf_counter()
+heavy = [m for m in ('sklearn', 'scipy', 'joblib', 'plotly', 'streamlit') if m in sys.modules]
+print(json.dumps({{'import': t_import - t0, 'load': t_load - t_import,
+                  'first': t_first - t_load, 'heavy': heavy}}))
+"""
+
+VARIANTS = {
+    # What a scoring process paid before: every utils module (Plotly
+    # included) and the sklearn pickles
+    'eager utils + pickles': dict(imports='import utils.visualizer, utils.job_manager, utils.results_store',
+                                  use_bundle=False),
+    'core + pickles': dict(imports='', use_bundle=False),
+    'core + bundle': dict(imports='', use_bundle=True),
+}
+
+
+def run_child_wall(cmd):
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True)
+    return time.perf_counter() - start
+
+
+def run_child(code):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    return wall, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_cli(repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, os.path.join(APP_DIR, 'batch_predict.py'), SAMPLE_CSV,
+               '-o', os.path.join(tmp, 'out.csv.gz')]
+        walls = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(cmd, capture_output=True, check=True)
+            walls.append(time.perf_counter() - start)
+    return statistics.median(walls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    interpreter = statistics.median(run_child_wall([sys.executable, '-c', 'pass']) for _ in range(args.repeat))
+    print(f"Interpreter start: {interpreter:.3f}s\n")
+    print(f"{'variant':<24} {'import s':>9} {'load s':>8} {'1st pred s':>11} {'wall s':>8}  heavy modules")
+    walls = {}
+    for name, variant in VARIANTS.items():
+        code = CHILD.format(app_dir=APP_DIR, models_dir=os.path.join(APP_DIR, '..', 'models'),
+                            sample=SAMPLE_CSV, **variant)
+        runs = [run_child(code) for _ in range(args.repeat)]
+        wall = statistics.median(r[0] for r in runs)
+        stages = {k: statistics.median(r[1][k] for r in runs) for k in ('import', 'load', 'first')}
+        walls[name] = wall
+        print(f"{name:<24} {stages['import']:>9.3f} {stages['load']:>8.3f} {stages['first']:>11.3f} "
+              f"{wall:>8.3f}  {', '.join(runs[0][1]['heavy']) or '-'}")
+
+    baseline = walls['eager utils + pickles']
+    print(f"\nLaunch to first prediction: {baseline:.2f}s -> {walls['core + bundle']:.2f}s "
+          f"({baseline / walls['core + bundle']:.1f}x faster)")
+    print(f"batch_predict.py on {os.path.basename(SAMPLE_CSV)}: {run_cli(args.repeat):.2f}s wall")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Sharded prediction CLI
+Split CSV files into row-range shards and score them on worker processes, local or remote
+
+Run: python shard_predict.py coordinator input.csv -o predictions.csv.gz --local-workers 4
+     python shard_predict.py coordinator input.csv -o out.parquet --listen 0.0.0.0:7700
+     python shard_predict.py worker --connect coordinator-host:7700     (on each scoring host)
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.quantized_model import QUANTIZATIONS
+from utils.sharding import SHARD_ROWS, MAX_ATTEMPTS, Coordinator, run_worker
+from utils.exporter import EXPORT_FORMATS, ResultExporter, format_stats
+
+DEFAULT_MODELS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+
+
+def parse_address(value):
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score CSV files on a pool of worker processes")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = commands.add_parser('coordinator', help="Plan shards, hand them out and write the results")
+    coordinator.add_argument('inputs', nargs='+', help="Input CSV files")
+    coordinator.add_argument('-o', '--output', required=True, help="Output file path")
+    coordinator.add_argument('-f', '--format', choices=list(EXPORT_FORMATS),
+                             help="Output format (default: inferred from the output extension)")
+    coordinator.add_argument('--listen', type=parse_address, default=('127.0.0.1', 0), metavar='HOST:PORT',
+                             help="Address workers connect to (default: a free local port)")
+    coordinator.add_argument('--local-workers', type=int, default=0, metavar='N',
+                             help="Start N worker processes on this host")
+    coordinator.add_argument('--shard-rows', type=int, default=SHARD_ROWS, help="Rows per shard")
+    coordinator.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS,
+                             help="Times a shard is handed out before the run fails")
+    coordinator.add_argument('--timeout', type=float, default=300.0,
+                             help="Seconds without a worker frame before its shard is retried")
+    coordinator.add_argument('--explain', action='store_true',
+                             help="Add the features that lowered each BLOCK and MONITOR row's trust score")
+    coordinator.add_argument('--neighbors', type=int, default=0, metavar='K',
+                             help="List the K most similar data.csv rows for each BLOCK row")
+
+    for sub in [coordinator, commands.add_parser('worker', help="Score shards from a coordinator")]:
+        sub.add_argument('--models', default=DEFAULT_MODELS, help="Directory containing the model artifacts")
+        sub.add_argument('--quantized', choices=QUANTIZATIONS,
+                         help="Score with the quantized model (needs build_quantized_model.py)")
+        sub.add_argument('--chunksize', type=int, default=20_000, help="Rows scored per chunk within a shard")
+    commands.choices['worker'].add_argument('--connect', type=parse_address, required=True, metavar='HOST:PORT',
+                                            help="Coordinator address")
+    return parser.parse_args(argv)
+
+
+def infer_format(path):
+    """Pick the export format from the output file name"""
+    for fmt, (extension, _) in EXPORT_FORMATS.items():
+        if path.endswith(extension):
+            return fmt
+    return 'csv.gz'
+
+
+def start_local_workers(n, address, models, quantized=None, chunksize=20_000):
+    """Launch n worker processes of this script connected to address"""
+    command = [sys.executable, os.path.abspath(__file__), 'worker', '--connect', f'{address[0]}:{address[1]}',
+               '--models', models, '--chunksize', str(chunksize)]
+    if quantized:
+        command += ['--quantized', quantized]
+    return [subprocess.Popen(command, stdout=subprocess.DEVNULL) for _ in range(n)]
+
+
+def worker_main(args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_loader = ModelLoader(args.models, quantization=args.quantized)
+    try:
+        done = run_worker(args.connect, model_loader, chunksize=args.chunksize)
+    except OSError as e:
+        print(f"⚠️ Lost the coordinator at {args.connect[0]}:{args.connect[1]}: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ Scored {done['rows']:,} rows in {done['shards']} shards")
+    return 0
+
+
+def coordinator_main(args):
+    fmt = args.format or infer_format(args.output)
+    coordinator = Coordinator(args.inputs, address=args.listen, shard_rows=args.shard_rows,
+                              max_attempts=args.max_attempts, timeout=args.timeout,
+                              explain=args.explain, neighbors=args.neighbors)
+    print(f"✓ {len(coordinator.shards)} shards, listening on {coordinator.address[0]}:{coordinator.address[1]}")
+    workers = start_local_workers(args.local_workers, coordinator.address, args.models, args.quantized,
+                                  args.chunksize)
+    try:
+        out, export_stats = ResultExporter(fmt, chunk_rows=args.shard_rows).export(coordinator.results(),
+                                                                                   dest=args.output)
+        out.close()
+    except RuntimeError as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    finally:
+        for worker in workers:
+            worker.wait()
+
+    stats = coordinator.stats()
+    summary = coordinator.summary
+    print(f"✓ Scored {summary.total:,} rows from {len(args.inputs)} file(s) "
+          f"on {len(stats['workers'])} workers ({stats['retries']} retried shards)")
+    for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+        print(f"  {action}: {summary.count('action', action):,}")
+    print(f"✓ {stats['wall_seconds']:.2f}s, {stats['rows_per_sec']:,.0f} rows/s, "
+          f"scaling efficiency {stats['efficiency']:.0%}")
+    print(stats['workers'].to_string())
+    print(f"✓ Wrote {args.output}: {format_stats(export_stats)}")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return worker_main(args) if args.command == 'worker' else coordinator_main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Streaming prediction CLI
+Read NDJSON connection records on stdin and write one NDJSON decision per line to stdout
+
+Run: tail -F connections.ndjson | python stream_predict.py [--max-batch 2000] [--max-delay-ms 250]
+"""
+
+import argparse
+import os
+import sys
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.quantized_model import QUANTIZATIONS
+from utils.data_processor import DataProcessor
+from utils.drift_monitor import DriftMonitor
+from utils.result_summary import ResultSummary
+from utils.stream_scorer import NDJSONStreamScorer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score NDJSON connection records from stdin")
+    parser.add_argument('--max-batch', type=int, default=2000, help="Most records scored at once")
+    parser.add_argument('--max-delay-ms', type=float, default=250,
+                        help="Target milliseconds from reading a record to writing its decision")
+    parser.add_argument('--queue', type=int, default=10_000,
+                        help="Records buffered before reading from stdin pauses")
+    parser.add_argument('--quantized', choices=QUANTIZATIONS,
+                        help="Score with the quantized model (needs build_quantized_model.py)")
+    parser.add_argument('--models', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models'),
+                        help="Directory containing the model artifacts")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Model loading messages would corrupt the NDJSON output
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        model_loader = ModelLoader(args.models, quantization=args.quantized)
+        drift_monitor = DriftMonitor.from_model_loader(model_loader)
+        processor = DataProcessor(model_loader, drift_monitor=drift_monitor)
+    finally:
+        sys.stdout = stdout
+
+    summary = ResultSummary()
+    scorer = NDJSONStreamScorer(processor, max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000,
+                                queue_size=args.queue, summary=summary)
+    try:
+        stats = scorer.run(sys.stdin.buffer, sys.stdout.buffer)
+    except BrokenPipeError:
+        # Downstream closed the pipe; stop quietly
+        sys.stderr.close()
+        return 0
+    except KeyboardInterrupt:
+        stats = scorer.stats()
+
+    print(f"✓ Scored {stats['records']:,} records in {stats['batches']:,} batches "
+          f"({stats['records_per_sec']:,.0f}/s), {stats['errors']:,} errors", file=sys.stderr)
+    for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+        print(f"  {action}: {summary.count('action', action):,}", file=sys.stderr)
+    print(f"✓ Delay p50 {stats['p50_delay'] * 1000:.0f} ms, p99 {stats['p99_delay'] * 1000:.0f} ms, "
+          f"max {stats['max_delay'] * 1000:.0f} ms", file=sys.stderr)
+    if drift_monitor is not None:
+        print(f"✓ Drift: {drift_monitor.describe()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Test script for the model bake-off harness and the encoded training data cache
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.bakeoff import (choose, export_model, fit_trust_scaler, measure, pareto_front, scoring_processor,
+                           train_candidates)
+from utils.training_data import load_training_matrix
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor(model_dir=MODELS_DIR):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(model_dir))
+
+
+def test_training_matrix_cache():
+    """The encoded matrix matches a fresh encode and is rebuilt when data.csv changes"""
+    processor = load_processor()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        cache_path = os.path.join(tmp, 'cache.npz')
+        pd.read_csv(DATA_CSV).head(300).to_csv(csv_path, index=False)
+        X, y, row_ids = load_training_matrix(processor, csv_path, cache_path)
+        processed_df, _ = processor.validate_and_prepare(pd.read_csv(csv_path))
+        assert np.array_equal(X, processor.encode_features(processed_df[processor.feature_names]))
+        assert np.array_equal(y, (processed_df['true_class'] == 'Normal').to_numpy())
+
+        mtime = os.path.getmtime(cache_path)
+        X_cached, _, _ = load_training_matrix(processor, csv_path, cache_path)
+        assert os.path.getmtime(cache_path) == mtime and np.array_equal(X_cached, X)
+
+        pd.read_csv(DATA_CSV).head(100).to_csv(csv_path, index=False)
+        X_small, _, row_ids = load_training_matrix(processor, csv_path, cache_path)
+        assert len(X_small) == 100 and list(row_ids[:3]) == [0, 1, 2]
+    print("✓ Encoded training data cache")
+
+
+def test_pareto_front_and_choice():
+    """Dominated models are off the front; the budget picks the most accurate model that fits"""
+    report = pd.DataFrame({
+        'model': ['slow_best', 'fast_good', 'dominated', 'fastest_poor'],
+        'accuracy': [0.99, 0.98, 0.97, 0.80],
+        'single_row_p50_ms': [20.0, 5.0, 6.0, 1.0],
+        'single_row_p99_ms': [30.0, 8.0, 9.0, 2.0],
+        'batch_us_per_row': [50.0, 10.0, 12.0, 1.0],
+    })
+    report['on_front'] = pareto_front(report)
+    assert list(report['on_front']) == [True, True, False, True]
+    assert choose(report) == 'slow_best'
+    assert choose(report, budget_ms=10) == 'fast_good'
+    assert choose(report, budget_ms=2) == 'fastest_poor'
+    assert choose(report, budget_ms=1) is None
+    print("✓ Pareto front and budgeted choice")
+
+
+def test_bakeoff_round_trip():
+    """Train in parallel, measure through DataProcessor, export and load from the registry"""
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.tree import DecisionTreeClassifier
+
+    processor = load_processor()
+    df = pd.read_csv(DATA_CSV).sample(1500, random_state=0)
+    processed_df, _ = processor.validate_and_prepare(df)
+    X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+    y = (processed_df['true_class'] == 'Normal').to_numpy(dtype=int)
+    fitted = train_candidates({'tree': DecisionTreeClassifier(max_depth=8, random_state=0), 'nb': GaussianNB()},
+                              X_scaled[:1000], y[:1000], max_workers=2)
+    assert list(fitted) == ['tree', 'nb']
+
+    tree, _ = fitted['tree']
+    trust_scaler = fit_trust_scaler(tree, X_scaled[1000:])
+    scorer = scoring_processor(processor.model_loader, 'tree', tree, trust_scaler)
+    assert scorer.model_loader.get_shadow_names() == [] and processor.model_loader.primary_name == 'svm_optimized'
+    metrics = measure(scorer, processed_df.iloc[1000:], single_rows=20, repeats=1)
+    assert 0.9 < metrics['accuracy'] <= 1 and 0 < metrics['f1'] <= 1
+    assert metrics['single_row_p50_ms'] <= metrics['single_row_p99_ms']
+    assert metrics['rows_per_sec'] > 0 and metrics['model_kb'] > 0 and metrics['peak_scoring_mb'] > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith(('.pkl', '.npz')):
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        registry_path = export_model('tree', tree, trust_scaler, tmp, role='primary')
+        export_model('tree', tree, trust_scaler, tmp, role='primary')
+        with open(registry_path) as f:
+            config = json.load(f)
+        assert config['primary'] == 'tree' and len(config['models']) == 1
+
+        loaded = load_processor(tmp)
+        assert loaded.model_loader.primary_name == 'tree'
+        assert loaded.model_loader.get_shadow_names() == ['svm_optimized']
+        results = loaded.predict(processed_df.iloc[1000:])
+        expected = scorer.predict(processed_df.iloc[1000:])
+        pd.testing.assert_frame_equal(results, expected)
+    print(f"✓ Bake-off round trip (tree accuracy {metrics['accuracy']:.3f})")
+
+
+if __name__ == "__main__":
+    test_training_matrix_cache()
+    test_pareto_front_and_choice()
+    test_bakeoff_round_trip()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,66 @@
+"""
+Test script for concurrent multi-file scoring
+"""
+
+import glob
+import io
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.result_summary import ResultSummary
+from utils.batch_runner import BatchRunner, compare_files, combine_summaries
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def test_parallel_matches_sequential():
+    """Per-file summaries match scoring each file on its own"""
+    loader = ModelLoader(MODELS_DIR)
+    paths = sorted(glob.glob(os.path.join(APP_DIR, 'test', '*.csv')))[:6]
+    files = [(os.path.basename(p), p) for p in paths]
+    files.append(('upload.csv', io.BytesIO(open(paths[0], 'rb').read())))
+    files.append(('missing.csv', os.path.join(APP_DIR, 'test', 'does_not_exist.csv')))
+
+    calls = []
+    results = BatchRunner(loader, max_workers=3, chunksize=4).run(files, progress=calls.append)
+    assert calls and all(r.status == 'done' for r in results[:-1])
+    assert results[-1].status == 'failed' and 'does_not_exist' in results[-1].error
+    results = results[:-1]
+
+    processor = DataProcessor(loader)
+    for result, path in zip(results, paths + [paths[0]]):
+        expected = ResultSummary()
+        processed_df, _ = processor.validate_and_prepare(pd.read_csv(path))
+        processor.predict(processed_df, summary=expected)
+        assert result.summary.total == expected.total == result.rows_read
+        assert result.summary.fingerprint() == expected.fingerprint()
+
+    comparison = compare_files(results)
+    assert list(comparison.index) == [name for name, _ in files[:-1]]
+    assert comparison[['allow_pct', 'monitor_pct', 'block_pct']].sum(axis=1).round(6).eq(100).all()
+    assert combine_summaries(results).total == comparison['rows'].sum()
+    print("✓ Parallel scoring matches sequential")
+
+
+def test_labeled_accuracy():
+    """Labeled files report accuracy with Normal/Anomaly mapped correctly"""
+    loader = ModelLoader(MODELS_DIR)
+    sample = io.BytesIO(pd.read_csv(DATA_CSV, nrows=2000).to_csv(index=False).encode())
+    results = BatchRunner(loader, max_workers=1).run([('sample.csv', sample)])
+    accuracy = compare_files(results).loc['sample.csv', 'accuracy_pct']
+    assert accuracy > 90, accuracy
+    print(f"✓ Accuracy on labeled sample: {accuracy:.1f}%")
+
+
+if __name__ == "__main__":
+    test_parallel_matches_sequential()
+    test_labeled_accuracy()
+    print("\n✅ All tests passed!")
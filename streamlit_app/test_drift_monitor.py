@@ -0,0 +1,113 @@
+"""
+Test script for streaming feature drift monitoring
+"""
+
+import contextlib
+import io
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.drift_monitor import DriftMonitor
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_loader():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ModelLoader(MODELS_DIR)
+
+
+def test_training_data_does_not_drift():
+    """Samples of the training data stay under the warning threshold"""
+    loader = load_loader()
+    monitor = DriftMonitor.from_model_loader(loader, min_rows=2000)
+    assert monitor is not None
+    processor = DataProcessor(loader, drift_monitor=monitor)
+    df = pd.read_csv(DATA_CSV).sample(6000, random_state=0)
+    for start in range(0, len(df), 1000):
+        chunk = df.iloc[start:start + 1000]
+        processor.predict(processor.validate_and_prepare(chunk)[0])
+    assert monitor.windows == 3 and monitor.rows_seen == 6000
+    assert len(monitor.alerts) == 0
+    assert (monitor.report()['level'] == 'ok').all()
+    print(f"✓ No drift on training samples (max PSI {monitor.last_scores['psi'].max():.3f})")
+
+
+def test_shifted_features_alert():
+    """A shifted numeric and a swapped category raise alerts for those features only"""
+    loader = load_loader()
+    monitor = DriftMonitor.from_model_loader(loader, min_rows=1000)
+    processor = DataProcessor(loader, drift_monitor=monitor)
+    df = pd.read_csv(DATA_CSV).sample(1500, random_state=1)
+    df["'src_bytes'"] *= 20
+    df["'protocol_type'"] = 'udp'
+    processor.predict(processor.validate_and_prepare(df)[0])
+
+    scores = monitor.last_scores.set_index('feature')
+    assert set(scores.index[scores['level'] == 'alert']) == {'src_bytes', 'protocol_type'}
+    assert scores.loc['protocol_type', 'ks'] > 0.5
+    assert scores.loc['protocol_type', 'mean_shift'] > 1
+    assert set(monitor.recent_alerts()['feature']) == {'src_bytes', 'protocol_type'}
+    assert 'protocol_type' in monitor.describe()
+    print(f"✓ Alerts: {monitor.describe()}")
+
+
+def test_constant_memory_and_round_trip():
+    """State size does not grow with rows; save/load keeps the reference"""
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.exponential(5, 5000), np.zeros(5000), rng.integers(0, 3, 5000)])
+    X[:2000, 1] = rng.normal(size=2000)
+    monitor = DriftMonitor.fit(X, ['a', 'b', 'c'], X.mean(axis=0), X.std(axis=0),
+                               categorical={'c': 3}, min_rows=100_000)
+    # Point mass at 0 in 'b' gets a bin of its own; 'c' gets one bin per class
+    assert len(monitor.edges[2]) == 2
+    zero_bin = np.searchsorted(monitor.edges[1], np.float32(0), side='right')
+    assert abs(monitor.reference[monitor._offsets[1] + zero_bin] - 0.6) < 0.01
+
+    size = monitor._window.nbytes + monitor._total.nbytes
+    for _ in range(20):
+        monitor.update(X)
+    assert monitor._window.nbytes + monitor._total.nbytes == size and monitor.rows_seen == 100_000
+    assert monitor.windows == 1 and monitor.report()['psi'].max() < 1e-9
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ref.npz')
+        monitor.save(path)
+        loaded = DriftMonitor.load(path)
+    assert loaded.categorical == ['c'] and np.array_equal(loaded.reference, monitor.reference)
+    assert all(np.array_equal(a, b) for a, b in zip(loaded.edges, monitor.edges))
+    print("✓ Constant memory and save/load round trip")
+
+
+def test_concurrent_updates():
+    """Updates from several threads are all counted"""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(1000, 2))
+    monitor = DriftMonitor.fit(X, ['a', 'b'], np.zeros(2), np.ones(2), min_rows=10**9)
+    threads = [threading.Thread(target=lambda: [monitor.update(X[:100]) for _ in range(50)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert monitor.rows_seen == 4 * 50 * 100
+    assert monitor._window.sum() == 2 * monitor.rows_seen
+    print("✓ Concurrent updates")
+
+
+if __name__ == "__main__":
+    test_training_data_does_not_drift()
+    test_shifted_features_alert()
+    test_constant_memory_and_round_trip()
+    test_concurrent_updates()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,120 @@
+"""
+Test script for per-prediction attributions and permutation importance
+"""
+
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.explainer import RBFExplainer, permutation_importance
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(MODELS_DIR, **kwargs))
+
+
+def scaled_sample(processor, n):
+    processed_df, _ = processor.validate_and_prepare(pd.read_csv(DATA_CSV, nrows=n))
+    return processed_df, processor.prepare_features(processed_df[processor.feature_names])
+
+
+def test_gradients_match_finite_differences():
+    """Analytic gradients equal numerical ones, for bundle and pickle alike"""
+    processor = load_processor()
+    _, X = scaled_sample(processor, 30)
+    explainer = RBFExplainer.from_model_loader(processor.model_loader)
+    grads = explainer.gradients(X)
+    h = 1e-6
+    for j in range(X.shape[1]):
+        step = np.zeros(X.shape[1])
+        step[j] = h
+        numeric = (processor.model.decision_function(X + step) - processor.model.decision_function(X - step)) / (2 * h)
+        assert np.allclose(grads[:, j], numeric, atol=1e-4), j
+
+    pickled = load_processor(use_bundle=False)
+    assert np.allclose(RBFExplainer.from_model_loader(pickled.model_loader).gradients(X), grads)
+    print("✓ Gradients match finite differences")
+
+
+def test_top_factors_on_flagged_rows():
+    """predict(explain=True) names features only for BLOCK and MONITOR rows"""
+    processor = load_processor()
+    processed_df, X = scaled_sample(processor, 400)
+    results = processor.predict(processed_df, explain=True)
+    plain = processor.predict(processed_df)
+    pd.testing.assert_frame_equal(results.drop(columns='top_factors'), plain)
+
+    flagged = results['action'] != 'ALLOW'
+    assert (results.loc[~flagged, 'top_factors'] == '').all()
+    assert (results.loc[flagged, 'top_factors'] != '').all()
+
+    attributions = processor.explain(processed_df)
+    row = int(np.flatnonzero(flagged)[0])
+    worst = attributions.iloc[row].idxmin()
+    assert results['top_factors'].iloc[row].startswith(f"{worst} (")
+    assert list(attributions.columns) == processor.feature_names
+    print(f"✓ top_factors on {flagged.sum()} flagged rows, e.g. {results['top_factors'].iloc[row]}")
+
+
+def test_non_svc_primary():
+    """A non-SVC primary scores with explain=True; top_factors stay empty"""
+    from sklearn.tree import DecisionTreeClassifier
+    from utils.bakeoff import fit_trust_scaler
+
+    processor = load_processor()
+    processed_df, X = scaled_sample(processor, 400)
+    y = (processed_df['true_class'] == 'Normal').to_numpy(dtype=int)
+    tree = DecisionTreeClassifier(max_depth=6, random_state=0).fit(X, y)
+    assert not RBFExplainer.supports(tree) and RBFExplainer.supports(processor.model)
+    processor.model_loader.register_model('tree', tree, fit_trust_scaler(tree, X), role='primary')
+    results_df = processor.predict(processed_df, explain=True)
+    assert (results_df['action'] != 'ALLOW').any() and (results_df['top_factors'] == '').all()
+    assert processor.explain(processed_df.head(5)).isna().all().all()
+    print("✓ Non-SVC primary leaves top_factors empty")
+
+
+def test_permutation_importance():
+    """Constant features have no importance; informative ones do"""
+    processor = load_processor()
+    processed_df, X = scaled_sample(processor, 300)
+    y = (processed_df['true_class'] == 'Normal').astype(int).to_numpy()
+    importance = permutation_importance(processor.model, X, y, processor.feature_names,
+                                        n_repeats=2, max_workers=2).set_index('feature')
+    assert importance.loc['num_outbound_cmds', 'importance'] == 0
+    assert importance.loc['num_outbound_cmds', 'trust_shift'] < 1e-9
+    assert importance['importance'].max() > 0.02
+    # Same permutations whatever the number of workers
+    serial = permutation_importance(processor.model, X, y, processor.feature_names,
+                                    n_repeats=2, max_workers=1).set_index('feature')
+    pd.testing.assert_frame_equal(serial, importance)
+    print(f"✓ Permutation importance, top feature {importance.index[0]}")
+
+
+def test_feature_importance_report():
+    """get_feature_importance returns the built report"""
+    importance = load_processor().get_feature_importance()
+    assert len(importance) == 41 and pd.api.types.is_numeric_dtype(importance['importance'])
+    assert importance['importance'].is_monotonic_decreasing
+    print("✓ Feature importance report loaded")
+
+
+if __name__ == "__main__":
+    test_gradients_match_finite_differences()
+    test_top_factors_on_flagged_rows()
+    test_non_svc_primary()
+    test_permutation_importance()
+    test_feature_importance_report()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,118 @@
+"""
+Test script for feature selection and reduced-feature model variants
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.bakeoff import export_model, fit_trust_scaler, scoring_processor
+from utils.feature_selection import (correlated_pairs, drop_correlated, feature_subsets,
+                                     rank_features, train_subset_models)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor(model_dir=MODELS_DIR):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(model_dir))
+
+
+def test_correlated_pairs():
+    """The vectorized scan finds the same pairs, in the same order, as the notebook's loop"""
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(500, 4))
+    X = np.column_stack([base[:, 0], base[:, 1], base[:, 0] * 2 + 0.01 * rng.normal(size=500),
+                         np.ones(500), -base[:, 1], base[:, 2], base[:, 3]])
+    names = [f'f{i}' for i in range(X.shape[1])]
+
+    corr = pd.DataFrame(X, columns=names).corr()
+    expected = [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))
+                if abs(corr.iloc[i, j]) > 0.9]
+    pairs = correlated_pairs(X, names)
+    assert list(zip(pairs['Feature1'], pairs['Feature2'])) == expected == [('f0', 'f2'), ('f1', 'f4')]
+    assert np.allclose(pairs['Correlation'], [corr.loc[a, b] for a, b in expected])
+    print("✓ Correlated pairs match the loop")
+
+
+def test_subsets():
+    """The weaker feature of a correlated pair is dropped; subsets keep model order"""
+    names = ['a', 'b', 'c', 'd']
+    ranking = pd.DataFrame({'feature': ['c', 'b', 'd', 'a'], 'importance': [0.4, 0.3, 0.2, 0.1]})
+    pairs = pd.DataFrame({'Feature1': ['a', 'b'], 'Feature2': ['c', 'd'], 'Correlation': [0.95, -0.93]})
+    assert drop_correlated(pairs, ranking) == ['d', 'a']
+    subsets = feature_subsets(ranking, pairs, names, sizes=(2,))
+    assert subsets == {'Full_Features': names, 'Reduced_Corr': ['b', 'c'], 'Top_2': ['b', 'c']}
+    print("✓ Feature subsets")
+
+
+def test_reduced_model_serving():
+    """A model registered on a feature subset scores, explains and round-trips through the registry"""
+    processor = load_processor()
+    feature_names = list(processor.feature_names)
+    df = pd.read_csv(DATA_CSV).sample(1200, random_state=0)
+    processed_df, _ = processor.validate_and_prepare(df)
+    X_scaled = processor.prepare_features(processed_df[feature_names])
+    y = (processed_df['true_class'] == 'Normal').to_numpy(dtype=int)
+
+    ranking = rank_features(X_scaled[:800], y[:800], feature_names)
+    assert len(ranking) == len(feature_names) and ranking['importance'].is_monotonic_decreasing
+    subsets = feature_subsets(ranking, correlated_pairs(X_scaled[:800], feature_names), feature_names, sizes=(10,))
+    subsets = {'Top_10': subsets['Top_10']}
+    fitted = train_subset_models(subsets, X_scaled[:800], y[:800], feature_names, max_workers=1)
+    model, _ = fitted['Top_10']
+    columns = [feature_names.index(f) for f in subsets['Top_10']]
+    assert model.n_features_in_ == 10
+
+    trust_scaler = fit_trust_scaler(model, X_scaled[800:, columns])
+    scorer = scoring_processor(processor.model_loader, 'Top_10', model, trust_scaler, subsets['Top_10'])
+    assert scorer.model_loader.get_feature_subset() == subsets['Top_10']
+    assert scorer.model_loader.list_models()[0]['num_features'] == 10
+    results = scorer.predict(processed_df.iloc[800:])
+    expected = np.where(model.predict(X_scaled[800:, columns]) == 1, 'Normal', 'Anomaly')
+    assert np.array_equal(results['prediction'].astype(str).to_numpy(), expected)
+
+    attributions = scorer.explain(processed_df.iloc[800:810])
+    assert list(attributions.columns) == feature_names
+    unused = [f for f in feature_names if f not in subsets['Top_10']]
+    assert (attributions[unused] == 0).all().all()
+
+    try:
+        processor.model_loader.register_model('bad', model, trust_scaler, feature_subset=['no_such_feature'])
+        assert False, "unknown feature accepted"
+    except ValueError:
+        pass
+    assert 'bad' not in processor.model_loader.registry
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith(('.pkl', '.npz')):
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        registry_path = export_model('Top_10', model, trust_scaler, tmp, role='primary',
+                                     feature_subset=subsets['Top_10'])
+        with open(registry_path) as f:
+            assert json.load(f)['models'][0]['feature_subset'] == subsets['Top_10']
+        loaded = load_processor(tmp)
+        assert loaded.model_loader.primary_name == 'Top_10'
+        pd.testing.assert_frame_equal(loaded.predict(processed_df.iloc[800:]), results)
+    print("✓ Reduced-feature model serving")
+
+
+if __name__ == "__main__":
+    test_correlated_pairs()
+    test_subsets()
+    test_reduced_model_serving()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,57 @@
+"""
+Test script for training-time imputation
+"""
+
+import numpy as np
+import pandas as pd
+import shutil
+import sys
+import os
+import tempfile
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data.csv')
+
+
+def test_fill_is_independent_of_batch():
+    """A row with nulls is filled the same whether scored alone or in a batch"""
+    processor = DataProcessor(ModelLoader(MODELS_DIR))
+    df = pd.read_csv(DATA_CSV, nrows=200)
+    df.loc[0, "'src_bytes'"] = np.nan
+    df.loc[0, "'service'"] = np.nan
+
+    alone, _ = processor.validate_and_prepare(df.iloc[[0]])
+    batch, _ = processor.validate_and_prepare(df)
+    other_batch, _ = processor.validate_and_prepare(df.iloc[[0] + list(range(100, 200))])
+    for col in ['src_bytes', 'service']:
+        assert alone[col].iloc[0] == batch[col].iloc[0] == other_batch[col].iloc[0]
+    assert alone['src_bytes'].iloc[0] == processor.imputation_values['src_bytes']
+    assert alone['service'].iloc[0] == processor.imputation_values['service']
+    print("✓ Imputation is deterministic across batches")
+
+
+def test_fallback_without_artifact():
+    """Without imputation_values.pkl the scaler means and first classes are used"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name != 'imputation_values.pkl':
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        loader = ModelLoader(tmp)
+    values = loader.get_imputation_values()
+    assert set(values) == set(loader.get_feature_names())
+    assert values['protocol_type'] == loader.get_label_encoders()['protocol_type'].classes_[0]
+    position = list(loader.get_scaler().feature_names_in_).index('src_bytes')
+    assert values['src_bytes'] == loader.get_scaler().mean_[position]
+    print("✓ Fallback imputation values")
+
+
+if __name__ == "__main__":
+    test_fill_is_independent_of_batch()
+    test_fallback_without_artifact()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,190 @@
+"""
+Test script for background scoring jobs
+"""
+
+import tempfile
+import time
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.result_summary import ResultSummary
+from utils.job_manager import JobManager, file_hash
+from utils.results_store import ResultsStore
+from utils.result_cache import ResultCache
+from utils.result_pager import ResultPager
+from utils.node_state import NodeStateStore
+from utils.drift_monitor import DriftMonitor
+from utils.trust_policy import materialize
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def wait_for(job, timeout=120):
+    deadline = time.time() + timeout
+    while not job.is_finished:
+        assert time.time() < deadline, f"job still {job.status}"
+        time.sleep(0.05)
+    return job
+
+
+def test_job_results_and_reattach():
+    """Chunked job output matches direct scoring; resubmits and new managers reattach"""
+    loader = ModelLoader(MODELS_DIR)
+    df = pd.read_csv(DATA_CSV, nrows=3000)
+    df.loc[5, "'duration'"] = -1  # quarantined by the range check
+    data = df.to_csv(index=False).encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore()
+        manager = JobManager(loader, results_dir=tmp, chunksize=500, results_store=store)
+        job = wait_for(manager.submit('session-a', 'sample.csv', data))
+        assert job.status == 'done', job.error
+        assert job.chunks == 6 and job.rows_read == 3000 and job.progress == 1.0
+        assert job.quarantined == 1 and job.rows_scored == 2999
+        assert len(store) == 2999 and store.batches()['quarantined'].tolist() == [1]
+
+        processor = DataProcessor(loader)
+        expected = ResultSummary()
+        processed_df, _ = processor.validate_and_prepare(pd.read_csv(DATA_CSV, nrows=3000).drop(index=5))
+        expected_df = materialize(processor.predict(processed_df, summary=expected))
+
+        output = manager.load_results(job)
+        assert output['summary'].fingerprint() == expected.fingerprint()
+        assert len(output['results_df']) == len(expected_df)
+        assert (output['results_df']['trust_score'].to_numpy() == expected_df['trust_score'].to_numpy()).all()
+        assert output['report'].total_rows == 3000 and output['report'].quarantined_rows == 1
+        assert output['report'].count('duration', 'range') == 1
+
+        # Same session and file: the finished job is returned, not rerun
+        assert manager.submit('session-a', 'renamed.csv', data) is job
+        assert manager.get('session-a', file_hash(data)) is job
+        assert manager.get('session-b', file_hash(data)) is None
+        manager.shutdown()
+
+        # A new process finds the persisted job on disk
+        restarted = JobManager(loader, results_dir=tmp)
+        reloaded = restarted.get('session-a', file_hash(data))
+        assert reloaded.status == 'done' and reloaded.rows_scored == 2999
+        assert restarted.load_results(reloaded)['summary'].fingerprint() == expected.fingerprint()
+        restarted.shutdown()
+    print("✓ Job results match direct scoring and reattach after restart")
+
+
+def test_cancel():
+    """Cancelled jobs stop between chunks, leave nothing on disk and can be resubmitted"""
+    loader = ModelLoader(MODELS_DIR)
+    data = pd.concat([pd.read_csv(DATA_CSV)] * 4).to_csv(index=False).encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore()
+        manager = JobManager(loader, results_dir=tmp, max_workers=1, chunksize=1000, results_store=store)
+        job = manager.submit('session-a', 'big.csv', data)
+        queued = manager.submit('session-a', 'other.csv', data[:len(data) // 10].rsplit(b'\n', 1)[0])
+        queued.cancel()
+        while job.chunks == 0 and not job.is_finished:
+            time.sleep(0.01)
+        manager.cancel(job)
+        wait_for(job)
+        wait_for(queued)
+        assert job.status == 'cancelled' and job.rows_read < 4 * 22_543
+        assert queued.status == 'cancelled' and queued.rows_read == 0
+        assert not os.path.exists(job.dir)
+        assert len(store) == 0 and store.batches().empty
+
+        again = manager.submit('session-a', 'big.csv', data)
+        assert again is not job and again.status in ('queued', 'running')
+        manager.shutdown()
+        assert again.status == 'cancelled'
+    print("✓ Cancellation stops jobs between chunks")
+
+
+def test_all_rows_quarantined():
+    """A file with no valid rows finishes with an empty results frame that keeps the schema"""
+    loader = ModelLoader(MODELS_DIR)
+    df = pd.read_csv(DATA_CSV, nrows=50)
+    df["'duration'"] = -1
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = JobManager(loader, results_dir=tmp, chunksize=20, explain=True)
+        job = wait_for(manager.submit('session-a', 'invalid.csv', df.to_csv(index=False).encode()))
+        assert job.status == 'done', job.error
+        assert job.rows_scored == 0 and job.quarantined == 50
+        output = manager.load_results(job)
+        results_df = output['results_df']
+        assert len(results_df) == 0 and output['summary'].total == 0
+        assert output['report'].quarantined_rows == 50
+        expected = DataProcessor(loader).empty_results(explain=True)
+        assert list(results_df.columns) == list(expected.columns)
+        assert (results_df.dtypes == expected.dtypes).all()
+        pager = ResultPager(results_df)
+        assert pager.filter_index('action') == {} and len(pager.page(0)[0]) == 0
+        manager.shutdown()
+    print("✓ All-quarantined files keep the results schema")
+
+
+def test_forced_rescore_counts_once():
+    """A forced resubmit gets its own directory, and the replaced job leaves no node or drift updates"""
+    loader = ModelLoader(MODELS_DIR)
+    data = open(DATA_CSV, 'rb').read()
+    node_state = NodeStateStore(max_nodes=50_000)
+    drift_monitor = DriftMonitor.from_model_loader(loader)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore()
+        manager = JobManager(loader, results_dir=tmp, chunksize=1000, node_state=node_state,
+                             drift_monitor=drift_monitor, results_store=store)
+        first = manager.submit('session-a', 'data.csv', data)
+        while first.chunks == 0 and not first.is_finished:
+            time.sleep(0.01)
+        assert not first.is_finished
+        second = manager.submit('session-a', 'data.csv', data, force=True)
+        assert second is not first and second.dir != first.dir
+        wait_for(first)
+        wait_for(second)
+        assert first.status == 'cancelled' and second.status == 'done', second.error
+        assert os.path.isdir(second.dir) and len(manager.load_results(second)['results_df']) == second.rows_scored
+
+        assert len(node_state) == second.rows_scored
+        assert node_state.snapshot()['evidence'].max() <= 1.0
+        assert drift_monitor.rows_seen == second.rows_scored
+        assert len(store) == second.rows_scored
+        manager.shutdown()
+    print("✓ Forced rescore counts every row once")
+
+
+def test_publish_failure():
+    """A job whose results cannot be saved fails instead of staying 'running'"""
+    loader = ModelLoader(MODELS_DIR)
+    data = pd.read_csv(DATA_CSV, nrows=200).to_csv(index=False).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, 'cache'))
+
+        def full_disk(key, path):
+            raise OSError("No space left on device")
+
+        cache.put = full_disk
+        store = ResultsStore()
+        node_state = NodeStateStore(max_nodes=1000)
+        manager = JobManager(loader, results_dir=os.path.join(tmp, 'jobs'), results_store=store,
+                             node_state=node_state, result_cache=cache)
+        job = wait_for(manager.submit('session-a', 'sample.csv', data))
+        assert job.status == 'failed' and 'No space left' in job.error
+        assert not os.path.exists(job.dir) and len(cache) == 0
+        assert len(store) == 0 and store.batches().empty and len(node_state) == 0
+        manager.shutdown()
+    print("✓ Failing to save results fails the job")
+
+
+if __name__ == "__main__":
+    test_job_results_and_reattach()
+    test_cancel()
+    test_all_rows_quarantined()
+    test_forced_rescore_counts_once()
+    test_publish_failure()
+    print("\n✅ All tests passed!")
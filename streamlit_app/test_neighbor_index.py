@@ -0,0 +1,101 @@
+"""
+Test script for nearest training record lookups
+"""
+
+import contextlib
+import io
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.neighbor_index import NeighborIndex
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(MODELS_DIR))
+
+
+def brute_force(X, Q, k):
+    dist = np.sqrt(((Q[:, None, :] - X[None, :, :].astype(np.float64)) ** 2).sum(axis=2))
+    order = np.argsort(dist, axis=1, kind='stable')[:, :k]
+    return np.take_along_axis(dist, order, axis=1), order
+
+
+def test_query_is_exact():
+    """Distances match a float64 brute-force search, including near-duplicate rows"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(6000, 12))
+    X[3000:3100] = X[:100] + 1e-4 * rng.normal(size=(100, 12))
+    labels = np.where(rng.random(6000) < 0.5, 'Normal', 'Anomaly')
+    index = NeighborIndex.build(X, labels)
+    Q = np.vstack([X[:50], rng.normal(size=(50, 12)) * 3])
+    for k in (1, 5, 20):
+        distances, indices = index.query(Q, k)
+        expected, _ = brute_force(index.X, Q, k)
+        assert distances.shape == (100, k)
+        assert np.allclose(distances, expected, atol=1e-9)
+        assert np.all(np.diff(distances, axis=1) >= 0)
+    # Every training row finds itself first
+    assert np.array_equal(index.row_ids[indices[:50, 0]], np.arange(50))
+    print("✓ Exact k-nearest neighbors")
+
+
+def test_save_load_and_neighbors_frame():
+    """save/load round trip; neighbors() reports source rows and labels"""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(500, 4))
+    labels = np.where(X[:, 0] > 0, 'Anomaly', 'Normal')
+    index = NeighborIndex.build(X, labels, row_ids=np.arange(500) + 1000, feature_names=list('abcd'))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'index.npz')
+        index.save(path)
+        loaded = NeighborIndex.load(path)
+    assert loaded.feature_names == list('abcd') and len(loaded) == 500
+    assert np.array_equal(loaded.row_ids, index.row_ids) and np.array_equal(loaded.X, index.X)
+
+    frame = loaded.neighbors(X[:3], k=4)
+    assert list(frame.columns) == ['query', 'rank', 'train_row', 'distance', 'class']
+    assert len(frame) == 12 and list(frame['train_row'][::4]) == [1000, 1001, 1002]
+    assert list(frame['class'][::4]) == list(labels[:3])
+    print("✓ Save/load round trip and neighbors frame")
+
+
+def test_predict_adds_similar_records_for_blocked_rows():
+    """Only BLOCK rows get similar training records"""
+    processor = load_processor()
+    df = pd.read_csv(DATA_CSV).sample(400, random_state=0)
+    processed_df, _ = processor.validate_and_prepare(df)
+    X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+    processor.neighbor_index = NeighborIndex.build(X_scaled, processed_df['true_class'],
+                                                   row_ids=processed_df.index.to_numpy(),
+                                                   feature_names=processor.feature_names)
+
+    assert 'similar_records' not in processor.predict(processed_df).columns
+    results = processor.predict(processed_df, neighbors=3)
+    blocked = results['action'] == 'BLOCK'
+    assert blocked.any() and (results.loc[~blocked, 'similar_records'] == '').all()
+    assert results.loc[~blocked, 'similar_anomaly_share'].isna().all()
+    # Training rows are their own nearest record
+    first = results.loc[blocked, 'similar_records'].str.split(', ').str[0].astype(int)
+    assert np.array_equal(first.to_numpy(), processed_df.index[blocked.to_numpy()])
+    assert results.loc[blocked, 'similar_anomaly_share'].between(0, 1).all()
+    print(f"✓ Similar records for {blocked.sum()} blocked rows")
+
+
+if __name__ == "__main__":
+    test_query_is_exact()
+    test_save_load_and_neighbors_frame()
+    test_predict_adds_similar_records_for_blocked_rows()
+    print("\n✅ All tests passed!")
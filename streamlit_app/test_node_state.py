@@ -0,0 +1,89 @@
+"""
+Test script for the rolling per-node trust store
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.node_state import NodeStateStore
+
+
+def test_decayed_trust():
+    """Scores decay toward recent evidence"""
+    store = NodeStateStore(max_nodes=100, half_life=10.0, idle_timeout=100.0)
+    store.update([1, 2], [90.0, 10.0], ['ALLOW', 'BLOCK'], timestamps=0.0)
+    store.update([1], [30.0], ['BLOCK'], timestamps=10.0)
+
+    state = store.get([1, 2, 3], now=10.0).set_index('node_id')
+    # Old score weighted 0.5, new score weighted 1.0
+    assert abs(state.loc[1, 'trust_score'] - (90 * 0.5 + 30) / 1.5) < 0.01
+    assert abs(state.loc[1, 'allow_count'] - 0.5) < 1e-4
+    assert abs(state.loc[1, 'block_count'] - 1.0) < 1e-4
+    assert state.loc[2, 'trust_score'] == 10.0
+    assert np.isnan(state.loc[3, 'trust_score'])
+    print("✓ Decayed trust scores correct")
+
+
+def test_duplicate_ids_in_batch():
+    """Repeated ids in one batch aggregate into one node"""
+    store = NodeStateStore(max_nodes=100)
+    store.update(['a', 'a', 'b'], [20.0, 40.0, 70.0], ['BLOCK', 'MONITOR', 'ALLOW'], timestamps=5.0)
+
+    assert len(store) == 2
+    state = store.get(['a'], now=5.0).iloc[0]
+    assert abs(state['trust_score'] - 30.0) < 0.01
+    assert abs(state['evidence'] - 2.0) < 1e-4
+    print("✓ Duplicate ids aggregated")
+
+
+def test_expiry_and_eviction():
+    """Idle nodes expire and the store never exceeds its capacity"""
+    store = NodeStateStore(max_nodes=1000, idle_timeout=50.0)
+    store.update(np.arange(500), np.full(500, 50.0), np.zeros(500, dtype=int), timestamps=0.0)
+    store.update(np.arange(500, 600), np.full(100, 50.0), np.zeros(100, dtype=int), timestamps=100.0)
+
+    assert store.expire(now=120.0) == 500
+    assert len(store) == 100
+    assert store.get([550], now=120.0)['evidence'].iloc[0] > 0
+
+    # Overfill: least recently seen nodes are evicted
+    for t in range(10):
+        ids = np.arange(1000 + t * 300, 1000 + (t + 1) * 300)
+        store.update(ids, np.full(300, 50.0), np.ones(300, dtype=int), timestamps=200.0 + t)
+        assert len(store) <= store.max_nodes
+    assert not np.isnan(store.get([3999], now=210.0)['trust_score'].iloc[0])
+    print(f"✓ Store bounded at {len(store)} nodes ({store.memory_bytes / 1024:.0f} KB)")
+
+
+def test_eviction_spares_batch():
+    """Nodes in the batch being folded in are never evicted to make room for it"""
+    store = NodeStateStore(max_nodes=100, half_life=1e9, idle_timeout=1e9)
+    store.update([0], [10.0], ['BLOCK'], timestamps=0.0)
+    store.update(np.arange(1, 100), np.full(99, 90.0), ['ALLOW'] * 99, timestamps=10.0)
+    # Node 0 is the least recently seen, but it is in the batch that overflows the store
+    store.update(np.r_[0, 100:110], np.full(11, 50.0), ['MONITOR'] * 11, timestamps=20.0)
+    assert len(store) <= 100
+    node = store.get([0], now=20.0).iloc[0]
+    assert node['evidence'] > 1.99 and node['trust_score'] == 30.0
+    print("✓ Eviction spares the current batch")
+
+
+def test_memory_budget():
+    """Memory budget caps the state arrays"""
+    store = NodeStateStore(memory_budget_mb=8)
+    assert store.memory_bytes <= 8 * 1024 * 1024
+    assert store.max_nodes >= 50_000
+    print(f"✓ 8 MB budget holds {store.max_nodes:,} nodes")
+
+
+if __name__ == "__main__":
+    test_decayed_trust()
+    test_duplicate_ids_in_batch()
+    test_expiry_and_eviction()
+    test_eviction_spares_batch()
+    test_memory_budget()
+    print("\n✅ All tests passed!")
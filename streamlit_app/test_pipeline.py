@@ -0,0 +1,133 @@
+"""
+Test script for the cached, stage-based pipeline runner
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.pipeline import Pipeline, Stage
+
+
+def read_number(path):
+    with open(path) as f:
+        return int(f.read())
+
+
+def parity(n):
+    return n % 2
+
+
+def scale(n, factor):
+    return n * factor
+
+
+def combine(p, s):
+    return {'parity': p, 'scaled': s}
+
+
+def describe(p):
+    return 'odd' if p else 'even'
+
+
+def slow(seconds, tag):
+    time.sleep(seconds)
+    return tag
+
+
+def fail():
+    raise ValueError("bad input")
+
+
+def statuses(pipeline):
+    return dict(zip(pipeline.report['stage'], pipeline.report['status']))
+
+
+def build(path, cache, factor=10):
+    return Pipeline([
+        Stage('number', read_number, params={'path': path}, files=[path]),
+        Stage('parity', parity, ['number']),
+        Stage('scaled', scale, ['number'], params={'factor': factor}),
+        Stage('both', combine, ['parity', 'scaled']),
+        Stage('label', describe, ['parity']),
+    ], cache)
+
+
+def test_only_changed_stages_run():
+    """Cached outputs are reused; a change re-runs its stage and only what its output changed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache = os.path.join(tmp, 'n.txt'), os.path.join(tmp, 'cache')
+        with open(path, 'w') as f:
+            f.write('3')
+        pipeline = build(path, cache)
+        assert pipeline.run(max_workers=0) == {'both': {'parity': 1, 'scaled': 30}, 'label': 'odd'}
+        assert set(statuses(pipeline).values()) == {'ran'}
+
+        assert build(path, cache).run(max_workers=0)['both'] == {'parity': 1, 'scaled': 30}
+        again = build(path, cache)
+        again.run(max_workers=0)
+        assert set(statuses(again).values()) == {'cached'}
+
+        # New contents, same parity: 'parity' re-runs but its unchanged output stops there
+        with open(path, 'w') as f:
+            f.write('5')
+        changed = build(path, cache)
+        assert changed.run(max_workers=0)['both'] == {'parity': 1, 'scaled': 50}
+        assert statuses(changed) == {'number': 'ran', 'parity': 'ran', 'scaled': 'ran', 'both': 'ran',
+                                     'label': 'cached'}
+        with open(path, 'w') as f:
+            f.write('3')
+        back = build(path, cache, factor=2)
+        assert back.run(max_workers=0)['both'] == {'parity': 1, 'scaled': 6}
+        assert statuses(back) == {'number': 'cached', 'parity': 'cached', 'scaled': 'ran', 'both': 'ran',
+                                  'label': 'cached'}
+
+        forced = build(path, cache)
+        assert forced.run(['parity'], max_workers=0, force=['number']) == {'parity': 1}
+        assert statuses(forced) == {'number': 'ran', 'parity': 'cached'}
+    print("✓ Only changed stages run")
+
+
+def test_independent_stages_run_in_parallel():
+    """Stages without a path between them run at the same time"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = Pipeline([Stage(f'sleep{i}', slow, params={'seconds': 0.5, 'tag': i}) for i in range(3)], tmp)
+        start = time.perf_counter()
+        outputs = pipeline.run(max_workers=3)
+        elapsed = time.perf_counter() - start
+        assert outputs == {'sleep0': 0, 'sleep1': 1, 'sleep2': 2}
+        assert elapsed < 1.2, elapsed
+    print(f"✓ 3 x 0.5s stages in {elapsed:.2f}s")
+
+
+def test_failures_and_bad_graphs():
+    """A failing stage raises and caches nothing; unknown inputs and cycles are rejected"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = Pipeline([Stage('fail', fail), Stage('after', parity, ['fail'])], tmp)
+        for workers in (0, 2):
+            try:
+                pipeline.run(max_workers=workers)
+                raise AssertionError("expected RuntimeError")
+            except RuntimeError as e:
+                assert 'Stage fail failed: bad input' in str(e)
+        assert os.listdir(tmp) == []
+
+        for stages in ([Stage('a', parity, ['missing'])],
+                       [Stage('a', parity, ['b']), Stage('b', parity, ['a'])]):
+            try:
+                Pipeline(stages, tmp).run(max_workers=0)
+                raise AssertionError("expected ValueError")
+            except ValueError:
+                pass
+    print("✓ Failures and bad graphs")
+
+
+if __name__ == "__main__":
+    test_only_changed_stages_run()
+    test_independent_stages_run_in_parallel()
+    test_failures_and_bad_graphs()
+    print("\n✅ All tests passed!")
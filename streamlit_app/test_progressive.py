@@ -0,0 +1,107 @@
+"""
+Test script for progressive (sample first, then exact) scoring estimates
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.csv_reader import SchemaCSVReader
+from utils.job_manager import JobManager
+from utils.progressive import ProgressiveEstimator, sample_lines
+from utils.result_summary import ResultSummary
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_loader():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ModelLoader(MODELS_DIR)
+
+
+def test_sample_lines():
+    """Every row range is sampled in proportion; blank lines and CRLF are not rows"""
+    rows = [f'{i},{i % 7}' for i in range(1000)]
+    data = ('a,b\r\n' + '\r\n'.join(rows[:500]) + '\r\n\r\n' + '\n'.join(rows[500:]) + '\n').encode()
+    sample, stratum, stratum_rows = sample_lines(data, rows=100, strata=10, seed=1)
+    df = pd.read_csv(io.BytesIO(sample))
+    assert list(df.columns) == ['a', 'b'] and len(df) == 100
+    assert stratum_rows.sum() == 1000 and np.bincount(stratum).tolist() == [10] * 10
+    assert ((df['a'].to_numpy() // 100) == stratum).all() and df['a'].is_unique
+
+    sample, stratum, stratum_rows = sample_lines(b'a,b\n1,2\n3,4', rows=100)
+    assert pd.read_csv(io.BytesIO(sample))['a'].tolist() == [1, 3] and stratum_rows.sum() == 2
+    print("✓ Stratified line sample")
+
+
+def test_estimates_converge():
+    """Sample intervals cover the exact counts and close on them as chunks are scored"""
+    loader = load_loader()
+    processor = DataProcessor(loader)
+    reader = SchemaCSVReader.from_model_loader(loader)
+    data = open(DATA_CSV, 'rb').read()
+
+    start = time.perf_counter()
+    sample, stratum, stratum_rows = sample_lines(data)
+    estimator = ProgressiveEstimator(stratum_rows)
+    processed_df, _ = processor.validate_and_prepare(reader.read(io.BytesIO(sample)))
+    estimator.fit(stratum, processor.predict(processed_df), processed_df.index)
+    first = estimator.estimate().set_index(['dim', 'category'])
+    seconds = time.perf_counter() - start
+
+    summary, done, widths = ResultSummary(), 0, []
+    for chunk in reader.iter_chunks(io.BytesIO(data), 5000):
+        done += len(chunk)
+        processor.predict(processor.validate_and_prepare(chunk)[0], summary=summary)
+        current = estimator.estimate(summary, done).set_index(['dim', 'category'])
+        widths.append((current['high'] - current['low']).sum())
+    assert estimator.is_exact(done) and widths[-1] == 0
+    assert all(a >= b for a, b in zip(widths, widths[1:]))
+
+    final = current
+    for action in ('ALLOW', 'MONITOR', 'BLOCK'):
+        exact = summary.count('action', action)
+        assert final.loc[('action', action), 'estimate'] == exact
+        assert first.loc[('action', action), 'low'] <= exact <= first.loc[('action', action), 'high']
+    assert abs(final.loc[('trust_score', 'mean'), 'estimate'] - summary.mean('trust_score')) < 1e-9
+    assert first.loc[('trust_score', 'mean'), 'low'] <= summary.mean('trust_score') <= \
+        first.loc[('trust_score', 'mean'), 'high']
+    print(f"✓ Estimates cover and converge to the exact counts (sample scored in {seconds:.2f}s)")
+
+
+def test_progressive_job():
+    """A progressive job publishes an estimate first and the exact counts last"""
+    loader = load_loader()
+    data = pd.read_csv(DATA_CSV, nrows=6000).to_csv(index=False).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = JobManager(loader, results_dir=tmp, chunksize=1000, progressive=True)
+        job = manager.submit('session-a', 'sample.csv', data)
+        while not job.is_finished:
+            time.sleep(0.05)
+        assert job.status == 'done', job.error
+        assert job.estimate_seconds is not None
+        summary = manager.load_results(job)['summary']
+        estimate = job.estimate.set_index(['dim', 'category'])
+        assert estimate.loc[('rows', 'scored'), 'estimate'] == summary.total == 6000
+        assert estimate.loc[('action', 'BLOCK'), 'high'] == summary.count('action', 'BLOCK')
+        manager.shutdown()
+    print("✓ Progressive job estimates")
+
+
+if __name__ == "__main__":
+    test_sample_lines()
+    test_estimates_converge()
+    test_progressive_job()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,104 @@
+"""
+Test script for the int8 / float16 quantized model
+"""
+
+import contextlib
+import io
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.quantized_model import (CODEBOOK_SIZE, QuantizedSVC, dequantize, export_quantized, quantize,
+                                   quantized_bundle_file)
+from utils.scoring_bundle import BUNDLE_FILE
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(MODELS_DIR, **kwargs))
+
+
+def test_codebooks():
+    """Columns with few distinct values round-trip exactly; wide ones stay close"""
+    rng = np.random.default_rng(0)
+    values = np.column_stack([
+        rng.integers(0, 3, 2000) * 0.37,     # 3 levels
+        rng.integers(0, 101, 2000) / 100,    # 101 levels
+        rng.lognormal(0, 3, 2000),           # heavy-tailed, ~2000 levels
+    ])
+    codes, codebooks = quantize(values, 'int8')
+    assert codes.dtype == np.uint8 and codebooks.shape == (3, CODEBOOK_SIZE)
+    restored = dequantize(codes, codebooks)
+    assert np.allclose(restored[:, :2], values[:, :2], rtol=1e-7)
+    # Levels follow the data, so small values keep their precision next to outliers
+    small = values[:, 2] < 1
+    assert np.abs(restored[small, 2] - values[small, 2]).max() < 0.1
+    assert np.abs(restored[:, 2] - values[:, 2]).max() < 1e-3 * values[:, 2].max()
+
+    vector_codes, vector_books = quantize(values[:, 1], 'int8')
+    assert vector_codes.shape == (2000,) and np.allclose(dequantize(vector_codes, vector_books), values[:, 1])
+    half, none = quantize(values, 'float16')
+    assert half.dtype == np.float16 and none is None
+    print("✓ int8 codebooks and float16")
+
+
+def test_quantized_model_agrees_with_full_model():
+    """Both quantizations reproduce the full model's decisions on data.csv"""
+    processor = load_processor()
+    df = pd.read_csv(DATA_CSV).sample(4000, random_state=0)
+    processed_df, _ = processor.validate_and_prepare(df)
+    X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+    full = processor.model.decision_function(X_scaled)
+    trust = lambda d: np.clip(processor.trust_scaler.transform(d.reshape(-1, 1)).ravel(), 0, 100)
+    for quantization in ('int8', 'float16'):
+        model = QuantizedSVC.from_model(processor.model, quantization)
+        decision = model.decision_function(X_scaled)
+        assert np.abs(trust(decision) - trust(full)).max() < 1.0
+        agreement = (processor.action_codes(trust(decision)) == processor.action_codes(trust(full))).mean()
+        assert agreement > 0.995
+        assert model.nbytes < processor.model.support_vectors_.nbytes
+        print(f"✓ {quantization}: {agreement:.2%} action agreement, {model.nbytes / 1024:.0f} KB")
+
+
+def test_loader_uses_quantized_bundle():
+    """ModelLoader(quantization=...) scores from the quantized file and falls back without it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith('.pkl') or name == BUNDLE_FILE:
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fallback = ModelLoader(tmp, quantization='int8')
+        assert not isinstance(fallback.model, QuantizedSVC) and fallback.quantization is None
+
+        export_quantized(os.path.join(tmp, BUNDLE_FILE), os.path.join(tmp, quantized_bundle_file('int8')))
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader = ModelLoader(tmp, quantization='int8')
+        assert isinstance(loader.model, QuantizedSVC) and loader.model.quantization == 'int8'
+
+        processor = DataProcessor(loader)
+        full = load_processor()
+        df = pd.read_csv(DATA_CSV).head(500)
+        results = processor.predict(processor.validate_and_prepare(df)[0])
+        expected = full.predict(full.validate_and_prepare(df)[0])
+        assert (results['action'] == expected['action']).mean() > 0.99
+        assert (results['trust_score'] - expected['trust_score']).abs().max() < 1.0
+    print("✓ Quantized bundle loads through ModelLoader")
+
+
+if __name__ == "__main__":
+    test_codebooks()
+    test_quantized_model_agrees_with_full_model()
+    test_loader_uses_quantized_bundle()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,100 @@
+"""
+Test script for the model registry and shadow scoring
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import os
+from sklearn.preprocessing import MinMaxScaler
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader, DEFAULT_MODEL_NAME
+from utils.data_processor import DataProcessor
+from utils.shadow_monitor import ShadowMonitor
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data.csv')
+
+
+def test_shadow_scoring():
+    """Shadows are scored on the same rows without changing the primary's results"""
+    loader = ModelLoader(MODELS_DIR)
+    processor = DataProcessor(loader)
+    processed_df, _ = processor.validate_and_prepare(pd.read_csv(DATA_CSV, nrows=300))
+    baseline = processor.predict(processed_df)
+
+    # Same SVM, but a trust scaler that shifts every score up by 20
+    trust_scaler = loader.get_trust_scaler()
+    shifted = MinMaxScaler((20, 120)).fit([trust_scaler.data_min_, trust_scaler.data_max_])
+    loader.register_model('svm_copy', loader.get_model())
+    loader.register_model('svm_shifted', loader.get_model(), shifted)
+    assert loader.get_shadow_names() == ['svm_copy', 'svm_shifted']
+
+    results = processor.predict(processed_df)
+    assert results.equals(baseline)
+
+    report = processor.shadow_monitor.report()
+    assert report.loc['svm_copy', 'action_disagreements'] == 0
+    assert report.loc['svm_shifted', 'prediction_disagreements'] == 0
+    assert report.loc['svm_shifted', 'action_disagreements'] > 0
+    assert report.loc[DEFAULT_MODEL_NAME, 'rows'] == 600 and report.loc['svm_copy', 'rows'] == 300
+    matrix = processor.shadow_monitor.action_matrix('svm_shifted')
+    assert matrix.to_numpy().sum() == 300 and matrix.iloc[0, 1:].sum() == 0
+    print("✓ Shadows scored, primary results unchanged")
+
+
+def test_set_primary():
+    """Switching the primary demotes the previous one to a shadow"""
+    loader = ModelLoader(MODELS_DIR)
+    loader.register_model('candidate', loader.get_model())
+    loader.set_primary('candidate')
+    assert loader.primary_name == 'candidate'
+    assert loader.get_shadow_names() == [DEFAULT_MODEL_NAME]
+    try:
+        loader.unregister_model('candidate')
+        assert False, "primary must not be removable"
+    except ValueError:
+        pass
+    print("✓ Primary switched")
+
+
+def test_default_trust_scaler():
+    """Versions registered without a trust scaler get the base SVM's, whatever the primary"""
+    loader = ModelLoader(MODELS_DIR)
+    base = loader.get_trust_scaler()
+    own = MinMaxScaler((0, 100)).fit([[0.0], [1.0]])
+    loader.register_model('forest', loader.get_model(), own, role='primary')
+    assert loader.trust_scaler is own and loader.base_trust_scaler is base
+    loader.register_model('later', loader.get_model())
+    assert loader.get_trust_scaler('later') is base
+    print("✓ Default trust scaler is the base SVM's")
+
+
+def test_monitor_counts():
+    """Disagreements and the action matrix are counted per batch"""
+    monitor = ShadowMonitor(max_samples=2)
+    primary = {'prediction_codes': np.array([1] * 4), 'action_codes': np.array([0, 1, 2, 2]),
+               'trust_scores': np.array([80.0, 50.0, 10.0, 20.0])}
+    shadow = {'prediction_codes': np.array([1, 1, 0, 1]),
+              'action_codes': np.array([0, 2, 2, 1]), 'trust_scores': np.array([80.0, 30.0, 10.0, 40.0])}
+    monitor.record_latency('primary', 4, 0.01)
+    monitor.record_latency('shadow', 4, 0.02)
+    monitor.record('shadow', primary, shadow, node_ids=np.array([10, 11, 12, 13]))
+    report = monitor.report()
+    assert report.loc['shadow', 'action_disagreements'] == 2
+    assert report.loc['shadow', 'prediction_disagreements'] == 1
+    assert report.loc['shadow', 'mean_abs_trust_delta'] == 10.0
+    assert monitor.samples('shadow')['node_id'].tolist() == [12, 13]
+    assert monitor.action_matrix('shadow').to_numpy().trace() == 2
+    print("✓ Monitor counts")
+
+
+if __name__ == "__main__":
+    test_shadow_scoring()
+    test_set_primary()
+    test_default_trust_scaler()
+    test_monitor_counts()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,151 @@
+"""
+Test script for the content-addressed result cache
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import pandas as pd
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.bakeoff import export_model
+from utils.job_manager import JobManager, file_hash
+from utils.result_cache import ResultCache
+from utils.results_store import ResultsStore
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def wait_for(job, timeout=120):
+    deadline = time.time() + timeout
+    while not job.is_finished:
+        assert time.time() < deadline, f"job still {job.status}"
+        time.sleep(0.05)
+    return job
+
+
+def make_entry(root, name, size):
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    with open(os.path.join(path, 'results.bin'), 'wb') as f:
+        f.write(b'x' * size)
+    return path
+
+
+def test_eviction():
+    """Both tiers drop their least recently used entries once over budget"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, 'cache'), max_disk_bytes=2500, max_memory_bytes=2000)
+        loads = []
+
+        def loader(path):
+            loads.append(os.path.basename(path))
+            return {'results_df': pd.DataFrame({'x': range(100)})}  # 928 bytes
+
+        for i, name in enumerate(['a', 'b']):
+            cache.put(name, make_entry(tmp, name, 1000))
+            os.utime(cache.path(name), (i, i))
+        cache.load('a', loader)
+        cache.load('b', loader)
+        assert cache.load('a', loader)['results_df'] is cache.load('a', loader)['results_df']
+        assert loads == ['a', 'b'] and cache.stats()['hits'] == 2
+
+        # 'b' was used least recently: the third entry evicts it from disk
+        os.utime(cache.path('b'), (0, 0))
+        cache.put('c', make_entry(tmp, 'c', 1000))
+        assert 'b' not in cache and 'a' in cache and 'c' in cache
+        assert cache.stats()['memory_entries'] == 1
+
+        # Memory holds two frames; a third load pushes out the oldest
+        cache.load('c', loader)
+        cache.load('a', loader)
+        assert cache.stats()['memory_entries'] == 2
+        cache.put('c', make_entry(tmp, 'c2', 10))
+        assert not os.path.exists(os.path.join(tmp, 'c2'))
+    print("✓ LRU eviction on disk and in memory")
+
+
+def test_jobs_share_cached_results():
+    """A file scored once is served to other sessions and managers without scoring"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = ModelLoader(MODELS_DIR)
+    data = pd.read_csv(DATA_CSV, nrows=2000).to_csv(index=False).encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, 'cache'))
+        store = ResultsStore()
+        manager = JobManager(loader, results_dir=os.path.join(tmp, 'jobs'), chunksize=500,
+                             results_store=store, result_cache=cache)
+        job = wait_for(manager.submit('session-a', 'sample.csv', data))
+        assert job.status == 'done', job.error
+        assert job.dir == cache.path(cache.key(file_hash(data), manager.fingerprint))
+        first = manager.load_results(job)
+
+        # Another session, then a fresh manager (server restart): no new job, no new decisions
+        other = manager.submit('session-b', 'copy.csv', data)
+        assert other.status == 'done' and other.id == job.id and other.session_id == 'session-b'
+        restarted = JobManager(loader, results_dir=os.path.join(tmp, 'jobs'), results_store=store,
+                               result_cache=cache)
+        again = restarted.get('session-c', file_hash(data))
+        assert again is not None and again.status == 'done'
+        assert len(store) == 2000 and len(store.batches()) == 1
+        start = time.perf_counter()
+        output = restarted.load_results(again)
+        pd.testing.assert_frame_equal(output['results_df'], first['results_df'])
+        assert output['summary'].fingerprint() == first['summary'].fingerprint()
+        assert manager.load_results(other)['results_df'] is first['results_df']
+        reload_ms = (time.perf_counter() - start) * 1000
+
+        # Different output columns are a different entry
+        explaining = JobManager(loader, results_dir=os.path.join(tmp, 'jobs'), result_cache=cache, explain=True)
+        assert explaining.fingerprint != manager.fingerprint
+        assert explaining.get('session-a', file_hash(data)) is None
+
+        # An evicted entry is scored again on the next submit
+        cache.discard(cache.key(file_hash(data), manager.fingerprint))
+        assert manager.get('session-a', file_hash(data)) is None
+        rescored = wait_for(manager.submit('session-a', 'sample.csv', data))
+        assert rescored.id != job.id and rescored.status == 'done' and len(cache) == 1
+        manager.shutdown()
+    print(f"✓ Jobs share cached results across sessions and restarts (reload {reload_ms:.1f} ms)")
+
+
+def test_fingerprint_tracks_registered_files():
+    """Overwriting a registered version's pickle in place changes the fingerprint"""
+    from sklearn.tree import DecisionTreeClassifier
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith(('.pkl', '.npz')):
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader = ModelLoader(tmp)
+        X = loader.scaler.mean_.reshape(1, -1).repeat(4, axis=0)
+        X[:2] += 1
+        tree = DecisionTreeClassifier(random_state=0).fit(X, [0, 0, 1, 1])
+        export_model('tree', tree, loader.trust_scaler, tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            before = ModelLoader(tmp).fingerprint()
+            assert ModelLoader(tmp).fingerprint() == before
+
+        # Retrained and written to the same path: same name, type and source
+        export_model('tree', DecisionTreeClassifier(random_state=0).fit(X, [1, 1, 0, 0]), loader.trust_scaler, tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert ModelLoader(tmp).fingerprint() != before
+    print("✓ Fingerprint follows registered model files")
+
+
+if __name__ == "__main__":
+    test_eviction()
+    test_jobs_share_cached_results()
+    test_fingerprint_tracks_registered_files()
+    print("\n✅ All tests passed!")
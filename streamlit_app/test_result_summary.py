@@ -0,0 +1,113 @@
+"""
+Test script for the single-pass result summary and the results pager
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.result_summary import DIMENSIONS, ResultSummary
+from utils.result_pager import ResultPager
+from utils.trust_policy import TrustPolicy
+
+
+def make_results(n, seed=0):
+    """Synthetic results frame shaped like DataProcessor.predict output"""
+    rng = np.random.default_rng(seed)
+    trust = rng.uniform(0, 100, n).round(2)
+    return pd.DataFrame({
+        'prediction': np.where(rng.random(n) < 0.4, 'Anomaly', 'Normal'),
+        'trust_score': trust,
+        'trust_level': np.select([trust >= 66, trust >= 33], ['High', 'Medium'], 'Low'),
+        'action': np.select([trust >= 66, trust >= 33], ['ALLOW', 'MONITOR'], 'BLOCK'),
+        'confidence': rng.uniform(0.5, 1.0, n).round(4),
+    })
+
+
+def test_summary_matches_pandas():
+    """Chunked summary agrees with filtering the full frame"""
+    results_df = make_results(20000)
+    summary = ResultSummary()
+    for start in range(0, len(results_df), 3000):
+        summary.update(results_df.iloc[start:start + 3000])
+
+    assert summary.total == len(results_df)
+    for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+        assert summary.count('action', action) == (results_df['action'] == action).sum()
+    assert abs(summary.mean('trust_score') - results_df['trust_score'].mean()) < 1e-9
+    assert abs(summary.std('confidence') - results_df['confidence'].std()) < 1e-9
+
+    expected = results_df[['trust_score', 'confidence']].describe()
+    actual = summary.describe()
+    # Quantiles are sketch estimates: within one bin width
+    assert (abs(actual['trust_score'] - expected['trust_score']) <= 0.1 + 1e-9).all()
+    assert (abs(actual['confidence'] - expected['confidence']) <= 0.001 + 1e-9).all()
+
+    normal = results_df[results_df['prediction'] == 'Normal']['trust_score']
+    median = summary.group_stats('prediction').loc['Normal', '50%']
+    assert abs(median - normal.median()) <= 0.1
+
+    # Every row lands in a histogram bin, including scores of 99-100
+    hist = summary.histogram('trust_score')
+    assert hist['counts'].sum() == len(results_df) and len(hist['edges']) == 26
+    expected_counts, _ = np.histogram(results_df['trust_score'], bins=25, range=(0, 100))
+    assert np.abs(hist['counts'] - expected_counts).sum() <= 2 * 25
+    try:
+        summary.histogram('trust_score', bins=30)
+        assert False, "bins that do not divide SKETCH_BINS accepted"
+    except ValueError:
+        pass
+    print("✓ Summary matches pandas")
+
+
+def test_merge():
+    """Merging per-file summaries equals one summary over both"""
+    a, b = make_results(500, seed=1), make_results(700, seed=2)
+    merged = ResultSummary()
+    merged.update(a)
+    other = ResultSummary()
+    other.update(b)
+    merged.merge(other)
+
+    combined = ResultSummary()
+    combined.update(pd.concat([a, b]))
+    assert merged.fingerprint() == combined.fingerprint()
+    print("✓ Summaries merge")
+
+
+def test_dimensions_follow_codes():
+    """Summary categories are the coded results columns' categories, in code order"""
+    categories = TrustPolicy().categories()
+    assert all(DIMENSIONS[dim] == categories[dim] for dim in DIMENSIONS)
+    print("✓ Summary dimensions follow the result codes")
+
+
+def test_pager():
+    """Pages follow the sort order and filters"""
+    results_df = make_results(1000)
+    pager = ResultPager(results_df)
+
+    page, total = pager.page(0, 50, sort_by='trust_score', ascending=False,
+                             filters={'action': ['MONITOR']})
+    expected = results_df[results_df['action'] == 'MONITOR'].sort_values(
+        'trust_score', ascending=False, kind='stable')
+    assert total == len(expected)
+    assert page['trust_score'].tolist() == expected['trust_score'].head(50).tolist()
+
+    page, total = pager.page(3, 100)
+    assert total == 1000 and page.index.tolist() == list(range(300, 400))
+    assert pager.num_pages(100, filters={'action': ['BLOCK', 'ALLOW']}) == \
+        -(-(results_df['action'] != 'MONITOR').sum() // 100)
+    print("✓ Pager sorts, filters and pages")
+
+
+if __name__ == "__main__":
+    test_summary_matches_pandas()
+    test_merge()
+    test_dimensions_follow_codes()
+    test_pager()
+    print("\n✅ All tests passed!")
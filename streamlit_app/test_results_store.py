@@ -0,0 +1,106 @@
+"""
+Test script for the SQLite results store
+"""
+
+import glob
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.batch_runner import BatchRunner
+from utils.results_store import ResultsStore
+from utils.trust_policy import materialize
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+DAY = 86400.0
+
+
+def scored_sample(rows=5000):
+    processor = DataProcessor(ModelLoader(MODELS_DIR))
+    processed_df, _ = processor.validate_and_prepare(pd.read_csv(DATA_CSV, nrows=rows))
+    return processor.predict(processed_df)
+
+
+def test_trends_match_results():
+    """Bucket aggregates agree with the stored rows at every resolution"""
+    results_df = scored_sample()
+    start = 1_700_000_000.0
+    timestamps = start + np.linspace(0, 2 * DAY, len(results_df), endpoint=False)
+    store = ResultsStore()
+    store.record(results_df, source='sample.csv', timestamps=timestamps)
+    store.record(results_df.head(100), source='late.csv', timestamps=start + 5 * DAY)
+    assert len(store) == len(results_df) + 100
+
+    for bucket in ('minute', 'hour', 'day'):
+        trend = store.trend(bucket, end=start + 3 * DAY)
+        assert trend['rows'].sum() == len(results_df)
+        for action in ('ALLOW', 'MONITOR', 'BLOCK'):
+            assert trend[action].sum() == (results_df['action'] == action).sum()
+        assert trend['anomalies'].sum() == (results_df['prediction'] == 'Anomaly').sum()
+
+    daily = store.trend('day', end=start + 3 * DAY)
+    first_day = results_df[timestamps < (start // DAY + 1) * DAY]
+    assert daily['rows'].iloc[0] == len(first_day)
+    assert np.isclose(daily['mean_trust'].iloc[0], first_day['trust_score'].mean())
+    assert np.isclose(daily['accuracy'].iloc[0], first_day['correct'].mean())
+
+    totals = store.totals()
+    assert totals['rows'] == len(results_df) + 100
+    assert np.isclose(totals['mean_trust'],
+                      pd.concat([results_df, results_df.head(100)])['trust_score'].mean())
+    print("✓ Trends match the stored results")
+
+
+def test_indexed_queries_and_delete():
+    """Decision filters use the stored codes; deleting a batch restores the buckets"""
+    results_df = scored_sample(2000)
+    store = ResultsStore()
+    first = store.record(results_df, timestamps=1_700_000_000.0)
+    before = store.trend('hour')
+    second = store.record(results_df, timestamps=1_700_000_000.0 + 60)
+
+    blocked = store.decisions(action='BLOCK', limit=100_000)
+    assert len(blocked) == 2 * (results_df['action'] == 'BLOCK').sum()
+    assert set(blocked['trust_level']) == {'Low'}
+    node_id = results_df['node_id'].iloc[7]
+    history = store.decisions(node_id=node_id)
+    assert list(history['batch_id']) == [second, first]
+    assert (history['trust_score'] == materialize(results_df)['trust_score'].iloc[7]).all()
+    assert store.decisions(trust_level='High', start=1_700_000_030.0)['batch_id'].eq(second).all()
+
+    assert store.delete_batch(second) == len(results_df)
+    pd.testing.assert_frame_equal(store.trend('hour'), before)
+    assert list(store.batches().index) == [first]
+    print("✓ Indexed queries and batch deletion")
+
+
+def test_batch_runner_appends():
+    """Batch runs store one batch per file in a database on disk"""
+    loader = ModelLoader(MODELS_DIR)
+    paths = sorted(glob.glob(os.path.join(APP_DIR, 'test', '*.csv')))[:3]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore(os.path.join(tmp, 'decisions.sqlite'))
+        results = BatchRunner(loader, max_workers=2, results_store=store).run(
+            [(os.path.basename(p), p) for p in paths])
+        batches = store.batches()
+        assert sorted(batches['source']) == sorted(r.name for r in results)
+        assert (batches['status'] == 'done').all()
+        assert len(store) == sum(r.summary.total for r in results)
+        store.close()
+    print("✓ Batch runner appends every file")
+
+
+if __name__ == "__main__":
+    test_trends_match_results()
+    test_indexed_queries_and_delete()
+    test_batch_runner_appends()
+    print("\n✅ All tests passed!")
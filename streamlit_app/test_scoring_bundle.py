@@ -0,0 +1,94 @@
+"""
+Test script for the NumPy scoring bundle and the lightweight import path
+"""
+
+import glob
+import shutil
+import subprocess
+import tempfile
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.scoring_bundle import BUNDLE_FILE, BundledLabelEncoder, BundledSVC
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def test_bundle_matches_pickles():
+    """Bundle and pickle loaders give identical results"""
+    bundled = DataProcessor(ModelLoader(MODELS_DIR))
+    pickled = DataProcessor(ModelLoader(MODELS_DIR, use_bundle=False))
+    assert isinstance(bundled.model, BundledSVC) and not isinstance(pickled.model, BundledSVC)
+    assert bundled.imputation_values == pickled.imputation_values
+    assert bundled.feature_names == pickled.feature_names
+
+    paths = [DATA_CSV] + sorted(glob.glob(os.path.join(APP_DIR, 'test', '*.csv')))[:3]
+    for path in paths:
+        df = pd.read_csv(path)
+        expected = pickled.predict(pickled.validate_and_prepare(df)[0])
+        actual = bundled.predict(bundled.validate_and_prepare(df)[0])
+        pd.testing.assert_frame_equal(actual, expected)
+    print("✓ Bundle results match the pickled model")
+
+
+def test_stale_bundle_is_ignored():
+    """A bundle built from other pickles falls back to loading the pickles"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith(('.pkl', '.npz')):
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        assert isinstance(ModelLoader(tmp).model, BundledSVC)
+        with open(os.path.join(tmp, 'feature_names.pkl'), 'ab') as f:
+            f.write(b'\0')
+        assert not isinstance(ModelLoader(tmp).model, BundledSVC)
+        # Without any pickles the bundle is used as shipped
+        for name in os.listdir(tmp):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(tmp, name))
+        assert isinstance(ModelLoader(tmp).model, BundledSVC)
+        assert os.path.exists(os.path.join(tmp, BUNDLE_FILE))
+    print("✓ Stale bundles are ignored")
+
+
+def test_label_encoder():
+    """Bundled encoder maps known classes and rejects unseen ones"""
+    encoder = BundledLabelEncoder(pd.Series(['icmp', 'tcp', 'udp']).to_numpy(dtype=object))
+    assert encoder.transform(['udp', 'icmp', 'tcp']).tolist() == [2, 0, 1]
+    for bad in (['xyz'], ['zzz'], ['a']):
+        try:
+            encoder.transform(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    print("✓ Bundled label encoder")
+
+
+def test_core_imports_stay_light():
+    """Scoring from the bundle loads no scikit-learn, joblib, Plotly or Streamlit"""
+    code = (
+        "import sys, warnings; warnings.filterwarnings('ignore'); sys.path.insert(0, %r)\n"
+        "import pandas as pd\n"
+        "from utils import DataProcessor, ModelLoader\n"
+        "p = DataProcessor(ModelLoader(%r))\n"
+        "p.predict(p.validate_and_prepare(pd.read_csv(%r, nrows=5))[0])\n"
+        "print(','.join(m for m in ('sklearn', 'joblib', 'plotly', 'streamlit') if m in sys.modules))\n"
+    ) % (APP_DIR, MODELS_DIR, DATA_CSV)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert out.stdout.splitlines()[-1] == '', out.stdout
+    print("✓ Core scoring imports stay light")
+
+
+if __name__ == "__main__":
+    test_bundle_matches_pickles()
+    test_stale_bundle_is_ignored()
+    test_label_encoder()
+    test_core_imports_stay_light()
+    print("\n✅ All tests passed!")
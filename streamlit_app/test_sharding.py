@@ -0,0 +1,140 @@
+"""
+Test script for sharded scoring over the coordinator/worker socket protocol
+"""
+
+import contextlib
+import io
+import os
+import socket
+import sys
+import tempfile
+import pandas as pd
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.csv_reader import SchemaCSVReader
+from utils.trust_policy import materialize
+from utils.sharding import PROTOCOL_VERSION, Coordinator, plan_shards, recv_message, send_message
+from shard_predict import start_local_workers
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_loader():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ModelLoader(MODELS_DIR)
+
+
+def expected_results(loader, data):
+    processor = DataProcessor(loader)
+    reader = SchemaCSVReader.from_model_loader(loader)
+    processed_df, _ = processor.validate_and_prepare(reader.read(io.BytesIO(data)))
+    return materialize(processor.predict(processed_df)).reset_index(drop=True)
+
+
+def fake_worker(address, fingerprint, version=PROTOCOL_VERSION):
+    """Say hello like a worker; returns the socket and the coordinator's reply"""
+    sock = socket.create_connection(address)
+    send_message(sock, {'type': 'hello', 'version': version, 'pid': 0, 'host': 'fake',
+                        'fingerprint': fingerprint})
+    return sock, recv_message(sock)[0]
+
+
+def test_plan_shards():
+    """Shards cover every row once, at row boundaries, with or without a final newline"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for ending in ['\n', '']:
+            path = os.path.join(tmp, 'rows.csv')
+            with open(path, 'w') as f:
+                f.write('a,b\n' + '\n'.join(f'{i},{i * 2}' for i in range(1003)) + ending)
+            shards = plan_shards([path, path], shard_rows=100)
+            assert [s.rows for s in shards] == ([100] * 10 + [3]) * 2
+            parts = [pd.read_csv(io.BytesIO(s.payload())) for s in shards]
+            assert all(list(p.columns) == ['a', 'b'] for p in parts)
+            assert pd.concat(parts)['a'].tolist() == list(range(1003)) * 2
+    print("✓ Shard planning")
+
+
+def test_local_workers_match_batch():
+    """Three worker processes produce the single-process results, in order"""
+    loader = load_loader()
+    data = pd.read_csv(DATA_CSV, nrows=9000).to_csv(index=False).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.csv')
+        with open(path, 'wb') as f:
+            f.write(data)
+        coordinator = Coordinator([path], shard_rows=1000, timeout=120)
+        procs = start_local_workers(3, coordinator.address, MODELS_DIR, chunksize=400)
+        results = pd.concat(list(coordinator.results()), ignore_index=True)
+        assert all(proc.wait(60) == 0 for proc in procs)
+
+    pd.testing.assert_frame_equal(results, expected_results(loader, data), check_dtype=False)
+    stats = coordinator.stats()
+    assert stats['rows'] == coordinator.summary.total == 9000 and stats['shards'] == 9
+    assert len(stats['workers']) == 3 and stats['workers']['shards'].sum() == 9
+    assert 0 < stats['efficiency'] <= 1
+    print(f"✓ 3 local workers match batch scoring ({stats['rows_per_sec']:,.0f} rows/s, "
+          f"efficiency {stats['efficiency']:.0%})")
+
+
+def test_lost_worker_shard_is_retried():
+    """A worker that dies mid-shard loses no rows; mismatched workers are turned away"""
+    loader = load_loader()
+    data = pd.read_csv(DATA_CSV, nrows=3000).to_csv(index=False).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.csv')
+        with open(path, 'wb') as f:
+            f.write(data)
+        coordinator = Coordinator([path], shard_rows=1000, timeout=60)
+        sock, welcome = fake_worker(coordinator.address, loader.fingerprint())
+        assert welcome['type'] == 'welcome'
+        message, payload = recv_message(sock)
+        assert message['type'] == 'shard' and len(pd.read_csv(io.BytesIO(payload))) == 1000
+        sock.close()
+
+        other, reply = fake_worker(coordinator.address, 'other-models')
+        assert reply['type'] == 'stop'
+        other.close()
+
+        procs = start_local_workers(1, coordinator.address, MODELS_DIR)
+        results = pd.concat(list(coordinator.results()), ignore_index=True)
+        assert procs[0].wait(60) == 0
+    pd.testing.assert_frame_equal(results, expected_results(loader, data), check_dtype=False)
+    stats = coordinator.stats()
+    assert stats['retries'] == 1 and stats['workers']['failures'].tolist() == [1, 0]
+    print("✓ Lost worker's shard retried")
+
+
+def test_failing_shard_stops_run():
+    """A shard every worker fails on ends the run after max_attempts"""
+    loader = load_loader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.csv')
+        with open(path, 'w') as f:
+            f.write('a,b\n1,2\n')
+        coordinator = Coordinator([path], max_attempts=2, timeout=30)
+        sock, _ = fake_worker(coordinator.address, loader.fingerprint())
+        for _ in range(2):
+            message, _ = recv_message(sock)
+            send_message(sock, {'type': 'error', 'shard': message['shard'], 'error': 'bad input'})
+        try:
+            list(coordinator.results())
+            raise AssertionError("expected RuntimeError")
+        except RuntimeError as e:
+            assert 'failed 2 times: bad input' in str(e)
+        assert recv_message(sock)[0]['type'] == 'stop'
+        sock.close()
+    print("✓ Run fails after max_attempts")
+
+
+if __name__ == "__main__":
+    test_plan_shards()
+    test_local_workers_match_batch()
+    test_lost_worker_shard_is_retried()
+    test_failing_shard_stops_run()
+    print("\n✅ All tests passed!")
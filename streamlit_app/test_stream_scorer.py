@@ -0,0 +1,132 @@
+"""
+Test script for the NDJSON pipe mode
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import pandas as pd
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.result_summary import ResultSummary
+from utils.stream_scorer import NDJSONStreamScorer
+from utils.trust_policy import materialize
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(MODELS_DIR))
+
+
+def sample_lines(n):
+    df = pd.read_csv(DATA_CSV, nrows=n)
+    df.insert(0, 'node_id', [f"node-{i}" for i in range(n)])
+    return df, df.to_json(orient='records', lines=True).encode().splitlines(keepends=True)
+
+
+def test_decisions_in_order():
+    """One decision per line, in order, matching batch scoring"""
+    processor = load_processor()
+    df, lines = sample_lines(500)
+    expected = materialize(processor.predict(processor.validate_and_prepare(df)[0]))
+
+    bad = json.loads(lines[7])
+    bad["'protocol_type'"] = 'not-a-protocol'
+    lines[7] = (json.dumps(bad) + '\n').encode()
+    source = b''.join(lines[:3] + [b'{broken\n', b'\n', b'[1, 2]\n'] + lines[3:])
+    sink = io.BytesIO()
+    summary = ResultSummary()
+    stats = NDJSONStreamScorer(processor, max_batch=64, summary=summary).run(io.BytesIO(source), sink)
+
+    out = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert len(out) == 502 and stats['records'] == 502 and stats['errors'] == 3
+    assert out[3] == {'line': 4, 'error': out[3]['error']} and out[3]['error'].startswith('invalid JSON')
+    assert out[4]['line'] == 6 and 'object' in out[4]['error']
+    assert out[9]['line'] == 11 and 'protocol_type' in out[9]['error']
+
+    decisions = pd.DataFrame([o for o in out if 'error' not in o])
+    expected = expected[expected['node_id'] != 'node-7'].reset_index(drop=True)
+    assert decisions['node_id'].tolist() == expected['node_id'].tolist()
+    assert (decisions['trust_score'] == expected['trust_score']).all()
+    assert (decisions['action'] == expected['action']).all()
+    assert summary.total == 499 and stats['batches'] >= 8
+    print(f"✓ {stats['records']} lines in {stats['batches']} batches, in order")
+
+
+def test_flushes_by_time():
+    """A slow producer gets decisions before EOF, within the delay bound"""
+    processor = load_processor()
+    _, lines = sample_lines(40)
+    read_fd, write_fd = os.pipe()
+    source, sink = os.fdopen(read_fd, 'rb'), io.BytesIO()
+    scorer = NDJSONStreamScorer(processor, max_batch=1000, max_delay=0.2)
+    thread = threading.Thread(target=scorer.run, args=(source, sink))
+    thread.start()
+    with os.fdopen(write_fd, 'wb') as producer:
+        for i in range(0, 40, 10):
+            producer.write(b''.join(lines[i:i + 10]))
+            producer.flush()
+            time.sleep(0.4)
+        # Everything written so far has been answered while the pipe is open
+        assert len(sink.getvalue().splitlines()) == 40
+    thread.join()
+    stats = scorer.stats()
+    assert stats['batches'] >= 4 and stats['max_delay'] < 0.4, stats
+    print(f"✓ Time-based flushes: {stats['batches']} batches, max delay {stats['max_delay'] * 1000:.0f} ms")
+
+
+def test_backpressure():
+    """The reader stops pulling lines once the queue is full"""
+    processor = load_processor()
+    _, lines = sample_lines(50)
+    pulled = []
+
+    class SlowSink(io.BytesIO):
+        def write(self, data):
+            time.sleep(0.2)
+            return super().write(data)
+
+    def source():
+        for line in lines:
+            pulled.append(time.perf_counter())
+            yield line
+
+    scorer = NDJSONStreamScorer(processor, max_batch=5, max_delay=0.01, queue_size=5)
+    sink = SlowSink()
+    scorer.run(source(), sink)
+    # Reading 50 lines through a 5-slot queue waits on the 0.2s writes
+    assert pulled[-1] - pulled[0] > 1.0
+    assert len(sink.getvalue().splitlines()) == 50
+    print("✓ Bounded queue applies backpressure")
+
+
+def test_cli():
+    """stream_predict.py keeps stdout to NDJSON decisions"""
+    _, lines = sample_lines(20)
+    out = subprocess.run([sys.executable, os.path.join(APP_DIR, 'stream_predict.py'), '--max-batch', '8'],
+                         input=b''.join(lines), capture_output=True, check=True)
+    decisions = [json.loads(line) for line in out.stdout.splitlines()]
+    assert [d['node_id'] for d in decisions] == [f"node-{i}" for i in range(20)]
+    assert b'Scored 20 records' in out.stderr
+    print("✓ CLI pipes NDJSON through")
+
+
+if __name__ == "__main__":
+    test_decisions_in_order()
+    test_flushes_by_time()
+    test_backpressure()
+    test_cli()
+    print("\n✅ All tests passed!")
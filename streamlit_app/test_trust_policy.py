@@ -0,0 +1,105 @@
+"""
+Test script for the trust policy table and coded prediction results
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.model_loader import ModelLoader
+from utils.data_processor import DataProcessor
+from utils.trust_policy import RECOMMENDATIONS, TRUST_POLICY_FILE, TrustPolicy, materialize
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(APP_DIR, '..', 'models')
+DATA_CSV = os.path.join(APP_DIR, '..', 'data.csv')
+
+
+def load_processor(model_dir=MODELS_DIR):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(model_dir))
+
+
+def test_default_policy():
+    """The default tiers reproduce the 33 / 66 thresholds, boundaries included"""
+    policy = TrustPolicy()
+    trust = np.array([-1.0, 0.0, 32.99, 33.0, 65.99, 66.0, 100.0])
+    codes = policy.apply(trust)
+    assert codes['action'].dtype == np.uint8
+    assert codes['action'].tolist() == np.where(trust >= 66, 0, np.where(trust >= 33, 1, 2)).tolist()
+    assert codes['trust_level'].tolist() == codes['action'].tolist()
+    assert policy.recommendations == RECOMMENDATIONS
+
+    for tiers in ([], [{'min_score': 50, 'action': 'ALLOW', 'trust_level': 'High', 'recommendation': 'x'},
+                       {'min_score': 50, 'action': 'BLOCK', 'trust_level': 'Low', 'recommendation': 'y'}],
+                  [{'min_score': 0, 'action': 'DENY', 'trust_level': 'Low', 'recommendation': 'x'}]):
+        try:
+            TrustPolicy(tiers)
+            raise AssertionError(f"accepted {tiers}")
+        except ValueError:
+            pass
+    print("✓ Default policy and tier validation")
+
+
+def test_coded_results():
+    """predict returns categoricals and float32; materialize gives the plain labels back"""
+    processor = load_processor()
+    df = pd.read_csv(DATA_CSV).head(2000)
+    results = processor.predict(processor.validate_and_prepare(df)[0])
+    for col in ('prediction', 'trust_level', 'action', 'recommendation'):
+        assert isinstance(results[col].dtype, pd.CategoricalDtype)
+    assert results['trust_score'].dtype == np.float32 and results['confidence'].dtype == np.float32
+
+    plain = materialize(results)
+    assert plain['action'].dtype == object and plain['trust_score'].dtype == np.float64
+    assert (plain['trust_score'] == plain['trust_score'].round(2)).all()
+    for col in ('trust_score', 'confidence'):
+        assert (plain[col] == results[col].astype(str).astype(np.float64)).all()
+    assert (plain['action'] == np.asarray(['ALLOW', 'MONITOR', 'BLOCK'], dtype=object)[
+        processor.action_codes(plain['trust_score'].to_numpy())]).all()
+    assert (results['prediction'] == plain['prediction']).all() and results['correct'].dtype == bool
+    assert results.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum() / 4
+    print("✓ Coded results and materialize")
+
+
+def test_policy_file():
+    """trust_policy.json in the model directory replaces the default tiers"""
+    tiers = [
+        {'min_score': 0, 'action': 'BLOCK', 'trust_level': 'Low', 'recommendation': 'Quarantine node'},
+        {'min_score': 20, 'action': 'BLOCK', 'trust_level': 'Low', 'recommendation': 'Deny access'},
+        {'min_score': 50, 'action': 'MONITOR', 'trust_level': 'Medium', 'recommendation': 'Re-authenticate'},
+        {'min_score': 90, 'action': 'ALLOW', 'trust_level': 'High', 'recommendation': 'Grant access'},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(MODELS_DIR):
+            if name.endswith(('.pkl', '.npz')):
+                shutil.copy(os.path.join(MODELS_DIR, name), tmp)
+        with open(os.path.join(tmp, TRUST_POLICY_FILE), 'w') as f:
+            json.dump({'tiers': tiers}, f)
+        processor = load_processor(tmp)
+
+        assert processor.trust_policy.recommendations == ('Grant access', 'Re-authenticate', 'Quarantine node',
+                                                          'Deny access')
+        results = materialize(processor.predict(processor.validate_and_prepare(pd.read_csv(DATA_CSV).head(2000))[0]))
+        trust = results['trust_score']
+        expected = np.select([trust >= 90, trust >= 50, trust >= 20], ['ALLOW', 'MONITOR', 'BLOCK'], 'BLOCK')
+        assert (results['action'] == expected).all()
+        assert (results.loc[trust < 20, 'recommendation'] == 'Quarantine node').all()
+        assert (results.loc[(trust >= 20) & (trust < 50), 'recommendation'] == 'Deny access').all()
+    print("✓ Policy loaded from trust_policy.json")
+
+
+if __name__ == "__main__":
+    test_default_policy()
+    test_coded_results()
+    test_policy_file()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,69 @@
+"""
+Test script for the schema validator
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.schema import build_schema
+from utils.validator import DataValidator
+
+
+class _Encoder:
+    classes_ = np.array(['icmp', 'tcp', 'udp'])
+
+
+SCHEMA = build_schema(['protocol_type', 'land', 'count', 'src_bytes', 'serror_rate'],
+                      {'protocol_type': _Encoder()})
+
+
+def make_frame():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 6],
+        'protocol_type': pd.Categorical(['tcp', 'udp', 'gre', 'icmp', None, 'tcp']),
+        'land': [0, 1, 0, 0, 0, 0],
+        'count': [1.0, 2.0, 3.0, 2.5, np.nan, -1.0],
+        'src_bytes': ['10', '20', 'oops', '40', '50', '60'],
+        'serror_rate': np.array([0.0, 1.0, 0.5, 0.1, 0.2, 1.2], dtype=np.float32),
+    })
+
+
+def test_violations_and_quarantine():
+    """Invalid rows are counted per column and quarantined; nulls are not"""
+    valid, report = DataValidator(SCHEMA, max_samples=2).validate(make_frame())
+    assert report.count('protocol_type', 'vocabulary') == 1
+    assert report.count('count', 'type') == 1 and report.count('count', 'range') == 1
+    assert report.count('src_bytes', 'type') == 1
+    assert report.count('serror_rate', 'range') == 1
+    assert report.count('protocol_type', 'null') == 1 and report.count('count', 'null') == 1
+
+    assert valid['id'].tolist() == [1, 2, 5]
+    assert report.quarantine['id'].tolist() == [3, 4, 6]
+    assert report.quarantine['violations'].tolist() == [
+        'protocol_type:vocabulary;src_bytes:type', 'count:type', 'count:range;serror_rate:range']
+    assert len(report.samples) == 2 and report.valid_rows == 3
+    assert valid['src_bytes'].tolist() == [10, 20, 50]
+    assert any('Quarantined 3 of 6 rows' in issue for issue in report.issues())
+    print("✓ Violations counted, bad rows quarantined")
+
+
+def test_clean_frame():
+    """A clean frame passes through untouched"""
+    df = make_frame().iloc[[0, 1]]
+    df = df.assign(src_bytes=[10, 20])
+    valid, report = DataValidator(SCHEMA).validate(df)
+    assert len(valid) == 2 and report.quarantined_rows == 0
+    assert report.violations.empty and report.issues() == []
+    assert report.missing_columns == []
+    print("✓ Clean frame passes")
+
+
+if __name__ == "__main__":
+    test_violations_and_quarantine()
+    test_clean_frame()
+    print("\n✅ All tests passed!")
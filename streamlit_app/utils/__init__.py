@@ -1,9 +1,50 @@
 """
 Utility modules for Node Authentication System
+
+Classes are imported on first access, so `import utils.model_loader` or
+`from utils import DataProcessor` loads only what scoring needs (NumPy
+and pandas) and never Plotly, Streamlit or SQLite.
 """
 
-from .model_loader import ModelLoader
-from .data_processor import DataProcessor
-from .visualizer import Visualizer
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'ModelLoader': 'model_loader',
+    'DataProcessor': 'data_processor',
+    'Visualizer': 'visualizer',
+    'NodeStateStore': 'node_state',
+    'ConnectionFeatureExtractor': 'feature_extractor',
+    'ResultSummary': 'result_summary',
+    'ResultPager': 'result_pager',
+    'ResultExporter': 'exporter',
+    'SchemaCSVReader': 'csv_reader',
+    'DataValidator': 'validator',
+    'ShadowMonitor': 'shadow_monitor',
+    'BatchRunner': 'batch_runner',
+    'JobManager': 'job_manager',
+    'ResultsStore': 'results_store',
+    'NDJSONStreamScorer': 'stream_scorer',
+    'RBFExplainer': 'explainer',
+    'DriftMonitor': 'drift_monitor',
+    'NeighborIndex': 'neighbor_index',
+    'QuantizedSVC': 'quantized_model',
+    'TrustPolicy': 'trust_policy',
+    'ResultCache': 'result_cache',
+    'ProgressiveEstimator': 'progressive',
+    'Coordinator': 'sharding',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['ModelLoader', 'DataProcessor', 'Visualizer']
+def __dir__():
+    return sorted(list(globals()) + __all__)
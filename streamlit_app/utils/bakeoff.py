@@ -0,0 +1,231 @@
+"""
+Bake-off Module
+Train candidate classifiers and compare them on accuracy, latency and memory
+"""
+
+import copy
+import json
+import os
+import pickle
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .data_processor import DataProcessor
+
+
+# Objectives of the Pareto front: higher is better / lower is better
+MAXIMIZE = ('accuracy',)
+MINIMIZE = ('single_row_p50_ms', 'batch_us_per_row')
+
+
+def default_candidates() -> Dict[str, Any]:
+    """The algorithms the notebook compares, with its settings"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+    return {
+        'svm_rbf': SVC(kernel='rbf', C=10, gamma='scale', probability=True, random_state=42),
+        'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'gradient_boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
+        'decision_tree': DecisionTreeClassifier(random_state=42),
+        'naive_bayes': GaussianNB(),
+    }
+
+
+def fit_candidate(name: str, estimator, X: np.ndarray, y: np.ndarray) -> Tuple[str, Any, float]:
+    """Fit one estimator and time it; runs in a worker process, so returns the fitted copy"""
+    start = time.perf_counter()
+    estimator.fit(X, y)
+    return name, estimator, time.perf_counter() - start
+
+
+def train_candidates(candidates: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+                     max_workers: Optional[int] = None) -> Dict[str, Tuple[Any, float]]:
+    """
+    Fit every candidate, one process each
+
+    Args:
+        candidates: Unfitted estimators by name
+        X_train: Scaled training matrix
+        y_train: 1 = Normal, 0 = Anomaly
+        max_workers: Processes (default: one per CPU, at most one per candidate)
+
+    Returns:
+        (fitted estimator, training seconds) by name, in candidate order
+    """
+    workers = max_workers or min(len(candidates), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fit_candidate, name, estimator, X_train, y_train) for name, estimator in candidates.items()]
+        fitted = {name: (model, seconds) for name, model, seconds in (f.result() for f in futures)}
+    return {name: fitted[name] for name in candidates}
+
+
+def raw_scores(model, X_scaled: np.ndarray) -> np.ndarray:
+    """The score DataProcessor maps to trust: the margin, or P(Normal) without one"""
+    if hasattr(model, 'decision_function'):
+        return model.decision_function(X_scaled)
+    return model.predict_proba(X_scaled)[:, 1]
+
+
+def fit_trust_scaler(model, X_scaled: np.ndarray):
+    """MinMaxScaler onto 0-100 over the model's scores, as the notebook builds trust_scaler.pkl"""
+    from sklearn.preprocessing import MinMaxScaler
+    return MinMaxScaler(feature_range=(0, 100)).fit(raw_scores(model, X_scaled).reshape(-1, 1))
+
+
+def scoring_processor(model_loader, name: str, model, trust_scaler,
+                      feature_subset: Optional[Sequence[str]] = None) -> DataProcessor:
+    """DataProcessor that scores with this model alone (no shadows), on feature_subset if given"""
+    view = copy.copy(model_loader)
+    view.registry = {}
+    view.primary_name = None
+    view.register_model(name, model, trust_scaler, role='primary', feature_subset=feature_subset)
+    return DataProcessor(view)
+
+
+def measure(processor: DataProcessor, df: pd.DataFrame, single_rows: int = 200,
+            repeats: int = 3) -> Dict[str, float]:
+    """
+    Accuracy, latency, throughput and memory of processor.predict
+
+    Args:
+        processor: DataProcessor from scoring_processor()
+        df: Preprocessed, labeled rows (validate_and_prepare output)
+        single_rows: Rows scored one at a time for the single-row latency
+        repeats: Batch timing repeats (best is kept)
+
+    Returns:
+        Dict of accuracy, f1 (anomaly class), single_row_p50_ms,
+        single_row_p99_ms, batch_us_per_row, rows_per_sec, model_kb
+        (pickled size) and peak_scoring_mb (tracemalloc peak of one batch;
+        it sees NumPy and Python allocations, not memory allocated inside
+        libsvm or the tree code)
+    """
+    results = processor.predict(df)
+    truth = df['true_class'].to_numpy()
+    predicted = results['prediction'].to_numpy()
+    true_anomaly, predicted_anomaly = truth == 'Anomaly', predicted == 'Anomaly'
+    hits = (true_anomaly & predicted_anomaly).sum()
+    f1 = 2 * hits / max(true_anomaly.sum() + predicted_anomaly.sum(), 1)
+
+    batch = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        processor.predict(df)
+        batch = min(batch, time.perf_counter() - start)
+
+    singles = []
+    for i in range(min(single_rows, len(df))):
+        row = df.iloc[[i]]
+        start = time.perf_counter()
+        processor.predict(row)
+        singles.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        processor.predict(df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'accuracy': (truth == predicted).mean(),
+        'f1': f1,
+        'single_row_p50_ms': np.percentile(singles, 50) * 1000,
+        'single_row_p99_ms': np.percentile(singles, 99) * 1000,
+        'batch_us_per_row': batch / len(df) * 1e6,
+        'rows_per_sec': len(df) / batch,
+        'model_kb': len(pickle.dumps(processor.model)) / 1024,
+        'peak_scoring_mb': peak / 1024 / 1024,
+    }
+
+
+def pareto_front(report: pd.DataFrame, maximize: Sequence[str] = MAXIMIZE,
+                 minimize: Sequence[str] = MINIMIZE) -> np.ndarray:
+    """
+    Rows no other row beats on every objective
+
+    Args:
+        report: One row per model
+        maximize: Columns where higher is better
+        minimize: Columns where lower is better
+
+    Returns:
+        Boolean mask over report's rows
+    """
+    # Flip the maximized columns so that lower is better everywhere
+    costs = np.column_stack([-report[c].to_numpy(dtype=float) for c in maximize] +
+                            [report[c].to_numpy(dtype=float) for c in minimize])
+    no_worse = (costs[:, None, :] <= costs[None, :, :]).all(axis=2)
+    better = (costs[:, None, :] < costs[None, :, :]).any(axis=2)
+    # dominated[j]: some row i is no worse on every objective and better on one
+    dominated = (no_worse & better).any(axis=0)
+    return ~dominated
+
+
+def choose(report: pd.DataFrame, budget_ms: Optional[float] = None) -> Optional[str]:
+    """
+    Most accurate model within the single-row latency budget
+
+    Ties go to the lower batch latency. Without a budget this is the most
+    accurate model, which is always on the front.
+
+    Args:
+        report: Bake-off report (one row per model)
+        budget_ms: Largest acceptable single_row_p99_ms (None: no budget)
+
+    Returns:
+        Model name, or None if no model fits the budget
+    """
+    eligible = report
+    if budget_ms is not None:
+        eligible = eligible[eligible['single_row_p99_ms'] <= budget_ms]
+    if not len(eligible):
+        return None
+    best = eligible.sort_values(['accuracy', 'batch_us_per_row'], ascending=[False, True], kind='stable')
+    return best.iloc[0]['model']
+
+
+def export_model(name: str, model, trust_scaler, model_dir: str, role: str = 'shadow',
+                 feature_subset: Optional[Sequence[str]] = None) -> str:
+    """
+    Save a model version and add it to model_registry.json
+
+    Args:
+        name: Registry name (also the file name prefix)
+        model: Fitted classifier over the scaled features
+        trust_scaler: Its 0-100 trust scaler
+        model_dir: Model directory
+        role: 'shadow' to score it alongside the primary, or 'primary'
+        feature_subset: Features the model was trained on, if not all of them
+
+    Returns:
+        Path of the registry file
+    """
+    import joblib
+    model_file, trust_file = f'{name}_model.pkl', f'{name}_trust_scaler.pkl'
+    joblib.dump(model, os.path.join(model_dir, model_file))
+    joblib.dump(trust_scaler, os.path.join(model_dir, trust_file))
+
+    registry_path = os.path.join(model_dir, 'model_registry.json')
+    config = {'models': []}
+    if os.path.exists(registry_path):
+        with open(registry_path) as f:
+            config = json.load(f)
+    config['models'] = [entry for entry in config.get('models', []) if entry['name'] != name]
+    entry = {'name': name, 'model': model_file, 'trust_scaler': trust_file, 'role': role}
+    if feature_subset is not None:
+        entry['feature_subset'] = list(feature_subset)
+    config['models'].append(entry)
+    if role == 'primary':
+        config['primary'] = name
+    elif config.get('primary') == name:
+        config.pop('primary')
+    with open(registry_path, 'w') as f:
+        json.dump(config, f, indent=2)
+    return registry_path
@@ -0,0 +1,197 @@
+"""
+Batch Runner Module
+Scores many files concurrently through one loaded model
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .csv_reader import SchemaCSVReader
+from .data_processor import DataProcessor
+from .result_summary import ResultSummary
+from .shadow_monitor import ShadowMonitor
+
+
+class FileResult:
+    """Per-file outcome of a batch run: summary and counters, no result rows"""
+
+    def __init__(self, name: str, size: Optional[int] = None):
+        self.name = name
+        self.size = size
+        self.summary = ResultSummary()
+        self.rows_read = 0
+        self.quarantined = 0
+        self.issues = []
+        self.status = 'queued'
+        self.error = None
+        self.bytes_read = 0
+        self.seconds = 0.0
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the file consumed (by bytes when the size is known)"""
+        if self.status in ('done', 'failed'):
+            return 1.0
+        if self.size:
+            return min(self.bytes_read / self.size, 0.99)
+        return 0.0
+
+
+class BatchRunner:
+    """
+    Score a list of files in parallel and keep only per-file summaries
+
+    Every worker thread gets its own DataProcessor over the same
+    ModelLoader, so the model, scalers and encoders are loaded once and
+    shared. Files are read and scored in chunks that fold into a
+    per-file ResultSummary and are then dropped, so memory stays at
+    roughly one chunk per worker however many files are compared.
+    """
+
+    def __init__(self, model_loader, max_workers: Optional[int] = None, chunksize: int = 20_000,
+                 shadow_monitor: Optional[ShadowMonitor] = None, results_store=None):
+        """
+        Initialize BatchRunner
+
+        Args:
+            model_loader: Loaded ModelLoader shared by all workers
+            max_workers: Worker threads (default: min(8, CPU count))
+            chunksize: Rows scored per chunk
+            shadow_monitor: Optional monitor shared by all workers
+            results_store: Optional ResultsStore each file is appended to as one batch
+        """
+        self.model_loader = model_loader
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.chunksize = chunksize
+        self.shadow_monitor = shadow_monitor if shadow_monitor is not None else ShadowMonitor()
+        self.results_store = results_store
+        self.reader = SchemaCSVReader.from_model_loader(model_loader)
+        self._local = threading.local()
+
+    def run(self, files: Sequence[Tuple[str, Any]],
+            progress: Optional[Callable[[List[FileResult]], None]] = None,
+            poll_interval: float = 0.25) -> List[FileResult]:
+        """
+        Score every file
+
+        Args:
+            files: (name, path or binary file object) pairs
+            progress: Called with the FileResults while work is running and
+                      once at the end; always from the calling thread, so it
+                      may update UI elements
+            poll_interval: Seconds between progress calls
+
+        Returns:
+            FileResults in input order
+        """
+        results = [FileResult(name, self._size(source)) for name, source in files]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._score_file, result, source)
+                       for result, (_, source) in zip(results, files)}
+            while pending:
+                _, pending = wait(pending, timeout=poll_interval)
+                if progress is not None:
+                    progress(results)
+        return results
+
+    def _processor(self) -> DataProcessor:
+        """This thread's DataProcessor (validation state is per processor)"""
+        processor = getattr(self._local, 'processor', None)
+        if processor is None:
+            processor = DataProcessor(self.model_loader, shadow_monitor=self.shadow_monitor)
+            self._local.processor = processor
+        return processor
+
+    def _score_file(self, result: FileResult, source: Any):
+        start = time.perf_counter()
+        result.status = 'running'
+        processor = self._processor()
+        handle = None
+        batch_id = None
+        try:
+            if self.results_store is not None:
+                batch_id = self.results_store.begin_batch(result.name, model=self.model_loader.primary_name)
+            handle = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+            # A second pass over an uploaded file starts from the top
+            handle.seek(0)
+            for chunk in self.reader.iter_chunks(handle, self.chunksize):
+                result.rows_read += len(chunk)
+                processed_df, issues = processor.validate_and_prepare(chunk)
+                result.quarantined += processor.validation_report.quarantined_rows
+                result.issues.extend(i for i in issues if i not in result.issues)
+                if len(processed_df):
+                    results_df = processor.predict(processed_df, summary=result.summary)
+                    if batch_id is not None:
+                        self.results_store.append(batch_id, results_df)
+                result.bytes_read = handle.tell()
+            result.status = 'done'
+            if batch_id is not None:
+                self.results_store.finish_batch(batch_id, quarantined=result.quarantined)
+        except Exception as e:
+            result.status = 'failed'
+            result.error = str(e)
+            if batch_id is not None:
+                self.results_store.delete_batch(batch_id)
+        finally:
+            if handle is not None and handle is not source:
+                handle.close()
+            result.seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _size(source: Any) -> Optional[int]:
+        if isinstance(source, (str, os.PathLike)):
+            # A missing file fails on its own when it is opened
+            return os.path.getsize(source) if os.path.exists(source) else None
+        size = getattr(source, 'size', None)
+        if size is None and hasattr(source, 'getbuffer'):
+            size = source.getbuffer().nbytes
+        return size
+
+
+def compare_files(results: Sequence[FileResult]) -> pd.DataFrame:
+    """
+    Side-by-side comparison table built from per-file summaries
+
+    Args:
+        results: FileResults from BatchRunner.run
+
+    Returns:
+        DataFrame indexed by file with row counts, action shares, trust
+        statistics, anomaly share, accuracy (labeled files) and throughput
+    """
+    rows = []
+    for result in results:
+        summary = result.summary
+        total = summary.total
+        p10, median = summary.quantiles('trust_score', [0.1, 0.5]) if total else (np.nan, np.nan)
+        row = {
+            'file': result.name,
+            'status': result.status,
+            'rows': total,
+            'quarantined': result.quarantined,
+        }
+        for action in ('ALLOW', 'MONITOR', 'BLOCK'):
+            row[f'{action.lower()}_pct'] = 100 * summary.count('action', action) / total if total else np.nan
+        row.update({
+            'mean_trust': summary.mean('trust_score'),
+            'median_trust': median,
+            'p10_trust': p10,
+            'anomaly_pct': 100 * summary.count('prediction', 'Anomaly') / total if total else np.nan,
+            'accuracy_pct': 100 * summary.accuracy if summary.accuracy is not None else np.nan,
+            'rows_per_sec': result.rows_read / result.seconds if result.seconds else np.nan,
+        })
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('file') if rows else pd.DataFrame()
+
+
+def combine_summaries(results: Sequence[FileResult]) -> ResultSummary:
+    """Merge every file's summary into one overall summary"""
+    combined = ResultSummary()
+    for result in results:
+        combined.merge(result.summary)
+    return combined
@@ -0,0 +1,235 @@
+"""
+CSV Reader Module
+Schema-driven CSV parsing for the upload and batch paths
+"""
+
+import csv
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .schema import PASSTHROUGH_COLUMNS, build_schema, normalize_column_name
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+    pa_csv = None
+
+
+class SchemaCSVReader:
+    """
+    Read connection CSVs straight into the model's column layout
+
+    The header row is read first and normalized ('duration' -> duration),
+    then only the model features and passthrough columns are parsed, with
+    explicit narrow dtypes and categoricals for the encoded columns. The
+    multithreaded pyarrow parser is used when installed. Files that do not
+    fit the schema (stray text in a numeric column, out-of-range ints)
+    fall back to an untyped parse so validation can still report them.
+    """
+
+    def __init__(self, feature_names: List[str], label_encoders: Optional[Dict[str, Any]] = None,
+                 passthrough: Tuple[str, ...] = PASSTHROUGH_COLUMNS, engine: Optional[str] = None):
+        """
+        Initialize SchemaCSVReader
+
+        Args:
+            feature_names: Feature names in model order
+            label_encoders: Fitted encoders for the categorical features
+            passthrough: Extra columns kept as parsed (ids, labels)
+            engine: 'pyarrow' or 'c' (default: pyarrow when installed)
+        """
+        self.schema = build_schema(feature_names, label_encoders)
+        self.passthrough = tuple(passthrough)
+        if engine is None:
+            engine = 'pyarrow' if pa_csv is not None else 'c'
+        if engine == 'pyarrow' and pa_csv is None:
+            raise ImportError("engine='pyarrow' requires pyarrow (pip install pyarrow)")
+        self.engine = engine
+        self.skipped_columns = []
+        self.fallback = None
+
+    @classmethod
+    def from_model_loader(cls, model_loader, **kwargs) -> 'SchemaCSVReader':
+        """Build a reader from a ModelLoader's feature names and encoders"""
+        return cls(model_loader.get_feature_names(), model_loader.get_label_encoders(), **kwargs)
+
+    def read(self, source: Any) -> pd.DataFrame:
+        """
+        Read a whole CSV
+
+        Args:
+            source: File path or binary file object (e.g. a Streamlit upload)
+
+        Returns:
+            DataFrame with normalized column names; skipped_columns and
+            fallback describe what was left out and which parse was used
+        """
+        names, usecols = self._plan(source)
+        self.fallback = None
+        try:
+            if self.engine == 'pyarrow':
+                return self._read_pyarrow(source, names, usecols)
+            return self._read_pandas(source, names, usecols, self._dtypes(usecols, 'dtype'))
+        except (ValueError, OverflowError):
+            pass
+        try:
+            self.fallback = 'nullable'
+            return self._read_pandas(source, names, usecols, self._dtypes(usecols, 'null_dtype'))
+        except (ValueError, OverflowError):
+            self.fallback = 'untyped'
+            return self._read_pandas(source, names, usecols, None)
+
+    def iter_chunks(self, source: Any, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Read a CSV in row chunks
+
+        Numeric columns use the null-tolerant dtypes, since a later chunk may
+        hold nulls the first did not. If a chunk fails to parse, reading
+        resumes untyped from that chunk.
+
+        Args:
+            source: File path or binary file object
+            chunksize: Rows per chunk
+
+        Yields:
+            DataFrames with normalized column names
+        """
+        names, usecols = self._plan(source)
+        self.fallback = None
+        done = 0
+        dtypes = self._dtypes(usecols, 'null_dtype')
+        while True:
+            try:
+                reader = self._pandas_reader(source, names, usecols, dtypes, skip=done, chunksize=chunksize)
+                with reader:
+                    for chunk in reader:
+                        chunk.index = pd.RangeIndex(done, done + len(chunk))
+                        done += len(chunk)
+                        yield chunk
+                return
+            except (ValueError, OverflowError):
+                if dtypes is None:
+                    raise
+                self.fallback = 'untyped'
+                dtypes = None
+
+    def _plan(self, source: Any) -> Tuple[List[str], List[str]]:
+        """Normalize the header row and pick the columns to parse"""
+        if hasattr(source, 'read'):
+            position = source.tell()
+            line = source.readline()
+            source.seek(position)
+        else:
+            with open(source, 'rb') as f:
+                line = f.readline()
+        if isinstance(line, bytes):
+            line = line.decode('utf-8-sig')
+        names = [normalize_column_name(n) for n in next(csv.reader([line]), [])]
+
+        wanted = set(self.schema) | set(self.passthrough)
+        usecols = [n for n in dict.fromkeys(names) if n in wanted]
+        self.skipped_columns = [n for n in names if n not in wanted]
+        return names, usecols
+
+    def _dtypes(self, usecols: List[str], key: str) -> Dict[str, str]:
+        return {c: self.schema[c][key] for c in usecols if c in self.schema}
+
+    def _read_pyarrow(self, source: Any, names: List[str], usecols: List[str]) -> pd.DataFrame:
+        """Multithreaded parse; int columns holding nulls get their null dtype"""
+        arrow_types = {
+            'category': pa.dictionary(pa.int32(), pa.string()),
+            'int8': pa.int8(), 'int32': pa.int32(), 'int64': pa.int64(),
+            'float32': pa.float32(), 'float64': pa.float64(),
+        }
+        dtypes = self._dtypes(usecols, 'dtype')
+        placeholders = _placeholders(names, usecols)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        table = pa_csv.read_csv(
+            source,
+            read_options=pa_csv.ReadOptions(column_names=[f'_{i}' for i in range(len(names))],
+                                            skip_rows=1, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(placeholders),
+                column_types={p: arrow_types[dtypes[c]] for p, c in placeholders.items() if c in dtypes},
+                strings_can_be_null=True,
+            ),
+        )
+        df = table.to_pandas().rename(columns=placeholders)
+        for col, dtype in dtypes.items():
+            if dtype != 'category' and df[col].dtype != dtype:
+                df[col] = df[col].astype(self.schema[col]['null_dtype'])
+        return df
+
+    def _read_pandas(self, source: Any, names: List[str], usecols: List[str],
+                     dtypes: Optional[Dict[str, str]]) -> pd.DataFrame:
+        with self._pandas_reader(source, names, usecols, dtypes) as reader:
+            return reader.read()
+
+    def _pandas_reader(self, source: Any, names: List[str], usecols: List[str],
+                       dtypes: Optional[Dict[str, str]], skip: int = 0,
+                       chunksize: Optional[int] = None):
+        """C-engine reader positioned after the header (and skip data rows)"""
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        placeholders = _placeholders(names, usecols)
+        return _RenamingReader(pd.read_csv(
+            source,
+            header=None,
+            skiprows=1 + skip,
+            names=[f'_{i}' for i in range(len(names))],
+            usecols=list(placeholders),
+            # The C parser wraps out-of-range narrow ints, so parse as int64
+            dtype={p: 'int64' if dtypes[c].startswith('int') else dtypes[c]
+                   for p, c in placeholders.items() if c in (dtypes or {})},
+            engine='c',
+            chunksize=chunksize,
+            iterator=chunksize is None,
+        ), placeholders, lambda df: self._narrow(df, dtypes or {}))
+
+    @staticmethod
+    def _narrow(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        """Downcast int64 columns to their schema dtype where every value fits"""
+        for col, dtype in dtypes.items():
+            if dtype.startswith('int') and df[col].dtype == np.int64 and len(df):
+                info = np.iinfo(dtype)
+                if info.min <= df[col].min() and df[col].max() <= info.max:
+                    df[col] = df[col].astype(dtype)
+        return df
+
+
+def _placeholders(names: List[str], usecols: List[str]) -> Dict[str, str]:
+    """
+    Positional placeholder -> normalized name for the first occurrence of
+    each wanted column (normalized headers may repeat, e.g. 'id' and id)
+    """
+    seen = {}
+    for i, name in enumerate(names):
+        if name in usecols and name not in seen.values():
+            seen[f'_{i}'] = name
+    return seen
+
+
+class _RenamingReader:
+    """Wrap a pandas TextFileReader to rename and narrow every chunk"""
+
+    def __init__(self, reader, columns: Dict[str, str], convert):
+        self._reader = reader
+        self._columns = columns
+        self._convert = convert
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._reader.close()
+
+    def __iter__(self):
+        for chunk in self._reader:
+            yield self._convert(chunk.rename(columns=self._columns))
+
+    def read(self) -> pd.DataFrame:
+        return self._convert(self._reader.read().rename(columns=self._columns))
@@ -3,27 +3,65 @@ Data Processor Module
 Handles CSV validation, preprocessing, and prediction
 """
 
+import os
+import time
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+from .drift_monitor import DriftMonitor
+from .explainer import FEATURE_IMPORTANCE_FILE, RBFExplainer
+from .neighbor_index import NeighborIndex
+from .node_state import ACTIONS, NodeStateStore
+from .shadow_monitor import ShadowMonitor
+from .result_summary import ResultSummary
+from .trust_policy import SCORE_DECIMALS, TrustPolicy
+from .validator import DataValidator, ValidationReport
+
+
+# Columns accepted as node identifiers, in order of preference
+NODE_ID_COLUMNS = ['node_id', 'id']
+
+# Features listed per explained row in the top_factors column
+TOP_FACTORS = 3
 
 
 class DataProcessor:
     """Process data for predictions"""
     
-    def __init__(self, model_loader):
+    def __init__(self, model_loader, node_state: Optional[NodeStateStore] = None,
+                 shadow_monitor: Optional[ShadowMonitor] = None,
+                 drift_monitor: Optional[DriftMonitor] = None,
+                 neighbor_index: Optional[NeighborIndex] = None,
+                 trust_policy: Optional[TrustPolicy] = None):
         """
         Initialize DataProcessor
         
         Args:
             model_loader: ModelLoader instance with loaded models
+            node_state: Optional per-node trust store updated on every predict
+            shadow_monitor: Collects per-model latency and shadow disagreements
+                            (a fresh one is created if not given)
+            drift_monitor: Optional DriftMonitor fed every predicted batch
+            neighbor_index: Optional NeighborIndex for predict(neighbors=k)
+            trust_policy: Trust score tiers (default: the model directory's
+                          trust_policy.json, or DEFAULT_TIERS)
         """
         self.model_loader = model_loader
+        self.node_state = node_state
+        self.shadow_monitor = shadow_monitor if shadow_monitor is not None else ShadowMonitor()
+        self.drift_monitor = drift_monitor
+        self.neighbor_index = neighbor_index
+        self.trust_policy = trust_policy if trust_policy is not None else TrustPolicy.from_model_loader(model_loader)
         self.model = model_loader.get_model()
         self.scaler = model_loader.get_scaler()
         self.trust_scaler = model_loader.get_trust_scaler()
         self.label_encoders = model_loader.get_label_encoders()
         self.feature_names = model_loader.get_feature_names()
+        self.imputation_values = model_loader.get_imputation_values()
+        self.validator = DataValidator.from_model_loader(model_loader)
+        self.validation_report: Optional[ValidationReport] = None
+        self._explainers = {}
     
     def validate_and_prepare(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
         """
@@ -33,7 +71,8 @@ class DataProcessor:
             df: Input DataFrame
             
         Returns:
-            Tuple of (processed_df, list_of_issues)
+            Tuple of (processed_df, list_of_issues); rows that break the
+            feature schema are left out and kept in validation_report.quarantine
         """
         issues = []
         processed_df = df.copy()
@@ -41,41 +80,47 @@ class DataProcessor:
         # Clean column names
         processed_df.columns = processed_df.columns.str.strip().str.replace("'", "")
         
+        # Split off malformed, out-of-range and unknown-category rows
+        processed_df, self.validation_report = self.validator.validate(processed_df)
+        issues.extend(self.validation_report.issues())
+        
         # Check if 'class' column exists (ground truth)
         has_labels = 'class' in processed_df.columns
         if has_labels:
-            # Store labels separately
-            true_labels = processed_df['class'].copy()
+            # Store labels separately, as 'Normal' / 'Anomaly' like predictions
+            true_labels = processed_df['class'].astype(str).str.strip().str.capitalize()
             processed_df = processed_df.drop('class', axis=1)
         
+        # Keep node identifiers aside so per-node state can be tracked
+        id_col = next((c for c in NODE_ID_COLUMNS if c in processed_df.columns), None)
+        has_node_ids = id_col is not None
+        if has_node_ids:
+            node_ids = processed_df[id_col].copy()
+            processed_df = processed_df.drop(id_col, axis=1)
+        
         # Validate feature count
         if len(processed_df.columns) < len(self.feature_names):
             issues.append(f"Expected {len(self.feature_names)} features, got {len(processed_df.columns)}")
         
-        # Check for missing values
-        missing = processed_df.isnull().sum()
-        if missing.sum() > 0:
-            issues.append(f"Found {missing.sum()} missing values")
-            # Fill missing values
-            for col in processed_df.columns:
-                if processed_df[col].dtype in ['int64', 'float64']:
-                    processed_df[col].fillna(processed_df[col].median(), inplace=True)
-                else:
-                    processed_df[col].fillna(processed_df[col].mode()[0] if len(processed_df[col].mode()) > 0 else 'unknown', inplace=True)
+        # Fill missing values (counted by the validator) with the training
+        # statistics, so a row imputes the same way whichever batch it is in
+        null_columns = [c for c in processed_df.columns[processed_df.isna().any().to_numpy()]
+                        if c in self.imputation_values]
+        if null_columns:
+            for col in null_columns:
+                values = processed_df[col]
+                if (isinstance(values.dtype, pd.CategoricalDtype)
+                        and self.imputation_values[col] not in values.cat.categories):
+                    processed_df[col] = values.cat.add_categories([self.imputation_values[col]])
+            processed_df = processed_df.fillna({c: self.imputation_values[c] for c in null_columns})
         
         # Ensure correct feature order and add missing features
         missing_features = set(self.feature_names) - set(processed_df.columns)
         if missing_features:
-            issues.append(f"Missing features: {missing_features}. Will fill with default values.")
+            issues.append(f"Missing features: {missing_features}. Will fill with training imputation values.")
             for feat in missing_features:
-                # Add missing features with appropriate default values
-                if feat in ['protocol_type', 'service', 'flag']:
-                    # Categorical features - use first class from encoder
-                    if feat in self.label_encoders:
-                        processed_df[feat] = self.label_encoders[feat].classes_[0]
-                else:
-                    # Numeric features - use 0
-                    processed_df[feat] = 0
+                # Add missing features with their imputation value
+                processed_df[feat] = self.imputation_values[feat]
         
         # Remove extra columns not in training features
         extra_features = set(processed_df.columns) - set(self.feature_names)
@@ -87,14 +132,17 @@ class DataProcessor:
         
         # Reorder columns to match training feature order exactly
         available_features = [f for f in self.feature_names if f in processed_df.columns]
-        processed_df = processed_df[available_features + (['true_class'] if has_labels else [])]
+        processed_df = processed_df[available_features]
         
         # Final check: ensure all features present
         if len(available_features) != len(self.feature_names):
             issues.append(f"Expected {len(self.feature_names)} features, have {len(available_features)}")
         
         # Ensure we have all features in correct order
-        processed_df = processed_df[self.feature_names + (['true_class'] if has_labels else [])]
+        processed_df = processed_df[self.feature_names]
+        
+        if has_node_ids:
+            processed_df.insert(0, 'node_id', node_ids.values)
         
         if has_labels:
             # Add labels back
@@ -116,6 +164,10 @@ class DataProcessor:
         
         for col, encoder in self.label_encoders.items():
             if col in df_encoded.columns:
+                if isinstance(df_encoded[col].dtype, pd.CategoricalDtype):
+                    # Encode each category once and index by the row codes
+                    df_encoded[col] = self._encode_categorical(df_encoded[col], encoder)
+                    continue
                 # Handle unseen categories
                 try:
                     df_encoded[col] = encoder.transform(df_encoded[col])
@@ -127,24 +179,144 @@ class DataProcessor:
         
         return df_encoded
     
-    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _encode_categorical(values: pd.Series, encoder) -> np.ndarray:
+        """Encode a categorical column; unseen categories and nulls map to classes_[0]"""
+        categories = np.asarray(values.cat.categories, dtype=object)
+        known = np.isin(categories, encoder.classes_)
+        categories[~known] = encoder.classes_[0]
+        lookup = np.append(encoder.transform(categories) if len(categories) else [],
+                           encoder.transform([encoder.classes_[0]]))
+        # Null rows have code -1, which picks the trailing classes_[0] entry
+        return lookup.astype(np.int64)[values.cat.codes.to_numpy()]
+    
+    def predict(self, df: pd.DataFrame, summary: Optional[ResultSummary] = None,
+                explain: bool = False, neighbors: int = 0) -> pd.DataFrame:
         """
         Make predictions on the DataFrame
         
         Args:
             df: Preprocessed DataFrame
+            summary: Optional ResultSummary to fold these results into
+            explain: Add a top_factors column naming the features that pulled
+                     each BLOCK and MONITOR row's trust score down (empty
+                     when the primary is not an RBF SVC)
+            neighbors: If > 0 and a neighbor_index is set, add the training
+                       rows (data.csv row numbers) nearest to each BLOCK row
+                       as similar_records, and the share of them labeled
+                       Anomaly as similar_anomaly_share
             
         Returns:
-            DataFrame with predictions and trust scores
+            DataFrame with predictions and trust scores; prediction,
+            trust_level, action and recommendation are categoricals and the
+            scores float32 (trust_policy.materialize gives plain columns)
         """
-        # Store true labels if they exist
+        # Store true labels and node ids if they exist
         has_true_labels = 'true_class' in df.columns
+        has_node_ids = 'node_id' in df.columns
         if has_true_labels:
             true_labels = df['true_class'].copy()
-            df_features = df.drop('true_class', axis=1)
-        else:
-            df_features = df.copy()
+        if has_node_ids:
+            node_ids = df['node_id'].copy()
+        df_features = df.drop(columns=[c for c in ('true_class', 'node_id') if c in df.columns])
+        
+        # Preprocess and scale once, then fan out to the registered models
+        X_numeric = self.encode_features(df_features)
+        if self.drift_monitor is not None:
+            # Compared before scaling, so scale_features' refit fallback can't hide drift
+            self.drift_monitor.update(X_numeric)
+        X_scaled = self.scale_features(X_numeric)
+        primary = self._score_model(self.model_loader.primary_name, X_scaled)
+        for name in self.model_loader.get_shadow_names():
+            shadow = self._score_model(name, X_scaled)
+            self.shadow_monitor.record(name, primary, shadow,
+                                       node_ids.to_numpy() if has_node_ids else None)
+        
+        trust_scores = primary['trust_scores']
+        codes = self.trust_policy.apply(trust_scores)
+        action_codes = codes['action']
+        results_df = self._results_frame(primary['prediction_codes'], trust_scores, codes, primary['confidence'])
+        
+        if explain:
+            results_df['top_factors'] = self._top_factors(X_scaled, action_codes)
+        if neighbors > 0 and self.neighbor_index is not None:
+            records, anomaly_share = self._similar_records(X_scaled, action_codes, neighbors)
+            results_df['similar_records'] = records
+            results_df['similar_anomaly_share'] = anomaly_share
+        
+        if has_node_ids:
+            results_df.insert(0, 'node_id', node_ids.values)
+            if self.node_state is not None:
+                self.node_state.update(node_ids.values, trust_scores, action_codes)
+        
+        # Add true labels if available
+        if has_true_labels:
+            results_df['true_class'] = true_labels.values
+            results_df['correct'] = results_df['prediction'].to_numpy(dtype=object) == true_labels.to_numpy()
+        
+        if summary is not None:
+            summary.update(results_df)
+        
+        return results_df
+    
+    def empty_results(self, explain: bool = False, neighbors: int = 0) -> pd.DataFrame:
+        """
+        Zero-row results with predict()'s columns and dtypes, for a file
+        whose rows were all quarantined
+        
+        Args:
+            explain: Include the top_factors column
+            neighbors: If > 0 and a neighbor_index is set, include the
+                       similar_records columns
+            
+        Returns:
+            Empty DataFrame shaped like predict() output
+        """
+        scores = np.empty(0)
+        results_df = self._results_frame(np.empty(0, dtype=np.uint8), scores, self.trust_policy.apply(scores), scores)
+        if explain:
+            results_df['top_factors'] = np.empty(0, dtype=object)
+        if neighbors > 0 and self.neighbor_index is not None:
+            results_df['similar_records'] = np.empty(0, dtype=object)
+            results_df['similar_anomaly_share'] = scores
+        return results_df
+    
+    def _results_frame(self, prediction_codes: np.ndarray, trust_scores: np.ndarray,
+                       codes: Dict[str, np.ndarray], confidence: np.ndarray) -> pd.DataFrame:
+        """Results columns: coded columns stay codes until displayed or exported"""
+        categories = self.trust_policy.categories()
+        coded = lambda col, values: pd.Categorical.from_codes(values, categories=categories[col])
+        return pd.DataFrame({
+            'prediction': coded('prediction', prediction_codes),
+            'trust_score': trust_scores.round(SCORE_DECIMALS['trust_score']).astype(np.float32),
+            'trust_level': coded('trust_level', codes['trust_level']),
+            'action': coded('action', codes['action']),
+            'confidence': confidence.round(SCORE_DECIMALS['confidence']).astype(np.float32),
+            'recommendation': coded('recommendation', codes['recommendation'])
+        })
+    
+    def prepare_features(self, df_features: pd.DataFrame) -> np.ndarray:
+        """
+        Encode and scale feature columns into the model input matrix
+        
+        Args:
+            df_features: DataFrame with the model features only
+            
+        Returns:
+            Scaled feature matrix shared by every registered model
+        """
+        return self.scale_features(self.encode_features(df_features))
+    
+    def encode_features(self, df_features: pd.DataFrame) -> np.ndarray:
+        """
+        Label-encode feature columns into an unscaled numeric matrix
         
+        Args:
+            df_features: DataFrame with the model features only
+            
+        Returns:
+            Matrix in model feature order, categoricals as encoder codes
+        """
         # Encode categorical features
         df_encoded = self.encode_categorical_features(df_features)
         
@@ -156,8 +328,18 @@ class DataProcessor:
             df_encoded[col] = pd.to_numeric(df_encoded[col], errors='coerce').fillna(0)
         
         # Get numeric array
-        X_numeric = df_encoded[self.feature_names].values
+        return df_encoded[self.feature_names].values
+    
+    def scale_features(self, X_numeric: np.ndarray) -> np.ndarray:
+        """
+        Apply the feature scaler to an encode_features matrix
         
+        Args:
+            X_numeric: Encoded, unscaled matrix
+            
+        Returns:
+            Scaled feature matrix
+        """
         # Check if scaler matches our features
         if self.scaler.n_features_in_ != len(self.feature_names):
             # Scaler mismatch - need to create a new one fitted on this data
@@ -169,70 +351,136 @@ class DataProcessor:
             temp_scaler = StandardScaler()
             # Fit and transform on the current data
             # This assumes the data distribution is similar to training
-            X_scaled = temp_scaler.fit_transform(X_numeric)
-        else:
-            # Use the saved scaler
-            X_scaled = self.scaler.transform(X_numeric)
+            return temp_scaler.fit_transform(X_numeric)
+        # Use the saved scaler
+        return self.scaler.transform(X_numeric)
+    
+    def _score_model(self, name: str, X_scaled: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score the scaled matrix with one registered model
         
-        # Make predictions
-        predictions = self.model.predict(X_scaled)
-        probabilities = self.model.predict_proba(X_scaled)
-        decision_values = self.model.decision_function(X_scaled)
+        Args:
+            name: Registry name
+            X_scaled: Output of prepare_features (all features; a model
+                      trained on a feature subset gets just its columns)
+            
+        Returns:
+            Dictionary of prediction_codes (indexes into PREDICTIONS),
+            confidence, trust_scores and action_codes (indexes into ACTIONS);
+            the call's latency goes to shadow_monitor
+        """
+        entry = self.model_loader.registry[name]
+        model = entry['model']
+        start = time.perf_counter()
+        X_scaled = self._project(X_scaled, name)
+        if hasattr(model, 'proba_from_decision'):
+            # Bundled SVC: one kernel pass gives both margins and probabilities
+            raw_scores = model.decision_function(X_scaled)
+            probabilities = model.proba_from_decision(raw_scores)
+            labels = model.classes_[(raw_scores > 0).astype(int)]
+        elif hasattr(model, 'decision_function'):
+            probabilities = model.predict_proba(X_scaled)
+            raw_scores = model.decision_function(X_scaled)
+            # Same as model.predict for binary SVC, without a second kernel pass
+            labels = model.classes_[(raw_scores > 0).astype(int)]
+        else:
+            probabilities = model.predict_proba(X_scaled)
+            # Probability of class 1 ('normal') stands in for the margin
+            raw_scores = probabilities[:, 1]
+            labels = model.classes_[probabilities.argmax(axis=1)]
         
         # Calculate trust scores (0-100)
-        trust_scores_raw = decision_values.reshape(-1, 1)
-        trust_scores = self.trust_scaler.transform(trust_scores_raw).flatten()
+        trust_scores = entry['trust_scaler'].transform(raw_scores.reshape(-1, 1)).flatten()
         trust_scores = np.clip(trust_scores, 0, 100)
+        self.shadow_monitor.record_latency(name, len(X_scaled), time.perf_counter() - start)
+        
+        return {
+            # Classes were label-encoded as anomaly=0, normal=1 in training
+            'prediction_codes': (labels == 1).astype(np.uint8),
+            'confidence': probabilities.max(axis=1),
+            'trust_scores': trust_scores,
+            'action_codes': self.action_codes(trust_scores),
+        }
+    
+    def _project(self, X_scaled: np.ndarray, name: Optional[str] = None) -> np.ndarray:
+        """The columns a registered model scores on (default: the primary's)"""
+        columns = self.model_loader.registry[name or self.model_loader.primary_name].get('columns')
+        return X_scaled if columns is None else X_scaled[:, columns]
+    
+    def action_codes(self, trust_scores: np.ndarray) -> np.ndarray:
+        """Index into ACTIONS under trust_policy (by default ALLOW at 66 and above, MONITOR at 33)"""
+        return self.trust_policy.action_codes(trust_scores)
+    
+    def explain(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Per-feature attributions for each row, in trust-score points
         
-        # Determine actions and trust levels
-        actions = []
-        trust_levels = []
-        recommendations = []
-        
-        for score in trust_scores:
-            if score >= 66:
-                actions.append('ALLOW')
-                trust_levels.append('High')
-                recommendations.append('Grant access - Low risk node')
-            elif score >= 33:
-                actions.append('MONITOR')
-                trust_levels.append('Medium')
-                recommendations.append('Additional verification required')
-            else:
-                actions.append('BLOCK')
-                trust_levels.append('Low')
-                recommendations.append('Deny access - High risk node')
-        
-        # Create results DataFrame
-        results_df = pd.DataFrame({
-            'prediction': ['Anomaly' if p == 1 else 'Normal' for p in predictions],
-            'trust_score': trust_scores.round(2),
-            'trust_level': trust_levels,
-            'action': actions,
-            'confidence': probabilities.max(axis=1).round(4),
-            'recommendation': recommendations
-        })
-        
-        # Add true labels if available
-        if has_true_labels:
-            results_df['true_class'] = true_labels.values
-            results_df['correct'] = (results_df['prediction'] == results_df['true_class'])
-        
-        return results_df
+        Args:
+            df: Preprocessed DataFrame (as passed to predict)
+            
+        Returns:
+            DataFrame with one column per feature; negative values pull the
+            row's trust score down (see RBFExplainer). Features a reduced
+            primary model does not use are 0; all values are NaN when the
+            primary is not an RBF SVC
+        """
+        explainer = self._explainer()
+        if explainer is None:
+            return pd.DataFrame(np.nan, columns=self.feature_names, index=df.index)
+        df_features = df.drop(columns=[c for c in ('true_class', 'node_id') if c in df.columns])
+        attributions = explainer.attributions(self._project(self.prepare_features(df_features)))
+        frame = pd.DataFrame(attributions, columns=self.model_loader.get_feature_subset(), index=df.index)
+        return frame.reindex(columns=self.feature_names, fill_value=0.0)
+    
+    def _explainer(self) -> Optional[RBFExplainer]:
+        """The primary's explainer, or None if it is not an RBF SVC"""
+        name = self.model_loader.primary_name
+        if name not in self._explainers:
+            model = self.model_loader.registry[name]['model']
+            supported = RBFExplainer.supports(model)
+            self._explainers[name] = RBFExplainer.from_model_loader(self.model_loader, name) if supported else None
+        return self._explainers[name]
+    
+    def _top_factors(self, X_scaled: np.ndarray, action_codes: np.ndarray) -> np.ndarray:
+        """top_factors strings for BLOCK and MONITOR rows; left empty for ALLOW rows and non-SVC primaries"""
+        factors = np.full(len(X_scaled), '', dtype=object)
+        flagged = np.flatnonzero(action_codes > 0)
+        explainer = self._explainer() if len(flagged) else None
+        if explainer is not None:
+            X_flagged = self._project(X_scaled[flagged])
+            factors[flagged] = explainer.top_factors(explainer.attributions(X_flagged), TOP_FACTORS)
+        return factors
+    
+    def _similar_records(self, X_scaled: np.ndarray, action_codes: np.ndarray,
+                         k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest training rows of BLOCK rows; other rows are left empty"""
+        records = np.full(len(X_scaled), '', dtype=object)
+        anomaly_share = np.full(len(X_scaled), np.nan)
+        blocked = np.flatnonzero(action_codes == ACTIONS.index('BLOCK'))
+        if len(blocked):
+            index = self.neighbor_index
+            _, nearest = index.query(X_scaled[blocked], k)
+            rows = index.row_ids[nearest].astype(str)
+            records[blocked] = [', '.join(r) for r in rows]
+            anomaly_share[blocked] = (index.labels[nearest] == index.classes.index('Anomaly')).mean(axis=1).round(2)
+        return records, anomaly_share
     
     def get_feature_importance(self) -> pd.DataFrame:
         """
-        Get feature importance (if available)
+        Get global feature importance
         
         Returns:
-            DataFrame with feature names and importance scores
+            DataFrame with feature names and importance scores (accuracy drop
+            under permutation, from build_feature_importance.py), most
+            important first
         """
-        # For SVM, we can use coefficient magnitudes (if linear kernel)
-        # For RBF kernel, feature importance is not directly available
-        # Return placeholder
+        path = os.path.join(self.model_loader.model_dir, FEATURE_IMPORTANCE_FILE)
+        if os.path.exists(path):
+            return pd.read_csv(path)
+        # Not built yet; per-row attributions are still available via explain()
         return pd.DataFrame({
             'feature': self.feature_names,
-            'importance': ['N/A (RBF kernel)'] * len(self.feature_names)
+            'importance': ['N/A (run build_feature_importance.py)'] * len(self.feature_names)
         })
     
     def validate_single_row(self, row_dict: Dict[str, Any]) -> Tuple[bool, List[str]]:
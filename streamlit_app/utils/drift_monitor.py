@@ -0,0 +1,292 @@
+"""
+Drift Monitor Module
+Streaming per-feature histograms compared against the training distribution
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Written by build_drift_reference.py into the model directory
+DRIFT_REFERENCE_FILE = 'drift_reference.npz'
+
+# Population stability index thresholds (the usual rule of thumb)
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+# Floor for empty bins in the PSI log ratio
+PSI_EPSILON = 1e-4
+
+# Values are binned as float32, so a value lands in the same bin whether it
+# was read by SchemaCSVReader (float32) or parsed as float64
+BIN_DTYPE = np.float32
+
+
+def _locked(method):
+    """Run a DriftMonitor method under the monitor's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DriftMonitor:
+    """
+    Feature drift against the training data, in constant memory
+
+    Each feature has fixed bins taken from the training data: quantile
+    edges for numeric features (with a bin of its own for any value that
+    holds a large share of the rows, such as 0), and one bin per encoder
+    class for categoricals. Scoring folds every batch into per-feature count
+    vectors and sums, so state is O(features x bins) however many rows are
+    seen. Once min_rows rows have accumulated the window is compared with
+    the reference (PSI, binned KS distance and mean shift in training
+    standard deviations), alerts are raised for drifted features, and the
+    window starts over. Public methods hold a lock, so background jobs can
+    update the monitor while the page reads it.
+    """
+
+    def __init__(self, feature_names: Sequence[str], edges: List[np.ndarray], reference: List[np.ndarray],
+                 mean: np.ndarray, scale: np.ndarray, categorical: Sequence[str] = (),
+                 min_rows: int = 1000, max_alerts: int = 200):
+        """
+        Initialize DriftMonitor
+
+        Args:
+            feature_names: Features in model order
+            edges: Interior bin edges per feature (values >= edge go right)
+            reference: Training share of rows per bin, per feature
+            mean: Training mean per feature (the feature scaler's mean_)
+            scale: Training standard deviation per feature (scaler scale_)
+            categorical: Label-encoded features
+            min_rows: Rows per comparison window
+            max_alerts: Recent alerts kept
+        """
+        self.feature_names = list(feature_names)
+        self.categorical = [f for f in self.feature_names if f in set(categorical)]
+        self.edges = [np.asarray(e, dtype=BIN_DTYPE) for e in edges]
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.min_rows = min_rows
+        # Bins of all features laid end to end in one flat count vector
+        sizes = np.array([len(e) + 1 for e in self.edges])
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self._sizes = sizes
+        self.reference = np.concatenate([np.asarray(r, dtype=np.float64) for r in reference])
+        self._window = np.zeros(sizes.sum(), dtype=np.int64)
+        self._window_sum = np.zeros(len(self.feature_names))
+        self._window_rows = 0
+        self._total = np.zeros(sizes.sum(), dtype=np.int64)
+        self._total_sum = np.zeros(len(self.feature_names))
+        self._total_rows = 0
+        self.windows = 0
+        self.alerts = collections.deque(maxlen=max_alerts)
+        self.last_scores: Optional[pd.DataFrame] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def fit(cls, X: np.ndarray, feature_names: Sequence[str], mean: np.ndarray, scale: np.ndarray,
+            categorical: Dict[str, int] = None, n_bins: int = 10, atom_share: float = 0.05,
+            **kwargs) -> 'DriftMonitor':
+        """
+        Build the reference bins from training data
+
+        Args:
+            X: Encoded, unscaled training matrix (DataProcessor.encode_features)
+            feature_names: Features in model order
+            mean: Feature scaler mean_
+            scale: Feature scaler scale_
+            categorical: Number of encoder classes per label-encoded feature
+            n_bins: Quantile bins per numeric feature
+            atom_share: Share of rows at one value that gets its own bin
+            **kwargs: Passed to the constructor
+        """
+        categorical = categorical or {}
+        X = np.asarray(X, dtype=BIN_DTYPE)
+        edges, reference = [], []
+        for j, name in enumerate(feature_names):
+            column = X[:, j]
+            if name in categorical:
+                # One bin per code: edges halfway between consecutive codes
+                col_edges = (np.arange(categorical[name] - 1) + 0.5).astype(BIN_DTYPE)
+            else:
+                col_edges = np.quantile(column, np.linspace(0, 1, n_bins + 1)[1:-1]).astype(BIN_DTYPE)
+                values, counts = np.unique(column, return_counts=True)
+                atoms = values[counts >= atom_share * len(column)]
+                # [atom, next float) holds exactly the atom
+                col_edges = np.unique(np.concatenate([col_edges, atoms, np.nextafter(atoms, np.inf)]))
+            counts = np.bincount(np.searchsorted(col_edges, column, side='right'), minlength=len(col_edges) + 1)
+            edges.append(col_edges)
+            reference.append(counts / len(column))
+        return cls(feature_names, edges, reference, mean, scale, categorical=list(categorical), **kwargs)
+
+    def save(self, path: str):
+        """Write the reference bins as plain arrays"""
+        meta = {
+            'feature_names': self.feature_names,
+            'categorical': self.categorical,
+            'sizes': self._sizes.tolist(),
+        }
+        np.savez(path, edges=np.concatenate(self.edges), reference=self.reference, mean=self.mean,
+                 scale=self.scale, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'DriftMonitor':
+        """Monitor with the reference written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            bounds = np.cumsum([0] + meta['sizes'])
+            edge_bounds = np.cumsum([0] + [s - 1 for s in meta['sizes']])
+            edges = [data['edges'][a:b] for a, b in zip(edge_bounds[:-1], edge_bounds[1:])]
+            reference = [data['reference'][a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            return cls(meta['feature_names'], edges, reference, data['mean'], data['scale'],
+                       categorical=meta['categorical'], **kwargs)
+
+    @classmethod
+    def from_model_loader(cls, model_loader, **kwargs) -> Optional['DriftMonitor']:
+        """Monitor for the loaded model, or None if no reference has been built"""
+        path = os.path.join(model_loader.model_dir, DRIFT_REFERENCE_FILE)
+        if not os.path.exists(path):
+            return None
+        monitor = cls.load(path, **kwargs)
+        if monitor.feature_names != list(model_loader.feature_names):
+            print(f"⚠️ {DRIFT_REFERENCE_FILE} does not match the model features; drift monitoring is off")
+            return None
+        return monitor
+
+    @_locked
+    def update(self, X: np.ndarray) -> Optional[pd.DataFrame]:
+        """
+        Fold a batch into the current window
+
+        Args:
+            X: Encoded, unscaled feature matrix in model order
+
+        Returns:
+            Per-feature scores when this batch completed a window, else None
+        """
+        if len(X) == 0:
+            return None
+        return self.update_counts(*self.bin_counts(X))
+
+    def bin_counts(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        A batch's bin counts, feature sums and rows, without folding them in
+
+        Args:
+            X: Encoded, unscaled feature matrix in model order
+
+        Returns:
+            Arguments for update_counts()
+        """
+        counts = np.zeros(self._sizes.sum(), dtype=np.int64)
+        binned = np.asarray(X, dtype=BIN_DTYPE)
+        for j, col_edges in enumerate(self.edges):
+            bins = np.searchsorted(col_edges, binned[:, j], side='right')
+            start = self._offsets[j]
+            counts[start:start + len(col_edges) + 1] = np.bincount(bins, minlength=len(col_edges) + 1)
+        return counts, np.asarray(X, dtype=np.float64).sum(axis=0), len(X)
+
+    @_locked
+    def update_counts(self, counts: np.ndarray, sums: np.ndarray, rows: int) -> Optional[pd.DataFrame]:
+        """Fold bin_counts() output into the current window, as update() does"""
+        if rows == 0:
+            return None
+        self._window += counts
+        self._window_sum += sums
+        self._window_rows += rows
+        if self._window_rows < self.min_rows:
+            return None
+        return self._close_window()
+
+    def _close_window(self) -> pd.DataFrame:
+        scores = self._scores(self._window, self._window_sum, self._window_rows)
+        self.windows += 1
+        now = time.time()
+        for row in scores[scores['level'] != 'ok'].itertuples(index=False):
+            self.alerts.append({'time': now, 'window': self.windows, 'rows': self._window_rows,
+                                'feature': row.feature, 'psi': row.psi, 'ks': row.ks,
+                                'mean_shift': row.mean_shift, 'level': row.level})
+        self._total += self._window
+        self._total_sum += self._window_sum
+        self._total_rows += self._window_rows
+        self._window[:] = 0
+        self._window_sum[:] = 0
+        self._window_rows = 0
+        self.last_scores = scores
+        return scores
+
+    def _scores(self, counts: np.ndarray, sums: np.ndarray, rows: int) -> pd.DataFrame:
+        """PSI, KS and mean shift per feature for one set of counts"""
+        actual = np.maximum(counts / max(rows, 1), PSI_EPSILON)
+        expected = np.maximum(self.reference, PSI_EPSILON)
+        terms = (actual - expected) * np.log(actual / expected)
+        psi = np.add.reduceat(terms, self._offsets)
+
+        # Binned KS: largest gap between the per-feature cumulative shares
+        feature_of_bin = np.repeat(np.arange(len(self._sizes)), self._sizes)
+        gap = counts / max(rows, 1) - self.reference
+        cumulative = np.cumsum(gap)
+        cumulative -= np.repeat(np.concatenate([[0], cumulative[self._offsets[1:] - 1]]), self._sizes)
+        ks = np.zeros(len(self._sizes))
+        np.maximum.at(ks, feature_of_bin, np.abs(cumulative))
+
+        mean_shift = (sums / max(rows, 1) - self.mean) / np.where(self.scale > 0, self.scale, 1.0)
+        level = np.where(psi >= PSI_ALERT, 'alert', np.where(psi >= PSI_WARNING, 'warning', 'ok'))
+        scores = pd.DataFrame({
+            'feature': self.feature_names,
+            'psi': psi.round(4),
+            'ks': ks.round(4),
+            'mean_shift': mean_shift.round(3),
+            'level': level,
+        })
+        return scores.sort_values('psi', ascending=False, kind='stable').reset_index(drop=True)
+
+    @_locked
+    def report(self) -> pd.DataFrame:
+        """Scores over every row seen so far, including the open window"""
+        rows = self._total_rows + self._window_rows
+        return self._scores(self._total + self._window, self._total_sum + self._window_sum, rows)
+
+    def describe(self, top: int = 5) -> str:
+        """One-line summary of report(), for command-line output"""
+        if self.rows_seen < self.min_rows:
+            return f"Too few rows to compare ({self.rows_seen:,} of {self.min_rows:,})"
+        report = self.report()
+        drifted = report[report['level'] != 'ok']
+        if not len(drifted):
+            return f"No feature drift over {self.rows_seen:,} rows"
+        features = ', '.join(f"{row.feature} (PSI {row.psi:.2f})" for row in drifted.head(top).itertuples())
+        return f"{len(drifted)} features drifted over {self.rows_seen:,} rows: {features}"
+
+    @_locked
+    def recent_alerts(self, n: int = 20) -> pd.DataFrame:
+        """Latest alerts, newest first"""
+        alerts = list(self.alerts)[-n:][::-1]
+        return pd.DataFrame(alerts, columns=['time', 'window', 'rows', 'feature', 'psi', 'ks',
+                                             'mean_shift', 'level'])
+
+    @_locked
+    def reset(self):
+        """Forget all counts and alerts"""
+        for array in (self._window, self._window_sum, self._total, self._total_sum):
+            array[:] = 0
+        self._window_rows = self._total_rows = self.windows = 0
+        self.alerts.clear()
+        self.last_scores = None
+
+    @property
+    def rows_seen(self) -> int:
+        return self._total_rows + self._window_rows
+
+    def __repr__(self) -> str:
+        return (f"DriftMonitor({len(self.feature_names)} features, {len(self.reference)} bins, "
+                f"{self.rows_seen:,} rows, {len(self.alerts)} alerts)")
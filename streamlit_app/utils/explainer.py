@@ -0,0 +1,162 @@
+"""
+Explainer Module
+Per-prediction feature attributions and permutation importance for the RBF SVM
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from .scoring_bundle import KERNEL_BLOCK_ROWS
+
+
+# Written by build_feature_importance.py into the model directory
+FEATURE_IMPORTANCE_FILE = 'feature_importance.csv'
+
+
+class RBFExplainer:
+    """
+    Gradient x input attributions for an RBF-kernel SVC
+
+    The decision function f(x) = sum_i a_i exp(-gamma |x - sv_i|^2) + b has
+    the gradient -2 gamma sum_i a_i K_i (x - sv_i). Each feature's
+    attribution is its gradient component times the row's offset from the
+    scaler mean (0 in scaled space), converted to trust-score points. It is
+    a first-order estimate of how far that feature moves the row's trust
+    score away from an average connection. Negative values push towards
+    BLOCK. The kernel is evaluated in the same row blocks as
+    BundledSVC.decision_function, so explaining a row costs about one
+    more scoring pass.
+    """
+
+    def __init__(self, model, feature_names: Sequence[str], trust_scale: float = 1.0):
+        """
+        Args:
+            model: Fitted binary RBF SVC (scikit-learn or BundledSVC)
+            feature_names: Feature names in model order
+            trust_scale: Trust points per unit of decision value (trust_scaler.scale_)
+        """
+        if not self.supports(model):
+            raise ValueError("RBFExplainer needs an RBF-kernel SVC")
+        self.support_vectors = np.asarray(model.support_vectors_, dtype=np.float64)
+        self.coef = np.asarray(model.dual_coef_, dtype=np.float64)[0]
+        self.gamma = float(getattr(model, '_gamma', model.gamma))
+        self.feature_names = list(feature_names)
+        self.trust_scale = float(trust_scale)
+        self._sv_sq = (self.support_vectors * self.support_vectors).sum(axis=1)
+
+    @staticmethod
+    def supports(model) -> bool:
+        """Whether model is an RBF-kernel SVC this explainer can attribute"""
+        return getattr(model, 'kernel', 'rbf') == 'rbf' and hasattr(model, 'support_vectors_')
+
+    @classmethod
+    def from_model_loader(cls, model_loader, name: Optional[str] = None) -> 'RBFExplainer':
+        """Explainer for a registered model version (default: the primary)"""
+        entry = model_loader.registry[name or model_loader.primary_name]
+        return cls(entry['model'], model_loader.get_feature_subset(name),
+                   trust_scale=np.ravel(entry['trust_scaler'].scale_)[0])
+
+    def gradients(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Gradient of the decision function at each row, in scaled feature space"""
+        X = np.asarray(X_scaled, dtype=np.float64)
+        out = np.empty_like(X)
+        for start in range(0, len(X), KERNEL_BLOCK_ROWS):
+            block = X[start:start + KERNEL_BLOCK_ROWS]
+            sq_dist = (block * block).sum(axis=1)[:, None] + self._sv_sq[None, :] - 2.0 * (block @ self.support_vectors.T)
+            np.maximum(sq_dist, 0.0, out=sq_dist)
+            weights = np.exp(-self.gamma * sq_dist)
+            weights *= self.coef
+            # sum_i w_i (x - sv_i) = x * sum_i w_i - W @ SV
+            out[start:start + len(block)] = -2.0 * self.gamma * (
+                block * weights.sum(axis=1)[:, None] - weights @ self.support_vectors)
+        return out
+
+    def attributions(self, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        Per-row, per-feature attributions in trust-score points
+
+        Args:
+            X_scaled: Rows from DataProcessor.prepare_features
+
+        Returns:
+            Array of shape (rows, features)
+        """
+        X = np.asarray(X_scaled, dtype=np.float64)
+        return self.gradients(X) * X * self.trust_scale
+
+    def top_factors(self, attributions: np.ndarray, k: int = 3) -> List[str]:
+        """
+        The k features pulling each row's trust score down the most
+
+        Args:
+            attributions: Output of attributions()
+            k: Features per row
+
+        Returns:
+            One 'feature (-12.3), ...' string per row; rows with no negative
+            attribution get an empty string
+        """
+        if len(attributions) == 0:
+            return []
+        k = min(k, attributions.shape[1])
+        top = np.argpartition(attributions, k - 1, axis=1)[:, :k]
+        values = np.take_along_axis(attributions, top, axis=1)
+        order = np.argsort(values, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+        names = np.asarray(self.feature_names, dtype=object)[top]
+        return [', '.join(f"{name} ({value:+.1f})" for name, value in zip(row_names, row_values) if value < 0)
+                for row_names, row_values in zip(names, values)]
+
+
+def permutation_importance(model, X_scaled: np.ndarray, y: np.ndarray, feature_names: Sequence[str],
+                           trust_scale: float = 1.0, n_repeats: int = 3, max_workers: Optional[int] = None,
+                           random_state: int = 0) -> pd.DataFrame:
+    """
+    Global importance: accuracy lost when one feature's column is shuffled
+
+    Features are scored in parallel threads (the kernel matrix products
+    release the GIL); each repeat uses its own fixed permutation, so results
+    do not depend on the number of workers.
+
+    Args:
+        model: Fitted classifier with decision_function and classes_
+        X_scaled: Scaled feature matrix
+        y: True labels in model.classes_ terms
+        feature_names: Feature names in model order
+        trust_scale: Trust points per unit of decision value
+        n_repeats: Shuffles per feature
+        max_workers: Threads (default: ThreadPoolExecutor's default)
+        random_state: Seed for the permutations
+
+    Returns:
+        DataFrame with feature, importance (mean accuracy drop),
+        importance_std and trust_shift (mean absolute trust-score change),
+        sorted by importance
+    """
+    X = np.asarray(X_scaled, dtype=np.float64)
+    y = np.asarray(y)
+    classes = np.asarray(model.classes_)
+    base_decision = model.decision_function(X)
+    base_accuracy = (classes[(base_decision > 0).astype(int)] == y).mean()
+    rng = np.random.default_rng(random_state)
+    permutations = [rng.permutation(len(X)) for _ in range(n_repeats)]
+
+    def score_feature(j):
+        drops, shifts = [], []
+        X_perm = X.copy()
+        for perm in permutations:
+            X_perm[:, j] = X[perm, j]
+            decision = model.decision_function(X_perm)
+            drops.append(base_accuracy - (classes[(decision > 0).astype(int)] == y).mean())
+            shifts.append(np.abs(decision - base_decision).mean() * trust_scale)
+        return np.mean(drops), np.std(drops), np.mean(shifts)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        scores = list(pool.map(score_feature, range(X.shape[1])))
+
+    importance = pd.DataFrame(scores, columns=['importance', 'importance_std', 'trust_shift'])
+    importance.insert(0, 'feature', list(feature_names))
+    return importance.sort_values('importance', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,200 @@
+"""
+Exporter Module
+Streams prediction results to compressed files in chunks
+"""
+
+import gzip
+import io
+import tempfile
+import time
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .trust_policy import materialize
+
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'ndjson': ('.ndjson', 'application/x-ndjson'),
+}
+
+
+def available_formats() -> list:
+    """Export formats usable with the installed packages"""
+    formats = ['csv.gz', 'ndjson']
+    try:
+        import pyarrow.parquet  # noqa: F401
+        formats.insert(1, 'parquet')
+    except ImportError:
+        pass
+    return formats
+
+
+class ResultExporter:
+    """
+    Write results in fixed-size chunks to a file or spooled temp file
+
+    Rows are encoded chunk by chunk straight into the (compressed) output,
+    so peak memory is one encoded chunk rather than the whole results
+    frame as a string. Results may also be passed as an iterable of
+    DataFrames, e.g. from chunked scoring, and are never concatenated.
+    """
+
+    def __init__(self, fmt: str = 'csv.gz', chunk_rows: int = 50_000,
+                 spool_max_bytes: int = 16 * 1024 * 1024, compresslevel: int = 6):
+        """
+        Initialize ResultExporter
+
+        Args:
+            fmt: One of EXPORT_FORMATS
+            chunk_rows: Rows encoded per write
+            spool_max_bytes: In-memory size before a spooled file rolls to disk
+            compresslevel: gzip level for csv.gz (1 fastest - 9 smallest)
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.spool_max_bytes = spool_max_bytes
+        self.compresslevel = compresslevel
+
+    @property
+    def extension(self) -> str:
+        return EXPORT_FORMATS[self.fmt][0]
+
+    @property
+    def mime_type(self) -> str:
+        return EXPORT_FORMATS[self.fmt][1]
+
+    def export(self, results: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+               dest: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Export results
+
+        Args:
+            results: Results DataFrame or iterable of result chunks
+            dest: Output path, or None for a spooled temporary file
+
+        Returns:
+            Tuple of (binary file object rewound to the start, stats dict with
+            rows, bytes, seconds, rows_per_sec and mb_per_sec; seconds excludes
+            time spent producing the chunks, total_seconds includes it)
+        """
+        start = time.perf_counter()
+        self._upstream_seconds = 0.0
+        if dest is None:
+            raw = tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes, mode='w+b')
+        else:
+            raw = open(dest, 'w+b')
+
+        writer = {
+            'csv.gz': self._write_csv_gz,
+            'parquet': self._write_parquet,
+            'ndjson': self._write_ndjson,
+        }[self.fmt]
+        try:
+            rows = writer(self._chunks(results), raw)
+        except BaseException:
+            # Upstream failures (e.g. a cancelled scoring job) must not leak the handle
+            raw.close()
+            raise
+
+        raw.flush()
+        size = raw.tell()
+        raw.seek(0)
+        total_seconds = time.perf_counter() - start
+        seconds = total_seconds - self._upstream_seconds
+        stats = {
+            'format': self.fmt,
+            'rows': rows,
+            'bytes': size,
+            'seconds': seconds,
+            'total_seconds': total_seconds,
+            'rows_per_sec': rows / seconds if seconds > 0 else float('inf'),
+            'mb_per_sec': size / (1024 * 1024) / seconds if seconds > 0 else float('inf'),
+            'path': dest,
+        }
+        return raw, stats
+
+    def _chunks(self, results: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Iterable[pd.DataFrame]:
+        """
+        Split a frame (or each frame of an iterable) into chunk_rows pieces
+        
+        Every chunk is conformed to the first chunk's columns so files with
+        and without optional columns (node_id, true_class) share one schema,
+        and its coded columns are written out as labels.
+        """
+        frames = iter([results] if isinstance(results, pd.DataFrame) else results)
+        columns = None
+        while True:
+            # Time spent producing chunks upstream (e.g. scoring) is not export time
+            waited = time.perf_counter()
+            frame = next(frames, None)
+            self._upstream_seconds += time.perf_counter() - waited
+            if frame is None:
+                return
+            if columns is None:
+                columns = list(frame.columns)
+            elif list(frame.columns) != columns:
+                frame = frame.reindex(columns=columns)
+            for start in range(0, len(frame), self.chunk_rows):
+                yield materialize(frame.iloc[start:start + self.chunk_rows])
+
+    def _write_csv_gz(self, chunks: Iterable[pd.DataFrame], raw) -> int:
+        rows = 0
+        with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel) as gz:
+            text = io.TextIOWrapper(gz, encoding='utf-8', newline='')
+            for chunk in chunks:
+                chunk.to_csv(text, header=(rows == 0), index=False)
+                rows += len(chunk)
+            text.flush()
+            text.detach()
+        return rows
+
+    def _write_ndjson(self, chunks: Iterable[pd.DataFrame], raw) -> int:
+        rows = 0
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='\n')
+        for chunk in chunks:
+            chunk.to_json(text, orient='records', lines=True)
+            rows += len(chunk)
+        text.flush()
+        text.detach()
+        return rows
+
+    def _write_parquet(self, chunks: Iterable[pd.DataFrame], raw) -> int:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+        rows = 0
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(raw, table.schema, compression='zstd')
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+
+def export_filename(prefix: str, fmt: str, timestamp: Optional[str] = None) -> str:
+    """File name such as predictions_20251019_120000.csv.gz"""
+    timestamp = timestamp or time.strftime('%Y%m%d_%H%M%S')
+    return f"{prefix}_{timestamp}{EXPORT_FORMATS[fmt][0]}"
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """One-line human readable export report"""
+    return (f"{stats['rows']:,} rows → {stats['bytes'] / 1024:,.1f} KB {stats['format']} "
+            f"in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/s, "
+            f"{stats['mb_per_sec']:.1f} MB/s)")
@@ -0,0 +1,211 @@
+"""
+Feature Extractor Module
+Derives the KDD time- and host-window features from raw connection events
+"""
+
+from collections import deque
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Flags counted as SYN errors and REJ errors in the KDD window rates
+SERROR_FLAGS = frozenset({'S0', 'S1', 'S2', 'S3'})
+RERROR_FLAGS = frozenset({'REJ'})
+
+
+class _WindowCounts:
+    """Counters over the connections currently inside one window"""
+
+    __slots__ = ('host', 'srv', 'host_srv', 'host_port',
+                 'host_serror', 'host_rerror', 'srv_serror', 'srv_rerror')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, {})
+
+    def add(self, conn: tuple, delta: int):
+        """Add (delta=1) or remove (delta=-1) one connection"""
+        _, host, srv, port, serror, rerror = conn
+        self._bump(self.host, host, delta)
+        self._bump(self.srv, srv, delta)
+        self._bump(self.host_srv, (host, srv), delta)
+        self._bump(self.host_port, (host, port), delta)
+        if serror:
+            self._bump(self.host_serror, host, delta)
+            self._bump(self.srv_serror, srv, delta)
+        if rerror:
+            self._bump(self.host_rerror, host, delta)
+            self._bump(self.srv_rerror, srv, delta)
+
+    @staticmethod
+    def _bump(counter: dict, key: Any, delta: int):
+        value = counter.get(key, 0) + delta
+        if value:
+            counter[key] = value
+        else:
+            del counter[key]
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole, 2) if whole else 0.0
+
+
+class ConnectionFeatureExtractor:
+    """
+    Streaming extractor for the window-derived KDD features
+
+    Keeps a 2-second time window and a last-100-connections host window.
+    Each window is a deque of admitted connections plus hash counters, so
+    every event costs amortized O(1): it is counted once on arrival and
+    uncounted once when it leaves the window.
+    """
+
+    def __init__(self, feature_names: List[str], time_window: float = 2.0,
+                 host_window: int = 100, node_id_field: Optional[str] = 'src'):
+        """
+        Initialize ConnectionFeatureExtractor
+
+        Args:
+            feature_names: Output column order (ModelLoader.get_feature_names())
+            time_window: Length of the time-based window in seconds
+            host_window: Number of connections in the host-based window
+            node_id_field: Event field emitted as node_id (None to omit)
+        """
+        self.feature_names = list(feature_names)
+        self.time_window = time_window
+        self.host_window = host_window
+        self.node_id_field = node_id_field
+        self.reset()
+
+    def reset(self):
+        """Forget all windowed connections"""
+        self._time_conns = deque()
+        self._time_counts = _WindowCounts()
+        self._host_conns = deque()
+        self._host_counts = _WindowCounts()
+        self._last_time = float('-inf')
+
+    def process_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add one connection event and compute its feature row
+
+        Args:
+            event: Mapping with timestamp, src, dst, service, flag and
+                   optionally src_bytes/dst_bytes (or bytes), src_port,
+                   protocol_type, duration and any other model feature
+
+        Returns:
+            Dictionary with the model features (and node_id)
+        """
+        # Events are expected in time order; late events join the current edge
+        timestamp = max(float(event['timestamp']), self._last_time)
+        self._last_time = timestamp
+        dst = event['dst']
+        service = event['service']
+        flag = event['flag']
+        conn = (timestamp, dst, service, event.get('src_port'),
+                flag in SERROR_FLAGS, flag in RERROR_FLAGS)
+
+        # Time window: drop connections older than the window, then admit
+        horizon = timestamp - self.time_window
+        while self._time_conns and self._time_conns[0][0] < horizon:
+            self._time_counts.add(self._time_conns.popleft(), -1)
+        self._time_conns.append(conn)
+        self._time_counts.add(conn, 1)
+
+        # Host window: fixed number of most recent connections
+        if len(self._host_conns) == self.host_window:
+            self._host_counts.add(self._host_conns.popleft(), -1)
+        self._host_conns.append(conn)
+        self._host_counts.add(conn, 1)
+
+        row = {name: 0 for name in self.feature_names}
+        row.update({k: v for k, v in event.items() if k in row})
+        row['protocol_type'] = event.get('protocol_type', 'tcp')
+        row['service'] = service
+        row['flag'] = flag
+        if 'src_bytes' not in event and 'bytes' in event:
+            row['src_bytes'] = event['bytes']
+        if 'land' not in event and 'src' in event:
+            row['land'] = int(event['src'] == dst and event.get('src_port') == event.get('dst_port'))
+
+        row.update(self._time_features(dst, service))
+        row.update(self._host_features(dst, service, event.get('src_port')))
+
+        if self.node_id_field is not None and self.node_id_field in event:
+            row['node_id'] = event[self.node_id_field]
+        return row
+
+    def transform(self, events: Any) -> pd.DataFrame:
+        """
+        Process a batch of events in order
+
+        Args:
+            events: DataFrame or iterable of event mappings
+
+        Returns:
+            DataFrame in feature_names order, ready for DataProcessor
+        """
+        if isinstance(events, pd.DataFrame):
+            events = events.to_dict('records')
+        rows = [self.process_event(event) for event in events]
+        columns = (['node_id'] if rows and 'node_id' in rows[0] else []) + self.feature_names
+        return pd.DataFrame(rows, columns=columns)
+
+    def iter_batches(self, events: Iterable[Dict[str, Any]], batch_size: int = 10000):
+        """
+        Stream feature rows in fixed-size DataFrame batches
+
+        Args:
+            events: Iterable of event mappings (may be unbounded)
+            batch_size: Rows per yielded DataFrame
+
+        Yields:
+            DataFrames in feature_names order
+        """
+        batch = []
+        for event in events:
+            batch.append(event)
+            if len(batch) >= batch_size:
+                yield self.transform(batch)
+                batch = []
+        if batch:
+            yield self.transform(batch)
+
+    def _time_features(self, host: Any, service: Any) -> Dict[str, float]:
+        """Features over connections in the past time_window seconds"""
+        c = self._time_counts
+        count = c.host.get(host, 0)
+        srv_count = c.srv.get(service, 0)
+        same_srv = c.host_srv.get((host, service), 0)
+        return {
+            'count': count,
+            'srv_count': srv_count,
+            'serror_rate': _rate(c.host_serror.get(host, 0), count),
+            'srv_serror_rate': _rate(c.srv_serror.get(service, 0), srv_count),
+            'rerror_rate': _rate(c.host_rerror.get(host, 0), count),
+            'srv_rerror_rate': _rate(c.srv_rerror.get(service, 0), srv_count),
+            'same_srv_rate': _rate(same_srv, count),
+            'diff_srv_rate': _rate(count - same_srv, count),
+            'srv_diff_host_rate': _rate(srv_count - same_srv, srv_count),
+        }
+
+    def _host_features(self, host: Any, service: Any, src_port: Any) -> Dict[str, float]:
+        """Features over the last host_window connections"""
+        c = self._host_counts
+        host_count = c.host.get(host, 0)
+        srv_count = c.srv.get(service, 0)
+        same_srv = c.host_srv.get((host, service), 0)
+        same_port = c.host_port.get((host, src_port), 0) if src_port is not None else 0
+        return {
+            'dst_host_count': host_count,
+            'dst_host_srv_count': srv_count,
+            'dst_host_same_srv_rate': _rate(same_srv, host_count),
+            'dst_host_diff_srv_rate': _rate(host_count - same_srv, host_count),
+            'dst_host_same_src_port_rate': _rate(same_port, host_count),
+            'dst_host_srv_diff_host_rate': _rate(srv_count - same_srv, srv_count),
+            'dst_host_serror_rate': _rate(c.host_serror.get(host, 0), host_count),
+            'dst_host_srv_serror_rate': _rate(c.srv_serror.get(service, 0), srv_count),
+            'dst_host_rerror_rate': _rate(c.host_rerror.get(host, 0), host_count),
+            'dst_host_srv_rerror_rate': _rate(c.srv_rerror.get(service, 0), srv_count),
+        }
@@ -0,0 +1,150 @@
+"""
+Feature Selection Module
+Correlation scan, importance ranking and reduced-feature model variants
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .bakeoff import fit_candidate
+
+
+# The notebook's selection: |r| above this marks a redundant pair; top-k sizes by importance
+CORRELATION_THRESHOLD = 0.9
+TOP_SIZES = (30, 20, 15)
+
+# Ranking, correlated pairs and subsets, as train_pipeline.py writes them to the model directory
+FEATURE_SUBSETS_FILE = 'feature_subsets.json'
+
+
+def correlated_pairs(X: np.ndarray, feature_names: Sequence[str],
+                     threshold: float = CORRELATION_THRESHOLD) -> pd.DataFrame:
+    """
+    Feature pairs whose absolute Pearson correlation exceeds threshold
+
+    One matrix product gives every correlation at once; constant columns
+    correlate with nothing.
+
+    Args:
+        X: Encoded feature matrix (rows x features)
+        feature_names: Column names of X
+        threshold: Absolute correlation above which a pair is reported
+
+    Returns:
+        DataFrame with Feature1, Feature2 (Feature1 first in column order)
+        and Correlation, in row-major order over the upper triangle
+    """
+    X = np.asarray(X, dtype=np.float64)
+    centered = X - X.mean(axis=0)
+    norms = np.sqrt((centered * centered).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (centered.T @ centered) / np.outer(norms, norms)
+    i, j = np.triu_indices(X.shape[1], k=1)
+    values = corr[i, j]
+    hit = np.abs(np.nan_to_num(values)) > threshold
+    names = np.asarray(feature_names, dtype=object)
+    return pd.DataFrame({'Feature1': names[i[hit]], 'Feature2': names[j[hit]], 'Correlation': values[hit]})
+
+
+def rank_features(X: np.ndarray, y: np.ndarray, feature_names: Sequence[str],
+                  random_state: int = 42) -> pd.DataFrame:
+    """
+    Random Forest importance ranking, as the notebook computes it
+
+    Args:
+        X: Training matrix
+        y: Training labels
+        feature_names: Column names of X
+        random_state: Forest seed
+
+    Returns:
+        DataFrame with feature and importance, most important first
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    forest = RandomForestClassifier(n_estimators=100, random_state=random_state, n_jobs=-1).fit(X, y)
+    ranking = pd.DataFrame({'feature': list(feature_names), 'importance': forest.feature_importances_})
+    return ranking.sort_values('importance', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def drop_correlated(pairs: pd.DataFrame, ranking: pd.DataFrame) -> List[str]:
+    """
+    The less important feature of every correlated pair
+
+    Args:
+        pairs: correlated_pairs() output
+        ranking: rank_features() output
+
+    Returns:
+        Features to drop, in ranking order
+    """
+    rank = pd.Series(np.arange(len(ranking)), index=ranking['feature'])
+    first, second = pairs['Feature1'].map(rank).to_numpy(), pairs['Feature2'].map(rank).to_numpy()
+    dropped = set(np.where(first < second, pairs['Feature2'], pairs['Feature1']))
+    return [f for f in ranking['feature'] if f in dropped]
+
+
+def feature_subsets(ranking: pd.DataFrame, pairs: pd.DataFrame, feature_names: Sequence[str],
+                    sizes: Sequence[int] = TOP_SIZES) -> Dict[str, List[str]]:
+    """
+    The notebook's feature sets
+
+    Args:
+        ranking: rank_features() output
+        pairs: correlated_pairs() output
+        feature_names: All features, in model order
+        sizes: Top-k sizes
+
+    Returns:
+        Full_Features, Reduced_Corr (correlated pairs' weaker features
+        dropped) and Top_<k> subsets, each in model feature order so a
+        variant's columns are a plain projection of the full matrix
+    """
+    def in_model_order(features):
+        keep = set(features)
+        return [f for f in feature_names if f in keep]
+
+    dropped = set(drop_correlated(pairs, ranking))
+    subsets = {
+        'Full_Features': list(feature_names),
+        'Reduced_Corr': [f for f in feature_names if f not in dropped],
+    }
+    for k in sizes:
+        subsets[f'Top_{k}'] = in_model_order(ranking['feature'].head(k))
+    return subsets
+
+
+def default_estimator():
+    """The deployed model's settings"""
+    from sklearn.svm import SVC
+    return SVC(kernel='rbf', C=10, gamma='scale', probability=True, random_state=42)
+
+
+def train_subset_models(subsets: Dict[str, List[str]], X_scaled: np.ndarray, y: np.ndarray,
+                        feature_names: Sequence[str], estimator: Any = None,
+                        max_workers: Optional[int] = None) -> Dict[str, Tuple[Any, float]]:
+    """
+    Fit one model per feature subset, one process each
+
+    Args:
+        subsets: Feature lists by name (feature_subsets() output)
+        X_scaled: Scaled training matrix over all features
+        y: 1 = Normal, 0 = Anomaly
+        feature_names: Column names of X_scaled
+        estimator: Unfitted estimator cloned per subset (default: default_estimator())
+        max_workers: Processes (default: one per CPU, at most one per subset)
+
+    Returns:
+        (fitted estimator, training seconds) by name, in subsets order
+    """
+    from sklearn.base import clone
+    estimator = estimator if estimator is not None else default_estimator()
+    index = {f: i for i, f in enumerate(feature_names)}
+    workers = max_workers or min(len(subsets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fit_candidate, name, clone(estimator), X_scaled[:, [index[f] for f in features]], y)
+                   for name, features in subsets.items()]
+        fitted = {name: (model, seconds) for name, model, seconds in (f.result() for f in futures)}
+    return {name: fitted[name] for name in subsets}
@@ -0,0 +1,486 @@
+"""
+Job Manager Module
+Scores uploads in a background worker pool that outlives page reruns
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from .csv_reader import SchemaCSVReader
+from .data_processor import DataProcessor
+from .exporter import ResultExporter, available_formats
+from .progressive import ProgressiveEstimator, sample_lines
+from .result_cache import ResultCache
+from .result_summary import DIMENSIONS, ResultSummary
+from .validator import ValidationReport
+
+
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+
+def file_hash(data: bytes) -> str:
+    """Content hash identifying an uploaded file"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation was requested"""
+
+
+class _StagedNodeState:
+    """NodeStateStore stand-in that holds a job's updates until commit()"""
+
+    def __init__(self, store):
+        self.store = store
+        self._batches = []
+
+    def update(self, node_ids, trust_scores, actions, timestamps=None):
+        # Stamped when scored, as the store would, not when the job commits
+        self._batches.append((np.asarray(node_ids), np.asarray(trust_scores), np.asarray(actions),
+                              time.time() if timestamps is None else timestamps))
+
+    def commit(self):
+        for batch in self._batches:
+            self.store.update(*batch)
+        self._batches = []
+
+
+class _StagedDrift:
+    """DriftMonitor stand-in that holds a job's bin counts until commit()"""
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self._batches = []
+
+    def update(self, X: np.ndarray):
+        if len(X):
+            self._batches.append(self.monitor.bin_counts(X))
+
+    def commit(self):
+        for batch in self._batches:
+            self.monitor.update_counts(*batch)
+        self._batches = []
+
+
+class Job:
+    """
+    One scoring job over an uploaded file
+
+    The worker thread updates the counters as chunks complete; the page
+    only reads them, so no locking is needed for progress display.
+    """
+
+    # Attributes persisted to job.json
+    _META = ('id', 'session_id', 'file_hash', 'name', 'size', 'status', 'rows_read',
+             'rows_scored', 'quarantined', 'chunks', 'issues', 'error', 'created',
+             'started', 'finished', 'result_format')
+
+    def __init__(self, session_id: str, file_hash: str, name: str, size: int, job_dir: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.session_id = session_id
+        self.file_hash = file_hash
+        self.name = name
+        self.size = size
+        self.dir = job_dir
+        self.status = 'queued'
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.rows_scored = 0
+        self.quarantined = 0
+        self.chunks = 0
+        self.issues = []
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result_format = None
+        # Progressive jobs: ProgressiveEstimator.estimate() output, refreshed per chunk
+        self.estimate = None
+        self.estimate_seconds = None
+        self._cancel = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the file consumed, by bytes"""
+        if self.status == 'done':
+            return 1.0
+        if self.size:
+            return min(self.bytes_read / self.size, 0.99)
+        return 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Time spent running so far (or in total once finished)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def cancel(self):
+        """Ask the worker to stop after the chunk it is scoring"""
+        self._cancel.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {attr: getattr(self, attr) for attr in self._META}
+
+    @classmethod
+    def from_dict(cls, meta: Dict[str, Any], job_dir: str) -> 'Job':
+        job = cls(meta['session_id'], meta['file_hash'], meta['name'], meta['size'], job_dir)
+        for attr in cls._META:
+            setattr(job, attr, meta.get(attr, getattr(job, attr)))
+        job.bytes_read = job.size
+        return job
+
+
+class JobManager:
+    """
+    Background executor for large uploads
+
+    Jobs are keyed by (session id, file hash): submitting the same file
+    again from the same session returns the queued, running or finished
+    job instead of scoring it twice. Each job reads its file in chunks,
+    reports chunk-level progress, can be cancelled between chunks, and
+    streams its results to disk as they are scored. Its node_state and
+    drift_monitor updates are held back until it is done, and its
+    results_store batch is deleted if it fails or is cancelled, so a job
+    scored again after either counts its rows once. Finished jobs are
+    persisted (results file, summary state and job.json), so a page
+    reattaches to them after a rerun or a server restart.
+
+    With a ResultCache, finished jobs move into it under the file hash and
+    the models' fingerprint, and a file any session already scored with
+    the same models and options comes back as a done job without being
+    read again. A cached file does not update node_state, results_store or
+    drift_monitor a second time, just as reattaching to a job does not.
+
+    Progressive jobs first score a stratified sample of the file and
+    publish estimates with confidence intervals as job.estimate, then
+    refine them after every chunk until they equal the exact counts.
+    """
+
+    def __init__(self, model_loader, results_dir: Optional[str] = None, max_workers: int = 2,
+                 chunksize: int = 20_000, node_state=None, results_store=None,
+                 max_age: float = 24 * 3600, explain: bool = False, drift_monitor=None,
+                 neighbor_index=None, neighbors: int = 0, result_cache: Optional[ResultCache] = None,
+                 progressive: bool = False):
+        """
+        Initialize JobManager
+
+        Args:
+            model_loader: Loaded ModelLoader shared by all jobs
+            results_dir: Where finished jobs are kept (default: a temp dir)
+            max_workers: Jobs that run at the same time
+            chunksize: Rows scored per chunk
+            node_state: Optional NodeStateStore every job updates
+            results_store: Optional ResultsStore every job appends its decisions to
+            max_age: Seconds after which finished jobs are deleted
+            explain: Add top_factors to BLOCK and MONITOR rows (see DataProcessor.predict)
+            drift_monitor: Optional DriftMonitor every job feeds
+            neighbor_index: Optional NeighborIndex over the training data
+            neighbors: Nearest training records listed per BLOCK row (0 = none)
+            result_cache: Optional ResultCache shared with other managers
+                          and sessions (finished jobs then live in it and
+                          are evicted by its size budget, not max_age)
+            progressive: Publish sample-based estimates as job.estimate
+                         before and while the file is scored
+        """
+        self.model_loader = model_loader
+        self.results_dir = results_dir or os.path.join(tempfile.gettempdir(), 'node_auth_jobs')
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.node_state = node_state
+        self.results_store = results_store
+        self.max_age = max_age
+        self.explain = explain
+        self.drift_monitor = drift_monitor
+        self.neighbor_index = neighbor_index
+        self.neighbors = neighbors
+        self.result_cache = result_cache
+        self.progressive = progressive
+        # Whatever changes a file's output: the models, the optional columns and the summary layout
+        options = [model_loader.fingerprint(), explain, neighbors if neighbor_index is not None else 0,
+                   list(DIMENSIONS.items())]
+        self.fingerprint = hashlib.sha256(json.dumps(options).encode()).hexdigest()
+        self.reader = SchemaCSVReader.from_model_loader(model_loader)
+        # Parquet keeps dtypes on reload; gzip CSV when pyarrow is missing
+        self.result_format = 'parquet' if 'parquet' in available_formats() else 'csv.gz'
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scoring-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.results_dir, exist_ok=True)
+
+    def submit(self, session_id: str, name: str, data: bytes, force: bool = False) -> Job:
+        """
+        Start scoring an uploaded file, or reattach to an existing job
+
+        Args:
+            session_id: Id of the browser session submitting the file
+            name: File name, for display
+            data: File contents
+            force: Score again even if a live or finished job exists
+
+        Returns:
+            The Job for (session_id, hash of data)
+        """
+        key = (session_id, file_hash(data))
+        with self._lock:
+            job = self._lookup(key)
+            if job is not None and job.status in ('queued', 'running', 'done') and not force:
+                return job
+            if job is not None:
+                job.cancel()
+                if job.is_finished:
+                    self._remove_files(job)
+            job = Job(session_id, key[1], name, len(data), self._job_root(key))
+            # Its own directory: a replaced job still running must not clean up the new one's files
+            job.dir = os.path.join(job.dir, job.id)
+            self._jobs[key] = job
+        self.cleanup()
+        self._pool.submit(self._run, job, data)
+        return job
+
+    def get(self, session_id: str, digest: str) -> Optional[Job]:
+        """Job for a session and file hash, from memory or from disk"""
+        with self._lock:
+            return self._lookup((session_id, digest))
+
+    def jobs(self, session_id: Optional[str] = None) -> List[Job]:
+        """Jobs known to this process, newest first"""
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if session_id is None or j.session_id == session_id]
+        return sorted(jobs, key=lambda j: j.created, reverse=True)
+
+    def cancel(self, job: Job):
+        """Request cancellation; a queued job never starts, a running one stops at the next chunk"""
+        job.cancel()
+
+    def load_results(self, job: Job) -> Dict[str, Any]:
+        """
+        Load a finished job's output
+
+        Args:
+            job: Job with status 'done'
+
+        Returns:
+            Dict with 'results_df', 'summary' (ResultSummary), 'report'
+            (merged ValidationReport) and 'shadow' (ShadowMonitor)
+        """
+        if job.status != 'done':
+            raise ValueError(f"Job {job.id} is {job.status}, not done")
+        if self._is_cached(job):
+            # Kept in memory by the cache after the first load
+            return self.result_cache.load(self._cache_key(job.file_hash), lambda _: self._read_output(job))
+        return self._read_output(job)
+
+    def _read_output(self, job: Job) -> Dict[str, Any]:
+        with open(os.path.join(job.dir, 'state.pkl'), 'rb') as f:
+            state = pickle.load(f)
+        path = self._results_path(job)
+        if job.rows_scored == 0:
+            # Every row was quarantined; keep the schema so pages and filters still work
+            processor = DataProcessor(self.model_loader, neighbor_index=self.neighbor_index)
+            results_df = processor.empty_results(explain=self.explain, neighbors=self.neighbors)
+        elif job.result_format == 'parquet':
+            results_df = pd.read_parquet(path)
+        else:
+            results_df = pd.read_csv(path)
+        state['results_df'] = results_df
+        return state
+
+    def cleanup(self, max_age: Optional[float] = None) -> int:
+        """
+        Delete finished jobs older than max_age, in memory and on disk
+
+        Returns:
+            Number of jobs removed
+        """
+        max_age = self.max_age if max_age is None else max_age
+        cutoff = time.time() - max_age
+        removed = 0
+        with self._lock:
+            for key, job in list(self._jobs.items()):
+                if job.is_finished and (job.finished or job.created) < cutoff:
+                    del self._jobs[key]
+                    if not self._is_cached(job):
+                        shutil.rmtree(job.dir, ignore_errors=True)
+                    removed += 1
+        return removed
+
+    def shutdown(self, cancel: bool = True):
+        """Stop the worker pool, cancelling unfinished jobs by default"""
+        if cancel:
+            for job in self.jobs():
+                job.cancel()
+        self._pool.shutdown(wait=True)
+
+    def _lookup(self, key) -> Optional[Job]:
+        """In-memory job, or a finished one left on disk by an earlier process or in the cache"""
+        job = self._jobs.get(key)
+        if job is not None and job.status == 'done' and not os.path.isdir(job.dir):
+            # Evicted from the result cache
+            del self._jobs[key]
+            job = None
+        if job is None:
+            meta_path = self._latest_meta(self._job_root(key))
+            if self.result_cache is not None and not os.path.exists(meta_path):
+                meta_path = os.path.join(self.result_cache.path(self._cache_key(key[1])), 'job.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    job = Job.from_dict(json.load(f), os.path.dirname(meta_path))
+                job.session_id = key[0]
+                self._jobs[key] = job
+        return job
+
+    def _job_root(self, key) -> str:
+        """Directory holding the job directories of a (session id, file hash)"""
+        return os.path.join(self.results_dir, key[0], key[1][:32])
+
+    @staticmethod
+    def _latest_meta(root: str) -> str:
+        """job.json of the most recently finished job under root (a missing path if none)"""
+        paths = [os.path.join(entry.path, 'job.json') for entry in os.scandir(root)] if os.path.isdir(root) else []
+        paths = [path for path in paths if os.path.exists(path)]
+        return max(paths, key=os.path.getmtime) if paths else os.path.join(root, 'job.json')
+
+    def _cache_key(self, digest: str) -> str:
+        return ResultCache.key(digest, self.fingerprint)
+
+    def _is_cached(self, job: Job) -> bool:
+        return self.result_cache is not None and job.dir == self.result_cache.path(self._cache_key(job.file_hash))
+
+    def _remove_files(self, job: Job):
+        """Delete a finished job's files (its cache entry, if it was cached)"""
+        if self._is_cached(job):
+            self.result_cache.discard(self._cache_key(job.file_hash))
+        else:
+            shutil.rmtree(job.dir, ignore_errors=True)
+
+    def _score_sample(self, job: Job, data: bytes) -> ProgressiveEstimator:
+        """Score a stratified sample and publish the first estimate"""
+        start = time.perf_counter()
+        sample, stratum, stratum_rows = sample_lines(data)
+        estimator = ProgressiveEstimator(stratum_rows)
+        # A plain processor: sampled rows must not reach node state, drift or the store
+        sampler = DataProcessor(self.model_loader)
+        processed_df, _ = sampler.validate_and_prepare(self.reader.read(io.BytesIO(sample)))
+        if len(processed_df):
+            estimator.fit(stratum, sampler.predict(processed_df), processed_df.index)
+        job.estimate = estimator.estimate()
+        job.estimate_seconds = time.perf_counter() - start
+        return estimator
+
+    def _results_path(self, job: Job) -> str:
+        return os.path.join(job.dir, 'results' + ResultExporter(job.result_format).extension)
+
+    def _run(self, job: Job, data: bytes):
+        if job.cancel_requested:
+            job.status = 'cancelled'
+            job.finished = time.time()
+            return
+        job.status = 'running'
+        job.started = time.time()
+        job.result_format = self.result_format
+        summary = ResultSummary()
+        reports = []
+        node_state = _StagedNodeState(self.node_state) if self.node_state is not None else None
+        drift_monitor = _StagedDrift(self.drift_monitor) if self.drift_monitor is not None else None
+        processor = DataProcessor(self.model_loader, node_state=node_state,
+                                  drift_monitor=drift_monitor, neighbor_index=self.neighbor_index)
+        handle = io.BytesIO(data)
+        batch_id = None
+        estimator = None
+        status = 'failed'
+
+        def scored_chunks():
+            for chunk in self.reader.iter_chunks(handle, self.chunksize):
+                if job.cancel_requested:
+                    raise JobCancelled()
+                job.rows_read += len(chunk)
+                processed_df, issues = processor.validate_and_prepare(chunk)
+                reports.append(processor.validation_report)
+                job.quarantined += processor.validation_report.quarantined_rows
+                job.issues.extend(i for i in issues if i not in job.issues)
+                if len(processed_df):
+                    results_df = processor.predict(processed_df, summary=summary, explain=self.explain,
+                                                   neighbors=self.neighbors)
+                    job.rows_scored += len(results_df)
+                    if batch_id is not None:
+                        self.results_store.append(batch_id, results_df)
+                    yield results_df
+                job.chunks += 1
+                job.bytes_read = handle.tell()
+                if estimator is not None:
+                    job.estimate = estimator.estimate(summary, job.rows_read)
+
+        try:
+            os.makedirs(job.dir, exist_ok=True)
+            if self.progressive:
+                estimator = self._score_sample(job, data)
+            if self.results_store is not None:
+                batch_id = self.results_store.begin_batch(job.name, job.file_hash, self.model_loader.primary_name)
+            out, _ = ResultExporter(job.result_format).export(scored_chunks(), dest=self._results_path(job))
+            out.close()
+            if job.cancel_requested:
+                # Replaced or cancelled while scoring the last chunk
+                raise JobCancelled()
+            with open(os.path.join(job.dir, 'state.pkl'), 'wb') as f:
+                pickle.dump({
+                    'summary': summary,
+                    'report': ValidationReport.combine(reports),
+                    'shadow': processor.shadow_monitor,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            status = 'done'
+        except JobCancelled:
+            status = 'cancelled'
+        except Exception as e:
+            status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
+            try:
+                if status == 'done':
+                    try:
+                        self._publish(job, batch_id, [node_state, drift_monitor])
+                    except Exception as e:
+                        status = 'failed'
+                        job.error = f"Could not save the results: {e}"
+                if status != 'done':
+                    # Decisions and files of cancelled or failed jobs are taken back out
+                    if batch_id is not None:
+                        self.results_store.delete_batch(batch_id)
+                    self._remove_files(job)
+            finally:
+                # Published last, so a finished job's updates and files are all in place
+                job.status = status
+
+    def _publish(self, job: Job, batch_id: Optional[int], staged: List[Any]):
+        """Persist a scored job, then apply its side effects; file steps come first, as they can be undone"""
+        with open(os.path.join(job.dir, 'job.json'), 'w') as f:
+            json.dump(dict(job.to_dict(), status='done'), f)
+        if self.result_cache is not None:
+            job.dir = self.result_cache.put(self._cache_key(job.file_hash), job.dir)
+        if batch_id is not None:
+            self.results_store.finish_batch(batch_id, quarantined=job.quarantined)
+        for updates in staged:
+            if updates is not None:
+                updates.commit()
@@ -3,72 +3,277 @@ Model Loader Module
 Handles loading of all trained models and preprocessing components
 """
 
-import joblib
+import hashlib
+import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from .quantized_model import quantized_bundle_file
+from .scoring_bundle import BUNDLE_FILE, load_bundle, source_digest
+from .trust_policy import TRUST_POLICY_FILE
+
+
+# Registry name of the model shipped as svm_optimized_model.pkl
+DEFAULT_MODEL_NAME = 'svm_optimized'
+MODEL_ROLES = ('primary', 'shadow')
+
+
+def _load_pickle(path: str) -> Any:
+    """joblib.load, imported on first use (it is only needed for pickles)"""
+    import joblib
+    return joblib.load(path)
 
 
 class ModelLoader:
-    """Load and manage ML models and preprocessing components"""
+    """
+    Load and manage ML models and preprocessing components
+
+    Besides the default SVM, the loader keeps a registry of named model
+    versions that share the preprocessing (encoders, feature scaler).
+    One version is the primary, whose results are returned; the others
+    are shadows scored alongside it for comparison. Extra versions are
+    listed in model_registry.json or added with register_model(). A
+    version trained on a feature subset (build_feature_subsets.py) is
+    scored on just those columns of the scaled matrix.
+
+    When scoring_bundle.npz (build_scoring_bundle.py) matches the pickles,
+    the primary model and preprocessing are loaded from it with NumPy
+    alone, so scoring never imports scikit-learn or joblib. With
+    quantization set, the int8 or float16 copy of the bundle
+    (build_quantized_model.py) is loaded instead.
+    """
     
-    def __init__(self, model_dir: str = '../models'):
+    def __init__(self, model_dir: str = '../models', use_bundle: bool = True,
+                 quantization: Optional[str] = None):
         """
         Initialize ModelLoader
         
         Args:
             model_dir: Directory containing saved model files
+            use_bundle: Load from scoring_bundle.npz when it is up to date
+            quantization: 'int8' or 'float16' to load the quantized bundle
         """
         self.model_dir = model_dir
+        self.use_bundle = use_bundle
+        self.quantization = quantization
+        self.model_source = None
         self.model = None
         self.scaler = None
         self.trust_scaler = None
+        # The base SVM's trust scaler, the default for new versions (trust_scaler follows the primary)
+        self.base_trust_scaler = None
         self.label_encoders = None
         self.feature_names = None
+        self.imputation_values = None
+        self.registry = {}
+        self.primary_name = None
         
         self._load_all_models()
+        self._load_registry()
     
     def _load_all_models(self):
         """Load all model components"""
+        if self.use_bundle and self._load_bundle():
+            return
         try:
             # Load SVM model
             model_path = os.path.join(self.model_dir, 'svm_optimized_model.pkl')
-            self.model = joblib.load(model_path)
+            self.model = _load_pickle(model_path)
+            self.model_source = model_path
             print(f"✓ Loaded model from {model_path}")
             
             # Load feature scaler
             scaler_path = os.path.join(self.model_dir, 'feature_scaler.pkl')
-            self.scaler = joblib.load(scaler_path)
+            self.scaler = _load_pickle(scaler_path)
             print(f"✓ Loaded scaler from {scaler_path}")
             
             # Load trust scaler
             trust_scaler_path = os.path.join(self.model_dir, 'trust_scaler.pkl')
-            self.trust_scaler = joblib.load(trust_scaler_path)
+            self.trust_scaler = _load_pickle(trust_scaler_path)
             print(f"✓ Loaded trust scaler from {trust_scaler_path}")
             
             # Load label encoders
             encoders_path = os.path.join(self.model_dir, 'label_encoders.pkl')
-            self.label_encoders = joblib.load(encoders_path)
+            self.label_encoders = _load_pickle(encoders_path)
             print(f"✓ Loaded label encoders from {encoders_path}")
             
             # Load feature names
             features_path = os.path.join(self.model_dir, 'feature_names.pkl')
-            self.feature_names = joblib.load(features_path)
+            self.feature_names = _load_pickle(features_path)
             print(f"✓ Loaded {len(self.feature_names)} feature names")
             
+            # Load imputation values (optional; built by build_imputation_values.py)
+            imputation_path = os.path.join(self.model_dir, 'imputation_values.pkl')
+            if os.path.exists(imputation_path):
+                self.imputation_values = _load_pickle(imputation_path)
+                print(f"✓ Loaded imputation values from {imputation_path}")
+            else:
+                self.imputation_values = self._default_imputation_values()
+                print("⚠️ imputation_values.pkl not found, imputing scaler means")
+            
         except Exception as e:
             raise Exception(f"Error loading models: {e}")
     
-    def get_model(self):
-        """Get the trained SVM model"""
-        return self.model
+    def _load_bundle(self) -> bool:
+        """Load the NumPy scoring bundle if it was built from the current pickles"""
+        bundle_file = quantized_bundle_file(self.quantization) if self.quantization else BUNDLE_FILE
+        bundle_path = os.path.join(self.model_dir, bundle_file)
+        if not os.path.exists(bundle_path):
+            if self.quantization:
+                print(f"⚠️ {bundle_file} not found (run build_quantized_model.py); loading the full model")
+                self.quantization = None
+                return self._load_bundle()
+            return False
+        bundle = load_bundle(bundle_path, digest=source_digest(self.model_dir))
+        if bundle is None:
+            script = 'build_quantized_model.py' if self.quantization else 'build_scoring_bundle.py'
+            print(f"⚠️ {bundle_file} is out of date (run {script}); loading pickles")
+            return False
+        for attr in ('model', 'scaler', 'trust_scaler', 'label_encoders', 'feature_names', 'imputation_values'):
+            setattr(self, attr, bundle[attr])
+        self.model_source = bundle_path
+        kind = f"{self.quantization} scoring bundle" if self.quantization else "scoring bundle"
+        print(f"✓ Loaded {kind} from {bundle_path} ({len(self.feature_names)} features)")
+        return True
+    
+    def _load_registry(self):
+        """Register the default model, then any versions in model_registry.json"""
+        self.base_trust_scaler = self.trust_scaler
+        self.register_model(DEFAULT_MODEL_NAME, self.model, self.trust_scaler, role='primary',
+                            source=self.model_source)
+        
+        registry_path = os.path.join(self.model_dir, 'model_registry.json')
+        if not os.path.exists(registry_path):
+            return
+        with open(registry_path) as f:
+            config = json.load(f)
+        for entry in config.get('models', []):
+            self.load_model_version(entry['name'], entry['model'], entry.get('trust_scaler'),
+                                    role=entry.get('role', 'shadow'), feature_subset=entry.get('feature_subset'))
+        if config.get('primary'):
+            self.set_primary(config['primary'])
+        print(f"✓ Loaded model registry: primary={self.primary_name}, shadows={self.get_shadow_names()}")
+    
+    def register_model(self, name: str, model: Any, trust_scaler: Any = None,
+                       role: str = 'shadow', source: Optional[str] = None,
+                       feature_subset: Optional[Sequence[str]] = None):
+        """
+        Add (or replace) a named model version
+        
+        Args:
+            name: Registry name
+            model: Fitted classifier over the scaled features (all 41, or
+                   feature_subset in that order)
+            trust_scaler: Scaler mapping the model's scores to 0-100
+                          (default: the base SVM's, trust_scaler.pkl)
+            role: 'primary' or 'shadow'
+            source: Where the model was loaded from, for display
+            feature_subset: Features the model was trained on (default: all)
+        """
+        if role not in MODEL_ROLES:
+            raise ValueError(f"Unknown model role {role!r}; expected one of {MODEL_ROLES}")
+        columns = None
+        if feature_subset is not None:
+            if not len(feature_subset):
+                raise ValueError(f"Model {name!r} has an empty feature subset")
+            unknown = [f for f in feature_subset if f not in self.feature_names]
+            if unknown:
+                raise ValueError(f"Model {name!r} uses unknown features: {unknown}")
+            feature_subset = list(feature_subset)
+            columns = np.array([list(self.feature_names).index(f) for f in feature_subset], dtype=np.intp)
+        self.registry[name] = {
+            'model': model,
+            'trust_scaler': trust_scaler if trust_scaler is not None else self.base_trust_scaler,
+            'role': 'shadow',
+            'source': source,
+            'feature_subset': feature_subset,
+            'columns': columns,
+            # Files in model_dir the version was loaded from, hashed by fingerprint()
+            'files': (),
+        }
+        if role == 'primary' or name == self.primary_name:
+            self.set_primary(name)
+    
+    def load_model_version(self, name: str, model_file: str, trust_scaler_file: Optional[str] = None,
+                           role: str = 'shadow', feature_subset: Optional[Sequence[str]] = None):
+        """
+        Load a model version from files in the model directory
+        
+        Args:
+            name: Registry name
+            model_file: Model pickle, relative to model_dir
+            trust_scaler_file: Optional trust scaler pickle, relative to model_dir
+            role: 'primary' or 'shadow'
+            feature_subset: Features the model was trained on (default: all)
+        """
+        model_path = os.path.join(self.model_dir, model_file)
+        model = _load_pickle(model_path)
+        trust_scaler = None
+        if trust_scaler_file:
+            trust_scaler = _load_pickle(os.path.join(self.model_dir, trust_scaler_file))
+        self.register_model(name, model, trust_scaler, role=role, source=model_path,
+                            feature_subset=feature_subset)
+        self.registry[name]['files'] = tuple(f for f in (model_file, trust_scaler_file) if f)
+        features = f" ({len(feature_subset)} features)" if feature_subset is not None else ""
+        print(f"✓ Loaded {role} model {name!r} from {model_path}{features}")
+    
+    def set_primary(self, name: str):
+        """Make a registered version the primary; the previous one becomes a shadow"""
+        if name not in self.registry:
+            raise KeyError(f"Model {name!r} is not registered; have {list(self.registry)}")
+        if self.primary_name is not None and self.primary_name in self.registry:
+            self.registry[self.primary_name]['role'] = 'shadow'
+        self.registry[name]['role'] = 'primary'
+        self.primary_name = name
+        self.model = self.registry[name]['model']
+        self.trust_scaler = self.registry[name]['trust_scaler']
+    
+    def unregister_model(self, name: str):
+        """Remove a shadow version"""
+        if name == self.primary_name:
+            raise ValueError("Cannot remove the primary model; set another primary first")
+        self.registry.pop(name, None)
+    
+    def get_shadow_names(self) -> List[str]:
+        """Names of the shadow versions, in registration order"""
+        return [name for name, entry in self.registry.items() if entry['role'] == 'shadow']
+    
+    def list_models(self) -> List[Dict[str, Any]]:
+        """Name, role, type and source of every registered version"""
+        return [{'name': name, 'role': entry['role'], 'model_type': type(entry['model']).__name__,
+                 'num_features': len(entry['feature_subset'] or self.feature_names),
+                 'source': entry['source']} for name, entry in self.registry.items()]
+    
+    def _default_imputation_values(self) -> Dict[str, Any]:
+        """Training means from the scaler, first encoder class for categoricals"""
+        scaler_names = list(getattr(self.scaler, 'feature_names_in_', self.feature_names))
+        values = {}
+        for feat in self.feature_names:
+            if feat in self.label_encoders:
+                values[feat] = self.label_encoders[feat].classes_[0]
+            elif feat in scaler_names:
+                values[feat] = float(self.scaler.mean_[scaler_names.index(feat)])
+            else:
+                values[feat] = 0.0
+        return values
+    
+    def get_model(self, name: Optional[str] = None):
+        """Get a registered model (default: the primary)"""
+        return self.registry[name or self.primary_name]['model']
     
     def get_scaler(self):
         """Get the feature scaler"""
         return self.scaler
     
-    def get_trust_scaler(self):
-        """Get the trust score scaler"""
-        return self.trust_scaler
+    def get_feature_subset(self, name: Optional[str] = None) -> List[str]:
+        """Features a registered model scores on, in its column order (default: the primary's)"""
+        return self.registry[name or self.primary_name]['feature_subset'] or list(self.feature_names)
+    
+    def get_trust_scaler(self, name: Optional[str] = None):
+        """Get a registered model's trust score scaler (default: the primary's)"""
+        return self.registry[name or self.primary_name]['trust_scaler']
     
     def get_label_encoders(self):
         """Get the label encoders dictionary"""
@@ -78,6 +283,10 @@ class ModelLoader:
         """Get the list of feature names in correct order"""
         return self.feature_names
     
+    def get_imputation_values(self) -> Dict[str, Any]:
+        """Get the per-feature values used to fill missing data"""
+        return self.imputation_values
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information"""
         return {
@@ -86,9 +295,33 @@ class ModelLoader:
             'feature_names': self.feature_names,
             'categorical_features': list(self.label_encoders.keys()) if self.label_encoders else [],
             'scaler_type': type(self.scaler).__name__,
-            'trust_scaler_type': type(self.trust_scaler).__name__
+            'trust_scaler_type': type(self.trust_scaler).__name__,
+            'primary_model': self.primary_name,
+            'primary_features': len(self.get_feature_subset()),
+            'shadow_models': self.get_shadow_names()
         }
     
+    def fingerprint(self) -> str:
+        """
+        Hash of everything that decides a file's scores
+        
+        Covers the source pickles, model_registry.json, trust_policy.json,
+        the quantization and the registered versions with the contents of
+        the files they were loaded from, so results cached under it go
+        stale when any of them change.
+        """
+        digest = hashlib.sha256(str(source_digest(self.model_dir)).encode())
+        for name in ('model_registry.json', TRUST_POLICY_FILE):
+            path = os.path.join(self.model_dir, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(name.encode() + f.read())
+        versions = [(name, entry['role'], type(entry['model']).__name__, entry['source'], entry['feature_subset'],
+                     source_digest(self.model_dir, entry['files']) if entry['files'] else None)
+                    for name, entry in self.registry.items()]
+        digest.update(json.dumps([self.quantization, versions]).encode())
+        return digest.hexdigest()
+    
     def validate_models(self) -> bool:
         """Validate that all models are loaded correctly"""
         return all([
@@ -0,0 +1,163 @@
+"""
+Neighbor Index Module
+Nearest labeled training connections for flagged rows
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+
+
+# Written by build_neighbor_index.py into the model directory (not committed)
+NEIGHBOR_INDEX_FILE = 'neighbor_index.npz'
+
+# Query rows per distance block (block x training rows float32)
+QUERY_BLOCK_ROWS = 1024
+
+# Extra float32 candidates re-ranked in float64, so near-ties come out exact
+CANDIDATE_MARGIN = 3
+
+# Leading (shuffled) training rows whose scores set each query's candidate threshold
+THRESHOLD_SAMPLE = 4096
+
+
+class NeighborIndex:
+    """
+    Exact k-nearest-neighbor search over the scaled training set
+
+    Distances are Euclidean in the scaler's space, the same geometry the
+    RBF kernel uses. The index holds the training matrix as float32 with
+    precomputed squared norms, so a batch of queries is one blocked matrix
+    product. Candidates are then picked with a single comparison per score:
+    the (k + margin)-th best score among a fixed sample of training rows is
+    an upper bound on each query's k-th best, so only rows at or under it
+    are re-ranked, with exact float64 distances. In this 41-dimensional
+    space that is several times faster than a ball tree or KD-tree
+    (benchmarks/bench_neighbor_index.py).
+    """
+
+    def __init__(self, X: np.ndarray, labels: np.ndarray, row_ids: Optional[np.ndarray] = None,
+                 classes: Sequence[str] = ('Anomaly', 'Normal'), feature_names: Sequence[str] = ()):
+        """
+        Args:
+            X: Scaled training matrix
+            labels: Class index per training row (into classes)
+            row_ids: Row number of each training row in its source file
+            classes: Label names
+            feature_names: Feature names in model order
+        """
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int8)
+        self.row_ids = np.arange(len(X), dtype=np.int64) if row_ids is None else np.asarray(row_ids, dtype=np.int64)
+        self.classes = list(classes)
+        self.feature_names = list(feature_names)
+        self._sq = np.einsum('ij,ij->i', self.X, self.X)
+        self._neg2_xt = np.ascontiguousarray(-2.0 * self.X.T)
+
+    @classmethod
+    def build(cls, X_scaled: np.ndarray, true_class: Sequence[str], **kwargs) -> 'NeighborIndex':
+        """
+        Index labeled training rows
+
+        Args:
+            X_scaled: Scaled training matrix (DataProcessor.prepare_features)
+            true_class: 'Normal' / 'Anomaly' per row
+            **kwargs: Passed to the constructor
+        """
+        classes = kwargs.pop('classes', ('Anomaly', 'Normal'))
+        labels = pd.Categorical(np.asarray(true_class, dtype=object), categories=list(classes)).codes
+        if (labels < 0).any():
+            raise ValueError(f"Labels must be one of {list(classes)}")
+        row_ids = kwargs.pop('row_ids', None)
+        row_ids = np.arange(len(X_scaled)) if row_ids is None else np.asarray(row_ids)
+        # Shuffled once, so the leading rows are a fair threshold sample
+        order = np.random.default_rng(0).permutation(len(X_scaled))
+        return cls(np.asarray(X_scaled)[order], labels[order], row_ids[order], classes=classes, **kwargs)
+
+    def save(self, path: str):
+        """Write the index as plain arrays"""
+        meta = {'classes': self.classes, 'feature_names': self.feature_names}
+        np.savez(path, X=self.X, labels=self.labels, row_ids=self.row_ids, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: str) -> 'NeighborIndex':
+        """Index written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(data['X'], data['labels'], data['row_ids'], **meta)
+
+    @classmethod
+    def from_model_loader(cls, model_loader) -> Optional['NeighborIndex']:
+        """Index for the loaded model, or None if it has not been built"""
+        path = os.path.join(model_loader.model_dir, NEIGHBOR_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        index = cls.load(path)
+        if index.feature_names and index.feature_names != list(model_loader.feature_names):
+            print(f"⚠️ {NEIGHBOR_INDEX_FILE} does not match the model features; rebuild it")
+            return None
+        return index
+
+    def query(self, X_scaled: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest training rows of each query row
+
+        Args:
+            X_scaled: Scaled query rows
+            k: Neighbors per row
+
+        Returns:
+            (distances, indices), each of shape (rows, k), nearest first;
+            indices point into the index (see row_ids and labels)
+        """
+        Q = np.asarray(X_scaled, dtype=np.float64)
+        k = min(k, len(self.X))
+        candidates = min(k + CANDIDATE_MARGIN, len(self.X))
+        sample = max(min(THRESHOLD_SAMPLE, len(self.X)), candidates)
+        distances = np.empty((len(Q), k))
+        indices = np.empty((len(Q), k), dtype=np.int64)
+        for start in range(0, len(Q), QUERY_BLOCK_ROWS):
+            block = Q[start:start + QUERY_BLOCK_ROWS]
+            # |q|^2 is the same for every candidate, so rank by |x|^2 - 2 q.x
+            scores = block.astype(np.float32) @ self._neg2_xt
+            scores += self._sq
+            threshold = np.partition(scores[:, :sample], candidates - 1, axis=1)[:, candidates - 1]
+            rows, cols = np.divmod(np.flatnonzero(scores <= threshold[:, None]), len(self.X))
+            # Exact distances for the candidates only, then the k best per row
+            diff = self.X[cols].astype(np.float64) - block[rows]
+            dist = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+            # Rows come out of flatnonzero in order; sort by distance within each row
+            order = np.argsort(rows * (2.0 * dist.max() + 1.0) + dist, kind='stable')
+            rows, cols, dist = rows[order], cols[order], dist[order]
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            keep = rank < k
+            indices[start + rows[keep], rank[keep]] = cols[keep]
+            distances[start + rows[keep], rank[keep]] = dist[keep]
+        return distances, indices
+
+    def neighbors(self, X_scaled: np.ndarray, k: int = 5) -> pd.DataFrame:
+        """
+        Nearest labeled records per query row, one row per (query, rank)
+
+        Args:
+            X_scaled: Scaled query rows
+            k: Neighbors per row
+
+        Returns:
+            DataFrame with query (position in X_scaled), rank, train_row,
+            distance and class
+        """
+        distances, indices = self.query(X_scaled, k)
+        n, k = indices.shape
+        return pd.DataFrame({
+            'query': np.repeat(np.arange(n), k),
+            'rank': np.tile(np.arange(1, k + 1), n),
+            'train_row': self.row_ids[indices.ravel()],
+            'distance': distances.ravel().round(4),
+            'class': np.asarray(self.classes, dtype=object)[self.labels[indices.ravel()]],
+        })
+
+    def __len__(self) -> int:
+        return len(self.X)
@@ -0,0 +1,316 @@
+"""
+Node State Module
+Tracks rolling per-node trust in fixed-size NumPy arrays
+"""
+
+import functools
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Optional, Sequence
+
+
+ACTIONS = ('ALLOW', 'MONITOR', 'BLOCK')
+
+
+def _locked(method):
+    """Run a NodeStateStore method under the store's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class NodeStateStore:
+    """
+    Per-node trust state keyed by node id
+
+    State lives in flat arrays indexed by an open-addressing hash table
+    (linear probing), so memory is fixed at construction time and a batch
+    update costs O(batch) regardless of how many nodes are tracked.
+    Trust is an exponentially decayed mean of the scores a node received;
+    action counts decay with the same half-life. Public methods hold a
+    lock, so background jobs can update the store while the page reads it.
+    """
+
+    _EMPTY = np.iinfo(np.int64).min
+    # key + score_sum + weight + 3 action counts + last_seen
+    BYTES_PER_SLOT = 8 + 4 + 4 + 3 * 4 + 8
+
+    def __init__(self, max_nodes: int = 1_000_000, half_life: float = 3600.0,
+                 idle_timeout: float = 86400.0, memory_budget_mb: Optional[float] = None,
+                 load_factor: float = 0.5):
+        """
+        Initialize NodeStateStore
+
+        Args:
+            max_nodes: Maximum number of nodes tracked at once
+            half_life: Seconds after which a node's past evidence counts half
+            idle_timeout: Seconds without traffic after which a node expires
+            memory_budget_mb: Optional memory cap; overrides max_nodes
+            load_factor: Maximum hash table occupancy
+        """
+        if memory_budget_mb is not None:
+            slots = int(memory_budget_mb * 1024 * 1024 // self.BYTES_PER_SLOT)
+            capacity = 1 << max(slots.bit_length() - 1, 4)
+            max_nodes = int(capacity * load_factor)
+        else:
+            capacity = 1 << max((int(np.ceil(max_nodes / load_factor)) - 1).bit_length(), 4)
+
+        self.max_nodes = max_nodes
+        self.capacity = capacity
+        self.half_life = half_life
+        self.idle_timeout = idle_timeout
+        self._decay_rate = np.log(2.0) / half_life
+        self._mask = np.uint64(capacity - 1)
+
+        self._keys = np.full(capacity, self._EMPTY, dtype=np.int64)
+        self._score_sum = np.zeros(capacity, dtype=np.float32)
+        self._weight = np.zeros(capacity, dtype=np.float32)
+        self._action_counts = np.zeros((capacity, len(ACTIONS)), dtype=np.float32)
+        self._last_seen = np.zeros(capacity, dtype=np.float64)
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the state arrays"""
+        return sum(a.nbytes for a in (self._keys, self._score_sum, self._weight,
+                                      self._action_counts, self._last_seen))
+
+    @_locked
+    def update(self, node_ids: Sequence[Any], trust_scores: Sequence[float],
+               actions: Sequence[Any], timestamps: Any = None):
+        """
+        Fold a scored batch into the per-node state
+
+        Args:
+            node_ids: Node id per row (ints or strings)
+            trust_scores: Trust score (0-100) per row
+            actions: Action name or code (index into ACTIONS) per row
+            timestamps: Epoch seconds per row, a single value, or None for now
+        """
+        keys = self._to_keys(node_ids)
+        if len(keys) == 0:
+            return
+        scores = np.asarray(trust_scores, dtype=np.float64)
+        codes = self._to_action_codes(actions)
+        if timestamps is None:
+            timestamps = time.time()
+        times = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), keys.shape)
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        if len(unique_keys) > self.max_nodes:
+            raise ValueError(f"Batch has {len(unique_keys)} distinct nodes; store holds {self.max_nodes}")
+        self._reserve(unique_keys, now=times.max())
+        slots = self._locate(unique_keys, insert=True)
+
+        # Reference time per node is the latest of its stored and batch times
+        ref_time = np.full(len(unique_keys), -np.inf)
+        np.maximum.at(ref_time, inverse, times)
+        is_new = self._weight[slots] == 0
+        ref_time = np.where(is_new, ref_time, np.maximum(ref_time, self._last_seen[slots]))
+
+        # Decay stored state and each new row to the node's reference time
+        old_decay = np.exp(-self._decay_rate * (ref_time - self._last_seen[slots]))
+        old_decay[is_new] = 0.0
+        row_decay = np.exp(-self._decay_rate * (ref_time[inverse] - times))
+
+        n = len(unique_keys)
+        score_add = np.bincount(inverse, weights=scores * row_decay, minlength=n)
+        weight_add = np.bincount(inverse, weights=row_decay, minlength=n)
+        count_add = np.zeros((n, len(ACTIONS)))
+        np.add.at(count_add, (inverse, codes), row_decay)
+
+        self._score_sum[slots] = self._score_sum[slots] * old_decay + score_add
+        self._weight[slots] = self._weight[slots] * old_decay + weight_add
+        self._action_counts[slots] = self._action_counts[slots] * old_decay[:, None] + count_add
+        self._last_seen[slots] = ref_time
+
+    @_locked
+    def get(self, node_ids: Sequence[Any], now: Optional[float] = None) -> pd.DataFrame:
+        """
+        Look up the current state of the given nodes
+
+        Args:
+            node_ids: Node ids to look up
+            now: Time to decay counts to (defaults to current time)
+
+        Returns:
+            DataFrame with one row per requested id; unknown nodes have NaN state
+        """
+        keys = self._to_keys(node_ids)
+        slots = self._locate(keys, insert=False)
+        found = slots >= 0
+        frame = self._frame(np.where(found, slots, 0), now)
+        frame.loc[~found, frame.columns != 'node_key'] = np.nan
+        frame['node_key'] = keys
+        frame.insert(0, 'node_id', np.asarray(node_ids))
+        return frame
+
+    @_locked
+    def snapshot(self, now: Optional[float] = None) -> pd.DataFrame:
+        """
+        Get the state of every tracked node
+
+        Args:
+            now: Time to decay counts to (defaults to current time)
+
+        Returns:
+            DataFrame with one row per tracked node
+        """
+        return self._frame(np.flatnonzero(self._keys != self._EMPTY), now)
+
+    @_locked
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop nodes idle for longer than idle_timeout
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of nodes removed
+        """
+        now = time.time() if now is None else now
+        live = self._keys != self._EMPTY
+        stale = live & (self._last_seen < now - self.idle_timeout)
+        removed = int(stale.sum())
+        if removed:
+            self._rebuild(live & ~stale)
+        return removed
+
+    def _frame(self, slots: np.ndarray, now: Optional[float]) -> pd.DataFrame:
+        """Build a state DataFrame for the given slots"""
+        now = time.time() if now is None else now
+        decay = np.exp(-self._decay_rate * np.maximum(now - self._last_seen[slots], 0.0))
+        weight = self._weight[slots]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            trust = np.where(weight > 0, self._score_sum[slots] / weight, np.nan)
+        frame = pd.DataFrame({
+            'node_key': self._keys[slots],
+            'trust_score': trust.round(2),
+            'evidence': (weight * decay).round(4),
+            'last_seen': self._last_seen[slots],
+        })
+        counts = self._action_counts[slots] * decay[:, None]
+        for i, action in enumerate(ACTIONS):
+            frame[f'{action.lower()}_count'] = counts[:, i].round(4)
+        return frame
+
+    def _reserve(self, keys: np.ndarray, now: float):
+        """Make room for keys not yet tracked, expiring or evicting as needed"""
+        missing = int((self._locate(keys, insert=False) < 0).sum())
+        if self._size + missing <= self.max_nodes:
+            return
+        self.expire(now)
+        overflow = self._size + missing - self.max_nodes
+        if overflow <= 0:
+            return
+        # Evict least recently seen nodes outside this batch, with headroom to amortize rebuilds
+        live = self._keys != self._EMPTY
+        batch = self._locate(keys, insert=False)
+        live[batch[batch >= 0]] = False
+        live = np.flatnonzero(live)
+        overflow = min(len(live), overflow + self.max_nodes // 20)
+        if overflow < len(live):
+            oldest = live[np.argpartition(self._last_seen[live], overflow)[:overflow]]
+        else:
+            oldest = live
+        keep = self._keys != self._EMPTY
+        keep[oldest] = False
+        self._rebuild(keep)
+
+    def _rebuild(self, keep: np.ndarray):
+        """Re-insert the kept slots into a cleared table"""
+        kept = np.flatnonzero(keep)
+        keys = self._keys[kept]
+        state = (self._score_sum[kept], self._weight[kept],
+                 self._action_counts[kept], self._last_seen[kept])
+
+        self._keys.fill(self._EMPTY)
+        self._score_sum.fill(0)
+        self._weight.fill(0)
+        self._action_counts.fill(0)
+        self._last_seen.fill(0)
+        self._size = 0
+
+        slots = self._locate(keys, insert=True)
+        (self._score_sum[slots], self._weight[slots],
+         self._action_counts[slots], self._last_seen[slots]) = state
+
+    def _locate(self, keys: np.ndarray, insert: bool) -> np.ndarray:
+        """
+        Find (or claim) the table slot of each key
+
+        Keys must be unique when insert is True. Probing runs in vectorized
+        rounds; each round resolves every key whose probe hits its own key
+        or an empty slot.
+        """
+        slots = np.full(len(keys), -1, dtype=np.int64)
+        pos = self._hash(keys)
+        pending = np.arange(len(keys))
+        while pending.size:
+            p = pos[pending]
+            current = self._keys[p]
+            hit = current == keys[pending]
+            empty = current == self._EMPTY
+            slots[pending[hit]] = p[hit]
+            done = hit.copy()
+
+            if insert and empty.any():
+                # Several keys may probe the same empty slot; the first claims it
+                candidates = np.flatnonzero(empty)
+                _, first = np.unique(p[candidates], return_index=True)
+                winners = candidates[first]
+                self._keys[p[winners]] = keys[pending[winners]]
+                slots[pending[winners]] = p[winners]
+                self._size += len(winners)
+                done[winners] = True
+                # Losers re-read the now-claimed slot next round
+                retry = empty & ~done
+                advance = ~done & ~retry
+            else:
+                done |= empty
+                advance = ~done
+
+            pos[pending[advance]] = (p[advance] + 1) & int(self._mask)
+            pending = pending[~done]
+        return slots
+
+    def _hash(self, keys: np.ndarray) -> np.ndarray:
+        """Spread keys over the table (splitmix64 finalizer)"""
+        z = keys.astype(np.uint64)
+        with np.errstate(over='ignore'):
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            z = z ^ (z >> np.uint64(31))
+        return (z & self._mask).astype(np.int64)
+
+    def _to_keys(self, node_ids: Sequence[Any]) -> np.ndarray:
+        """Map node ids to int64 keys; non-integer ids are hashed"""
+        ids = np.asarray(node_ids)
+        if ids.dtype.kind == 'f' and np.isfinite(ids).all() and (ids == np.floor(ids)).all():
+            ids = ids.astype(np.int64)
+        if ids.dtype.kind in 'iu':
+            keys = ids.astype(np.int64)
+        else:
+            keys = pd.util.hash_array(ids.astype(str).astype(object)).view(np.int64)
+        return np.where(keys == self._EMPTY, self._EMPTY + 1, keys)
+
+    @staticmethod
+    def _to_action_codes(actions: Sequence[Any]) -> np.ndarray:
+        """Map action names to indexes into ACTIONS"""
+        values = np.asarray(actions)
+        if values.dtype.kind in 'iu':
+            codes = values.astype(np.intp)
+        else:
+            codes = pd.Categorical(values, categories=ACTIONS).codes.astype(np.intp)
+        if (codes < 0).any() or (codes >= len(ACTIONS)).any():
+            raise ValueError(f"Unknown action in batch; expected one of {ACTIONS}")
+        return codes
@@ -0,0 +1,232 @@
+"""
+Pipeline Module
+Stages with content-hashed, cached outputs, run in parallel where independent
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+
+# Cache entries kept per stage (older keys are deleted after a run)
+KEEP_ENTRIES = 3
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    One step of a Pipeline
+
+    fn is called as fn(*outputs of inputs, **params) and returns the
+    stage's output, which must pickle. It runs in a worker process, so it
+    has to be a module-level function and should not write files itself.
+    """
+
+    def __init__(self, name: str, fn: Callable, inputs: Sequence[str] = (), params: Optional[Dict[str, Any]] = None,
+                 files: Sequence[str] = (), version: int = 1):
+        """
+        Initialize Stage
+
+        Args:
+            name: Unique stage name
+            fn: Stage function
+            inputs: Names of the stages whose outputs fn takes, in argument order
+            params: Keyword arguments of fn; must be JSON-serializable
+            files: Files fn reads, hashed by content into the stage key
+            version: Bump when fn changes, to invalidate cached outputs
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.files = tuple(files)
+        self.version = version
+
+    def key(self, input_digests: Dict[str, str]) -> str:
+        """Cache key: the stage definition, its files' contents and its inputs' output digests"""
+        spec = {
+            'stage': self.name,
+            'version': self.version,
+            'params': self.params,
+            'files': {os.path.basename(path): file_digest(path) for path in self.files},
+            'inputs': [input_digests[name] for name in self.inputs],
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def _call(fn: Callable, args: List[Any], params: Dict[str, Any]):
+    start = time.perf_counter()
+    return fn(*args, **params), time.perf_counter() - start
+
+
+class Pipeline:
+    """
+    Run stages whose inputs changed, reuse cached outputs for the rest
+
+    A stage's key covers its parameters, file contents and the digests of
+    its inputs' outputs, so a stage that re-runs and produces the same
+    output as before does not invalidate the stages after it. Stages
+    whose inputs are all available are run concurrently in a process pool.
+    Cached outputs are only unpickled when a stage that has to run, or
+    the caller, needs them.
+    """
+
+    def __init__(self, stages: Iterable[Stage], cache_dir: str):
+        """
+        Initialize Pipeline
+
+        Args:
+            stages: Stages in any order; inputs must name other stages
+            cache_dir: Directory for cached outputs (created if missing)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in self.stages.values():
+            unknown = set(stage.inputs) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} has unknown inputs: {sorted(unknown)}")
+        self._ancestors(list(self.stages))
+        self.cache_dir = cache_dir
+        self.report = pd.DataFrame(columns=['stage', 'status', 'seconds', 'key'])
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def run(self, targets: Optional[Sequence[str]] = None, max_workers: Optional[int] = None,
+            force: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Bring targets up to date
+
+        Args:
+            targets: Stages whose outputs to return (default: every stage
+                     nothing else depends on); their inputs run as needed
+            max_workers: Worker processes (default: one per CPU; 0 runs
+                         every stage in this process)
+            force: Stages to re-run even if cached
+
+        Returns:
+            Output of each target, by name. self.report lists every stage
+            considered, with status 'cached' or 'ran' and its run time
+        """
+        if targets is None:
+            used = {name for stage in self.stages.values() for name in stage.inputs}
+            targets = [name for name in self.stages if name not in used]
+        needed = self._ancestors(targets)
+        digests, keys, outputs, rows = {}, {}, {}, {}
+        pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) if max_workers != 0 else None
+        running = {}
+        try:
+            while len(digests) < len(needed):
+                for name in needed:
+                    stage = self.stages[name]
+                    if name in keys or not all(i in digests for i in stage.inputs):
+                        continue
+                    keys[name] = stage.key(digests)
+                    meta = self._read_meta(name, keys[name])
+                    if meta is not None and name not in force:
+                        digests[name] = meta['digest']
+                        rows[name] = {'stage': name, 'status': 'cached', 'seconds': meta['seconds'],
+                                      'key': keys[name][:12]}
+                        continue
+                    args = [self._output(i, keys[i], outputs) for i in stage.inputs]
+                    if pool is None:
+                        try:
+                            running[name] = _call(stage.fn, args, stage.params)
+                        except Exception as e:
+                            raise RuntimeError(f"Stage {name} failed: {e}") from e
+                    else:
+                        running[name] = pool.submit(_call, stage.fn, args, stage.params)
+                if not running:
+                    continue
+                if pool is None:
+                    finished = list(running)
+                else:
+                    done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                    finished = [name for name, future in running.items() if future in done]
+                for name in finished:
+                    result = running.pop(name)
+                    try:
+                        output, seconds = result if pool is None else result.result()
+                    except Exception as e:
+                        raise RuntimeError(f"Stage {name} failed: {e}") from e
+                    outputs[name] = output
+                    digests[name] = self._write(name, keys[name], output, seconds)
+                    rows[name] = {'stage': name, 'status': 'ran', 'seconds': seconds, 'key': keys[name][:12]}
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self.report = pd.DataFrame([rows[name] for name in needed], columns=self.report.columns)
+        return {name: self._output(name, keys[name], outputs) for name in targets}
+
+    def _ancestors(self, targets: Sequence[str]) -> List[str]:
+        """Targets and everything they depend on, inputs before the stages using them"""
+        order, seen = [], set()
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Cycle through stage {name}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name in seen:
+                return
+            for dep in self.stages[name].inputs:
+                visit(dep, path + (name,))
+            seen.add(name)
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+        return order
+
+    def _path(self, name: str, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f'{name}-{key[:20]}{ext}')
+
+    def _read_meta(self, name: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(name, key, '.json')
+        if not os.path.exists(path) or not os.path.exists(self._path(name, key, '.pkl')):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _output(self, name: str, key: str, outputs: Dict[str, Any]) -> Any:
+        if name not in outputs:
+            with open(self._path(name, key, '.pkl'), 'rb') as f:
+                outputs[name] = pickle.load(f)
+        return outputs[name]
+
+    def _write(self, name: str, key: str, output: Any, seconds: float) -> str:
+        """Cache an output; returns its digest"""
+        data = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(name, key, '.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+        with open(self._path(name, key, '.json'), 'w') as f:
+            json.dump({'stage': name, 'key': key, 'digest': digest, 'seconds': seconds,
+                       'created': time.time()}, f)
+        self._prune(name)
+        return digest
+
+    def _prune(self, name: str):
+        """Delete all but the KEEP_ENTRIES newest cached outputs of a stage"""
+        metas = sorted((e for e in os.scandir(self.cache_dir)
+                        if e.name.startswith(f'{name}-') and e.name.endswith('.json')
+                        and e.name[len(name) + 1:-5].isalnum()),
+                       key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in metas[KEEP_ENTRIES:]:
+            for ext in ('.json', '.pkl'):
+                try:
+                    os.remove(entry.path[:-5] + ext)
+                except FileNotFoundError:
+                    pass
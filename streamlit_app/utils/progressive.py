@@ -0,0 +1,175 @@
+"""
+Progressive Module
+Early estimates of a file's results from a stratified sample, refined as chunks are scored
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from .result_summary import DIMENSIONS, ResultSummary
+
+
+# Rows scored up front, spread over the file in equal row-range strata
+SAMPLE_ROWS = 2000
+SAMPLE_STRATA = 20
+
+# Normal quantile of the reported intervals (95%)
+Z_95 = 1.959964
+
+
+def sample_lines(data: bytes, rows: int = SAMPLE_ROWS, strata: int = SAMPLE_STRATA,
+                 seed: int = 0) -> Tuple[bytes, np.ndarray, np.ndarray]:
+    """
+    Stratified random sample of a CSV's data rows
+
+    The rows are split into equal row ranges and each range is sampled
+    without replacement in proportion to its size, so a file whose mix
+    changes from start to end is still covered evenly. Row boundaries are
+    found with one vectorized newline scan, which assumes no quoted field
+    spans lines (true of connection logs).
+
+    Args:
+        data: CSV file contents, header first
+        rows: Sample size (the whole file if it has fewer rows)
+        strata: Number of row ranges
+        seed: Random seed
+
+    Returns:
+        (sample CSV with the header, stratum of each sampled row, data rows
+        per stratum)
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate([[0], newlines + 1])
+    ends = np.concatenate([newlines, [len(data)]])
+    # Blank lines (and the empty tail after a final newline) are not rows, as for the reader
+    length = ends - starts
+    carriage_return = (length == 1) & (buf[np.minimum(starts, len(buf) - 1)] == ord('\r'))
+    starts, ends = starts[(length > 0) & ~carriage_return], ends[(length > 0) & ~carriage_return]
+    if not len(starts):
+        raise ValueError("The file is empty")
+    header, starts, ends = data[starts[0]:ends[0]], starts[1:], ends[1:]
+
+    n = len(starts)
+    strata = max(1, min(strata, n))
+    edges = np.linspace(0, n, strata + 1).astype(np.int64)
+    stratum_rows = np.diff(edges)
+    take = np.minimum(np.round(min(rows, n) * stratum_rows / max(n, 1)).astype(np.int64), stratum_rows)
+    rng = np.random.default_rng(seed)
+    picked = [lo + np.sort(rng.choice(hi - lo, size=k, replace=False))
+              for lo, hi, k in zip(edges[:-1], edges[1:], take)]
+    picked = np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+    lines = [header] + [data[s:e] for s, e in zip(starts[picked].tolist(), ends[picked].tolist())]
+    stratum = np.repeat(np.arange(strata), take)
+    return b'\n'.join(line.rstrip(b'\r') for line in lines) + b'\n', stratum, stratum_rows
+
+
+class ProgressiveEstimator:
+    """
+    Action, prediction and trust estimates with confidence intervals
+
+    fit() takes the scored sample; estimate() then combines the exact
+    counts of the rows scored so far with the sample's estimate of the
+    rows not yet scored, stratum by stratum. The intervals narrow as
+    chunks complete and close on the exact values once every row is in.
+    Rows the validator quarantines count as neither action.
+    """
+
+    def __init__(self, stratum_rows: np.ndarray):
+        """
+        Initialize ProgressiveEstimator
+
+        Args:
+            stratum_rows: Data rows per stratum, in file order (from sample_lines)
+        """
+        self.stratum_rows = np.asarray(stratum_rows, dtype=np.float64)
+        self.edges = np.concatenate([[0], np.cumsum(stratum_rows)])
+        self.sampled = np.zeros(len(stratum_rows))
+        # Per stratum: scored rows, category counts and trust sums of the sample
+        self.scored = np.zeros(len(stratum_rows))
+        self.counts = {dim: np.zeros((len(stratum_rows), len(cats))) for dim, cats in DIMENSIONS.items()}
+        self.trust_sum = np.zeros(len(stratum_rows))
+        self.trust_sq_sum = np.zeros(len(stratum_rows))
+
+    @property
+    def total_rows(self) -> int:
+        return int(self.edges[-1])
+
+    def fit(self, stratum: np.ndarray, results_df: pd.DataFrame, scored_rows: np.ndarray):
+        """
+        Add the scored sample
+
+        Args:
+            stratum: Stratum of every sampled row (from sample_lines)
+            results_df: predict() output for the sampled rows that passed validation
+            scored_rows: Sample row numbers of those rows (processed_df.index)
+        """
+        k = len(self.stratum_rows)
+        self.sampled += np.bincount(stratum, minlength=k)
+        h = np.asarray(stratum)[np.asarray(scored_rows, dtype=np.int64)]
+        self.scored += np.bincount(h, minlength=k)
+        for dim, cats in DIMENSIONS.items():
+            codes = pd.Categorical(results_df[dim], categories=cats).codes.astype(np.int64)
+            self.counts[dim] += np.bincount(h * len(cats) + codes, minlength=k * len(cats)).reshape(k, len(cats))
+        trust = results_df['trust_score'].to_numpy(dtype=np.float64)
+        self.trust_sum += np.bincount(h, weights=trust, minlength=k)
+        self.trust_sq_sum += np.bincount(h, weights=trust * trust, minlength=k)
+
+    def estimate(self, summary: Optional[ResultSummary] = None, rows_done: int = 0,
+                 z: float = Z_95) -> pd.DataFrame:
+        """
+        Current estimates
+
+        Args:
+            summary: ResultSummary of the rows scored so far (None before the first chunk)
+            rows_done: Data rows read so far, from the top of the file
+            z: Normal quantile of the intervals
+
+        Returns:
+            DataFrame with dim, category, estimate, low, high and share
+            (of all rows): scored row count, count per action and
+            prediction, and the mean trust score
+        """
+        # Rows of each stratum still to come, and the sample's per-row rates there
+        remaining = np.clip(self.edges[1:] - np.maximum(rows_done, self.edges[:-1]), 0, self.stratum_rows)
+        n = np.maximum(self.sampled, 1)
+        fpc = np.where(self.stratum_rows > 0, 1 - self.sampled / np.maximum(self.stratum_rows, 1), 0)
+        spread = fpc / np.maximum(self.sampled - 1, 1)
+
+        def count_row(dim, category, exact, hits):
+            p = hits / n
+            est = exact + (remaining * p).sum()
+            se = np.sqrt((remaining ** 2 * p * (1 - p) * spread).sum())
+            low, high = max(est - z * se, exact), min(est + z * se, exact + remaining.sum())
+            return {'dim': dim, 'category': category, 'estimate': est, 'low': low, 'high': high}
+
+        exact_scored = summary.total if summary is not None else 0
+        rows = [count_row('rows', 'scored', exact_scored, self.scored)]
+        for dim, cats in DIMENSIONS.items():
+            for j, cat in enumerate(cats):
+                exact = summary.count(dim, cat) if summary is not None else 0
+                rows.append(count_row(dim, cat, exact, self.counts[dim][:, j]))
+
+        # Mean trust as a ratio estimate; linearized variance over the remaining rows
+        exact_sum = summary.sums['trust_score'] if summary is not None else 0.0
+        total = exact_scored + (remaining * self.scored / n).sum()
+        mean = (exact_sum + (remaining * self.trust_sum / n).sum()) / total if total else float('nan')
+        if total:
+            resid_mean = (self.trust_sum - mean * self.scored) / n
+            resid_sq = (self.trust_sq_sum - 2 * mean * self.trust_sum + mean * mean * self.scored) / n
+            resid_var = np.maximum(resid_sq - resid_mean ** 2, 0) * n / np.maximum(n - 1, 1)
+            se = np.sqrt((remaining ** 2 * resid_var * fpc / n).sum()) / total
+        else:
+            se = 0.0
+        rows.append({'dim': 'trust_score', 'category': 'mean', 'estimate': mean,
+                     'low': mean - z * se, 'high': mean + z * se})
+
+        frame = pd.DataFrame(rows)
+        is_count = frame['dim'] != 'trust_score'
+        frame['share'] = np.where(is_count, frame['estimate'] / max(self.total_rows, 1), np.nan)
+        return frame
+
+    def is_exact(self, rows_done: int) -> bool:
+        """Whether every row has been scored, so estimates are the exact values"""
+        return rows_done >= self.total_rows
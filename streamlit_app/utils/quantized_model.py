@@ -0,0 +1,247 @@
+"""
+Quantized Model Module
+int8 / float16 copies of the bundled SVM for memory-constrained nodes
+"""
+
+import json
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+from .scoring_bundle import KERNEL_BLOCK_ROWS, BundledSVC
+from .trust_policy import TrustPolicy
+
+
+# Supported storage types for support vectors and dual coefficients
+QUANTIZATIONS = ('int8', 'float16')
+
+# Codebook entries per feature in int8 mode (one byte per code)
+CODEBOOK_SIZE = 256
+
+
+def quantized_bundle_file(quantization: str) -> str:
+    """File name of the quantized bundle, next to scoring_bundle.npz"""
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+    return f'scoring_bundle_{quantization}.npz'
+
+
+def _codebook(values: np.ndarray) -> np.ndarray:
+    """
+    At most CODEBOOK_SIZE levels for one column of values
+
+    Distinct values are the levels when there are few enough of them (the
+    column is then stored exactly); otherwise the closest adjacent levels
+    are merged, smallest Ward cost (count-weighted squared gap) first.
+    """
+    levels, counts = np.unique(values, return_counts=True)
+    levels = levels.astype(np.float64)
+    counts = counts.astype(np.float64)
+    while len(levels) > CODEBOOK_SIZE:
+        cost = counts[:-1] * counts[1:] / (counts[:-1] + counts[1:]) * np.diff(levels) ** 2
+        i = int(np.argmin(cost))
+        total = counts[i] + counts[i + 1]
+        levels[i] = (levels[i] * counts[i] + levels[i + 1] * counts[i + 1]) / total
+        counts[i] = total
+        levels = np.delete(levels, i + 1)
+        counts = np.delete(counts, i + 1)
+    return levels
+
+
+def quantize(values: np.ndarray, quantization: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize a matrix (or vector) column by column
+
+    Args:
+        values: Array of shape (rows, columns) or (rows,)
+        quantization: 'int8' or 'float16'
+
+    Returns:
+        (codes, codebooks): float16 values and None, or uint8 codes and a
+        float32 (columns, CODEBOOK_SIZE) array of the level each code
+        stands for in its column
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if quantization == 'float16':
+        return values.astype(np.float16), None
+    if quantization != 'int8':
+        raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+    matrix = values.reshape(len(values), -1)
+    codes = np.empty(matrix.shape, dtype=np.uint8)
+    codebooks = np.zeros((matrix.shape[1], CODEBOOK_SIZE), dtype=np.float32)
+    for j in range(matrix.shape[1]):
+        levels = _codebook(matrix[:, j])
+        # Nearest level: levels are sorted, so compare against the midpoints
+        codes[:, j] = np.searchsorted((levels[:-1] + levels[1:]) / 2, matrix[:, j])
+        codebooks[j, :len(levels)] = levels
+    return codes.reshape(values.shape), codebooks
+
+
+def dequantize(codes: np.ndarray, codebooks: Optional[np.ndarray]) -> np.ndarray:
+    """float32 values of quantize() output"""
+    if codebooks is None:
+        return codes.astype(np.float32)
+    matrix = codes.reshape(len(codes), -1)
+    return np.take_along_axis(codebooks.T, matrix.astype(np.intp), axis=0).reshape(codes.shape)
+
+
+class QuantizedSVC(BundledSVC):
+    """
+    RBF-kernel binary SVC restored from int8 or float16 storage
+
+    In int8 mode every feature has its own codebook of up to 256 levels,
+    the non-uniform generalisation of a per-feature scale: most features
+    take fewer distinct values than that over the support vectors, so they
+    round-trip exactly, and only the wide numeric ones (byte counts) lose
+    precision. A single per-feature scale would spend all 256 steps on
+    those features' outliers. Codes are expanded once at load into float32
+    working arrays, and the kernel runs in float32, half the memory and
+    bandwidth of BundledSVC. Probabilities and predictions use BundledSVC's
+    code, so the model is a drop-in replacement in DataProcessor and the
+    model registry.
+    """
+
+    def __init__(self, support_vectors: np.ndarray, dual_coef: np.ndarray, intercept: float, gamma: float,
+                 prob_a: float, prob_b: float, classes: np.ndarray, quantization: str = 'int8'):
+        self.support_vectors_ = np.ascontiguousarray(support_vectors, dtype=np.float32)
+        self.dual_coef_ = np.asarray(dual_coef, dtype=np.float32).reshape(1, -1)
+        self.intercept_ = np.array([intercept])
+        self.gamma = gamma
+        self.probA_ = np.array([prob_a])
+        self.probB_ = np.array([prob_b])
+        self.classes_ = classes
+        self.quantization = quantization
+        self.n_features_in_ = self.support_vectors_.shape[1]
+        self._sv_sq = np.einsum('ij,ij->i', self.support_vectors_, self.support_vectors_)
+
+    @classmethod
+    def from_model(cls, model, quantization: str = 'int8') -> 'QuantizedSVC':
+        """
+        Quantize a fitted binary RBF SVC (scikit-learn or BundledSVC)
+
+        Args:
+            model: Model with support_vectors_, dual_coef_, probA_/probB_
+            quantization: 'int8' or 'float16'
+        """
+        sv = dequantize(*quantize(model.support_vectors_, quantization))
+        coef = dequantize(*quantize(np.ravel(model.dual_coef_), quantization))
+        return cls(sv, coef, float(model.intercept_[0]), float(getattr(model, '_gamma', model.gamma)),
+                   float(model.probA_[0]), float(model.probB_[0]), np.asarray(model.classes_),
+                   quantization=quantization)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the model's arrays"""
+        return self.support_vectors_.nbytes + self.dual_coef_.nbytes + self._sv_sq.nbytes
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(len(X))
+        coef = self.dual_coef_[0]
+        for start in range(0, len(X), KERNEL_BLOCK_ROWS):
+            block = X[start:start + KERNEL_BLOCK_ROWS]
+            sq_dist = (block * block).sum(axis=1)[:, None] + self._sv_sq[None, :]
+            sq_dist -= 2.0 * (block @ self.support_vectors_.T)
+            np.maximum(sq_dist, 0.0, out=sq_dist)
+            sq_dist *= -self.gamma
+            out[start:start + len(block)] = np.exp(sq_dist, out=sq_dist) @ coef
+        return out + self.intercept_[0]
+
+
+def export_quantized(bundle_path: str, path: str, quantization: str = 'int8'):
+    """
+    Write a quantized copy of a scoring bundle
+
+    Preprocessing (scalers, encoders, imputation values) and the source
+    digest are copied unchanged; only the support vectors and dual
+    coefficients are replaced, so load_bundle() reads the file like any
+    other bundle.
+
+    Args:
+        bundle_path: scoring_bundle.npz written by export_bundle
+        path: Output .npz path
+        quantization: 'int8' or 'float16'
+    """
+    with np.load(bundle_path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(str(arrays['meta']))
+    if meta.get('quantization'):
+        raise ValueError(f"{bundle_path} is already quantized ({meta['quantization']})")
+    for name in ('support_vectors', 'dual_coef'):
+        codes, codebooks = quantize(arrays.pop(name), quantization)
+        arrays[f'{name}_codes'] = codes
+        if codebooks is not None:
+            arrays[f'{name}_codebooks'] = codebooks
+    meta['quantization'] = quantization
+    arrays['meta'] = np.array(json.dumps(meta))
+    np.savez_compressed(path, **arrays)
+
+
+def model_from_arrays(data, meta: Dict[str, Any]) -> QuantizedSVC:
+    """QuantizedSVC from the arrays of a file written by export_quantized"""
+    restored = {}
+    for name in ('support_vectors', 'dual_coef'):
+        codebooks = data[f'{name}_codebooks'] if f'{name}_codebooks' in data.files else None
+        restored[name] = dequantize(data[f'{name}_codes'], codebooks)
+    return QuantizedSVC(restored['support_vectors'], restored['dual_coef'], meta['intercept'], meta['gamma'],
+                        meta['prob_a'], meta['prob_b'], data['classes'], quantization=meta['quantization'])
+
+
+def _model_nbytes(model) -> int:
+    if hasattr(model, 'nbytes'):
+        return model.nbytes
+    return sum(np.asarray(getattr(model, attr)).nbytes
+               for attr in ('support_vectors_', 'dual_coef_', '_sv_sq') if hasattr(model, attr))
+
+
+def _latency(model, X: np.ndarray, repeats: int) -> float:
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.decision_function(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_models(reference, models: Dict[str, Any], X_scaled: np.ndarray, trust_scaler,
+                   latency_rows: int = 1000, repeats: int = 5) -> pd.DataFrame:
+    """
+    Footprint, latency and agreement of candidate models against a reference
+
+    Args:
+        reference: Full-precision model (e.g. svm_optimized_model.pkl)
+        models: Candidate models by name
+        X_scaled: Scaled rows to score
+        trust_scaler: Trust scaler the models share
+        latency_rows: Rows in the batch latency measurement
+        repeats: Timing repeats (best is kept)
+
+    Returns:
+        DataFrame with one row per model (reference first): model_kb,
+        batch_us_per_row, single_row_us, label_agreement, action_agreement,
+        max_trust_diff and mean_trust_diff
+    """
+    policy = TrustPolicy()
+    X = np.asarray(X_scaled, dtype=np.float64)
+
+    def score(model):
+        decision = model.decision_function(X)
+        trust = np.clip(trust_scaler.transform(decision.reshape(-1, 1)).ravel(), 0, 100)
+        return decision > 0, trust, policy.action_codes(trust)
+
+    ref_labels, ref_trust, ref_action = score(reference)
+    rows = []
+    for name, model in [('full', reference)] + list(models.items()):
+        labels, trust, action = score(model)
+        rows.append({
+            'model': name,
+            'model_kb': _model_nbytes(model) / 1024,
+            'batch_us_per_row': _latency(model, X[:latency_rows], repeats) / min(latency_rows, len(X)) * 1e6,
+            'single_row_us': _latency(model, X[:1], repeats * 20) * 1e6,
+            'label_agreement': (labels == ref_labels).mean(),
+            'action_agreement': (action == ref_action).mean(),
+            'max_trust_diff': np.abs(trust - ref_trust).max(),
+            'mean_trust_diff': np.abs(trust - ref_trust).mean(),
+        })
+    return pd.DataFrame(rows)
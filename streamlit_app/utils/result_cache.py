@@ -0,0 +1,174 @@
+"""
+Result Cache Module
+Content-addressed store of finished scoring outputs, in memory and on disk
+"""
+
+import os
+import shutil
+import threading
+from collections import OrderedDict
+import pandas as pd
+from typing import Any, Callable, Dict, Optional
+
+
+class ResultCache:
+    """
+    Scored outputs keyed by file content hash and model fingerprint
+
+    An entry is a finished job directory (results file, state.pkl,
+    job.json) moved to cache_dir/<key>. Outputs loaded from it are kept in
+    an in-memory LRU, so a rerun, a re-upload or another session's upload
+    of a file already scored by the same models is served without reading
+    the CSV or scoring anything. Each tier evicts its least recently used
+    entries once it is over its byte budget.
+    """
+
+    def __init__(self, cache_dir: str, max_disk_bytes: int = 2 << 30,
+                 max_memory_bytes: int = 512 << 20):
+        """
+        Initialize ResultCache
+
+        Args:
+            cache_dir: Directory holding one subdirectory per entry
+            max_disk_bytes: Disk budget over all entries
+            max_memory_bytes: Budget of the loaded outputs kept in memory
+                              (results frames measured with memory_usage)
+        """
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(file_digest: str, model_digest: str) -> str:
+        """Entry key of a file's content hash under a model fingerprint"""
+        return f'{file_digest[:32]}-{model_digest[:16]}'
+
+    def path(self, key: str) -> str:
+        """Directory of an entry"""
+        return os.path.join(self.cache_dir, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.isdir(self.path(key))
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def put(self, key: str, src_dir: str) -> str:
+        """
+        Move a finished job directory into the cache
+
+        Args:
+            key: Entry key
+            src_dir: Directory with the job's files (moved, not copied)
+
+        Returns:
+            The entry's directory; if the key was already cached (another
+            session scored the same file meanwhile) src_dir is dropped and
+            the existing entry kept
+        """
+        dest = self.path(key)
+        with self._lock:
+            if os.path.isdir(dest):
+                shutil.rmtree(src_dir, ignore_errors=True)
+            else:
+                shutil.move(src_dir, dest)
+            os.utime(dest)
+            self._evict_disk(keep=key)
+        return dest
+
+    def load(self, key: str, loader: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Loaded output of an entry, from memory or via loader
+
+        Args:
+            key: Entry key (must be cached)
+            loader: Reads the output from the entry's directory
+
+        Returns:
+            A new dict each call; its values are shared and must not be modified
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                output, _ = self._memory[key]
+                self._touch(key)
+                return dict(output)
+            self.misses += 1
+        output = loader(self.path(key))
+        nbytes = self._nbytes(output)
+        with self._lock:
+            self._touch(key)
+            if nbytes <= self.max_memory_bytes:
+                if key in self._memory:
+                    self._memory_bytes -= self._memory.pop(key)[1]
+                self._memory[key] = (output, nbytes)
+                self._memory_bytes += nbytes
+                while self._memory_bytes > self.max_memory_bytes:
+                    _, (_, dropped) = self._memory.popitem(last=False)
+                    self._memory_bytes -= dropped
+        return dict(output)
+
+    def discard(self, key: str):
+        """Remove an entry from both tiers"""
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, bytes per tier and memory hit counts"""
+        with self._lock:
+            entries = self._entries()
+            return {
+                'entries': len(entries),
+                'disk_bytes': sum(size for _, size, _ in entries),
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def _touch(self, key: str):
+        """Mark an entry used now (its directory mtime orders disk eviction)"""
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        """(key, bytes, last used) of every entry on disk"""
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            path = self.path(key)
+            if not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((key, size, os.stat(path).st_mtime))
+        return entries
+
+    def _evict_disk(self, keep: Optional[str] = None):
+        """Delete least recently used entries until the disk budget holds"""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_disk_bytes:
+                break
+            if key == keep:
+                continue
+            self.discard(key)
+            total -= size
+
+    @staticmethod
+    def _nbytes(output: Dict[str, Any]) -> int:
+        """Memory of an output, counted by its results frame"""
+        results_df = output.get('results_df')
+        if isinstance(results_df, pd.DataFrame):
+            return int(results_df.memory_usage(deep=True).sum())
+        return 0
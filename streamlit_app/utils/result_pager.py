@@ -0,0 +1,118 @@
+"""
+Result Pager Module
+Server-side sorting, filtering and paging of prediction results
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class ResultPager:
+    """
+    Serve pages of a results frame without shipping the whole frame
+
+    Sort orders (one argsort per column) and filter indexes (row positions
+    per category) are built lazily and cached, and the last combined view
+    is kept, so flipping through pages only slices a position array.
+    """
+
+    def __init__(self, results_df: pd.DataFrame,
+                 filter_columns: Sequence[str] = ('action', 'trust_level', 'prediction')):
+        """
+        Initialize ResultPager
+
+        Args:
+            results_df: DataFrame returned by DataProcessor.predict
+            filter_columns: Categorical columns that can be filtered on
+        """
+        self.results_df = results_df
+        self.filter_columns = [c for c in filter_columns if c in results_df.columns]
+        self._sort_orders = {}
+        self._filter_indexes = {}
+        self._view_key = None
+        self._view = None
+
+    def __len__(self) -> int:
+        return len(self.results_df)
+
+    def sort_order(self, column: str) -> np.ndarray:
+        """Row positions in ascending order of column (stable, cached)"""
+        if column not in self._sort_orders:
+            self._sort_orders[column] = np.argsort(
+                self.results_df[column].to_numpy(), kind='stable')
+        return self._sort_orders[column]
+
+    def filter_index(self, column: str) -> Dict[str, np.ndarray]:
+        """Sorted row positions per category of column (cached)"""
+        if column not in self._filter_indexes:
+            codes, uniques = pd.factorize(self.results_df[column], sort=True)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._filter_indexes[column] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+            }
+        return self._filter_indexes[column]
+
+    def positions(self, sort_by: Optional[str] = None, ascending: bool = True,
+                  filters: Optional[Dict[str, Sequence[str]]] = None) -> np.ndarray:
+        """
+        Row positions of the sorted, filtered view
+
+        Args:
+            sort_by: Column to sort by (None keeps the original order)
+            ascending: Sort direction
+            filters: Mapping of column to allowed values
+
+        Returns:
+            Array of row positions into results_df
+        """
+        filters = {c: tuple(v) for c, v in (filters or {}).items() if v}
+        key = (sort_by, ascending, tuple(sorted(filters.items())))
+        if key == self._view_key:
+            return self._view
+
+        selected = None
+        for column, values in filters.items():
+            index = self.filter_index(column)
+            rows = np.concatenate([index.get(v, np.empty(0, dtype=np.intp)) for v in values])
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+        if sort_by is None:
+            view = np.sort(selected) if selected is not None else np.arange(len(self.results_df))
+        else:
+            order = self.sort_order(sort_by)
+            if not ascending:
+                order = order[::-1]
+            if selected is not None:
+                keep = np.zeros(len(self.results_df), dtype=bool)
+                keep[selected] = True
+                order = order[keep[order]]
+            view = order
+
+        self._view_key, self._view = key, view
+        return view
+
+    def page(self, page_number: int, page_size: int = 100, sort_by: Optional[str] = None,
+             ascending: bool = True, filters: Optional[Dict[str, Sequence[str]]] = None
+             ) -> Tuple[pd.DataFrame, int]:
+        """
+        Get one page of the sorted, filtered view
+
+        Args:
+            page_number: Zero-based page index
+            page_size: Rows per page
+            sort_by: Column to sort by
+            ascending: Sort direction
+            filters: Mapping of column to allowed values
+
+        Returns:
+            Tuple of (page DataFrame, total rows in the view)
+        """
+        view = self.positions(sort_by, ascending, filters)
+        start = max(page_number, 0) * page_size
+        return self.results_df.iloc[view[start:start + page_size]], len(view)
+
+    def num_pages(self, page_size: int, **view_kwargs) -> int:
+        """Number of pages in the view for a page size"""
+        return max(1, -(-len(self.positions(**view_kwargs)) // page_size))
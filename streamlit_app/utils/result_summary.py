@@ -0,0 +1,246 @@
+"""
+Result Summary Module
+Single-pass aggregates over prediction results
+"""
+
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+from .node_state import ACTIONS
+from .trust_policy import PREDICTIONS, TRUST_LEVELS
+
+
+# Grouping dimensions and their categories, in the results columns' code order
+DIMENSIONS = {
+    'action': ACTIONS,
+    'trust_level': TRUST_LEVELS,
+    'prediction': PREDICTIONS,
+}
+
+# Quantile sketch resolution: fixed-width bins over each column's range
+SKETCH_BINS = 1000
+SKETCH_RANGES = {
+    'trust_score': (0.0, 100.0),
+    'confidence': (0.0, 1.0),
+}
+
+
+class ResultSummary:
+    """
+    Incrementally maintained counts, sums and quantile sketches
+
+    Every update folds a results batch in with one categorical encoding
+    and a few bincounts, so chunked scoring can fill one summary and every
+    panel reads from it instead of re-filtering the results frame.
+    Quantiles come from fixed-bin histograms (error below one bin width).
+    """
+
+    def __init__(self):
+        """Initialize an empty ResultSummary"""
+        self.total = 0
+        self.labeled = 0
+        self.correct = 0
+        # Per column: overall sums, squared sums, extremes and sketch
+        self.sums = {col: 0.0 for col in SKETCH_RANGES}
+        self.sq_sums = {col: 0.0 for col in SKETCH_RANGES}
+        self.mins = {col: np.inf for col in SKETCH_RANGES}
+        self.maxs = {col: -np.inf for col in SKETCH_RANGES}
+        self.sketches = {col: np.zeros(SKETCH_BINS, dtype=np.int64) for col in SKETCH_RANGES}
+        # Per dimension category: counts, sums and trust/confidence sketches
+        self.counts = {dim: np.zeros(len(cats), dtype=np.int64) for dim, cats in DIMENSIONS.items()}
+        self.group_sums = {
+            dim: {col: np.zeros(len(cats)) for col in SKETCH_RANGES}
+            for dim, cats in DIMENSIONS.items()
+        }
+        self.group_sketches = {
+            dim: {col: np.zeros((len(cats), SKETCH_BINS), dtype=np.int64) for col in SKETCH_RANGES}
+            for dim, cats in DIMENSIONS.items()
+        }
+
+    def update(self, results_df: pd.DataFrame):
+        """
+        Fold a batch of prediction results into the summary
+
+        Args:
+            results_df: DataFrame returned by DataProcessor.predict
+        """
+        n = len(results_df)
+        if n == 0:
+            return
+        self.total += n
+
+        bins = {}
+        for col, (low, high) in SKETCH_RANGES.items():
+            values = results_df[col].to_numpy(dtype=np.float64)
+            self.sums[col] += values.sum()
+            self.sq_sums[col] += np.square(values).sum()
+            self.mins[col] = min(self.mins[col], values.min())
+            self.maxs[col] = max(self.maxs[col], values.max())
+            bins[col] = self._bin(values, low, high)
+            self.sketches[col] += np.bincount(bins[col], minlength=SKETCH_BINS)
+
+        for dim, cats in DIMENSIONS.items():
+            codes = pd.Categorical(results_df[dim], categories=cats).codes.astype(np.int64)
+            known = codes >= 0
+            codes = codes[known]
+            self.counts[dim] += np.bincount(codes, minlength=len(cats))
+            for col in SKETCH_RANGES:
+                values = results_df[col].to_numpy(dtype=np.float64)[known]
+                self.group_sums[dim][col] += np.bincount(codes, weights=values, minlength=len(cats))
+                flat = codes * SKETCH_BINS + bins[col][known]
+                self.group_sketches[dim][col] += np.bincount(
+                    flat, minlength=len(cats) * SKETCH_BINS).reshape(len(cats), SKETCH_BINS)
+
+        if 'correct' in results_df.columns:
+            self.labeled += n
+            self.correct += int(results_df['correct'].sum())
+
+    def merge(self, other: 'ResultSummary') -> 'ResultSummary':
+        """
+        Add another summary's totals into this one
+
+        Args:
+            other: Summary of a disjoint set of results
+
+        Returns:
+            self, for chaining
+        """
+        self.total += other.total
+        self.labeled += other.labeled
+        self.correct += other.correct
+        for col in SKETCH_RANGES:
+            self.sums[col] += other.sums[col]
+            self.sq_sums[col] += other.sq_sums[col]
+            self.mins[col] = min(self.mins[col], other.mins[col])
+            self.maxs[col] = max(self.maxs[col], other.maxs[col])
+            self.sketches[col] += other.sketches[col]
+        for dim in DIMENSIONS:
+            self.counts[dim] += other.counts[dim]
+            for col in SKETCH_RANGES:
+                self.group_sums[dim][col] += other.group_sums[dim][col]
+                self.group_sketches[dim][col] += other.group_sketches[dim][col]
+        return self
+
+    def count(self, dim: str, category: str) -> int:
+        """Number of rows whose dim equals category"""
+        return int(self.counts[dim][DIMENSIONS[dim].index(category)])
+
+    def value_counts(self, dim: str) -> pd.Series:
+        """Non-zero category counts for a dimension, largest first"""
+        counts = pd.Series(self.counts[dim], index=list(DIMENSIONS[dim]))
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def mean(self, col: str) -> float:
+        """Mean of trust_score or confidence"""
+        return self.sums[col] / self.total if self.total else float('nan')
+
+    def std(self, col: str) -> float:
+        """Sample standard deviation of trust_score or confidence"""
+        if self.total < 2:
+            return float('nan')
+        variance = (self.sq_sums[col] - self.sums[col] ** 2 / self.total) / (self.total - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        """Fraction of labeled rows predicted correctly, if any were labeled"""
+        return self.correct / self.labeled if self.labeled else None
+
+    def quantiles(self, col: str, qs: Sequence[float], dim: Optional[str] = None,
+                  category: Optional[str] = None) -> np.ndarray:
+        """
+        Approximate quantiles from the histogram sketch
+
+        Args:
+            col: 'trust_score' or 'confidence'
+            qs: Quantiles in [0, 1]
+            dim: Optional dimension to restrict to (with category)
+            category: Category of dim to restrict to
+
+        Returns:
+            Array of quantile estimates (linear within a bin)
+        """
+        if dim is None:
+            sketch = self.sketches[col]
+        else:
+            sketch = self.group_sketches[dim][col][DIMENSIONS[dim].index(category)]
+        total = sketch.sum()
+        if total == 0:
+            return np.full(len(qs), np.nan)
+
+        low, high = SKETCH_RANGES[col]
+        width = (high - low) / SKETCH_BINS
+        cumulative = np.cumsum(sketch)
+        targets = np.asarray(qs, dtype=np.float64) * total
+        idx = np.minimum(np.searchsorted(cumulative, targets, side='left'), SKETCH_BINS - 1)
+        before = np.where(idx > 0, cumulative[idx - 1], 0)
+        within = np.where(sketch[idx] > 0, (targets - before) / np.maximum(sketch[idx], 1), 0)
+        estimates = low + (idx + np.clip(within, 0, 1)) * width
+        return np.clip(estimates, self.mins[col], self.maxs[col])
+
+    def group_stats(self, dim: str, col: str = 'trust_score') -> pd.DataFrame:
+        """
+        Per-category count, mean and quartiles of a column
+
+        Args:
+            dim: 'action', 'trust_level' or 'prediction'
+            col: 'trust_score' or 'confidence'
+
+        Returns:
+            DataFrame indexed by category (only categories with rows)
+        """
+        rows = []
+        for i, cat in enumerate(DIMENSIONS[dim]):
+            n = self.counts[dim][i]
+            if n == 0:
+                continue
+            q = self.quantiles(col, [0.0, 0.25, 0.5, 0.75, 1.0], dim=dim, category=cat)
+            rows.append({dim: cat, 'count': int(n), 'mean': self.group_sums[dim][col][i] / n,
+                         'min': q[0], '25%': q[1], '50%': q[2], '75%': q[3], 'max': q[4]})
+        return pd.DataFrame(rows).set_index(dim) if rows else pd.DataFrame()
+
+    def histogram(self, col: str, bins: int = 25) -> Dict[str, np.ndarray]:
+        """
+        Coarsen the sketch into a histogram for charts
+
+        Args:
+            col: 'trust_score' or 'confidence'
+            bins: Number of output bins (must divide SKETCH_BINS, so each
+                  output bin covers whole sketch bins)
+
+        Returns:
+            Dictionary with 'counts' and 'edges'
+        """
+        if bins <= 0 or SKETCH_BINS % bins:
+            raise ValueError(f"bins must divide {SKETCH_BINS}, got {bins}")
+        low, high = SKETCH_RANGES[col]
+        counts = self.sketches[col].reshape(bins, SKETCH_BINS // bins).sum(axis=1)
+        return {'counts': counts, 'edges': np.linspace(low, high, bins + 1)}
+
+    def describe(self) -> pd.DataFrame:
+        """Equivalent of results_df[['trust_score', 'confidence']].describe()"""
+        stats = {}
+        for col in SKETCH_RANGES:
+            q = self.quantiles(col, [0.25, 0.5, 0.75])
+            stats[col] = [self.total, self.mean(col), self.std(col), self.mins[col],
+                          q[0], q[1], q[2], self.maxs[col]]
+        return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def fingerprint(self) -> str:
+        """Content hash of the summary state, for caching derived figures"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array([self.total, self.labeled, self.correct]).tobytes())
+        for col in SKETCH_RANGES:
+            digest.update(self.sketches[col].tobytes())
+        for dim in DIMENSIONS:
+            digest.update(self.counts[dim].tobytes())
+            digest.update(self.group_sketches[dim]['trust_score'].tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _bin(values: np.ndarray, low: float, high: float) -> np.ndarray:
+        """Map values to sketch bin indexes (closed upper edge)"""
+        scaled = (values - low) * (SKETCH_BINS / (high - low))
+        return np.clip(scaled.astype(np.int64), 0, SKETCH_BINS - 1)
@@ -0,0 +1,338 @@
+"""
+Results Store Module
+Persists scored decisions in SQLite with indexed lookups and time-bucket aggregates
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from .node_state import ACTIONS
+from .trust_policy import PREDICTIONS, TRUST_LEVELS
+
+
+# Trend resolutions: bucket name -> width in seconds
+BUCKET_WIDTHS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Stored codes: prediction 0/1 as the model's classes, action and trust
+# level as indexes into ACTIONS / TRUST_LEVELS (the codes predict() returns)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id INTEGER PRIMARY KEY,
+    source TEXT,
+    file_hash TEXT,
+    model TEXT,
+    started REAL NOT NULL,
+    finished REAL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    quarantined INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    batch_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    node_id TEXT,
+    prediction INTEGER NOT NULL,
+    trust_score REAL NOT NULL,
+    trust_level INTEGER NOT NULL,
+    action INTEGER NOT NULL,
+    correct INTEGER
+);
+CREATE INDEX IF NOT EXISTS decisions_ts ON decisions (ts);
+CREATE INDEX IF NOT EXISTS decisions_action_ts ON decisions (action, ts);
+CREATE INDEX IF NOT EXISTS decisions_level_ts ON decisions (trust_level, ts);
+CREATE INDEX IF NOT EXISTS decisions_node_ts ON decisions (node_id, ts);
+CREATE INDEX IF NOT EXISTS decisions_batch ON decisions (batch_id);
+CREATE TABLE IF NOT EXISTS buckets (
+    width INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    action INTEGER NOT NULL,
+    prediction INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    trust_sum REAL NOT NULL,
+    trust_sq_sum REAL NOT NULL,
+    labeled INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (width, start, action, prediction)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_BUCKET = """
+INSERT INTO buckets (width, start, action, prediction, n, trust_sum, trust_sq_sum, labeled, correct)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (width, start, action, prediction) DO UPDATE SET
+    n = n + excluded.n,
+    trust_sum = trust_sum + excluded.trust_sum,
+    trust_sq_sum = trust_sq_sum + excluded.trust_sq_sum,
+    labeled = labeled + excluded.labeled,
+    correct = correct + excluded.correct
+"""
+
+
+class ResultsStore:
+    """
+    Append-only store of scored decisions
+
+    Every decision row is kept in an indexed table (timestamp, action,
+    trust level, node id) for drill-down queries. Alongside, counts and
+    trust sums are upserted into per-minute, per-hour and per-day
+    buckets in the same transaction, so trend and dashboard queries read
+    a few thousand bucket rows however many decisions are stored.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Initialize ResultsStore
+
+        Args:
+            path: SQLite database file (created if missing) or ':memory:'
+        """
+        self.path = path
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the page and background job threads
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.RLock()
+        with self._lock:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            # Random node ids touch the whole index; keep more of it cached
+            self._conn.execute('PRAGMA cache_size=-65536')
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def begin_batch(self, source: Optional[str] = None, file_hash: Optional[str] = None,
+                    model: Optional[str] = None) -> int:
+        """
+        Register a batch whose decisions will be appended
+
+        Returns:
+            batch_id to pass to append and finish_batch
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO batches (source, file_hash, model, started) VALUES (?, ?, ?, ?)',
+                (source, file_hash, model, time.time()))
+        return cursor.lastrowid
+
+    def append(self, batch_id: int, results_df: pd.DataFrame, timestamps: Any = None) -> int:
+        """
+        Store a chunk of prediction results and update the buckets
+
+        Args:
+            batch_id: Batch from begin_batch
+            results_df: Output of DataProcessor.predict
+            timestamps: Epoch seconds per row, a single value, or None for
+                        now (a 'timestamp' column is used when present)
+
+        Returns:
+            Rows stored
+        """
+        n = len(results_df)
+        if n == 0:
+            return 0
+        if timestamps is None and 'timestamp' in results_df.columns:
+            timestamps = pd.to_datetime(results_df['timestamp']).astype('int64') / 1e9
+        ts = np.broadcast_to(np.asarray(time.time() if timestamps is None else timestamps,
+                                        dtype=np.float64), (n,))
+        prediction = pd.Categorical(results_df['prediction'], categories=PREDICTIONS).codes.astype(np.int64)
+        action = pd.Categorical(results_df['action'], categories=ACTIONS).codes.astype(np.int64)
+        level = pd.Categorical(results_df['trust_level'], categories=TRUST_LEVELS).codes.astype(np.int64)
+        # float32 scores back to the two decimals they were rounded to
+        trust = results_df['trust_score'].to_numpy(dtype=np.float64).round(2)
+        if 'correct' in results_df.columns:
+            correct = results_df['correct'].to_numpy(dtype=np.float64)
+            labeled = ~np.isnan(correct)
+        else:
+            correct = np.full(n, np.nan)
+            labeled = np.zeros(n, dtype=bool)
+        node_ids = (results_df['node_id'].astype(str).tolist() if 'node_id' in results_df.columns
+                    else [None] * n)
+
+        correct_values = [int(c) if ok else None for c, ok in zip(np.nan_to_num(correct).tolist(), labeled)]
+        rows = zip([batch_id] * n, ts.tolist(), node_ids, prediction.tolist(), trust.tolist(),
+                   level.tolist(), action.tolist(), correct_values)
+        frame = pd.DataFrame({
+            'action': action, 'prediction': prediction, 'n': 1, 'trust_sum': trust,
+            'trust_sq_sum': trust * trust, 'labeled': labeled.astype(np.int64),
+            'correct': np.where(labeled, np.nan_to_num(correct), 0).astype(np.int64),
+        })
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO decisions (batch_id, ts, node_id, prediction, trust_score, trust_level, '
+                'action, correct) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            for width in BUCKET_WIDTHS.values():
+                self._conn.executemany(_UPSERT_BUCKET, self._bucket_rows(frame, ts, width))
+            self._conn.execute('UPDATE batches SET rows = rows + ? WHERE batch_id = ?', (n, batch_id))
+        return n
+
+    def finish_batch(self, batch_id: int, quarantined: int = 0, status: str = 'done'):
+        """Mark a batch complete"""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE batches SET finished = ?, quarantined = ?, status = ? WHERE batch_id = ?',
+                               (time.time(), quarantined, status, batch_id))
+
+    def record(self, results_df: pd.DataFrame, source: Optional[str] = None,
+               timestamps: Any = None, **batch) -> int:
+        """Store a whole results frame as one batch; returns its batch_id"""
+        batch_id = self.begin_batch(source, **batch)
+        self.append(batch_id, results_df, timestamps)
+        self.finish_batch(batch_id)
+        return batch_id
+
+    def delete_batch(self, batch_id: int) -> int:
+        """
+        Remove a batch's decisions and take them back out of the buckets
+
+        Returns:
+            Decisions removed
+        """
+        with self._lock, self._conn:
+            for width in BUCKET_WIDTHS.values():
+                aggregates = self._conn.execute(
+                    'SELECT CAST(ts / ? AS INTEGER) * ?, action, prediction, COUNT(*), SUM(trust_score), '
+                    'SUM(trust_score * trust_score), COUNT(correct), COALESCE(SUM(correct), 0) '
+                    'FROM decisions WHERE batch_id = ? GROUP BY 1, 2, 3', (width, width, batch_id)).fetchall()
+                self._conn.executemany(_UPSERT_BUCKET, [
+                    (width, start, action, prediction, -n, -s, -sq, -labeled, -correct)
+                    for start, action, prediction, n, s, sq, labeled, correct in aggregates])
+            self._conn.execute('DELETE FROM buckets WHERE n <= 0')
+            removed = self._conn.execute('DELETE FROM decisions WHERE batch_id = ?', (batch_id,)).rowcount
+            self._conn.execute('DELETE FROM batches WHERE batch_id = ?', (batch_id,))
+        return removed
+
+    def trend(self, bucket: str = 'hour', start: Optional[float] = None,
+              end: Optional[float] = None) -> pd.DataFrame:
+        """
+        Per-bucket decision counts and trust, from the pre-aggregated buckets
+
+        Args:
+            bucket: One of BUCKET_WIDTHS
+            start: Earliest epoch second (inclusive)
+            end: Latest epoch second (exclusive)
+
+        Returns:
+            DataFrame indexed by bucket start time with rows, ALLOW/MONITOR/
+            BLOCK counts, anomalies, mean_trust, std_trust and accuracy
+            (NaN for buckets without labeled rows)
+        """
+        if bucket not in BUCKET_WIDTHS:
+            raise ValueError(f"Unknown bucket {bucket!r}; expected one of {list(BUCKET_WIDTHS)}")
+        width = BUCKET_WIDTHS[bucket]
+        query = 'SELECT start, action, prediction, n, trust_sum, trust_sq_sum, labeled, correct FROM buckets WHERE width = ?'
+        params = [width]
+        if start is not None:
+            query += ' AND start >= ?'
+            params.append(int(start // width * width))
+        if end is not None:
+            query += ' AND start < ?'
+            params.append(end)
+        with self._lock:
+            raw = pd.read_sql_query(query, self._conn, params=params)
+
+        columns = ['rows', *ACTIONS, 'anomalies', 'mean_trust', 'std_trust', 'accuracy']
+        if raw.empty:
+            return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='bucket'))
+        grouped = raw.groupby('start')
+        trend = pd.DataFrame({'rows': grouped['n'].sum()})
+        by_action = raw.pivot_table(index='start', columns='action', values='n', aggfunc='sum', fill_value=0)
+        for code, action in enumerate(ACTIONS):
+            trend[action] = by_action[code] if code in by_action.columns else 0
+        trend['anomalies'] = raw[raw['prediction'] == 0].groupby('start')['n'].sum()
+        trend['anomalies'] = trend['anomalies'].fillna(0).astype(np.int64)
+        sums = grouped[['trust_sum', 'trust_sq_sum', 'labeled', 'correct']].sum()
+        trend['mean_trust'] = sums['trust_sum'] / trend['rows']
+        variance = sums['trust_sq_sum'] / trend['rows'] - trend['mean_trust'] ** 2
+        trend['std_trust'] = np.sqrt(variance.clip(lower=0))
+        trend['accuracy'] = (sums['correct'] / sums['labeled']).where(sums['labeled'] > 0)
+        trend.index = pd.to_datetime(trend.index, unit='s').rename('bucket')
+        return trend[columns]
+
+    def totals(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, Any]:
+        """Overall counts and mean trust over a period, from the daily buckets"""
+        trend = self.trend('day', start, end)
+        rows = int(trend['rows'].sum())
+        totals = {'rows': rows, **{a: int(trend[a].sum()) for a in ACTIONS},
+                  'anomalies': int(trend['anomalies'].sum())}
+        totals['mean_trust'] = float((trend['mean_trust'] * trend['rows']).sum() / rows) if rows else np.nan
+        return totals
+
+    def decisions(self, start: Optional[float] = None, end: Optional[float] = None,
+                  action: Optional[str] = None, trust_level: Optional[str] = None,
+                  node_id: Optional[Any] = None, limit: int = 10_000) -> pd.DataFrame:
+        """
+        Stored decisions matching the filters, newest first
+
+        Args:
+            start: Earliest epoch second (inclusive)
+            end: Latest epoch second (exclusive)
+            action: ALLOW, MONITOR or BLOCK
+            trust_level: High, Medium or Low
+            node_id: Only this node
+            limit: Maximum rows returned
+
+        Returns:
+            DataFrame with timestamp, node_id, prediction, trust_score,
+            trust_level, action, correct and batch_id
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('ts < ?')
+            params.append(end)
+        if action is not None:
+            clauses.append('action = ?')
+            params.append(ACTIONS.index(action))
+        if trust_level is not None:
+            clauses.append('trust_level = ?')
+            params.append(TRUST_LEVELS.index(trust_level))
+        if node_id is not None:
+            clauses.append('node_id = ?')
+            params.append(str(node_id))
+        query = ('SELECT ts, node_id, prediction, trust_score, trust_level, action, correct, batch_id '
+                 'FROM decisions')
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY ts DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            frame = pd.read_sql_query(query, self._conn, params=params)
+
+        frame.insert(0, 'timestamp', pd.to_datetime(frame.pop('ts'), unit='s'))
+        frame['prediction'] = np.asarray(PREDICTIONS, dtype=object)[frame['prediction'].to_numpy(dtype=np.int64)]
+        frame['trust_level'] = np.asarray(TRUST_LEVELS, dtype=object)[frame['trust_level'].to_numpy(dtype=np.int64)]
+        frame['action'] = np.asarray(ACTIONS, dtype=object)[frame['action'].to_numpy(dtype=np.int64)]
+        return frame
+
+    def batches(self) -> pd.DataFrame:
+        """Stored batches, newest first"""
+        with self._lock:
+            frame = pd.read_sql_query('SELECT * FROM batches ORDER BY batch_id DESC', self._conn)
+        for col in ('started', 'finished'):
+            frame[col] = pd.to_datetime(frame[col], unit='s')
+        return frame.set_index('batch_id')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(n), 0) FROM buckets WHERE width = ?',
+                                      (BUCKET_WIDTHS['day'],)).fetchone()[0]
+
+    @staticmethod
+    def _bucket_rows(frame: pd.DataFrame, ts: np.ndarray, width: int):
+        """Aggregate a chunk into (width, start, action, prediction, sums...) rows"""
+        starts = (ts // width).astype(np.int64) * width
+        grouped = frame.assign(start=starts).groupby(['start', 'action', 'prediction'], sort=False).sum()
+        for (start, action, prediction), row in zip(grouped.index, grouped.itertuples(index=False)):
+            yield (width, int(start), int(action), int(prediction), int(row.n), float(row.trust_sum),
+                   float(row.trust_sq_sum), int(row.labeled), int(row.correct))
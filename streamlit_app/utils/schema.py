@@ -0,0 +1,69 @@
+"""
+Schema Module
+Column kinds, storage dtypes and valid ranges of the model features
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+CATEGORICAL_FEATURES = ('protocol_type', 'service', 'flag')
+BINARY_FEATURES = ('land', 'logged_in', 'root_shell', 'is_host_login', 'is_guest_login')
+BYTE_FEATURES = ('src_bytes', 'dst_bytes')
+
+# Feature kind -> (dtype, dtype when the column has nulls, (min, max) or None)
+FEATURE_KINDS = {
+    'categorical': ('category', 'category', None),
+    'binary': ('int8', 'float32', (0, 1)),
+    'count': ('int32', 'float32', (0, None)),
+    'bytes': ('int64', 'float64', (0, None)),
+    'rate': ('float32', 'float32', (0.0, 1.0)),
+}
+
+# Non-feature columns carried through reading untouched
+PASSTHROUGH_COLUMNS = ('node_id', 'id', 'class')
+
+
+def normalize_column_name(name: str) -> str:
+    """Strip whitespace and quoting, e.g. " 'duration' " -> "duration" """
+    return str(name).strip().strip('\'"').strip()
+
+
+def feature_kind(name: str) -> str:
+    """Kind of a model feature, from the KDD naming conventions"""
+    if name in CATEGORICAL_FEATURES:
+        return 'categorical'
+    if name in BINARY_FEATURES:
+        return 'binary'
+    if name in BYTE_FEATURES:
+        return 'bytes'
+    if name.endswith('_rate'):
+        return 'rate'
+    return 'count'
+
+
+def build_schema(feature_names: List[str],
+                 label_encoders: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Describe every model feature
+
+    Args:
+        feature_names: Feature names in model order
+        label_encoders: Fitted encoders; their classes_ become the vocabulary
+
+    Returns:
+        Dictionary of feature -> {'kind', 'dtype', 'null_dtype', 'range', 'vocabulary'}
+    """
+    label_encoders = label_encoders or {}
+    schema = {}
+    for name in feature_names:
+        kind = feature_kind(name)
+        dtype, null_dtype, valid_range = FEATURE_KINDS[kind]
+        encoder = label_encoders.get(name)
+        schema[name] = {
+            'kind': kind,
+            'dtype': dtype,
+            'null_dtype': null_dtype,
+            'range': valid_range,
+            'vocabulary': list(encoder.classes_) if encoder is not None else None,
+        }
+    return schema
@@ -0,0 +1,249 @@
+"""
+Scoring Bundle Module
+NumPy-only copies of the fitted model and preprocessing, for fast cold starts
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Optional, Sequence
+
+
+BUNDLE_FILE = 'scoring_bundle.npz'
+
+# Pickles the bundle is built from, relative to the model directory
+BUNDLE_SOURCES = ('svm_optimized_model.pkl', 'feature_scaler.pkl', 'trust_scaler.pkl',
+                  'label_encoders.pkl', 'feature_names.pkl', 'imputation_values.pkl')
+
+# Rows per kernel block in decision_function (block x support vectors float64)
+KERNEL_BLOCK_ROWS = 4096
+
+
+class BundledSVC:
+    """
+    RBF-kernel binary SVC evaluated with NumPy
+
+    decision_function matches sklearn's SVC to ~1e-11 and predict_proba
+    reproduces libsvm's Platt scaling and pairwise coupling, so results
+    equal the pickled model's. The kernel is computed in row blocks as
+    one matrix product per block.
+    """
+
+    def __init__(self, support_vectors: np.ndarray, dual_coef: np.ndarray, intercept: float,
+                 gamma: float, prob_a: float, prob_b: float, classes: np.ndarray):
+        self.support_vectors_ = support_vectors
+        self.dual_coef_ = dual_coef.reshape(1, -1)
+        self.intercept_ = np.array([intercept])
+        self.gamma = gamma
+        self.probA_ = np.array([prob_a])
+        self.probB_ = np.array([prob_b])
+        self.classes_ = classes
+        self.n_features_in_ = support_vectors.shape[1]
+        self._sv_sq = (support_vectors * support_vectors).sum(axis=1)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty(len(X))
+        coef = self.dual_coef_[0]
+        for start in range(0, len(X), KERNEL_BLOCK_ROWS):
+            block = X[start:start + KERNEL_BLOCK_ROWS]
+            sq_dist = (block * block).sum(axis=1)[:, None] + self._sv_sq[None, :] - 2.0 * (block @ self.support_vectors_.T)
+            np.maximum(sq_dist, 0.0, out=sq_dist)
+            out[start:start + len(block)] = np.exp(-self.gamma * sq_dist) @ coef
+        return out + self.intercept_[0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.proba_from_decision(self.decision_function(X))
+
+    def proba_from_decision(self, decision: np.ndarray) -> np.ndarray:
+        """Class probabilities for given decision values, as libsvm computes them"""
+        # libsvm's decision value for the (0, 1) pair is the negated sklearn one
+        fApB = -decision * self.probA_[0] + self.probB_[0]
+        with np.errstate(over='ignore'):
+            r01 = np.where(fApB >= 0, np.exp(-fApB) / (1.0 + np.exp(-fApB)), 1.0 / (1.0 + np.exp(fApB)))
+        r01 = np.clip(r01, 1e-7, 1 - 1e-7)
+        p0, p1 = _couple_pairwise(r01)
+        return np.column_stack([p0, p1])
+
+
+def _couple_pairwise(r01: np.ndarray, max_iter: int = 100):
+    """
+    libsvm's multiclass_probability for two classes, vectorized over rows
+
+    libsvm iterates the coupling to a 0.005/k tolerance instead of using
+    r01 directly, so the same updates are replayed per row until each row
+    meets the stopping rule.
+    """
+    r10 = 1.0 - r01
+    q00, q11, q01 = r10 * r10, r01 * r01, -r10 * r01
+    p0 = np.full(len(r01), 0.5)
+    p1 = np.full(len(r01), 0.5)
+    active = np.ones(len(r01), dtype=bool)
+    eps = 0.005 / 2
+    for _ in range(max_iter):
+        qp0 = q00 * p0 + q01 * p1
+        qp1 = q01 * p0 + q11 * p1
+        pqp = p0 * qp0 + p1 * qp1
+        active &= np.maximum(np.abs(qp0 - pqp), np.abs(qp1 - pqp)) >= eps
+        if not active.any():
+            break
+        # Update class 0, then class 1 with the refreshed Qp and pQp
+        diff = (pqp - qp0) / q00
+        new_pqp = (pqp + diff * (diff * q00 + 2 * qp0)) / (1 + diff) / (1 + diff)
+        new_qp1 = (qp1 + diff * q01) / (1 + diff)
+        new_p0 = (p0 + diff) / (1 + diff)
+        new_p1 = p1 / (1 + diff)
+        diff = (new_pqp - new_qp1) / q11
+        new_p1 = (new_p1 + diff) / (1 + diff)
+        new_p0 = new_p0 / (1 + diff)
+        p0 = np.where(active, new_p0, p0)
+        p1 = np.where(active, new_p1, p1)
+    return p0, p1
+
+
+class BundledStandardScaler:
+    """StandardScaler.transform with the fitted mean_ and scale_"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, feature_names: Sequence[str]):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(mean)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class BundledMinMaxScaler:
+    """MinMaxScaler.transform (the trust scaler) with the fitted scale_ and min_"""
+
+    def __init__(self, scale: np.ndarray, offset: np.ndarray, data_min: np.ndarray, data_max: np.ndarray):
+        self.scale_ = scale
+        self.min_ = offset
+        self.data_min_ = data_min
+        self.data_max_ = data_max
+        self.n_features_in_ = len(scale)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X *= self.scale_
+        X += self.min_
+        return X
+
+
+class BundledLabelEncoder:
+    """LabelEncoder.transform over sorted classes_"""
+
+    def __init__(self, classes: np.ndarray):
+        self.classes_ = classes
+
+    def transform(self, values: Any) -> np.ndarray:
+        values = np.asarray(values, dtype=object)
+        codes = np.searchsorted(self.classes_, values)
+        found = codes < len(self.classes_)
+        found[found] = self.classes_[codes[found]] == values[found]
+        if not found.all():
+            raise ValueError(f"y contains previously unseen labels: {sorted(set(values[~found]))[:5]}")
+        return codes
+
+
+def source_digest(model_dir: str, names: Sequence[str] = BUNDLE_SOURCES) -> Optional[str]:
+    """Hash of the source pickles, to tell whether a bundle is stale (None if none exist)"""
+    digest = hashlib.sha256()
+    found = False
+    for name in names:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(name.encode() + f.read())
+            found = True
+    return digest.hexdigest() if found else None
+
+
+def export_bundle(model, scaler, trust_scaler, label_encoders: Dict[str, Any], feature_names: Sequence[str],
+                  imputation_values: Dict[str, Any], path: str, digest: Optional[str] = None):
+    """
+    Write the fitted components as plain arrays
+
+    Args:
+        model: Fitted binary RBF SVC with probability=True
+        scaler: Fitted StandardScaler over the features
+        trust_scaler: Fitted MinMaxScaler over decision values
+        label_encoders: Fitted LabelEncoders by feature
+        feature_names: Feature names in model order
+        imputation_values: Per-feature fill values
+        path: Output .npz path
+        digest: source_digest of the pickles the components came from
+    """
+    if getattr(model, 'kernel', None) != 'rbf' or len(model.classes_) != 2 or not len(getattr(model, 'probA_', [])):
+        raise ValueError("Only binary RBF SVCs fitted with probability=True can be bundled")
+    meta = {
+        'feature_names': list(feature_names),
+        'scaler_feature_names': [str(n) for n in getattr(scaler, 'feature_names_in_', feature_names)],
+        'encoders': sorted(label_encoders),
+        'imputation_values': {k: (v.item() if hasattr(v, 'item') else v) for k, v in imputation_values.items()},
+        'gamma': float(model._gamma),
+        'intercept': float(model.intercept_[0]),
+        'prob_a': float(model.probA_[0]),
+        'prob_b': float(model.probB_[0]),
+        'source_digest': digest,
+    }
+    arrays = {
+        'support_vectors': model.support_vectors_,
+        'dual_coef': model.dual_coef_[0],
+        'classes': model.classes_,
+        'scaler_mean': scaler.mean_,
+        'scaler_scale': scaler.scale_,
+        'trust_scale': trust_scaler.scale_,
+        'trust_min': trust_scaler.min_,
+        'trust_data_min': trust_scaler.data_min_,
+        'trust_data_max': trust_scaler.data_max_,
+        'meta': np.array(json.dumps(meta)),
+    }
+    for col, encoder in label_encoders.items():
+        arrays[f'classes_{col}'] = np.asarray(encoder.classes_, dtype=str)
+    np.savez(path, **arrays)
+
+
+def load_bundle(path: str, digest: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a bundle written by export_bundle
+
+    Args:
+        path: Bundle .npz path
+        digest: If given, the bundle is only used when built from these sources
+
+    Returns:
+        Dict with model, scaler, trust_scaler, label_encoders, feature_names
+        and imputation_values, or None when the bundle is missing or stale;
+        quantized bundles (export_quantized) give a QuantizedSVC model
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if digest is not None and meta['source_digest'] != digest:
+            return None
+        if meta.get('quantization'):
+            from .quantized_model import model_from_arrays
+            model = model_from_arrays(data, meta)
+        else:
+            model = BundledSVC(data['support_vectors'], data['dual_coef'], meta['intercept'], meta['gamma'],
+                               meta['prob_a'], meta['prob_b'], data['classes'])
+        return {
+            'model': model,
+            'scaler': BundledStandardScaler(data['scaler_mean'], data['scaler_scale'], meta['scaler_feature_names']),
+            'trust_scaler': BundledMinMaxScaler(data['trust_scale'], data['trust_min'],
+                                                data['trust_data_min'], data['trust_data_max']),
+            'label_encoders': {col: BundledLabelEncoder(data[f'classes_{col}'].astype(object))
+                               for col in meta['encoders']},
+            'feature_names': meta['feature_names'],
+            'imputation_values': meta['imputation_values'],
+        }
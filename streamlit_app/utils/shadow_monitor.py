@@ -0,0 +1,140 @@
+"""
+Shadow Monitor Module
+Records per-model latency and shadow vs primary disagreements
+"""
+
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from .node_state import ACTIONS
+
+
+class ShadowMonitor:
+    """
+    Accumulate scoring statistics across batches
+
+    For every model: rows scored and time spent. For every shadow: how
+    often its prediction and action differ from the primary's, a 3x3
+    primary-vs-shadow action matrix, the mean absolute trust difference
+    and a bounded sample of disagreeing rows.
+    """
+
+    def __init__(self, max_samples: int = 100):
+        """
+        Initialize ShadowMonitor
+
+        Args:
+            max_samples: Disagreeing rows kept per shadow (most recent)
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded statistics"""
+        with self._lock:
+            self._latency = {}
+            self._shadows = {}
+
+    def record_latency(self, name: str, rows: int, seconds: float):
+        """Add one scoring call of a model"""
+        with self._lock:
+            stats = self._latency.setdefault(name, {'batches': 0, 'rows': 0, 'seconds': 0.0})
+            stats['batches'] += 1
+            stats['rows'] += rows
+            stats['seconds'] += seconds
+
+    def record(self, name: str, primary: Dict[str, np.ndarray], shadow: Dict[str, np.ndarray],
+               node_ids: Optional[np.ndarray] = None):
+        """
+        Compare one batch of shadow scores with the primary's
+
+        Args:
+            name: Shadow model name
+            primary: Scores with 'prediction_codes', 'action_codes' and 'trust_scores'
+            shadow: Same keys for the shadow model
+            node_ids: Optional node identifiers for the disagreement sample
+        """
+        prediction_diff = primary['prediction_codes'] != shadow['prediction_codes']
+        action_diff = primary['action_codes'] != shadow['action_codes']
+        matrix = np.bincount(primary['action_codes'] * len(ACTIONS) + shadow['action_codes'],
+                             minlength=len(ACTIONS) ** 2).reshape(len(ACTIONS), len(ACTIONS))
+        trust_delta = np.abs(primary['trust_scores'] - shadow['trust_scores'])
+
+        disagreeing = np.flatnonzero(prediction_diff | action_diff)[-self.max_samples:]
+        sample = pd.DataFrame({
+            'node_id': node_ids[disagreeing] if node_ids is not None else disagreeing,
+            'primary_action': np.asarray(ACTIONS)[primary['action_codes'][disagreeing]],
+            'shadow_action': np.asarray(ACTIONS)[shadow['action_codes'][disagreeing]],
+            'primary_trust': primary['trust_scores'][disagreeing].round(2),
+            'shadow_trust': shadow['trust_scores'][disagreeing].round(2),
+        })
+
+        with self._lock:
+            stats = self._shadows.setdefault(name, {
+                'rows': 0, 'prediction_disagreements': 0, 'action_disagreements': 0,
+                'trust_delta_sum': 0.0, 'action_matrix': np.zeros((len(ACTIONS), len(ACTIONS)), dtype=np.int64),
+                'samples': deque(maxlen=self.max_samples),
+            })
+            stats['rows'] += len(trust_delta)
+            stats['prediction_disagreements'] += int(prediction_diff.sum())
+            stats['action_disagreements'] += int(action_diff.sum())
+            stats['trust_delta_sum'] += float(trust_delta.sum())
+            stats['action_matrix'] += matrix
+            stats['samples'].extend(sample.to_dict('records'))
+
+    def report(self) -> pd.DataFrame:
+        """
+        Per-model summary
+
+        Returns:
+            DataFrame indexed by model with rows, latency and, for shadows,
+            disagreement counts and rates
+        """
+        with self._lock:
+            rows = []
+            for name, lat in self._latency.items():
+                row = {
+                    'model': name,
+                    'rows': lat['rows'],
+                    'ms_per_1k_rows': 1e6 * lat['seconds'] / lat['rows'] if lat['rows'] else np.nan,
+                    'rows_per_sec': lat['rows'] / lat['seconds'] if lat['seconds'] else np.nan,
+                }
+                shadow = self._shadows.get(name)
+                if shadow is not None and shadow['rows']:
+                    row.update({
+                        'prediction_disagreements': shadow['prediction_disagreements'],
+                        'action_disagreements': shadow['action_disagreements'],
+                        'action_disagreement_rate': shadow['action_disagreements'] / shadow['rows'],
+                        'mean_abs_trust_delta': shadow['trust_delta_sum'] / shadow['rows'],
+                    })
+                rows.append(row)
+        return pd.DataFrame(rows).set_index('model') if rows else pd.DataFrame()
+
+    def action_matrix(self, name: str) -> pd.DataFrame:
+        """Primary action (rows) vs shadow action (columns) counts"""
+        with self._lock:
+            matrix = self._shadows[name]['action_matrix'].copy()
+        return pd.DataFrame(matrix, index=[f'primary {a}' for a in ACTIONS],
+                            columns=[f'shadow {a}' for a in ACTIONS])
+
+    def samples(self, name: str) -> pd.DataFrame:
+        """Most recent rows where the shadow disagreed with the primary"""
+        with self._lock:
+            return pd.DataFrame(list(self._shadows[name]['samples']))
+
+    def shadow_names(self) -> list:
+        with self._lock:
+            return list(self._shadows)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,418 @@
+"""
+Sharding Module
+Coordinator/worker scoring of large CSV files over a length-prefixed socket protocol
+"""
+
+import io
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .result_summary import ResultSummary
+from .trust_policy import materialize
+
+
+PROTOCOL_VERSION = 1
+
+# Data rows per shard, and how often a shard is handed out before the run fails
+SHARD_ROWS = 50_000
+MAX_ATTEMPTS = 3
+
+# Bytes read at a time while planning shards
+PLAN_BLOCK = 16 << 20
+
+# Frame header: big-endian length of the JSON header that follows; the
+# header's 'size' gives the length of the binary payload after it
+_LENGTH = struct.Struct('>I')
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], payload: bytes = b''):
+    """Write one frame: header length, JSON header, payload"""
+    body = json.dumps({**header, 'size': len(payload)}).encode()
+    sock.sendall(_LENGTH.pack(len(body)) + body + payload)
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    """Read one frame; ConnectionError if the peer closed the connection"""
+    header = json.loads(_recv_exact(sock, _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))[0]))
+    return header, _recv_exact(sock, header['size'])
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    parts = []
+    while size:
+        part = sock.recv(min(size, 1 << 20))
+        if not part:
+            raise ConnectionError("Connection closed")
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def encode_frame(results_df: pd.DataFrame) -> Tuple[str, bytes]:
+    """Results as Parquet (CSV without pyarrow), with the labels materialized"""
+    plain = materialize(results_df)
+    buf = io.BytesIO()
+    try:
+        plain.to_parquet(buf, index=False)
+        return 'parquet', buf.getvalue()
+    except ImportError:
+        return 'csv', plain.to_csv(index=False).encode()
+
+
+def decode_frame(fmt: str, payload: bytes) -> pd.DataFrame:
+    if fmt == 'parquet':
+        return pd.read_parquet(io.BytesIO(payload))
+    return pd.read_csv(io.BytesIO(payload))
+
+
+class Shard:
+    """A byte range of whole rows in one input file"""
+
+    def __init__(self, shard_id: int, path: str, start: int, end: int, rows: int):
+        self.id = shard_id
+        self.path = path
+        self.start = int(start)
+        self.end = int(end)
+        self.rows = int(rows)
+        self.attempts = 0
+
+    def payload(self) -> bytes:
+        """The file's header line and this shard's rows, as a standalone CSV"""
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            f.seek(self.start)
+            return header + f.read(self.end - self.start)
+
+
+def plan_shards(paths: Sequence[str], shard_rows: int = SHARD_ROWS) -> List[Shard]:
+    """
+    Split files into shards of shard_rows lines
+
+    Files are scanned in PLAN_BLOCK blocks with a vectorized newline
+    search, so planning a multi-gigabyte file takes seconds and constant
+    memory. Like sample_lines, this assumes no quoted field spans lines.
+
+    Args:
+        paths: Input CSV files
+        shard_rows: Lines per shard (the last shard of a file may be shorter)
+
+    Returns:
+        Shards in file and row order
+    """
+    shards = []
+    for path in paths:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            offset = len(f.readline())
+            bounds, rows, pending, last = [offset], [], 0, b'\n'
+            while True:
+                block = f.read(PLAN_BLOCK)
+                if not block:
+                    break
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+                cuts = np.arange(shard_rows - pending - 1, len(newlines), shard_rows)
+                bounds.extend((offset + newlines[cuts] + 1).tolist())
+                rows.extend([shard_rows] * len(cuts))
+                pending = len(newlines) - cuts[-1] - 1 if len(cuts) else pending + len(newlines)
+                offset += len(block)
+                last = block[-1:]
+        if bounds[-1] < size:
+            # Trailing rows, the last one possibly without a newline
+            bounds.append(size)
+            rows.append(pending + (last != b'\n'))
+        for start, end, n in zip(bounds[:-1], bounds[1:], rows):
+            shards.append(Shard(len(shards), path, start, end, n))
+    return shards
+
+
+def run_worker(address: Tuple[str, int], model_loader, chunksize: int = 20_000,
+               connect_timeout: float = 30.0) -> Dict[str, Any]:
+    """
+    Score shards handed out by a coordinator until it says stop
+
+    The models are loaded once by the caller; every shard is read from
+    the frame, scored in chunks with DataProcessor and streamed back one
+    'rows' frame per chunk, then acknowledged with 'done'. A scoring error
+    is reported with 'error' and the worker carries on.
+
+    Args:
+        address: Coordinator (host, port)
+        model_loader: Loaded ModelLoader
+        chunksize: Rows scored per chunk within a shard
+        connect_timeout: Seconds to keep retrying the connection
+
+    Returns:
+        Dict of shards and rows scored by this worker
+    """
+    from .csv_reader import SchemaCSVReader
+    from .data_processor import DataProcessor
+    from .neighbor_index import NeighborIndex
+
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address)
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.2)
+
+    done = {'shards': 0, 'rows': 0}
+    with sock:
+        send_message(sock, {'type': 'hello', 'version': PROTOCOL_VERSION, 'pid': os.getpid(),
+                            'host': socket.gethostname(), 'fingerprint': model_loader.fingerprint()})
+        welcome, _ = recv_message(sock)
+        if welcome['type'] != 'welcome':
+            return done
+        options = welcome.get('options', {})
+        neighbors = options.get('neighbors', 0)
+        processor = DataProcessor(model_loader,
+                                  neighbor_index=NeighborIndex.from_model_loader(model_loader) if neighbors else None)
+        reader = SchemaCSVReader.from_model_loader(model_loader)
+        while True:
+            message, payload = recv_message(sock)
+            if message['type'] != 'shard':
+                return done
+            start = time.perf_counter()
+            rows = quarantined = 0
+            try:
+                for chunk in reader.iter_chunks(io.BytesIO(payload), chunksize):
+                    processed_df, _ = processor.validate_and_prepare(chunk)
+                    quarantined += processor.validation_report.quarantined_rows
+                    if len(processed_df):
+                        results_df = processor.predict(processed_df, explain=options.get('explain', False),
+                                                       neighbors=neighbors)
+                        fmt, frame = encode_frame(results_df)
+                        send_message(sock, {'type': 'rows', 'shard': message['shard'], 'format': fmt}, frame)
+                        rows += len(results_df)
+            except (ValueError, KeyError) as e:
+                send_message(sock, {'type': 'error', 'shard': message['shard'], 'error': str(e)})
+                continue
+            send_message(sock, {'type': 'done', 'shard': message['shard'], 'rows': rows,
+                                'quarantined': quarantined, 'seconds': time.perf_counter() - start})
+            done['shards'] += 1
+            done['rows'] += rows
+
+
+class Coordinator:
+    """
+    Hand shards of the input files to socket-connected workers
+
+    Workers connect (from any host) and get one shard at a time. A
+    shard's result frames are held until its 'done' arrives; if the
+    worker disconnects, times out or reports an error first, the partial
+    frames are dropped and the shard is queued again, up to max_attempts
+    times. Results are yielded in input order, so the output matches
+    scoring the files in one process.
+
+    Every worker must report the same ModelLoader.fingerprint() as the
+    first one; a worker with other models is sent 'stop'.
+    """
+
+    def __init__(self, paths: Sequence[str], address: Tuple[str, int] = ('127.0.0.1', 0),
+                 shard_rows: int = SHARD_ROWS, max_attempts: int = MAX_ATTEMPTS, timeout: float = 300.0,
+                 explain: bool = False, neighbors: int = 0):
+        """
+        Initialize Coordinator and start listening
+
+        Args:
+            paths: Input CSV files
+            address: (host, port) to listen on; port 0 picks a free port
+            shard_rows: Lines per shard
+            max_attempts: Times a shard is handed out before the run fails
+            timeout: Seconds to wait on a worker's next frame, and for the
+                     next shard to complete before the run fails
+            explain: Workers add top_factors (see DataProcessor.predict)
+            neighbors: Workers add similar_records for BLOCK rows
+        """
+        self.shards = plan_shards(paths, shard_rows)
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.options = {'explain': explain, 'neighbors': neighbors}
+        self.summary = ResultSummary()
+        self.fingerprint = None
+        self.retries = 0
+        self.workers = {}
+        self._pending = queue.Queue()
+        for shard in self.shards:
+            self._pending.put(shard)
+        self._results = {}
+        self._failed = {}
+        self._completed = 0
+        self._started = None
+        self._cond = threading.Condition()
+        self._finished = threading.Event()
+        self._threads = []
+        self._server = socket.create_server(address)
+        self._server.settimeout(0.2)
+        self.address = self._server.getsockname()[:2]
+        self._accept_thread = threading.Thread(target=self._accept, name='shard-accept', daemon=True)
+        self._accept_thread.start()
+
+    def results(self) -> Iterator[pd.DataFrame]:
+        """
+        Result frames in input order, as shards complete
+
+        Frames of shards finished ahead of the next one in order are held
+        in memory until it arrives. The coordinator is closed when the
+        iterator ends.
+
+        Raises:
+            RuntimeError: A shard failed max_attempts times, or no shard
+                          completed within timeout seconds
+        """
+        try:
+            for shard in self.shards:
+                with self._cond:
+                    while shard.id not in self._results:
+                        if shard.id in self._failed:
+                            raise RuntimeError(f"Shard {shard.id} of {os.path.basename(shard.path)} failed "
+                                               f"{shard.attempts} times: {self._failed[shard.id]}")
+                        if not self._cond.wait(self.timeout):
+                            raise RuntimeError(f"No shard completed in {self.timeout:g}s "
+                                               f"({len(self.workers)} workers connected)")
+                    frames = self._results.pop(shard.id)
+                for frame in frames:
+                    self.summary.update(frame)
+                    yield frame
+        finally:
+            self.close()
+
+    def close(self, wait: float = 5.0):
+        """Send connected workers 'stop' and stop listening"""
+        self._finished.set()
+        self._accept_thread.join()
+        self._server.close()
+        for thread in self._threads:
+            thread.join(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Run statistics
+
+        Returns:
+            Dict with shards, rows, quarantined, retries, wall_seconds (first
+            worker hello to last completed shard), rows_per_sec, workers (a
+            DataFrame with host, pid, shards, rows, busy_seconds and failures
+            per worker) and efficiency: busy worker time over workers x wall
+            time, 1.0 when every worker scored the whole time
+        """
+        with self._cond:
+            workers = pd.DataFrame(list(self.workers.values()),
+                                   columns=['host', 'pid', 'shards', 'rows', 'quarantined', 'busy_seconds',
+                                            'failures', 'last_done'])
+        done = workers['last_done'].dropna()
+        wall = float(done.max() - self._started) if len(done) else 0.0
+        rows = int(workers['rows'].sum())
+        return {
+            'shards': len(self.shards),
+            'rows': rows,
+            'quarantined': int(workers['quarantined'].sum()),
+            'retries': self.retries,
+            'wall_seconds': wall,
+            'rows_per_sec': rows / wall if wall else 0.0,
+            'workers': workers.drop(columns='last_done'),
+            'efficiency': float(workers['busy_seconds'].sum() / (len(workers) * wall)) if wall else 0.0,
+        }
+
+    def _accept(self):
+        while not self._finished.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            thread = threading.Thread(target=self._serve, args=(conn,), name='shard-worker', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _serve(self, conn: socket.socket):
+        """Feed one worker until the run is over or the worker is lost"""
+        conn.settimeout(self.timeout)
+        worker_id = shard = None
+        with conn:
+            try:
+                hello, _ = recv_message(conn)
+                worker_id = self._register(hello)
+                if worker_id is None:
+                    send_message(conn, {'type': 'stop', 'reason': 'protocol or model mismatch'})
+                    return
+                send_message(conn, {'type': 'welcome', 'worker': worker_id, 'options': self.options})
+                while not self._finished.is_set():
+                    try:
+                        shard = self._pending.get(timeout=0.2)
+                    except queue.Empty:
+                        if self._all_done():
+                            break
+                        continue
+                    shard.attempts += 1
+                    send_message(conn, {'type': 'shard', 'shard': shard.id, 'rows': shard.rows}, shard.payload())
+                    frames = []
+                    while True:
+                        message, payload = recv_message(conn)
+                        if message['type'] == 'rows':
+                            frames.append(decode_frame(message['format'], payload))
+                            continue
+                        if message['type'] == 'done':
+                            self._complete(worker_id, shard, frames, message)
+                        else:
+                            self._retry(worker_id, shard, message.get('error', message['type']))
+                        shard = None
+                        break
+                send_message(conn, {'type': 'stop'})
+            except (OSError, ValueError) as e:
+                # Lost worker (ConnectionError and timeouts are OSErrors): requeue its shard
+                if shard is not None:
+                    self._retry(worker_id, shard, f"worker lost: {e}")
+
+    def _register(self, hello: Dict[str, Any]) -> Optional[int]:
+        """Worker id for an accepted hello, None for a mismatch"""
+        with self._cond:
+            if self.fingerprint is None:
+                self.fingerprint = hello.get('fingerprint')
+            if hello.get('version') != PROTOCOL_VERSION or hello.get('fingerprint') != self.fingerprint:
+                return None
+            if self._started is None:
+                self._started = time.time()
+            worker_id = len(self.workers)
+            self.workers[worker_id] = {'host': hello.get('host'), 'pid': hello.get('pid'), 'shards': 0,
+                                       'rows': 0, 'quarantined': 0, 'busy_seconds': 0.0, 'failures': 0,
+                                       'last_done': None}
+            return worker_id
+
+    def _complete(self, worker_id: int, shard: Shard, frames: List[pd.DataFrame], message: Dict[str, Any]):
+        with self._cond:
+            stats = self.workers[worker_id]
+            stats['shards'] += 1
+            stats['rows'] += message['rows']
+            stats['quarantined'] += message['quarantined']
+            stats['busy_seconds'] += message['seconds']
+            stats['last_done'] = time.time()
+            self._results[shard.id] = frames
+            self._completed += 1
+            self._cond.notify_all()
+
+    def _retry(self, worker_id: Optional[int], shard: Shard, reason: str):
+        with self._cond:
+            if worker_id is not None:
+                self.workers[worker_id]['failures'] += 1
+            if shard.attempts >= self.max_attempts:
+                self._failed[shard.id] = reason
+            else:
+                self.retries += 1
+                self._pending.put(shard)
+            self._cond.notify_all()
+
+    def _all_done(self) -> bool:
+        with self._cond:
+            return self._completed + len(self._failed) >= len(self.shards)
@@ -0,0 +1,238 @@
+"""
+Stream Scorer Module
+Score NDJSON connection records from a pipe in latency-bounded micro-batches
+"""
+
+import json
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from .result_summary import ResultSummary
+from .trust_policy import materialize
+
+
+# Latency histogram resolution and range (1 ms buckets up to a minute)
+DELAY_BUCKET_MS = 1
+MAX_TRACKED_DELAY_MS = 60_000
+
+# Per-batch decay of older batches in the scoring cost fit
+COST_DECAY = 0.8
+
+# Margin on the estimated scoring time when deciding how long to wait
+COST_HEADROOM = 1.25
+
+
+class NDJSONStreamScorer:
+    """
+    Reads one JSON object per line, scores records in micro-batches and
+    writes one JSON decision per input line, in input order
+
+    A reader thread fills a bounded queue, so a producer that outruns the
+    model blocks on the pipe instead of growing memory. A batch is flushed
+    when it reaches max_batch records, or earlier when waiting any longer
+    would push its oldest record past max_delay once the (measured) scoring
+    time is added. Lines that are not JSON objects or fail validation get
+    an error record ({"line": n, "error": ...}) in their place; blank
+    lines are skipped.
+    """
+
+    def __init__(self, processor, max_batch: int = 2000, max_delay: float = 0.25,
+                 queue_size: int = 10_000, summary: Optional[ResultSummary] = None):
+        """
+        Args:
+            processor: DataProcessor used to validate and score records
+            max_batch: Largest number of records scored at once
+            max_delay: Target seconds from reading a line to writing its decision
+            queue_size: Lines buffered between the reader and the scorer
+            summary: Optional ResultSummary to fold decisions into
+        """
+        if max_batch < 1 or max_delay <= 0 or queue_size < 1:
+            raise ValueError("max_batch, max_delay and queue_size must be positive")
+        self.processor = processor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue_size = queue_size
+        self.summary = summary
+        self.records = 0
+        self.errors = 0
+        self.batches = 0
+        self._delays = np.zeros(MAX_TRACKED_DELAY_MS // DELAY_BUCKET_MS + 1, dtype=np.int64)
+        self._max_delay_seen = 0.0
+        # Scoring cost model: seconds per batch plus seconds per record,
+        # fitted by decayed least squares over batch sizes and times
+        self._batch_cost = 0.0
+        self._row_cost = 0.0
+        self._fit = np.zeros(5)
+        self._read_error = None
+        self._elapsed = 0.0
+
+    def run(self, source: BinaryIO, sink: BinaryIO) -> Dict[str, float]:
+        """
+        Score every line of source until EOF
+
+        Args:
+            source: Binary stream of NDJSON lines (e.g. sys.stdin.buffer)
+            sink: Binary stream for the decisions (e.g. sys.stdout.buffer)
+
+        Returns:
+            stats() after the last batch
+        """
+        lines = queue.Queue(maxsize=self.queue_size)
+        reader = threading.Thread(target=self._read, args=(source, lines), daemon=True)
+        started = time.perf_counter()
+        reader.start()
+        done = False
+        while not done:
+            batch, done = self._collect(lines)
+            if batch:
+                self._flush(batch, sink)
+        reader.join()
+        if self._read_error is not None:
+            raise self._read_error
+        self._elapsed = time.perf_counter() - started
+        return self.stats()
+
+    def _read(self, source: BinaryIO, lines: queue.Queue):
+        line_no = 0
+        try:
+            for line in source:
+                line_no += 1
+                if line.strip():
+                    # Blocks when the scorer falls behind (backpressure)
+                    lines.put((line_no, line, time.perf_counter()))
+        except Exception as e:
+            self._read_error = e
+        finally:
+            lines.put(None)
+
+    def _collect(self, lines: queue.Queue) -> Tuple[List[tuple], bool]:
+        """Gather the next micro-batch; True once the reader has hit EOF"""
+        first = lines.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        oldest = first[2]
+        # The first record goes alone: it warms the model up and measures the fixed cost
+        while self.batches and len(batch) < self.max_batch:
+            # Stop waiting early enough to score the batch within the bound
+            flush_at = oldest + self.max_delay - self._estimate(len(batch) + 1)
+            try:
+                # Take whatever is already queued without waiting
+                item = lines.get_nowait()
+            except queue.Empty:
+                timeout = flush_at - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = lines.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _estimate(self, n: int) -> float:
+        return (self._batch_cost + self._row_cost * n) * COST_HEADROOM
+
+    def _flush(self, batch: List[tuple], sink: BinaryIO):
+        start = time.perf_counter()
+        out = self._score(batch)
+        sink.write(''.join(out).encode('utf-8'))
+        sink.flush()
+        now = time.perf_counter()
+        self._update_cost(len(batch), now - start)
+
+        arrivals = np.fromiter((item[2] for item in batch), dtype=np.float64, count=len(batch))
+        delays = now - arrivals
+        self._max_delay_seen = max(self._max_delay_seen, float(delays.max()))
+        buckets = np.minimum((delays * 1000 / DELAY_BUCKET_MS).astype(np.int64), len(self._delays) - 1)
+        self._delays += np.bincount(buckets, minlength=len(self._delays))
+        self.records += len(batch)
+        self.batches += 1
+
+    def _score(self, batch: List[tuple]) -> List[str]:
+        """One output line per batch entry, in order"""
+        out = [None] * len(batch)
+        records = []
+        positions = []
+        for i, (line_no, line, _) in enumerate(batch):
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                out[i] = self._error(line_no, f"invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                out[i] = self._error(line_no, "expected a JSON object")
+                continue
+            records.append(record)
+            positions.append(i)
+
+        if records:
+            try:
+                self._score_records(batch, records, positions, out)
+            except Exception as e:
+                for i in positions:
+                    if out[i] is None:
+                        out[i] = self._error(batch[i][0], f"scoring failed: {e}")
+        return [line if line is not None else self._error(batch[i][0], "record was not scored")
+                for i, line in enumerate(out)]
+
+    def _score_records(self, batch, records, positions, out):
+        df = pd.DataFrame.from_records(records)
+        processed_df, _ = self.processor.validate_and_prepare(df)
+        # Rows keep their DataFrame index through validation
+        quarantine = self.processor.validation_report.quarantine
+        for row, reason in zip(quarantine.index, quarantine['violations'] if len(quarantine) else []):
+            i = positions[row]
+            out[i] = self._error(batch[i][0], f"validation failed: {reason}")
+        if len(processed_df):
+            results_df = self.processor.predict(processed_df, summary=self.summary)
+            decisions = materialize(results_df).to_json(orient='records', lines=True).splitlines(keepends=True)
+            if decisions and not decisions[-1].endswith('\n'):
+                decisions[-1] += '\n'
+            for row, decision in zip(processed_df.index, decisions):
+                out[positions[row]] = decision
+
+    def _error(self, line_no: int, message: str) -> str:
+        self.errors += 1
+        return json.dumps({'line': line_no, 'error': message}) + '\n'
+
+    def _update_cost(self, n: int, seconds: float):
+        # Decayed sums of 1, n, t, n^2 and n*t
+        self._fit = self._fit * COST_DECAY + np.array([1.0, n, seconds, n * n, n * seconds])
+        weight, sum_n, sum_t, sum_nn, sum_nt = self._fit
+        mean_n, mean_t = sum_n / weight, sum_t / weight
+        var_n = sum_nn / weight - mean_n ** 2
+        if var_n > 1e-6 * max(mean_n, 1.0) ** 2:
+            self._row_cost = max((sum_nt / weight - mean_n * mean_t) / var_n, 0.0)
+            self._batch_cost = max(mean_t - self._row_cost * mean_n, 0.0)
+        else:
+            # A single batch size so far: attribute it all to the fixed cost
+            self._batch_cost = mean_t
+            self._row_cost = 0.0
+
+    def delay_percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) of read-to-write delay, in seconds"""
+        if self.records == 0:
+            return 0.0
+        rank = int(np.ceil(q / 100 * self.records))
+        bucket = int(np.searchsorted(np.cumsum(self._delays), max(rank, 1)))
+        return min((bucket + 1) * DELAY_BUCKET_MS / 1000, self._max_delay_seen)
+
+    def stats(self) -> Dict[str, float]:
+        elapsed = self._elapsed
+        return {
+            'records': self.records,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch': self.records / self.batches if self.batches else 0.0,
+            'records_per_sec': self.records / elapsed if elapsed else 0.0,
+            'p50_delay': self.delay_percentile(50),
+            'p99_delay': self.delay_percentile(99),
+            'max_delay': self._max_delay_seen,
+        }
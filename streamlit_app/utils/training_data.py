@@ -0,0 +1,68 @@
+"""
+Training Data Module
+data.csv encoded once with the model's encoders and cached as arrays
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from .scoring_bundle import source_digest
+
+
+# Written next to the model files (not committed; rebuilt when data.csv or the encoders change)
+TRAINING_CACHE_FILE = 'training_matrix.npz'
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_training_matrix(processor, csv_path: str, cache_path: Optional[str] = None
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encoded, unscaled feature matrix and labels of a labeled CSV
+
+    The first call validates and encodes the CSV the way scoring does
+    (DataProcessor.validate_and_prepare + encode_features) and saves the
+    result; later calls load the arrays as long as the CSV and the model
+    pickles are unchanged.
+
+    Args:
+        processor: DataProcessor whose encoders to use
+        csv_path: Labeled CSV (data.csv)
+        cache_path: Cache file (default: TRAINING_CACHE_FILE in the model directory)
+
+    Returns:
+        (X_numeric, y, row_ids): y is 1 for Normal and 0 for Anomaly, as the
+        model was trained; row_ids are the CSV row numbers of the rows kept
+    """
+    if cache_path is None:
+        cache_path = os.path.join(processor.model_loader.model_dir, TRAINING_CACHE_FILE)
+    key = {
+        'csv': _file_digest(csv_path),
+        'models': source_digest(processor.model_loader.model_dir),
+        'feature_names': list(processor.feature_names),
+    }
+    if os.path.exists(cache_path):
+        with np.load(cache_path, allow_pickle=False) as data:
+            if json.loads(str(data['key'])) == key:
+                return data['X'], data['y'], data['row_ids']
+
+    processed_df, _ = processor.validate_and_prepare(pd.read_csv(csv_path))
+    if 'true_class' not in processed_df.columns:
+        raise ValueError(f"{csv_path} has no 'class' column")
+    X_numeric = processor.encode_features(processed_df[processor.feature_names])
+    # Classes were label-encoded as anomaly=0, normal=1 in training
+    y = (processed_df['true_class'] == 'Normal').to_numpy(dtype=np.int8)
+    row_ids = processed_df.index.to_numpy(dtype=np.int64)
+    np.savez_compressed(cache_path, X=np.asarray(X_numeric, dtype=np.float64), y=y, row_ids=row_ids,
+                        key=np.array(json.dumps(key)))
+    return np.asarray(X_numeric, dtype=np.float64), y, row_ids
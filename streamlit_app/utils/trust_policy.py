@@ -0,0 +1,149 @@
+"""
+Trust Policy Module
+Maps trust scores to action, trust level and recommendation codes
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Sequence
+
+from .node_state import ACTIONS
+
+
+# Coded result columns: the column's values are indexes into these
+PREDICTIONS = ('Anomaly', 'Normal')
+TRUST_LEVELS = ('High', 'Medium', 'Low')
+RECOMMENDATIONS = ('Grant access - Low risk node', 'Additional verification required',
+                   'Deny access - High risk node')
+
+# Decimals each float32 score column is rounded to, in predict() and back in materialize()
+SCORE_DECIMALS = {'trust_score': 2, 'confidence': 4}
+
+# Optional override of DEFAULT_TIERS, read from the model directory
+TRUST_POLICY_FILE = 'trust_policy.json'
+
+# Lowest trust score of each tier, ascending; the first tier covers everything below the second
+DEFAULT_TIERS = (
+    {'min_score': 0, 'action': 'BLOCK', 'trust_level': 'Low', 'recommendation': RECOMMENDATIONS[2]},
+    {'min_score': 33, 'action': 'MONITOR', 'trust_level': 'Medium', 'recommendation': RECOMMENDATIONS[1]},
+    {'min_score': 66, 'action': 'ALLOW', 'trust_level': 'High', 'recommendation': RECOMMENDATIONS[0]},
+)
+
+
+class TrustPolicy:
+    """
+    Tiered trust-score policy applied with one binary search per batch
+
+    Each tier maps to codes into ACTIONS, TRUST_LEVELS and the policy's
+    recommendations, so a batch is binned once with np.searchsorted and
+    every coded column is a lookup on the tier index.
+    """
+
+    def __init__(self, tiers: Sequence[Dict[str, Any]] = DEFAULT_TIERS):
+        """
+        Initialize TrustPolicy
+
+        Args:
+            tiers: Dicts with min_score, action (one of ACTIONS), trust_level
+                   (one of TRUST_LEVELS) and recommendation, by ascending min_score
+        """
+        if not tiers:
+            raise ValueError("A trust policy needs at least one tier")
+        self.tiers = [dict(tier) for tier in tiers]
+        self.bounds = np.array([tier['min_score'] for tier in self.tiers], dtype=np.float64)
+        if (np.diff(self.bounds) <= 0).any():
+            raise ValueError(f"Tier min_score values must increase: {self.bounds.tolist()}")
+        for tier in self.tiers:
+            if tier['action'] not in ACTIONS:
+                raise ValueError(f"Unknown action {tier['action']!r}; expected one of {ACTIONS}")
+            if tier['trust_level'] not in TRUST_LEVELS:
+                raise ValueError(f"Unknown trust level {tier['trust_level']!r}; expected one of {TRUST_LEVELS}")
+        # Recommendations ordered by action, as in RECOMMENDATIONS
+        self.recommendations = tuple(dict.fromkeys(
+            tier['recommendation'] for tier in sorted(self.tiers, key=lambda t: ACTIONS.index(t['action']))))
+        self._actions = np.array([ACTIONS.index(t['action']) for t in self.tiers], dtype=np.uint8)
+        self._levels = np.array([TRUST_LEVELS.index(t['trust_level']) for t in self.tiers], dtype=np.uint8)
+        self._recommendations = np.array([self.recommendations.index(t['recommendation']) for t in self.tiers],
+                                         dtype=np.uint8)
+
+    @classmethod
+    def load(cls, model_dir: str) -> 'TrustPolicy':
+        """TRUST_POLICY_FILE's tiers if the model directory has one, else DEFAULT_TIERS"""
+        path = os.path.join(model_dir, TRUST_POLICY_FILE)
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls(json.load(f)['tiers'])
+
+    @classmethod
+    def from_model_loader(cls, model_loader) -> 'TrustPolicy':
+        """Policy of a ModelLoader's model directory"""
+        return cls.load(model_loader.model_dir)
+
+    def tiers_of(self, trust_scores: np.ndarray) -> np.ndarray:
+        """Tier index of each score (scores below the first bound fall in the first tier)"""
+        tiers = np.searchsorted(self.bounds, trust_scores, side='right') - 1
+        return np.maximum(tiers, 0).astype(np.uint8)
+
+    def action_codes(self, trust_scores: np.ndarray) -> np.ndarray:
+        """Index into ACTIONS of each score"""
+        return self._actions[self.tiers_of(trust_scores)]
+
+    def apply(self, trust_scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Code every policy column for a batch of trust scores
+
+        Args:
+            trust_scores: Trust scores (0-100)
+
+        Returns:
+            uint8 codes by column: action (into ACTIONS), trust_level (into
+            TRUST_LEVELS) and recommendation (into self.recommendations)
+        """
+        tiers = self.tiers_of(trust_scores)
+        return {
+            'action': self._actions[tiers],
+            'trust_level': self._levels[tiers],
+            'recommendation': self._recommendations[tiers],
+        }
+
+    def categories(self) -> Dict[str, tuple]:
+        """Labels of each coded results column"""
+        return {'prediction': PREDICTIONS, 'trust_level': TRUST_LEVELS, 'action': ACTIONS,
+                'recommendation': self.recommendations}
+
+    def to_frame(self) -> pd.DataFrame:
+        """The tiers as a table, for display"""
+        frame = pd.DataFrame(self.tiers, columns=['min_score', 'action', 'trust_level', 'recommendation'])
+        frame.insert(1, 'max_score', np.append(self.bounds[1:], 100))
+        return frame
+
+
+def materialize(results_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Results with plain string and float64 columns, for display and export
+
+    predict() returns the coded columns as categoricals and the scores as
+    float32; this turns them back into the strings and two- or four-decimal
+    numbers the results always showed.
+
+    Args:
+        results_df: DataFrame returned by DataProcessor.predict (or a slice of it)
+
+    Returns:
+        Copy with categoricals as object strings and float32 as float64
+    """
+    columns = {}
+    for col, values in results_df.items():
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[col] = values.astype(object)
+        elif values.dtype == np.float32:
+            # Re-rounded in float64, so 45.12 stays 45.12 rather than 45.119998931884766
+            columns[col] = values.astype(np.float64)
+            if col in SCORE_DECIMALS:
+                columns[col] = columns[col].round(SCORE_DECIMALS[col])
+    if not columns:
+        return results_df
+    return results_df.assign(**columns)
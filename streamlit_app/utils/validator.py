@@ -0,0 +1,226 @@
+"""
+Validator Module
+Vectorized schema validation with per-column diagnostics and quarantine
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schema import build_schema
+
+
+# Violations that send a row to quarantine; nulls are only reported
+QUARANTINE_RULES = ('type', 'range', 'vocabulary')
+
+
+class ValidationReport:
+    """Outcome of one validation pass"""
+
+    def __init__(self, total_rows: int, violations: pd.DataFrame, samples: pd.DataFrame,
+                 quarantine: pd.DataFrame, missing_columns: List[str]):
+        """
+        Initialize ValidationReport
+
+        Args:
+            total_rows: Rows checked
+            violations: Per column and rule violation counts
+            samples: Bounded sample of quarantined rows with their violations
+            quarantine: Every quarantined row, with a 'violations' column
+            missing_columns: Schema columns absent from the input
+        """
+        self.total_rows = total_rows
+        self.violations = violations
+        self.samples = samples
+        self.quarantine = quarantine
+        self.missing_columns = missing_columns
+
+    @classmethod
+    def combine(cls, reports: List['ValidationReport'], max_samples: int = 20) -> 'ValidationReport':
+        """
+        Merge the reports of consecutive chunks of one file
+
+        Args:
+            reports: Per-chunk reports, in file order
+            max_samples: Quarantined rows kept in the merged sample
+
+        Returns:
+            One ValidationReport covering every chunk
+        """
+        if not reports:
+            return cls(0, pd.DataFrame(columns=['column', 'rule', 'count']), pd.DataFrame(),
+                       pd.DataFrame(), [])
+        counts = [r.violations for r in reports if len(r.violations)]
+        if counts:
+            violations = pd.concat(counts).groupby(['column', 'rule'], sort=False, as_index=False)['count'].sum()
+            violations = violations.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+        else:
+            violations = reports[0].violations
+        quarantined = [r.quarantine for r in reports if len(r.quarantine)]
+        quarantine = pd.concat(quarantined, ignore_index=True) if quarantined else reports[0].quarantine
+        return cls(
+            total_rows=sum(r.total_rows for r in reports),
+            violations=violations,
+            samples=quarantine.head(max_samples),
+            quarantine=quarantine,
+            missing_columns=reports[0].missing_columns,
+        )
+
+    @property
+    def quarantined_rows(self) -> int:
+        return len(self.quarantine)
+
+    @property
+    def valid_rows(self) -> int:
+        return self.total_rows - self.quarantined_rows
+
+    def count(self, column: str, rule: str) -> int:
+        """Violations of rule in column"""
+        match = self.violations[(self.violations['column'] == column) & (self.violations['rule'] == rule)]
+        return int(match['count'].sum())
+
+    def issues(self) -> List[str]:
+        """Human readable summary lines"""
+        issues = []
+        if self.quarantined_rows:
+            worst = self.violations[self.violations['rule'].isin(QUARANTINE_RULES)].head(5)
+            detail = ', '.join(f"{r.column} {r.rule} ({r.count:,})" for r in worst.itertuples())
+            issues.append(f"Quarantined {self.quarantined_rows:,} of {self.total_rows:,} rows: {detail}")
+        nulls = self.violations[self.violations['rule'] == 'null']
+        if len(nulls):
+            issues.append(f"Found {int(nulls['count'].sum())} missing values in "
+                          f"{len(nulls)} columns; they will be imputed")
+        return issues
+
+
+class DataValidator:
+    """
+    Check every feature column against the schema in one vectorized pass
+
+    Numeric columns are checked for unparseable or non-integral values
+    ('type') and values outside the allowed range ('range'); categorical
+    columns for values outside the encoder vocabulary ('vocabulary').
+    Rows with any of these go to quarantine instead of being imputed;
+    nulls are counted ('null') and left for imputation.
+    """
+
+    def __init__(self, schema: Dict[str, Dict[str, Any]], max_samples: int = 20):
+        """
+        Initialize DataValidator
+
+        Args:
+            schema: Feature schema from utils.schema.build_schema
+            max_samples: Quarantined rows kept in the report sample
+        """
+        self.schema = schema
+        self.max_samples = max_samples
+
+    @classmethod
+    def from_model_loader(cls, model_loader, **kwargs) -> 'DataValidator':
+        """Build a validator from a ModelLoader's feature names and encoders"""
+        schema = build_schema(model_loader.get_feature_names(), model_loader.get_label_encoders())
+        return cls(schema, **kwargs)
+
+    def validate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, ValidationReport]:
+        """
+        Validate a frame and split off invalid rows
+
+        Args:
+            df: Input DataFrame with normalized column names
+
+        Returns:
+            Tuple of (valid rows with numeric feature columns converted to
+            numbers, ValidationReport)
+        """
+        n = len(df)
+        bad = np.zeros(n, dtype=bool)
+        counts = []
+        masks = []
+        converted = {}
+
+        for col, spec in self.schema.items():
+            if col not in df.columns:
+                continue
+            if spec['kind'] == 'categorical':
+                col_masks = self._check_categorical(df[col], spec['vocabulary'])
+            else:
+                col_masks, converted[col] = self._check_numeric(df[col], spec)
+            for rule, mask in col_masks.items():
+                total = int(np.count_nonzero(mask))
+                if total == 0:
+                    continue
+                counts.append((col, rule, total))
+                if rule in QUARANTINE_RULES:
+                    bad |= mask
+                    masks.append((col, rule, mask))
+
+        violations = pd.DataFrame(counts, columns=['column', 'rule', 'count'])
+        violations = violations.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+        valid = df if not bad.any() else df[~bad]
+        # Numeric columns that arrived as text are now safe to hand on as numbers
+        for col, values in converted.items():
+            if values is not None:
+                valid = valid.assign(**{col: values[~bad]})
+
+        quarantine = df[bad].copy()
+        if len(quarantine):
+            reasons = np.full(len(quarantine), '', dtype=object)
+            for col, rule, mask in masks:
+                hit = mask[bad]
+                reasons[hit] = reasons[hit] + f"{col}:{rule};"
+            quarantine['violations'] = [r.rstrip(';') for r in reasons]
+
+        report = ValidationReport(
+            total_rows=n,
+            violations=violations,
+            samples=quarantine.head(self.max_samples),
+            quarantine=quarantine,
+            missing_columns=[c for c in self.schema if c not in df.columns],
+        )
+        return valid, report
+
+    @staticmethod
+    def _check_categorical(values: pd.Series, vocabulary: Optional[List[str]]) -> Dict[str, np.ndarray]:
+        nulls = values.isna().to_numpy()
+        if vocabulary is None:
+            return {'null': nulls}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Check each category once, then look rows up by code
+            allowed = np.append(values.cat.categories.isin(vocabulary), True)
+            unknown = ~allowed[values.cat.codes.to_numpy()]
+        else:
+            unknown = ~(values.isin(vocabulary).to_numpy() | nulls)
+        return {'null': nulls, 'vocabulary': unknown}
+
+    @staticmethod
+    def _check_numeric(values: pd.Series, spec: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], Any]:
+        converted = None
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            nulls = np.isnan(numbers)
+            unparseable = np.zeros(len(values), dtype=bool)
+        else:
+            # Text in a numeric column (untyped parse): null vs unparseable
+            nulls = values.isna().to_numpy()
+            converted = pd.to_numeric(values, errors='coerce')
+            numbers = converted.to_numpy(dtype=np.float64, na_value=np.nan)
+            unparseable = np.isnan(numbers) & ~nulls
+            converted = converted.to_numpy()
+
+        masks = {'null': nulls}
+        type_errors = unparseable
+        if spec['kind'] != 'rate' and values.dtype.kind not in 'iu':
+            with np.errstate(invalid='ignore'):
+                type_errors = type_errors | (np.isfinite(numbers) & (numbers != np.floor(numbers)))
+            type_errors |= np.isinf(numbers)
+        masks['type'] = type_errors
+
+        if spec['range'] is not None:
+            low, high = spec['range']
+            with np.errstate(invalid='ignore'):
+                out = numbers < low if low is not None else np.zeros(len(values), dtype=bool)
+                if high is not None:
+                    out |= numbers > high
+            masks['range'] = out & ~type_errors
+        return masks, converted
@@ -3,18 +3,37 @@ Visualizer Module
 Creates interactive visualizations for predictions
 """
 
+import hashlib
+from collections import OrderedDict
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
+
+from .result_summary import ResultSummary
 
 
 class Visualizer:
     """Create visualizations for prediction results"""
     
-    def __init__(self):
-        """Initialize Visualizer"""
+    def __init__(self, max_points: int = 5000, large_mode: str = 'density',
+                 cache_size: int = 32):
+        """
+        Initialize Visualizer
+        
+        Args:
+            max_points: Largest result set plotted point by point; above this,
+                        charts are built from server-side aggregates
+            large_mode: 'density' (2-D histogram) or 'sample' for large scatters
+            cache_size: Number of figures kept per results fingerprint
+        """
+        if large_mode not in ('density', 'sample'):
+            raise ValueError(f"large_mode must be 'density' or 'sample', got {large_mode!r}")
+        self.max_points = max_points
+        self.large_mode = large_mode
+        self.cache_size = cache_size
+        self._figure_cache = OrderedDict()
         self.colors = {
             'ALLOW': '#28a745',
             'MONITOR': '#ffc107',
@@ -23,17 +42,81 @@ class Visualizer:
             'Anomaly': '#fd7e14'
         }
     
-    def create_action_distribution_chart(self, results_df: pd.DataFrame) -> go.Figure:
+    def _cached(self, name: str, results_df: Optional[pd.DataFrame], columns: List[str],
+                build: Callable[[], go.Figure],
+                summary: Optional[ResultSummary] = None) -> go.Figure:
+        """
+        Return a cached figure for these results, building it on a miss
+        
+        The key is a content hash of the columns the chart reads (or of the
+        summary it is drawn from), so a Streamlit rerun with equal results
+        reuses the figure.
+        """
+        if summary is not None:
+            digest = 'summary-' + summary.fingerprint()
+        else:
+            row_hashes = pd.util.hash_pandas_object(results_df[columns], index=False).values
+            digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+        key = (name, digest, self.max_points, self.large_mode)
+        
+        if key in self._figure_cache:
+            self._figure_cache.move_to_end(key)
+            return self._figure_cache[key]
+        
+        fig = build()
+        self._figure_cache[key] = fig
+        if len(self._figure_cache) > self.cache_size:
+            self._figure_cache.popitem(last=False)
+        return fig
+    
+    def _box_from_stats(self, name: str, q1: float, median: float, q3: float,
+                        lower: float, upper: float, mean: float) -> go.Box:
+        """Box trace from precomputed statistics (no raw points sent)"""
+        return go.Box(
+            name=name,
+            x=[name],
+            q1=[q1], median=[median], q3=[q3],
+            lowerfence=[lower], upperfence=[upper],
+            mean=[mean],
+            marker_color=self.colors.get(name, '#999'),
+            boxpoints=False
+        )
+    
+    @staticmethod
+    def _histogram_bar(values: np.ndarray, bins: int, value_range: tuple, **trace_kwargs) -> go.Bar:
+        """Bin values with NumPy and return them as a bar trace"""
+        counts, edges = np.histogram(values, bins=bins, range=value_range)
+        return go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            **trace_kwargs
+        )
+    
+    def create_action_distribution_chart(self, results_df: Optional[pd.DataFrame] = None,
+                                         summary: Optional[ResultSummary] = None) -> go.Figure:
         """
         Create pie chart showing action distribution
         
         Args:
             results_df: DataFrame with prediction results
+            summary: ResultSummary to read counts from instead of results_df
             
         Returns:
             Plotly figure
         """
-        action_counts = results_df['action'].value_counts()
+        return self._cached('action_distribution', results_df, ['action'],
+                            lambda: self._build_action_distribution_chart(results_df, summary),
+                            summary=summary)
+    
+    def _build_action_distribution_chart(self, results_df: Optional[pd.DataFrame],
+                                         summary: Optional[ResultSummary]) -> go.Figure:
+        if summary is not None:
+            action_counts = summary.value_counts('action')
+        else:
+            action_counts = results_df['action'].value_counts()
+            # Categorical actions count unseen categories as zero
+            action_counts = action_counts[action_counts > 0]
         
         fig = go.Figure(data=[go.Pie(
             labels=action_counts.index,
@@ -53,21 +136,37 @@ class Visualizer:
         
         return fig
     
-    def create_trust_score_distribution(self, results_df: pd.DataFrame) -> go.Figure:
+    def create_trust_score_distribution(self, results_df: Optional[pd.DataFrame] = None,
+                                        summary: Optional[ResultSummary] = None) -> go.Figure:
         """
         Create histogram of trust scores
         
         Args:
             results_df: DataFrame with prediction results
+            summary: ResultSummary to read the histogram from instead of results_df
             
         Returns:
             Plotly figure
         """
+        return self._cached('trust_score_distribution', results_df, ['trust_score'],
+                            lambda: self._build_trust_score_distribution(results_df, summary),
+                            summary=summary)
+    
+    def _build_trust_score_distribution(self, results_df: Optional[pd.DataFrame],
+                                        summary: Optional[ResultSummary]) -> go.Figure:
         fig = go.Figure()
         
-        fig.add_trace(go.Histogram(
-            x=results_df['trust_score'],
-            nbinsx=30,
+        # Pre-binned on the server: the browser receives 25 bars, not every score.
+        # 25 rather than 30 because summary histograms need a divisor of SKETCH_BINS
+        if summary is not None:
+            hist = summary.histogram('trust_score', bins=25)
+            counts, edges = hist['counts'], hist['edges']
+        else:
+            counts, edges = np.histogram(results_df['trust_score'].to_numpy(), bins=25, range=(0, 100))
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
             name='Trust Score',
             marker_color='#1f77b4',
             opacity=0.7
@@ -90,26 +189,53 @@ class Visualizer:
         
         return fig
     
-    def create_trust_score_by_prediction(self, results_df: pd.DataFrame) -> go.Figure:
+    def create_trust_score_by_prediction(self, results_df: Optional[pd.DataFrame] = None,
+                                         summary: Optional[ResultSummary] = None) -> go.Figure:
         """
         Create box plot of trust scores by prediction
         
         Args:
             results_df: DataFrame with prediction results
+            summary: ResultSummary to read quartiles from instead of results_df
             
         Returns:
             Plotly figure
         """
+        return self._cached('trust_score_by_prediction', results_df, ['prediction', 'trust_score'],
+                            lambda: self._build_trust_score_by_prediction(results_df, summary),
+                            summary=summary)
+    
+    def _build_trust_score_by_prediction(self, results_df: Optional[pd.DataFrame],
+                                         summary: Optional[ResultSummary]) -> go.Figure:
         fig = go.Figure()
         
-        for pred_type in results_df['prediction'].unique():
-            subset = results_df[results_df['prediction'] == pred_type]
-            fig.add_trace(go.Box(
-                y=subset['trust_score'],
-                name=pred_type,
-                marker_color=self.colors.get(pred_type, '#999'),
-                boxmean='sd'
-            ))
+        if summary is not None:
+            # Quartiles come from the summary's per-prediction sketches
+            stats = summary.group_stats('prediction', 'trust_score')
+            for pred_type, row in stats.iterrows():
+                fig.add_trace(self._box_from_stats(
+                    pred_type, row['25%'], row['50%'], row['75%'],
+                    row['min'], row['max'], row['mean']
+                ))
+        else:
+            for pred_type, scores in results_df.groupby('prediction', sort=False, observed=True)['trust_score']:
+                if len(scores) <= self.max_points:
+                    fig.add_trace(go.Box(
+                        y=scores,
+                        name=pred_type,
+                        marker_color=self.colors.get(pred_type, '#999'),
+                        boxmean='sd'
+                    ))
+                    continue
+                
+                # Large groups: send precomputed box statistics instead of points
+                values = scores.to_numpy()
+                q1, median, q3 = np.percentile(values, [25, 50, 75])
+                iqr = q3 - q1
+                inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+                fig.add_trace(self._box_from_stats(
+                    pred_type, q1, median, q3, inside.min(), inside.max(), values.mean()
+                ))
         
         fig.update_layout(
             title='Trust Scores by Prediction Type',
@@ -121,6 +247,138 @@ class Visualizer:
         
         return fig
     
+    def create_batch_action_comparison(self, comparison_df: pd.DataFrame) -> go.Figure:
+        """
+        Create stacked bars of action shares per file
+        
+        Args:
+            comparison_df: Table from batch_runner.compare_files
+            
+        Returns:
+            Plotly figure
+        """
+        fig = go.Figure()
+        for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+            fig.add_trace(go.Bar(
+                y=comparison_df.index,
+                x=comparison_df[f'{action.lower()}_pct'],
+                name=action,
+                orientation='h',
+                marker_color=self.colors[action]
+            ))
+        
+        fig.update_layout(
+            title='Actions by File',
+            title_font_size=18,
+            barmode='stack',
+            xaxis_title='Share of Rows (%)',
+            yaxis=dict(autorange='reversed'),
+            height=max(400, 28 * len(comparison_df))
+        )
+        
+        return fig
+    
+    def create_batch_trust_comparison(self, summaries: Dict[str, ResultSummary]) -> go.Figure:
+        """
+        Create side-by-side trust score boxes, one per file
+        
+        Args:
+            summaries: File name -> ResultSummary
+            
+        Returns:
+            Plotly figure
+        """
+        fig = go.Figure()
+        for name, summary in summaries.items():
+            if summary.total == 0:
+                continue
+            q1, median, q3 = summary.quantiles('trust_score', [0.25, 0.5, 0.75])
+            box = self._box_from_stats(name, q1, median, q3, summary.mins['trust_score'],
+                                       summary.maxs['trust_score'], summary.mean('trust_score'))
+            box.marker.color = self.colors['Normal']
+            fig.add_trace(box)
+        
+        fig.update_layout(
+            title='Trust Scores by File',
+            title_font_size=18,
+            yaxis_title='Trust Score',
+            showlegend=False,
+            height=450
+        )
+        
+        return fig
+    
+    def create_batch_metric_comparison(self, comparison_df: pd.DataFrame, column: str,
+                                       title: str) -> go.Figure:
+        """
+        Create a bar chart of one comparison column per file
+        
+        Args:
+            comparison_df: Table from batch_runner.compare_files
+            column: Column to plot, e.g. 'accuracy_pct' or 'anomaly_pct'
+            title: Chart title
+            
+        Returns:
+            Plotly figure
+        """
+        values = comparison_df[column].dropna()
+        fig = go.Figure(data=[go.Bar(
+            x=values.index,
+            y=values.values,
+            text=values.round(1),
+            textposition='outside',
+            marker_color=self.colors['Anomaly'] if column == 'anomaly_pct' else self.colors['Normal']
+        )])
+        
+        fig.update_layout(
+            title=title,
+            title_font_size=18,
+            yaxis_title='%',
+            yaxis_range=[0, 105],
+            height=400
+        )
+        
+        return fig
+    
+    def create_trend_chart(self, trend_df: pd.DataFrame) -> go.Figure:
+        """
+        Create stacked action counts per time bucket with mean trust on a second axis
+
+        Args:
+            trend_df: Table from ResultsStore.trend
+
+        Returns:
+            Plotly figure
+        """
+        fig = go.Figure()
+        for action in ['ALLOW', 'MONITOR', 'BLOCK']:
+            fig.add_trace(go.Bar(
+                x=trend_df.index,
+                y=trend_df[action],
+                name=action,
+                marker_color=self.colors[action]
+            ))
+        fig.add_trace(go.Scatter(
+            x=trend_df.index,
+            y=trend_df['mean_trust'],
+            name='Mean trust',
+            mode='lines+markers',
+            yaxis='y2',
+            line=dict(color=self.colors['Normal'], width=2)
+        ))
+
+        fig.update_layout(
+            title='Decisions Over Time',
+            title_font_size=18,
+            barmode='stack',
+            yaxis_title='Decisions',
+            yaxis2=dict(title='Mean Trust Score', overlaying='y', side='right', range=[0, 100]),
+            legend=dict(orientation='h', y=-0.2),
+            height=450
+        )
+
+        return fig
+
     def create_confidence_distribution(self, results_df: pd.DataFrame) -> go.Figure:
         """
         Create histogram of confidence scores
@@ -131,16 +389,24 @@ class Visualizer:
         Returns:
             Plotly figure
         """
-        fig = px.histogram(
-            results_df,
-            x='confidence',
-            color='prediction',
-            nbins=30,
-            title='Confidence Distribution by Prediction',
-            color_discrete_map=self.colors
-        )
+        return self._cached('confidence_distribution', results_df, ['prediction', 'confidence'],
+                            lambda: self._build_confidence_distribution(results_df))
+    
+    def _build_confidence_distribution(self, results_df: pd.DataFrame) -> go.Figure:
+        # Confidence is the max class probability, so it lies in [0.5, 1]
+        fig = go.Figure()
+        for pred_type, values in results_df.groupby('prediction', sort=False, observed=True)['confidence']:
+            fig.add_trace(self._histogram_bar(
+                values.to_numpy(),
+                bins=30,
+                value_range=(0.5, 1.0),
+                name=pred_type,
+                marker_color=self.colors.get(pred_type, '#999')
+            ))
         
         fig.update_layout(
+            title='Confidence Distribution by Prediction',
+            barmode='stack',
             title_font_size=18,
             xaxis_title='Confidence',
             yaxis_title='Count',
@@ -204,6 +470,10 @@ class Visualizer:
         if 'true_class' not in results_df.columns:
             return None
         
+        return self._cached('confusion_matrix', results_df, ['true_class', 'prediction'],
+                            lambda: self._build_confusion_matrix_heatmap(results_df))
+    
+    def _build_confusion_matrix_heatmap(self, results_df: pd.DataFrame) -> go.Figure:
         from sklearn.metrics import confusion_matrix
         
         # Create confusion matrix
@@ -234,16 +504,21 @@ class Visualizer:
         
         return fig
     
-    def create_summary_table(self, results_df: pd.DataFrame) -> pd.DataFrame:
+    def create_summary_table(self, results_df: Optional[pd.DataFrame] = None,
+                             result_summary: Optional[ResultSummary] = None) -> pd.DataFrame:
         """
         Create summary statistics table
         
         Args:
             results_df: DataFrame with prediction results
+            result_summary: ResultSummary to read totals from instead of results_df
             
         Returns:
             Summary DataFrame
         """
+        if result_summary is not None:
+            return self._summary_table_from(result_summary)
+        
         summary = {
             'Metric': [
                 'Total Predictions',
@@ -275,6 +550,37 @@ class Visualizer:
         
         return pd.DataFrame(summary)
     
+    def _summary_table_from(self, result_summary: ResultSummary) -> pd.DataFrame:
+        """Summary statistics table built from a ResultSummary"""
+        summary = {
+            'Metric': [
+                'Total Predictions',
+                'Normal Predictions',
+                'Anomaly Predictions',
+                'High Trust (Allow)',
+                'Medium Trust (Monitor)',
+                'Low Trust (Block)',
+                'Avg Trust Score',
+                'Avg Confidence'
+            ],
+            'Value': [
+                result_summary.total,
+                result_summary.count('prediction', 'Normal'),
+                result_summary.count('prediction', 'Anomaly'),
+                result_summary.count('action', 'ALLOW'),
+                result_summary.count('action', 'MONITOR'),
+                result_summary.count('action', 'BLOCK'),
+                f"{result_summary.mean('trust_score'):.2f}",
+                f"{result_summary.mean('confidence'):.4f}"
+            ]
+        }
+        
+        if result_summary.accuracy is not None:
+            summary['Metric'].append('Accuracy')
+            summary['Value'].append(f"{result_summary.accuracy * 100:.2f}%")
+        
+        return pd.DataFrame(summary)
+    
     def create_scatter_trust_vs_confidence(self, results_df: pd.DataFrame) -> go.Figure:
         """
         Create scatter plot of trust score vs confidence
@@ -285,6 +591,19 @@ class Visualizer:
         Returns:
             Plotly figure
         """
+        return self._cached('scatter_trust_vs_confidence', results_df,
+                            ['confidence', 'trust_score', 'action'],
+                            lambda: self._build_scatter_trust_vs_confidence(results_df))
+    
+    def _build_scatter_trust_vs_confidence(self, results_df: pd.DataFrame) -> go.Figure:
+        if len(results_df) > self.max_points:
+            if self.large_mode == 'density':
+                return self._build_density_trust_vs_confidence(results_df)
+            # Stratified sample so rare actions stay visible
+            frac = self.max_points / len(results_df)
+            results_df = (results_df.groupby('action', group_keys=False, observed=True)
+                          .sample(frac=frac, random_state=42))
+        
         fig = px.scatter(
             results_df,
             x='confidence',
@@ -302,3 +621,30 @@ class Visualizer:
         )
         
         return fig
+    
+    def _build_density_trust_vs_confidence(self, results_df: pd.DataFrame) -> go.Figure:
+        """2-D histogram of trust score vs confidence, binned with NumPy"""
+        counts, x_edges, y_edges = np.histogram2d(
+            results_df['confidence'].to_numpy(),
+            results_df['trust_score'].to_numpy(),
+            bins=[50, 50],
+            range=[[0.5, 1.0], [0, 100]]
+        )
+        
+        fig = go.Figure(data=go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan),
+            colorscale='Blues',
+            colorbar=dict(title='Count')
+        ))
+        
+        fig.update_layout(
+            title=f'Trust Score vs Confidence (density of {len(results_df):,} points)',
+            xaxis_title='Confidence',
+            yaxis_title='Trust Score',
+            title_font_size=18,
+            height=400
+        )
+        
+        return fig
@@ -0,0 +1,356 @@
+"""
+Training pipeline: rebuild every artifact in models/ from data.csv in one command
+The notebook's steps as cached stages; only stages whose inputs changed re-run, independent ones in parallel
+
+Run: python train_pipeline.py [--output models] [--force grid_search] [--workers 4] [--skip feature_importance]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app'))
+from utils.feature_selection import CORRELATION_THRESHOLD
+from utils.pipeline import Pipeline, Stage
+
+CACHE_DIR = '.pipeline_cache'
+REPORT_FILE = 'training_report.json'
+
+# The notebook's split, grid and final settings
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+PARAM_GRID = {'C': [0.1, 1, 10], 'gamma': ['scale', 'auto', 0.001, 0.01], 'kernel': ['rbf']}
+GRID_SAMPLE = 0.1
+GRID_FOLDS = 3
+
+# Stages whose outputs are written to the model directory
+ARTIFACT_STAGES = ('artifacts', 'scoring_bundle', 'quantized_bundles', 'drift_reference', 'neighbor_index',
+                   'feature_importance', 'feature_selection')
+
+
+# --- Stages: the notebook's cells ---------------------------------------------
+
+def load_dataset(path):
+    """data.csv with clean column names and no id column"""
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip().str.replace("'", "")
+    return df.drop(columns='id', errors='ignore')
+
+
+def fit_encoders(df):
+    """One LabelEncoder per text feature, and the feature order"""
+    from sklearn.preprocessing import LabelEncoder
+    categorical = [col for col in df.select_dtypes(include=['object']).columns if col != 'class']
+    return {
+        'label_encoders': {col: LabelEncoder().fit(df[col]) for col in categorical},
+        'feature_names': [col for col in df.columns if col != 'class'],
+    }
+
+
+def compute_imputation(df, encoding):
+    """Medians for numeric features, most frequent known class for categoricals"""
+    values = {}
+    for col in encoding['feature_names']:
+        column = df[col].dropna()
+        if col in encoding['label_encoders']:
+            known = column[column.isin(encoding['label_encoders'][col].classes_)]
+            values[col] = str(known.mode().iloc[0])
+        else:
+            values[col] = float(column.median())
+    return values
+
+
+def split_dataset(df, encoding, test_size, random_state):
+    """Encoded features, class as anomaly=0 / normal=1, stratified train/test split"""
+    from sklearn.model_selection import train_test_split
+    X = df[encoding['feature_names']].copy()
+    for col, encoder in encoding['label_encoders'].items():
+        X[col] = encoder.transform(X[col])
+    y = (df['class'] == 'normal').astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state,
+                                                        stratify=y)
+    return {'X_train': X_train, 'X_test': X_test, 'y_train': y_train.to_numpy(), 'y_test': y_test.to_numpy()}
+
+
+def fit_scaler(split):
+    from sklearn.preprocessing import StandardScaler
+    return StandardScaler().fit(split['X_train'])
+
+
+def grid_search(split, scaler, param_grid, sample, folds):
+    """Grid search on the first sample share of the scaled training rows"""
+    from sklearn.model_selection import GridSearchCV
+    from sklearn.svm import SVC
+    n = int(sample * len(split['X_train']))
+    search = GridSearchCV(SVC(random_state=RANDOM_STATE), param_grid, cv=folds, scoring='accuracy', n_jobs=-1)
+    search.fit(scaler.transform(split['X_train'])[:n], split['y_train'][:n])
+    return {'best_params': search.best_params_, 'best_score': float(search.best_score_)}
+
+
+def fit_model(split, scaler, search):
+    from sklearn.svm import SVC
+    model = SVC(**search['best_params'], random_state=RANDOM_STATE, probability=True)
+    return model.fit(scaler.transform(split['X_train']), split['y_train'])
+
+
+def fit_trust(model, split, scaler):
+    """Trust scaler over the test rows' decision values, as the notebook fits it"""
+    from utils.bakeoff import fit_trust_scaler
+    return fit_trust_scaler(model, scaler.transform(split['X_test']))
+
+
+def evaluate(model, split, scaler):
+    """Test-set metrics (Normal as the positive class, as in the notebook)"""
+    y_test = split['y_test']
+    y_pred = model.predict(scaler.transform(split['X_test']))
+    tp = int(((y_pred == 1) & (y_test == 1)).sum())
+    precision = tp / max(int((y_pred == 1).sum()), 1)
+    recall = tp / max(int((y_test == 1).sum()), 1)
+    return {
+        'accuracy': float((y_pred == y_test).mean()),
+        'precision': precision,
+        'recall': recall,
+        'f1_score': 2 * precision * recall / max(precision + recall, 1e-12),
+        'false_positive_rate': float(((y_pred == 1) & (y_test == 0)).sum() / max(int((y_test == 0).sum()), 1)),
+        'n_train': len(split['y_train']),
+        'n_test': len(y_test),
+        'support_vectors': int(len(model.support_vectors_)),
+    }
+
+
+def package(encoding, imputation, scaler, model, trust_scaler):
+    """The pickles the app loads, as file bytes"""
+    objects = {
+        'svm_optimized_model.pkl': model,
+        'feature_scaler.pkl': scaler,
+        'trust_scaler.pkl': trust_scaler,
+        'label_encoders.pkl': encoding['label_encoders'],
+        'feature_names.pkl': encoding['feature_names'],
+        'imputation_values.pkl': imputation,
+    }
+    files = {}
+    for name, obj in objects.items():
+        buf = io.BytesIO()
+        joblib.dump(obj, buf)
+        files[name] = buf.getvalue()
+    return files
+
+
+# --- Stages: artifacts derived from the trained model ------------------------
+
+@contextlib.contextmanager
+def model_dir(*file_sets):
+    """Temporary model directory holding the given files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for files in file_sets:
+            for name, data in files.items():
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(data)
+        yield tmp
+
+
+def read_files(directory, names):
+    files = {}
+    for name in names:
+        with open(os.path.join(directory, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+def load_processor(directory):
+    from utils.data_processor import DataProcessor
+    from utils.model_loader import ModelLoader
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataProcessor(ModelLoader(directory))
+
+
+def build_scoring_bundle(artifacts, encoding, imputation, scaler, model, trust_scaler):
+    from utils.scoring_bundle import BUNDLE_FILE, export_bundle, source_digest
+    with model_dir(artifacts) as tmp:
+        export_bundle(model, scaler, trust_scaler, encoding['label_encoders'], encoding['feature_names'],
+                      imputation, os.path.join(tmp, BUNDLE_FILE), digest=source_digest(tmp))
+        return read_files(tmp, [BUNDLE_FILE])
+
+
+def build_quantized_bundles(artifacts, bundle):
+    from utils.quantized_model import QUANTIZATIONS, export_quantized, quantized_bundle_file
+    from utils.scoring_bundle import BUNDLE_FILE
+    with model_dir(artifacts, bundle) as tmp:
+        names = [quantized_bundle_file(q) for q in QUANTIZATIONS]
+        for quantization, name in zip(QUANTIZATIONS, names):
+            export_quantized(os.path.join(tmp, BUNDLE_FILE), os.path.join(tmp, name), quantization)
+        return read_files(tmp, names)
+
+
+def build_drift_reference(artifacts, df):
+    from utils.drift_monitor import DRIFT_REFERENCE_FILE, DriftMonitor
+    with model_dir(artifacts) as tmp:
+        processor = load_processor(tmp)
+        processed_df, _ = processor.validate_and_prepare(df)
+        X = processor.encode_features(processed_df[processor.feature_names])
+        categorical = {col: len(encoder.classes_) for col, encoder in processor.label_encoders.items()}
+        DriftMonitor.fit(X, processor.feature_names, processor.scaler.mean_, processor.scaler.scale_,
+                         categorical=categorical).save(os.path.join(tmp, DRIFT_REFERENCE_FILE))
+        return read_files(tmp, [DRIFT_REFERENCE_FILE])
+
+
+def build_neighbor_index(artifacts, df):
+    from utils.neighbor_index import NEIGHBOR_INDEX_FILE, NeighborIndex
+    with model_dir(artifacts) as tmp:
+        processor = load_processor(tmp)
+        processed_df, _ = processor.validate_and_prepare(df)
+        X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+        NeighborIndex.build(X_scaled, processed_df['true_class'], row_ids=processed_df.index.to_numpy(),
+                            feature_names=processor.feature_names).save(os.path.join(tmp, NEIGHBOR_INDEX_FILE))
+        return read_files(tmp, [NEIGHBOR_INDEX_FILE])
+
+
+def build_feature_importance(artifacts, df, n_repeats):
+    from utils.explainer import FEATURE_IMPORTANCE_FILE, RBFExplainer, permutation_importance
+    with model_dir(artifacts) as tmp:
+        processor = load_processor(tmp)
+        processed_df, _ = processor.validate_and_prepare(df)
+        X_scaled = processor.prepare_features(processed_df[processor.feature_names])
+        y = (processed_df['true_class'] == 'Normal').astype(int).to_numpy()
+        trust_scale = float(np.ravel(processor.trust_scaler.scale_)[0])
+        importance = permutation_importance(processor.model, X_scaled, y, processor.feature_names,
+                                            trust_scale=trust_scale, n_repeats=n_repeats)
+        attributions = np.abs(RBFExplainer.from_model_loader(processor.model_loader).attributions(X_scaled))
+        importance['mean_abs_attribution'] = importance['feature'].map(
+            dict(zip(processor.feature_names, attributions.mean(axis=0))))
+        return {FEATURE_IMPORTANCE_FILE: importance.round(6).to_csv(index=False).encode()}
+
+
+def select_features(split, threshold):
+    """The notebook's importance ranking, correlated pairs and feature subsets over the training rows"""
+    from utils.feature_selection import FEATURE_SUBSETS_FILE, correlated_pairs, feature_subsets, rank_features
+    feature_names = list(split['X_train'].columns)
+    X_train = split['X_train'].to_numpy(dtype=np.float64)
+    ranking = rank_features(X_train, split['y_train'], feature_names, random_state=RANDOM_STATE)
+    pairs = correlated_pairs(X_train, feature_names, threshold)
+    selection = {
+        'threshold': threshold,
+        'ranking': ranking.round(6).to_dict(orient='records'),
+        'correlated_pairs': pairs.round(6).to_dict(orient='records'),
+        'subsets': feature_subsets(ranking, pairs, feature_names),
+    }
+    return {FEATURE_SUBSETS_FILE: json.dumps(selection, indent=2).encode()}
+
+
+def build_stages(data_path, n_repeats=3):
+    return [
+        Stage('dataset', load_dataset, params={'path': data_path}, files=[data_path]),
+        Stage('encoding', fit_encoders, ['dataset']),
+        Stage('imputation', compute_imputation, ['dataset', 'encoding']),
+        Stage('split', split_dataset, ['dataset', 'encoding'],
+              params={'test_size': TEST_SIZE, 'random_state': RANDOM_STATE}),
+        Stage('scaler', fit_scaler, ['split']),
+        Stage('grid_search', grid_search, ['split', 'scaler'],
+              params={'param_grid': PARAM_GRID, 'sample': GRID_SAMPLE, 'folds': GRID_FOLDS}),
+        Stage('model', fit_model, ['split', 'scaler', 'grid_search']),
+        Stage('trust_scaler', fit_trust, ['model', 'split', 'scaler']),
+        Stage('evaluation', evaluate, ['model', 'split', 'scaler']),
+        Stage('artifacts', package, ['encoding', 'imputation', 'scaler', 'model', 'trust_scaler']),
+        Stage('scoring_bundle', build_scoring_bundle,
+              ['artifacts', 'encoding', 'imputation', 'scaler', 'model', 'trust_scaler']),
+        Stage('quantized_bundles', build_quantized_bundles, ['artifacts', 'scoring_bundle']),
+        Stage('drift_reference', build_drift_reference, ['artifacts', 'dataset']),
+        Stage('neighbor_index', build_neighbor_index, ['artifacts', 'dataset']),
+        Stage('feature_importance', build_feature_importance, ['artifacts', 'dataset'],
+              params={'n_repeats': n_repeats}),
+        Stage('feature_selection', select_features, ['split'],
+              params={'threshold': CORRELATION_THRESHOLD}),
+    ]
+
+
+# --- Command line ------------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the model and rebuild every artifact from data.csv")
+    parser.add_argument('--data', default='data.csv', help="Labeled training CSV")
+    parser.add_argument('--output', default='models', help="Model directory to write")
+    parser.add_argument('--cache', default=CACHE_DIR, help="Stage cache directory")
+    parser.add_argument('--workers', type=int, help="Stage processes (default: one per CPU; 0 = sequential)")
+    parser.add_argument('--force', default='', help="Comma-separated stages to re-run even if cached")
+    parser.add_argument('--skip', default='', help="Comma-separated derived artifacts not to build: "
+                                                   + ', '.join(ARTIFACT_STAGES[1:]))
+    parser.add_argument('--importance-repeats', type=int, default=3, help="Shuffles per feature for importance")
+    return parser.parse_args(argv)
+
+
+def write_atomic(path, data):
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = build_stages(args.data, n_repeats=args.importance_repeats)
+    names = [stage.name for stage in stages]
+    force = [n.strip() for n in args.force.split(',') if n.strip()]
+    skip = [n.strip() for n in args.skip.split(',') if n.strip()]
+    unknown = (set(force) - set(names)) | (set(skip) - set(ARTIFACT_STAGES[1:]))
+    if unknown:
+        sys.exit(f"❌ Unknown stages: {sorted(unknown)}")
+
+    print("="*80)
+    print("TRAINING PIPELINE")
+    print("="*80)
+
+    print(f"\n1. Running stages (cache: {args.cache})...")
+    pipeline = Pipeline(stages, args.cache)
+    targets = [name for name in ARTIFACT_STAGES if name not in skip] + ['grid_search', 'evaluation']
+    start = time.perf_counter()
+    outputs = pipeline.run(targets, max_workers=args.workers, force=force)
+    wall = time.perf_counter() - start
+    report = pipeline.report
+    print(report.to_string(index=False, float_format='{:.2f}'.format))
+    ran = report[report['status'] == 'ran']
+    print(f"✓ {len(ran)} of {len(report)} stages ran, {len(report) - len(ran)} cached; "
+          f"{wall:.1f}s wall for {ran['seconds'].sum():.1f}s of stage time")
+
+    print(f"\n2. Writing artifacts to {args.output}/...")
+    os.makedirs(args.output, exist_ok=True)
+    files = {}
+    for name in ARTIFACT_STAGES:
+        files.update(outputs.get(name, {}))
+    for name, data in files.items():
+        write_atomic(os.path.join(args.output, name), data)
+        print(f"✓ {name} ({len(data) / 1024:.0f} KB)")
+
+    metrics = outputs['evaluation']
+    search = outputs['grid_search']
+    training_report = {
+        'data': os.path.basename(args.data),
+        'best_params': search['best_params'],
+        'grid_search_accuracy': search['best_score'],
+        'metrics': metrics,
+        'stages': report.to_dict(orient='records'),
+        'files': {name: hashlib.sha256(data).hexdigest() for name, data in files.items()},
+    }
+    write_atomic(os.path.join(args.output, REPORT_FILE), json.dumps(training_report, indent=2).encode())
+    print(f"✓ {REPORT_FILE}")
+
+    print("\n" + "="*80)
+    print("✅ ARTIFACTS REBUILT!")
+    print("="*80)
+    print(f"\n📁 {os.path.abspath(args.output)}")
+    print(f"   Best params: {search['best_params']}")
+    print(f"   Test accuracy: {metrics['accuracy']:.4f}, F1: {metrics['f1_score']:.4f} "
+          f"({metrics['n_train']} train / {metrics['n_test']} test rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())